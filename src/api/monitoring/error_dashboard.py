@@ -272,9 +272,7 @@ async def reset_monitoring_stats(
 
     try:
         # Reset the response tracker
-        response_tracker.times.clear()
-        response_tracker.error_counts.clear()
-        response_tracker.last_errors.clear()
+        response_tracker.reset()
 
         logger.info("Monitoring statistics reset by admin request")
 
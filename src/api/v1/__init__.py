@@ -9,6 +9,7 @@ from ..endpoints.course_batch import router as course_batch_router
 from ..endpoints.find_course import router as find_course_router
 from .index_cal_and_gap_analysis import router as index_gap_router
 from .index_calculation import router as index_calculation_router
+from .jobs import router as jobs_router
 
 # Import endpoint routers
 from .keyword_extraction import router as keyword_router
@@ -35,6 +36,9 @@ router.include_router(index_gap_router, tags=["Gap Analysis"])
 # Include other routers as they are implemented
 router.include_router(format_router, tags=["Resume Format"])
 router.include_router(tailoring_router, tags=["Resume Tailoring"])
+
+# Include async job router (queued tailoring / gap analysis with polling)
+router.include_router(jobs_router, tags=["Jobs"])
 # router.include_router(course_router, tags=["Course Matching"])
 
 # Include course routers
@@ -125,6 +129,24 @@ async def v1_root():
                     "description": "Get supported languages for resume tailoring",
                     "status": "implemented"
                 },
+                "tailor_resume_job": {
+                    "path": "/api/v1/jobs/tailor-resume",
+                    "method": "POST",
+                    "description": "Queue resume tailoring and return a job id",
+                    "status": "implemented"
+                },
+                "index_cal_and_gap_analysis_job": {
+                    "path": "/api/v1/jobs/index-cal-and-gap-analysis",
+                    "method": "POST",
+                    "description": "Queue index calculation and gap analysis and return a job id",
+                    "status": "implemented"
+                },
+                "job_status": {
+                    "path": "/api/v1/jobs/{job_id}",
+                    "method": "GET",
+                    "description": "Poll job status, partial results and final result",
+                    "status": "implemented"
+                },
                 "find_courses": {
                     "path": "/api/v1/courses/search",
                     "method": "POST",
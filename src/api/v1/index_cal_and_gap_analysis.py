@@ -12,11 +12,14 @@ from pydantic import BaseModel, Field, validator
 
 from src.core.config import get_settings
 from src.core.monitoring_service import monitoring_service
+from src.core.single_flight import request_key
 from src.decorators.error_handler import handle_api_errors
 from src.models.response import (
     UnifiedResponse,
     create_success_response,
 )
+from src.services.analyzed_text import AnalyzedText
+from src.services.idempotency import IDEMPOTENCY_HEADER, run_deduplicated
 
 
 # Environment variable control for course_details field exclusion
@@ -232,7 +235,8 @@ router = APIRouter()
 async def _execute_v2_analysis(
     request: IndexCalAndGapAnalysisRequest,
     keywords_list: list[str],
-    start_time: float
+    start_time: float,
+    http_request: Request | None = None
 ) -> UnifiedResponse:
     """
     Execute analysis using V2 implementation with optimizations.
@@ -241,6 +245,7 @@ async def _execute_v2_analysis(
         request: API request data
         keywords_list: Processed keywords list
         start_time: Request start time for timing
+        http_request: Incoming request, checked for client disconnects
 
     Returns:
         UnifiedResponse with V2 analysis results
@@ -251,12 +256,29 @@ async def _execute_v2_analysis(
         # Initialize V2 service
         v2_service = CombinedAnalysisServiceV2()
 
-        # Execute combined analysis
-        result = await v2_service.analyze(
-            resume=request.resume,
-            job_description=request.job_description,
-            keywords=keywords_list,
-            language=request.language
+        # Normalize each input once; every downstream service reuses the memoized views
+        resume_doc = AnalyzedText(request.resume)
+        jd_doc = AnalyzedText(request.job_description)
+
+        # Execute combined analysis; concurrent identical requests share one execution,
+        # and an Idempotency-Key retry gets the stored result
+        key = request_key("index_cal_and_gap_analysis", {
+            "resume": request.resume,
+            "job_description": request.job_description,
+            "keywords": keywords_list,
+            "language": request.language
+        })
+        result = await run_deduplicated(
+            "index_cal_and_gap_analysis",
+            key,
+            lambda: v2_service.analyze(
+                resume=resume_doc,
+                job_description=jd_doc,
+                keywords=keywords_list,
+                language=request.language
+            ),
+            idempotency_key=http_request.headers.get(IDEMPOTENCY_HEADER) if http_request else None,
+            is_disconnected=http_request.is_disconnected if http_request else None
         )
 
         # Extract data for response formatting
@@ -500,4 +522,4 @@ async def index_cal_and_gap_analysis_endpoint(
     keywords_list = request.keywords  # Already guaranteed to be a list by validator
 
     # Use V2 implementation (optimized path)
-    return await _execute_v2_analysis(request, keywords_list, start_time)
+    return await _execute_v2_analysis(request, keywords_list, start_time, req)
@@ -0,0 +1,104 @@
+"""
+Asynchronous job API for long-running analyses.
+
+POST /api/v1/jobs/tailor-resume and /api/v1/jobs/index-cal-and-gap-analysis
+take the same body as the synchronous endpoints, queue the work and return
+202 with a job id right away. GET /api/v1/jobs/{job_id} returns the job's
+status, any partial results, and once finished the exact status code and
+body the synchronous endpoint would have returned. An optional
+``webhook_url`` query parameter receives the finished job as a POST.
+"""
+import json
+import logging
+from typing import Any
+
+from fastapi import APIRouter, Query, status
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from src.constants.error_codes import ErrorCodes
+from src.core.config import get_settings
+from src.decorators.error_handler import handle_api_errors
+from src.models.api.resume_tailoring import TailorResumeRequest
+from src.models.response import create_success_response
+from src.services.exceptions import ServiceError
+from src.services.job_queue import get_job_queue, public_view
+
+from .index_cal_and_gap_analysis import IndexCalAndGapAnalysisRequest, index_cal_and_gap_analysis_endpoint
+from .resume_tailoring import tailor_resume
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs")
+
+WEBHOOK_QUERY = Query(default=None, description="Receives the finished job record as a POST")
+
+
+def _as_job_result(response: Any) -> tuple[int, dict[str, Any]]:
+    """Status code and JSON body of what a synchronous endpoint returned."""
+    if isinstance(response, Response):
+        return response.status_code, json.loads(response.body)
+    if isinstance(response, BaseModel):
+        return status.HTTP_200_OK, response.model_dump(mode="json")
+    return status.HTTP_200_OK, response
+
+
+def _accepted(record: dict[str, Any]) -> JSONResponse:
+    response = create_success_response(data={
+        **public_view(record),
+        "status_url": f"{get_settings().api_v1_prefix}/jobs/{record['job_id']}",
+    })
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=response.model_dump())
+
+
+@router.post(
+    "/tailor-resume",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a resume tailoring job",
+)
+@handle_api_errors(api_name="jobs_tailor_resume")
+async def submit_tailor_resume_job(
+    request: TailorResumeRequest,
+    webhook_url: str | None = WEBHOOK_QUERY,
+):
+    """Queue /tailor-resume and return the job id to poll."""
+    async def run():
+        return _as_job_result(await tailor_resume(request=request, http_request=None, settings=get_settings()))
+
+    return _accepted(await get_job_queue().submit("tailor_resume", run, webhook_url))
+
+
+@router.post(
+    "/index-cal-and-gap-analysis",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue an index calculation and gap analysis job",
+)
+@handle_api_errors(api_name="jobs_index_cal_and_gap_analysis")
+async def submit_index_cal_and_gap_analysis_job(
+    request: IndexCalAndGapAnalysisRequest,
+    webhook_url: str | None = WEBHOOK_QUERY,
+):
+    """Queue /index-cal-and-gap-analysis and return the job id to poll."""
+    async def run():
+        return _as_job_result(
+            await index_cal_and_gap_analysis_endpoint(request=request, req=None, settings=get_settings())
+        )
+
+    return _accepted(await get_job_queue().submit("index_cal_and_gap_analysis", run, webhook_url))
+
+
+@router.get("/{job_id}", summary="Get job status and result")
+@handle_api_errors(api_name="jobs_status")
+async def get_job(job_id: str):
+    """
+    Job status: queued, running, succeeded or failed.
+
+    ``partial`` holds stage results published while the job runs;
+    ``status_code`` and ``result`` hold the synchronous endpoint's response.
+    """
+    record = await get_job_queue().store.get(job_id)
+    if record is None:
+        raise ServiceError(
+            f"Job {job_id} not found or expired", error_code=ErrorCodes.RESOURCE_NOT_FOUND, status_code=404
+        )
+    return create_success_response(data=public_view(record))
@@ -17,6 +17,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from src.core.config import get_settings
 from src.core.monitoring.storage.failure_storage import failure_storage
 from src.core.monitoring_service import monitoring_service
+from src.core.single_flight import request_key
 from src.decorators.error_handler import handle_api_errors
 from src.models.keyword_extraction import (
     KeywordExtractionRequest,
@@ -35,6 +36,7 @@ from src.services.exceptions import (
     UnsupportedLanguageError,
     ValidationError,
 )
+from src.services.idempotency import IDEMPOTENCY_HEADER, run_deduplicated
 from src.services.keyword_extraction_v2 import (
     get_keyword_extraction_service_v2,
 )
@@ -274,7 +276,16 @@ async def extract_jd_keywords(
 
         # Process keyword extraction using Work Item #343 core logic
         extraction_start = time.time()
-        result = await service.process(validated_data)
+        # Concurrent identical requests (retries, double clicks) share one extraction;
+        # an Idempotency-Key retry gets the stored result
+        key = request_key("keyword_extraction", {**validated_data, "model": llm_info["model"]})
+        result = await run_deduplicated(
+            "keyword_extraction",
+            key,
+            lambda: service.process(validated_data),
+            idempotency_key=http_request.headers.get(IDEMPOTENCY_HEADER) if http_request else None,
+            is_disconnected=http_request.is_disconnected if http_request else None
+        )
         timing_breakdown["keyword_extraction_ms"] = (
             (time.time() - extraction_start) * 1000
         )
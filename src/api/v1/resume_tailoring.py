@@ -5,9 +5,10 @@ Resume Tailoring API endpoints.
 import logging
 import time
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from ...core.config import Settings, get_settings
+from ...core.single_flight import request_key
 from ...decorators.error_handler import handle_tailor_resume_errors
 from ...models.api.resume_tailoring import (
     KeywordsMetrics,
@@ -18,6 +19,7 @@ from ...models.api.resume_tailoring import (
     TailorResumeRequest,
     WarningInfo,
 )
+from ...services.idempotency import IDEMPOTENCY_HEADER, run_deduplicated
 from ...services.resume_tailoring_v31 import ResumeTailoringServiceV31
 from ...utils.bubble_compatibility import (
     BUBBLE_ARRAY_FIELDS,
@@ -44,6 +46,7 @@ def get_tailoring_service():
 @handle_tailor_resume_errors(api_name="tailor_resume")
 async def tailor_resume(
     request: TailorResumeRequest,
+    http_request: Request,
     settings: Settings = Depends(get_settings)
 ) -> TailoringResponse:
     """
@@ -64,13 +67,20 @@ async def tailor_resume(
         f"Resume tailoring v3.1.0 request for language: {request.options.language}"
     )
 
-    # Call the new v3.1.0 service
+    # Call the new v3.1.0 service; concurrent identical requests share one execution,
+    # and an Idempotency-Key retry gets the stored result
     service = get_tailoring_service()
-    result = await service.tailor_resume(
-        job_description=request.job_description,
-        original_resume=request.original_resume,
-        original_index=request.original_index,
-        output_language=request.options.language
+    result = await run_deduplicated(
+        "tailor_resume",
+        request_key("tailor_resume", request.model_dump()),
+        lambda: service.tailor_resume(
+            job_description=request.job_description,
+            original_resume=request.original_resume,
+            original_index=request.original_index,
+            output_language=request.options.language
+        ),
+        idempotency_key=http_request.headers.get(IDEMPOTENCY_HEADER) if http_request else None,
+        is_disconnected=http_request.is_disconnected if http_request else None
     )
 
     # Extract metrics from result
@@ -104,6 +114,7 @@ async def tailor_resume(
         llm1_processing_time_ms=result.get("llm1_processing_time_ms", 0),
         llm2_processing_time_ms=result.get("llm2_processing_time_ms", 0),
         post_processing_ms=result.get("post_processing_ms", 0),
+        post_processing_breakdown=result.get("post_processing_breakdown", {}),
         stage_timings=stage_timings,
         Keywords=KeywordsMetrics(**keywords_metrics) if keywords_metrics else KeywordsMetrics(
             kcr_improvement=0,
@@ -0,0 +1,555 @@
+"""
+Pluggable storage backends for the service caches.
+
+The course search cache, the dynamic course cache, the index-calculation
+embedding cache and the keyword-extraction cache each keep an in-process
+dict. This is fine for one process. With several workers (``src.server``),
+though, every worker warms its own copy and repeats the same embedding and
+LLM calls. When a shared backend is configured, each cache keeps its dict
+as the first tier. It also reads through to, and writes through to, a
+namespace in the shared store.
+
+Backends:
+- ``memory``: in-process LRU dict (the default; caches then use only their own dicts)
+- ``sqlite``: one SQLite file in WAL mode, shared by workers in the same container
+- ``redis``: any server speaking the Redis protocol (RESP2). The client is a
+  minimal dependency-free implementation of GET/SET PX/DEL/SCAN/PING.
+
+Values are stored as bytes. Float vectors (embeddings) are packed as raw
+float32, about 4x smaller than JSON, and everything else as JSON. Every
+operation is observed into ``cache_backend_latency_seconds{backend,op}``.
+A backend error counts in ``cache_backend_errors_total`` and is treated as
+a miss, so a failing shared store can only cost speed, never requests.
+
+Async code uses ``aget``/``aset``/``adelete``/``aclear_prefix``, which run
+the socket or SQLite call of a shared backend in a worker thread instead of
+on the event loop. After ``CACHE_BACKEND_BREAKER_FAILURES`` consecutive
+errors a circuit breaker skips the backend for ``CACHE_BACKEND_BREAKER_S``
+seconds (counted in ``cache_backend_skipped_total``), so an unreachable
+Redis costs one timeout per window instead of one per lookup.
+
+Environment:
+- CACHE_BACKEND: memory | sqlite | redis (default: memory)
+- CACHE_SQLITE_PATH: SQLite file (default: <tmp>/resume-api-cache.sqlite3)
+- CACHE_REDIS_URL: redis://host:port/db (default: redis://localhost:6379/0)
+- CACHE_BACKEND_TIMEOUT_S: socket / lock timeout (default: 0.1)
+- CACHE_BACKEND_BREAKER_FAILURES: consecutive errors that open the breaker (default: 3)
+- CACHE_BACKEND_BREAKER_S: how long an open breaker skips the backend (default: 30)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, ClassVar
+from urllib.parse import urlparse
+
+import numpy as np
+
+from src.core.metrics.registry import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Cache operations take microseconds (memory) to a few milliseconds (network)
+BACKEND_LATENCY_BUCKETS_S = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+# Value encodings: one tag byte followed by the payload
+_TAG_JSON = b"J"
+_TAG_FLOAT32 = b"F"
+
+# Returned by CacheNamespace._decode for entries that must be dropped
+_UNDECODABLE = object()
+
+_latency = get_metrics_registry().histogram(
+    "cache_backend_latency_seconds", "Latency of cache backend operations", ["backend", "op"],
+    buckets=BACKEND_LATENCY_BUCKETS_S,
+)
+_errors = get_metrics_registry().counter(
+    "cache_backend_errors", "Cache backend operations that failed", ["backend", "op"]
+)
+_skipped = get_metrics_registry().counter(
+    "cache_backend_skipped", "Cache backend operations skipped by an open circuit breaker", ["backend", "op"]
+)
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Serialize a cache value.
+
+    Float vectors (numpy arrays and non-empty lists of floats) become raw
+    float32 bytes; everything else must be JSON-serializable.
+
+    Raises:
+        TypeError: If the value is not JSON-serializable
+    """
+    if isinstance(value, np.ndarray) and value.ndim == 1:
+        return _TAG_FLOAT32 + value.astype(np.float32).tobytes()
+    if isinstance(value, list) and value and all(type(item) is float for item in value):
+        return _TAG_FLOAT32 + np.asarray(value, dtype=np.float32).tobytes()
+    return _TAG_JSON + json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(data: bytes) -> Any:
+    """
+    Deserialize a value written by ``encode_value``.
+
+    Float vectors come back as lists of Python floats (float32 precision).
+
+    Raises:
+        ValueError: If the data has an unknown encoding
+    """
+    tag, payload = data[:1], data[1:]
+    if tag == _TAG_FLOAT32:
+        return np.frombuffer(payload, dtype=np.float32).tolist()
+    if tag == _TAG_JSON:
+        return json.loads(payload)
+    raise ValueError(f"Unknown cache value encoding: {tag!r}")
+
+
+class CacheBackend:
+    """
+    Byte-oriented key-value store with per-key TTL.
+
+    Subclasses implement ``_get``/``_set``/``_delete``/``_clear_prefix``. The
+    public methods add latency metrics, turn backend errors into misses and
+    skip the backend while the circuit breaker is open. The ``a``-prefixed
+    variants are for async callers.
+    """
+
+    name: ClassVar[str] = "base"
+    # Whether the store is visible to other processes
+    shared: ClassVar[bool] = False
+
+    # Circuit breaker state (consecutive errors, monotonic time until which calls are skipped)
+    _failures: int = 0
+    _open_until: float = 0.0
+
+    def get(self, key: str) -> bytes | None:
+        """Stored bytes, or None when missing, expired or unreachable."""
+        return self._call("get", self._get, key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        """Store bytes for ``ttl_seconds``."""
+        self._call("set", self._set, key, value, ttl_seconds)
+
+    def delete(self, key: str):
+        """Remove a key."""
+        self._call("delete", self._delete, key)
+
+    def clear_prefix(self, prefix: str):
+        """Remove every key starting with ``prefix``."""
+        self._call("clear", self._clear_prefix, prefix)
+
+    async def aget(self, key: str) -> bytes | None:
+        """``get`` without blocking the event loop."""
+        return await self._offload(self.get, key)
+
+    async def aset(self, key: str, value: bytes, ttl_seconds: float):
+        """``set`` without blocking the event loop."""
+        await self._offload(self.set, key, value, ttl_seconds)
+
+    async def adelete(self, key: str):
+        """``delete`` without blocking the event loop."""
+        await self._offload(self.delete, key)
+
+    async def aclear_prefix(self, prefix: str):
+        """``clear_prefix`` without blocking the event loop."""
+        await self._offload(self.clear_prefix, prefix)
+
+    def close(self):
+        """Release connections."""
+
+    @property
+    def breaker_open(self) -> bool:
+        """Whether calls are currently skipped after repeated errors."""
+        return time.monotonic() < self._open_until
+
+    async def _offload(self, method, *args) -> Any:
+        # In-process stores never block, and an open breaker returns at once
+        if not self.shared or self.breaker_open:
+            return method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    def _call(self, op: str, func, *args) -> Any:
+        if self.breaker_open:
+            _skipped.inc(backend=self.name, op=op)
+            return None
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        except Exception as e:
+            _errors.inc(backend=self.name, op=op)
+            logger.warning(f"Cache backend {self.name} {op} failed: {e}")
+            self._record_failure()
+            return None
+        finally:
+            _latency.observe(time.perf_counter() - start, backend=self.name, op=op)
+        self._failures = 0
+        return result
+
+    def _record_failure(self):
+        self._failures += 1
+        if self._failures >= int(os.getenv("CACHE_BACKEND_BREAKER_FAILURES", "3")):
+            pause = float(os.getenv("CACHE_BACKEND_BREAKER_S", "30"))
+            self._open_until = time.monotonic() + pause
+            self._failures = 0
+            logger.warning(f"Cache backend {self.name} unavailable, skipping it for {pause:g}s")
+
+    def _get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: bytes, ttl_seconds: float):
+        raise NotImplementedError
+
+    def _delete(self, key: str):
+        raise NotImplementedError
+
+    def _clear_prefix(self, prefix: str):
+        raise NotImplementedError
+
+
+class InProcessBackend(CacheBackend):
+    """Thread-safe LRU dict with expiry times."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def _set(self, key: str, value: bytes, ttl_seconds: float):
+        with self._lock:
+            self._data[key] = (time.time() + ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def _delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def _clear_prefix(self, prefix: str):
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    SQLite file shared by the processes of one container.
+
+    WAL mode lets readers proceed while a writer commits. Each thread (of
+    each forked worker) uses its own connection. Expired rows are hidden on
+    read and purged every ``PURGE_EVERY`` writes.
+    """
+
+    name = "sqlite"
+    shared = True
+
+    PURGE_EVERY: ClassVar[int] = 500
+
+    def __init__(self, path: str, timeout: float = 0.1):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._writes = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            # Connections must not cross a fork; the inherited one is abandoned, not closed
+            self._local.pid = os.getpid()
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _get(self, key: str) -> bytes | None:
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes, ttl_seconds: float):
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl_seconds),
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            connection.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def _delete(self, key: str):
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _clear_prefix(self, prefix: str):
+        self._connection().execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class RedisProtocolError(Exception):
+    """Error reply or malformed data from a Redis-protocol server."""
+
+
+class RedisBackend(CacheBackend):
+    """
+    Minimal RESP2 client over one socket.
+
+    Requests are serialized by a lock, which is enough for cache lookups
+    that take well under a millisecond on a local server. A broken
+    connection, or one inherited across a fork, is replaced on the next call.
+    """
+
+    name = "redis"
+    shared = True
+
+    SCAN_COUNT: ClassVar[int] = 500
+
+    def __init__(self, url: str, timeout: float = 0.1):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._reader = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._send("AUTH", self.password)
+        if self.db:
+            self._send("SELECT", str(self.db))
+
+    def _send(self, *args: str | bytes) -> Any:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg.encode("utf-8") if isinstance(arg, str) else arg
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisProtocolError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise RedisProtocolError(f"Unexpected reply type {kind!r}")
+
+    def command(self, *args: str | bytes) -> Any:
+        """Run one command and return its decoded reply."""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._sock, self._reader, self._pid = None, None, os.getpid()
+            if self._sock is None:
+                self._connect()
+            try:
+                return self._send(*args)
+            except (OSError, ConnectionError):
+                self._drop()
+                raise
+
+    def _drop(self):
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+
+    def _get(self, key: str) -> bytes | None:
+        return self.command("GET", key)
+
+    def _set(self, key: str, value: bytes, ttl_seconds: float):
+        self.command("SET", key, value, "PX", str(max(1, int(ttl_seconds * 1000))))
+
+    def _delete(self, key: str):
+        self.command("DEL", key)
+
+    def _clear_prefix(self, prefix: str):
+        cursor = b"0"
+        while True:
+            cursor, keys = self.command("SCAN", cursor, "MATCH", prefix + "*", "COUNT", str(self.SCAN_COUNT))
+            if keys:
+                self.command("DEL", *keys)
+            if cursor == b"0":
+                break
+
+    def close(self):
+        with self._lock:
+            self._drop()
+
+
+class CacheNamespace:
+    """One cache's view of a backend: key prefix, TTL and value encoding."""
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl_seconds: float):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._prefix = f"{namespace}:"
+
+    def get(self, key: str) -> Any | None:
+        """Decoded value, or None on a miss."""
+        data = self.backend.get(self._prefix + key)
+        value = self._decode(data)
+        if value is _UNDECODABLE:
+            self.backend.delete(self._prefix + key)
+            return None
+        return value
+
+    async def aget(self, key: str) -> Any | None:
+        """``get`` without blocking the event loop."""
+        data = await self.backend.aget(self._prefix + key)
+        value = self._decode(data)
+        if value is _UNDECODABLE:
+            await self.backend.adelete(self._prefix + key)
+            return None
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a value; values that cannot be serialized are skipped."""
+        data = self._encode(value)
+        if data is not None:
+            self.backend.set(self._prefix + key, data, self.ttl_seconds)
+
+    async def aset(self, key: str, value: Any):
+        """``set`` without blocking the event loop."""
+        data = self._encode(value)
+        if data is not None:
+            await self.backend.aset(self._prefix + key, data, self.ttl_seconds)
+
+    def clear(self):
+        """Remove every entry of this namespace."""
+        self.backend.clear_prefix(self._prefix)
+
+    async def aclear(self):
+        """``clear`` without blocking the event loop."""
+        await self.backend.aclear_prefix(self._prefix)
+
+    def _decode(self, data: bytes | None) -> Any | None:
+        if data is None:
+            return None
+        try:
+            return decode_value(data)
+        except ValueError as e:
+            logger.warning(f"Dropping undecodable {self.namespace} cache entry: {e}")
+            return _UNDECODABLE
+
+    def _encode(self, value: Any) -> bytes | None:
+        try:
+            return encode_value(value)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Not sharing {self.namespace} cache entry: {e}")
+            return None
+
+
+_backend: CacheBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def create_cache_backend(kind: str | None = None) -> CacheBackend:
+    """
+    Build a backend from the environment.
+
+    Args:
+        kind: memory | sqlite | redis (defaults to CACHE_BACKEND)
+
+    Raises:
+        ValueError: For an unknown backend name
+    """
+    kind = (kind or os.getenv("CACHE_BACKEND", "memory")).lower()
+    timeout = float(os.getenv("CACHE_BACKEND_TIMEOUT_S", "0.1"))
+    if kind == "memory":
+        return InProcessBackend()
+    if kind == "sqlite":
+        path = os.getenv("CACHE_SQLITE_PATH") or os.path.join(tempfile.gettempdir(), "resume-api-cache.sqlite3")
+        return SQLiteBackend(path, timeout=timeout)
+    if kind == "redis":
+        return RedisBackend(os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"), timeout=timeout)
+    raise ValueError(f"Unknown CACHE_BACKEND: {kind}")
+
+
+def get_cache_backend() -> CacheBackend:
+    """Process-wide backend (created on first use)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_cache_backend()
+                logger.info(f"Cache backend: {_backend.name}")
+    return _backend
+
+
+def get_shared_cache(namespace: str, ttl_seconds: float) -> CacheNamespace | None:
+    """
+    Shared second tier for a cache, if one is configured.
+
+    Args:
+        namespace: Key prefix of the cache (e.g. "index_embedding")
+        ttl_seconds: Entry lifetime in the shared store
+
+    Returns:
+        A namespace on the configured backend, or None when the backend is
+        in-process (the cache's own dict already covers that)
+    """
+    backend = get_cache_backend()
+    if not backend.shared:
+        return None
+    return CacheNamespace(backend, namespace, ttl_seconds)
+
+
+def reset_cache_backend():
+    """Close and forget the process-wide backend (after fork or in tests)."""
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+        _backend = None
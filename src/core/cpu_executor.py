@@ -0,0 +1,327 @@
+"""
+Managed executor for CPU-bound stages (HTML parsing, regex passes).
+
+BeautifulSoup parsing and large regex passes hold the GIL, so running them on
+the event loop (or in the default thread pool) stalls every concurrent
+request. ``run_cpu`` sends such work to a shared pool:
+
+- ``process`` (default): ProcessPoolExecutor. Workers are started from a
+  forkserver that has the HTML/regex modules preloaded, and each worker warms
+  its parsers once in the initializer.
+- ``thread``: ThreadPoolExecutor. Keeps the loop responsive but stays GIL-bound.
+- ``inline``: runs on the calling thread (tests and debugging).
+
+Functions sent to the process pool, and their arguments and results, must be
+picklable: use module-level functions or methods of stateless helpers.
+
+Environment:
+- CPU_POOL_MODE: process | thread | inline
+- CPU_POOL_WORKERS: number of workers (default: min(4, CPU count))
+"""
+
+import asyncio
+import functools
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from src.core.metrics.registry import MetricFamily, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+POOL_MODES = ("process", "thread", "inline")
+
+# Modules imported by the forkserver and every worker before the first task
+WARM_MODULES = (
+    "bs4",
+    "src.core.keyword_marking",
+    "src.core.enhanced_marker",
+    "src.core.marker_fixer",
+    "src.core.html_pipeline",
+    "src.core.html_processor",
+    "src.services.html_validator",
+    "src.services.resume_text_processor",
+)
+
+# Recent task durations kept per task for percentile reporting
+TASK_HISTORY_SIZE = 200
+
+
+def _warm_worker():
+    """Process pool initializer: import modules and prime the HTML parser."""
+    for module_name in WARM_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            logger.warning(f"CPU worker could not preload {module_name}: {e}")
+
+    from bs4 import BeautifulSoup
+
+    BeautifulSoup("<p>warm</p>", "html.parser").get_text()
+
+
+def _timed_call(fn: Callable[..., T], args: tuple, kwargs: dict) -> tuple[T, float, float]:
+    """Run a task and report when it started (wall clock) and how long it took."""
+    started_at = time.time()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, started_at, time.perf_counter() - start
+
+
+def _task_name(fn: Callable) -> str:
+    """Readable task name for metrics."""
+    if isinstance(fn, functools.partial):
+        fn = fn.func
+    return getattr(fn, "__qualname__", None) or repr(fn)
+
+
+class CPUExecutor:
+    """Shared CPU pool with queue-depth and task-time metrics."""
+
+    def __init__(self, mode: str | None = None, max_workers: int | None = None):
+        """
+        Configure the executor; the pool itself is created on first use.
+
+        Args:
+            mode: process, thread or inline (default: CPU_POOL_MODE or process)
+            max_workers: Worker count (default: CPU_POOL_WORKERS or min(4, CPU count))
+        """
+        mode = (mode or os.getenv("CPU_POOL_MODE", "process")).lower()
+        if mode not in POOL_MODES:
+            logger.warning(f"Unknown CPU_POOL_MODE '{mode}', using 'process'")
+            mode = "process"
+        self.mode = mode
+        self.max_workers = max_workers or int(os.getenv("CPU_POOL_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+        self._pool: Executor | None = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._in_flight = 0
+        self._peak_queue_depth = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._task_stats: dict[str, dict[str, Any]] = {}
+
+    def _create_pool(self) -> Executor:
+        """Create the underlying pool for the configured mode."""
+        if self.mode == "thread":
+            return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cpu-pool")
+
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            context.set_forkserver_preload(list(WARM_MODULES))
+        logger.info(f"Starting CPU process pool ({self.max_workers} workers, {start_method})")
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context, initializer=_warm_worker)
+
+    def _get_pool(self) -> Executor:
+        """Return the pool, creating it on first use."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+        return self._pool
+
+    def _reset_pool(self):
+        """Drop a broken pool so the next task starts a fresh one."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a CPU-bound function off the event loop.
+
+        Args:
+            fn: Function to run (picklable in process mode)
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The function's return value
+        """
+        name = _task_name(fn)
+        submitted_at = time.time()
+        self._on_submit()
+
+        try:
+            if self.mode == "inline":
+                result, started_at, duration = _timed_call(fn, args, kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                try:
+                    result, started_at, duration = await loop.run_in_executor(
+                        self._get_pool(), _timed_call, fn, args, kwargs
+                    )
+                except BrokenProcessPool:
+                    logger.error(f"CPU process pool broken while running {name}; restarting pool")
+                    self._reset_pool()
+                    result, started_at, duration = await loop.run_in_executor(
+                        self._get_pool(), _timed_call, fn, args, kwargs
+                    )
+        except Exception:
+            self._on_finish(name, None, None, failed=True)
+            raise
+
+        self._on_finish(name, max(0.0, started_at - submitted_at), duration, failed=False)
+        return result
+
+    def _on_submit(self):
+        """Record a submitted task and the resulting queue depth."""
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queue_depth())
+
+    def _on_finish(self, name: str, wait_s: float | None, duration_s: float | None, failed: bool):
+        """Record a finished task."""
+        with self._lock:
+            self._in_flight -= 1
+            stats = self._task_stats.setdefault(name, {
+                "count": 0,
+                "failed": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "total_wait_ms": 0.0,
+                "recent_ms": deque(maxlen=TASK_HISTORY_SIZE),
+            })
+            if failed:
+                self._failed += 1
+                stats["failed"] += 1
+                return
+
+            self._completed += 1
+            duration_ms = duration_s * 1000
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stats["total_wait_ms"] += wait_s * 1000
+            stats["recent_ms"].append(duration_ms)
+
+    def _queue_depth(self) -> int:
+        """Tasks waiting for a free worker (in-flight beyond the worker count)."""
+        if self.mode == "inline":
+            return 0
+        return max(0, self._in_flight - self.max_workers)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get pool metrics.
+
+        Returns:
+            Dictionary with pool configuration, queue depth and per-task timings
+        """
+        with self._lock:
+            tasks = {}
+            for name, stats in self._task_stats.items():
+                count = stats["count"]
+                recent = sorted(stats["recent_ms"])
+                tasks[name] = {
+                    "count": count,
+                    "failed": stats["failed"],
+                    "avg_ms": round(stats["total_ms"] / count, 2) if count else 0.0,
+                    "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 2) if recent else 0.0,
+                    "max_ms": round(stats["max_ms"], 2),
+                    "avg_wait_ms": round(stats["total_wait_ms"] / count, 2) if count else 0.0,
+                }
+
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "started": self._pool is not None,
+                "in_flight": self._in_flight,
+                "queue_depth": self._queue_depth(),
+                "peak_queue_depth": self._peak_queue_depth,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "tasks": tasks,
+            }
+
+    def collect_metrics(self) -> list[MetricFamily]:
+        """Pool utilization and task counters for the metric registry."""
+        with self._lock:
+            in_flight = self._in_flight
+            busy = in_flight if self.mode == "inline" else min(in_flight, self.max_workers)
+            return [
+                MetricFamily("cpu_pool_workers", "gauge", "Configured CPU pool workers").add(
+                    self.max_workers, mode=self.mode
+                ),
+                MetricFamily("cpu_pool_in_flight", "gauge", "CPU tasks submitted and not finished").add(in_flight),
+                MetricFamily("cpu_pool_queue_depth", "gauge", "CPU tasks waiting for a worker").add(
+                    self._queue_depth()
+                ),
+                MetricFamily("cpu_pool_utilization", "gauge", "Share of CPU workers busy").add(
+                    busy / self.max_workers
+                ),
+                MetricFamily("cpu_pool_tasks_total", "counter", "Finished CPU tasks by outcome")
+                .add(self._completed, outcome="completed")
+                .add(self._failed, outcome="failed"),
+            ]
+
+    def start(self):
+        """Start the pool eagerly so workers are warm before the first request."""
+        if self.mode == "inline":
+            return
+        pool = self._get_pool()
+        # Process workers are spawned on demand; one no-op per worker starts them all
+        for _ in range(self.max_workers):
+            pool.submit(os.getpid)
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+            logger.info("CPU pool shut down")
+
+
+# Global executor instance
+_cpu_executor: CPUExecutor | None = None
+
+
+def get_cpu_executor() -> CPUExecutor:
+    """Get the shared CPU executor instance."""
+    global _cpu_executor
+    if _cpu_executor is None:
+        _cpu_executor = CPUExecutor()
+        get_metrics_registry().register_collector("cpu_pool", _cpu_executor.collect_metrics)
+    return _cpu_executor
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a CPU-bound function on the shared CPU executor.
+
+    Args:
+        fn: Function to run (picklable in process mode)
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        The function's return value
+    """
+    return await get_cpu_executor().run(fn, *args, **kwargs)
+
+
+def shutdown_cpu_executor(wait: bool = True):
+    """Shut down the shared CPU executor if it was created."""
+    global _cpu_executor
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=wait)
+        _cpu_executor = None
+        get_metrics_registry().unregister_collector("cpu_pool")
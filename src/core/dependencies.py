@@ -11,6 +11,7 @@ from src.services.standardization.en_standardizer import EnglishStandardizer
 from src.services.standardization.multilingual_standardizer import (
     MultilingualStandardizer,
 )
+from src.services.standardization.snapshot import load_snapshot
 from src.services.standardization.zh_tw_standardizer import (
     TraditionalChineseStandardizer,
 )
@@ -40,10 +41,16 @@ def initialize_dependencies():
     global _english_standardizer, _chinese_standardizer
     global _unified_prompt_service
 
+    if _keyword_standardizer is not None:
+        # Already loaded, e.g. preloaded by the prefork server before forking workers
+        logger.info("Application dependencies already initialized")
+        return
+
     logger.info("Initializing application dependencies...")
 
-    # Initialize KeywordStandardizer (loads YAML files)
-    logger.info("Loading keyword standardizer dictionaries...")
+    # Initialize KeywordStandardizer (loads snapshot, or YAML files if stale)
+    source = "snapshot" if load_snapshot() is not None else "YAML sources"
+    logger.info(f"Loading keyword standardizer dictionaries from {source}...")
     _keyword_standardizer = KeywordStandardizer()
     logger.info(f"  ✓ Loaded {len(_keyword_standardizer.skill_dictionary)} skills")
     logger.info(f"  ✓ Loaded {len(_keyword_standardizer.position_dictionary)} positions")
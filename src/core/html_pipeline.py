@@ -0,0 +1,106 @@
+"""
+Parse-once DOM pipeline for HTML post-processing.
+
+Post-processing steps (e.g. keyword detection and keyword marking) used
+to parse and serialize the document once each. ``HTMLPipeline`` parses the
+document once, lets every stage work on the same tree and serializes once,
+recording how long each stage took.
+
+Documents are parsed with the stdlib ``html.parser``, the parser the
+post-processing steps always used. Other parsers (e.g. lxml) normalize
+markup differently and would change the serialized resume HTML, so they
+are only used when requested explicitly.
+"""
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARSER = "html.parser"
+
+
+def parse_fragment(html: str, parser: str | None = None) -> "BeautifulSoup":
+    """
+    Parse an HTML fragment.
+
+    Args:
+        html: HTML fragment to parse
+        parser: BeautifulSoup parser name (defaults to DEFAULT_PARSER)
+
+    Returns:
+        Parsed document
+    """
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html or "", parser or DEFAULT_PARSER)
+
+
+def serialize_fragment(soup: "BeautifulSoup") -> str:
+    """
+    Serialize a parsed fragment without the wrappers some parsers add.
+
+    lxml wraps fragments in ``<html><body>``; for documents parsed with it only
+    the body content is returned.
+
+    Args:
+        soup: Parsed document
+
+    Returns:
+        HTML fragment
+    """
+    if soup.builder.NAME != "html.parser" and soup.body is not None:
+        return soup.body.decode_contents()
+    return str(soup)
+
+
+class HTMLPipeline:
+    """Run post-processing stages over one parsed document."""
+
+    def __init__(self, html: str, parser: str | None = None):
+        """
+        Parse the document once.
+
+        Args:
+            html: HTML document or fragment
+            parser: BeautifulSoup parser name (defaults to DEFAULT_PARSER)
+        """
+        start = time.perf_counter()
+        self.soup = parse_fragment(html, parser)
+        self.timings: dict[str, int] = {"parse_ms": int((time.perf_counter() - start) * 1000)}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator["BeautifulSoup"]:
+        """
+        Time a stage working on the shared tree.
+
+        Args:
+            name: Stage name; the duration is recorded as ``{name}_ms``
+
+        Yields:
+            The parsed document
+        """
+        start = time.perf_counter()
+        try:
+            yield self.soup
+        finally:
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            key = f"{name}_ms"
+            self.timings[key] = self.timings.get(key, 0) + elapsed_ms
+
+    def text(self) -> str:
+        """Return the document text content."""
+        return self.soup.get_text()
+
+    def serialize(self) -> str:
+        """Serialize the document once, recording the time as a stage."""
+        with self.stage("serialize"):
+            html = serialize_fragment(self.soup)
+        logger.debug(f"HTML pipeline stage timings: {self.timings}")
+        return html
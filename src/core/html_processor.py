@@ -5,8 +5,6 @@ HTML processor for parsing and rebuilding resume HTML.
 import logging
 from typing import ClassVar
 
-from bs4 import BeautifulSoup, Tag
-
 from ..models.domain.tailoring import OptimizationType, ResumeSection, ResumeStructure
 
 logger = logging.getLogger(__name__)
@@ -29,6 +27,8 @@ class HTMLProcessor:
 
     def parse_resume(self, html: str) -> ResumeStructure:
         """Parse HTML resume into structured sections"""
+        from bs4 import BeautifulSoup, Tag
+
         soup = BeautifulSoup(html, 'html.parser')
         sections = {}
         has_summary = False
@@ -151,6 +151,8 @@ class HTMLProcessor:
 
     def remove_markers(self, html: str) -> str:
         """Remove all optimization markers from HTML"""
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html, 'html.parser')
 
         # Find all spans with optimization classes (old-style)
@@ -198,6 +200,8 @@ class HTMLProcessor:
 
     def standardize_section_titles(self, html: str) -> str:
         """Standardize section titles to avoid duplication"""
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html, 'html.parser')
 
         # Map of variations to standard titles
@@ -251,6 +255,8 @@ class HTMLProcessor:
 
     def validate_html_structure(self, html: str) -> tuple[bool, str | None]:
         """Validate HTML structure"""
+        from bs4 import BeautifulSoup
+
         try:
             soup = BeautifulSoup(html, 'html.parser')
 
@@ -273,6 +279,8 @@ class HTMLProcessor:
 
     def normalize_to_html(self, content: str) -> str:
         """Convert plain text to basic HTML if needed"""
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(content, 'html.parser')
 
         # Check if it's already HTML (has any tags)
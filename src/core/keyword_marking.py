@@ -0,0 +1,265 @@
+"""
+Single-pass keyword marking engine for resume HTML.
+
+All keywords are compiled into one case-insensitive alternation that tells,
+in a single scan, whether a text node contains any keyword at all; most nodes
+of a resume do not. Nodes that do are resolved like the original markers:
+keywords are applied longest-first across the whole text, and a match is kept
+only if it does not overlap a longer keyword's match (so in "Deep Learning
+Systems", "Learning Systems" wins over "Deep Learning"). The DOM is walked
+once and matches are spliced into the tree as ``<span>`` tags in place,
+without serializing and re-parsing each modified text node.
+
+With ``nest_overlaps`` keywords are instead applied one at a time in priority
+order, and later keywords are also matched inside the spans of earlier ones
+("React" inside "React Native"), as v3.1 tailoring has always marked them.
+"""
+
+import re
+from collections.abc import Callable, Iterable, Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, NavigableString, Tag
+
+# Tags whose text is never marked
+DEFAULT_SKIP_TAGS = frozenset({'script', 'style'})
+
+# Text, or a (css_class, pieces) span, while nested matches are resolved
+_Piece = str | tuple[str, list]
+
+
+def word_boundary_pattern(keyword: str) -> str:
+    """Default keyword pattern: the escaped keyword between word boundaries."""
+    return rf'\b{re.escape(keyword)}\b'
+
+
+class KeywordMarkingEngine:
+    """
+    Compiled keyword set that marks keywords in a parsed HTML tree.
+
+    Skip rules:
+    - Text inside ``skip_tags`` is never marked.
+    - Text whose enclosing span has a class in ``skip_span_classes`` (or starting
+      with ``skip_span_prefix``) is left untouched. With ``skip_descendants``
+      the rule applies to any ancestor span, otherwise only to the direct parent.
+    """
+
+    def __init__(
+        self,
+        keyword_groups: Sequence[tuple[Iterable[str], str]],
+        pattern_builder: Callable[[str], str] = word_boundary_pattern,
+        skip_span_classes: Iterable[str] = (),
+        skip_span_prefix: str | None = None,
+        skip_descendants: bool = False,
+        skip_tags: Iterable[str] = DEFAULT_SKIP_TAGS,
+        transform: Callable[[str], str] | None = None,
+        nest_overlaps: bool = False,
+    ):
+        """
+        Compile the keyword automaton.
+
+        Args:
+            keyword_groups: (keywords, css_class) pairs in priority order; a keyword
+                listed in several groups (case-insensitive) keeps its first class
+            pattern_builder: Builds the regex for one keyword
+            skip_span_classes: Span classes whose text must not be marked
+            skip_span_prefix: Span class prefix whose text must not be marked
+            skip_descendants: Apply span skip rules to all ancestors, not just the parent
+            skip_tags: Tag names whose text must not be marked
+            transform: Optional function applied to matched text (e.g. case correction)
+            nest_overlaps: Apply keywords one by one in priority order, nesting
+                overlapping keywords instead of keeping the longest match only
+        """
+        self.skip_span_classes = frozenset(skip_span_classes)
+        self.skip_span_prefix = skip_span_prefix
+        self.skip_descendants = skip_descendants
+        self.skip_tags = frozenset(skip_tags)
+        self.transform = transform
+        self.nest_overlaps = nest_overlaps
+
+        entries = []
+        seen = set()
+        for keywords, css_class in keyword_groups:
+            for keyword in keywords or []:
+                if not keyword or not keyword.strip():
+                    continue
+                key = keyword.lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                entries.append((keyword, css_class))
+
+        if not nest_overlaps:
+            # Longest first (stable): longer keywords claim their text before shorter
+            # ones anywhere in the node; equal lengths keep group priority
+            entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+        self.keyword_count = len(entries)
+
+        self._keyword_patterns = [
+            (re.compile(pattern_builder(keyword), re.IGNORECASE), css_class) for keyword, css_class in entries
+        ]
+        # Presence filter: matches somewhere iff at least one keyword pattern does
+        alternatives = [f'(?:{pattern.pattern})' for pattern, _ in self._keyword_patterns]
+        self.pattern = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+
+    def mark_html(self, html: str) -> str:
+        """
+        Parse HTML once, mark keywords and serialize once.
+
+        Args:
+            html: HTML content to process
+
+        Returns:
+            HTML with keyword spans
+        """
+        from bs4 import BeautifulSoup
+
+        if not html or self.pattern is None:
+            return html
+
+        soup = BeautifulSoup(html, 'html.parser')
+        self.mark_soup(soup)
+        return str(soup)
+
+    def mark_soup(self, soup: "BeautifulSoup") -> int:
+        """
+        Mark keywords in an already parsed tree, in place.
+
+        Args:
+            soup: Parsed document to modify
+
+        Returns:
+            Number of keyword spans inserted
+        """
+        if self.pattern is None:
+            return 0
+
+        marked = 0
+        for text_node in self._collect_text_nodes(soup):
+            marked += self._mark_text_node(soup, text_node)
+        return marked
+
+    def _is_skipped_span(self, tag: "Tag") -> bool:
+        """Check whether a span carries a class that blocks marking."""
+        if tag.name != 'span':
+            return False
+        classes = tag.get('class') or []
+        for css_class in classes:
+            if css_class in self.skip_span_classes:
+                return True
+            if self.skip_span_prefix and css_class.startswith(self.skip_span_prefix):
+                return True
+        return False
+
+    def _collect_text_nodes(self, soup: "BeautifulSoup") -> list["NavigableString"]:
+        """Walk the tree once and collect the text nodes eligible for marking (any order)."""
+        from bs4 import NavigableString, Tag
+
+        text_nodes = []
+        stack = [(soup, False)]
+        while stack:
+            tag, inside_skipped = stack.pop()
+            parent_skipped = self._is_skipped_span(tag)
+            if self.skip_descendants:
+                parent_skipped = parent_skipped or inside_skipped
+
+            for child in tag.contents:
+                if isinstance(child, Tag):
+                    if child.name not in self.skip_tags:
+                        stack.append((child, parent_skipped))
+                # Plain text only; comments, CDATA and doctypes are subclasses
+                elif type(child) is NavigableString and not parent_skipped:
+                    text_nodes.append(child)
+
+        return text_nodes
+
+    def _resolve_matches(self, text: str) -> list[tuple[int, int, str]]:
+        """Non-overlapping (start, end, css_class) matches, longest keyword first."""
+        accepted: list[tuple[int, int, str]] = []
+        for pattern, css_class in self._keyword_patterns:
+            for match in pattern.finditer(text):
+                start, end = match.span()
+                if start == end:
+                    continue
+                if any(start < accepted_end and end > accepted_start for accepted_start, accepted_end, _ in accepted):
+                    continue
+                accepted.append((start, end, css_class))
+        accepted.sort()
+        return accepted
+
+    def _nested_pieces(self, text: str) -> list[_Piece]:
+        """Apply each keyword in turn to every text piece, including earlier keyword spans."""
+        pieces: list[_Piece] = [text]
+        for pattern, css_class in self._keyword_patterns:
+            pieces = self._split_pieces(pieces, pattern, css_class)
+        return pieces
+
+    def _split_pieces(self, pieces: list[_Piece], pattern: re.Pattern, css_class: str) -> list[_Piece]:
+        result: list[_Piece] = []
+        for piece in pieces:
+            if isinstance(piece, tuple):
+                result.append((piece[0], self._split_pieces(piece[1], pattern, css_class)))
+                continue
+            position = 0
+            for match in pattern.finditer(piece):
+                start, end = match.span()
+                if start == end:
+                    continue
+                if start > position:
+                    result.append(piece[position:start])
+                result.append((css_class, [piece[start:end]]))
+                position = end
+            if position < len(piece):
+                result.append(piece[position:])
+        return result
+
+    def _build_pieces(self, soup: "BeautifulSoup", pieces: list[_Piece]) -> list["NavigableString | Tag"]:
+        from bs4 import NavigableString
+
+        nodes = []
+        for piece in pieces:
+            if isinstance(piece, str):
+                nodes.append(NavigableString(piece))
+                continue
+            css_class, children = piece
+            span = soup.new_tag('span', attrs={'class': css_class})
+            if len(children) == 1 and isinstance(children[0], str):
+                span.string = self.transform(children[0]) if self.transform else children[0]
+            else:
+                span.extend(self._build_pieces(soup, children))
+            nodes.append(span)
+        return nodes
+
+    def _mark_text_node(self, soup: "BeautifulSoup", text_node: "NavigableString") -> int:
+        """Replace one text node with text and keyword span pieces."""
+        from bs4 import NavigableString, Tag
+
+        text = str(text_node)
+        if self.pattern.search(text) is None:
+            return 0
+
+        if self.nest_overlaps:
+            nodes = self._build_pieces(soup, self._nested_pieces(text))
+            text_node.replace_with(*nodes)
+            return sum(len(node.find_all('span')) + 1 for node in nodes if isinstance(node, Tag))
+
+        pieces = []
+        position = 0
+        for start, end, css_class in self._resolve_matches(text):
+            if start > position:
+                pieces.append(NavigableString(text[position:start]))
+
+            matched = text[start:end]
+            span = soup.new_tag('span', attrs={'class': css_class})
+            span.string = self.transform(matched) if self.transform else matched
+            pieces.append(span)
+            position = end
+
+        if not pieces:
+            return 0
+
+        if position < len(text):
+            pieces.append(NavigableString(text[position:]))
+        text_node.replace_with(*pieces)
+        return sum(1 for piece in pieces if isinstance(piece, Tag))
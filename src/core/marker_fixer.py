@@ -3,9 +3,12 @@ Marker Fixer - Ensures optimization markers are only applied to specific keyword
 """
 
 import re
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 
-from bs4 import BeautifulSoup, NavigableString
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+from .keyword_marking import KeywordMarkingEngine
 
 
 class MarkerFixer:
@@ -19,6 +22,8 @@ class MarkerFixer:
 
     def fix_markers(self, html: str) -> str:
         """Fix optimization markers to ensure they're only on appropriate elements"""
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html, 'html.parser')
 
         # Find all elements with optimization classes
@@ -54,63 +59,9 @@ class MarkerFixer:
         if not keywords or not content.strip():
             return content
 
-        # Parse HTML content
-        soup = BeautifulSoup(content, 'html.parser')
-
-        # Process text nodes to mark keywords
-        for element in soup.find_all(text=True):
-            if isinstance(element, NavigableString) and element.strip():
-                # Skip if already inside a span with opt- class
-                parent = element.parent
-                # SIM102: Combine nested if statements using 'and'
-                if (parent and parent.name == 'span' and parent.get('class') and
-                    any(cls.startswith('opt-') for cls in parent['class'])):
-                    continue
-
-                # Check if text contains any keywords
-                new_html = self._mark_keywords_in_text(str(element), keywords)
-                if new_html != str(element):
-                    # Replace the text node with parsed HTML
-                    new_soup = BeautifulSoup(new_html, 'html.parser')
-                    element.replace_with(new_soup)
-
-        return str(soup)
-
-    def _mark_keywords_in_text(self, text: str, keywords: list[str]) -> str:
-        """Mark keywords in a text string"""
-        # Sort keywords by length (longest first) to avoid partial matches
-        sorted_keywords = sorted(keywords, key=len, reverse=True)
-
-        # Track positions already marked to avoid overlaps
-        marked_positions = []
-        result = text
-
-        for keyword in sorted_keywords:
-            # Use word boundaries to match whole words only
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                start, end = match.span()
-
-                # Check if this position overlaps with already marked text
-                overlap = any(
-                    start < marked_end and end > marked_start
-                    for marked_start, marked_end in marked_positions
-                )
-
-                if not overlap:
-                    marked_positions.append((start, end))
-
-        # Sort positions by start index (reverse to replace from end to start)
-        marked_positions.sort(reverse=True)
-
-        # Apply markers
-        for start, end in marked_positions:
-            keyword = text[start:end]
-            marked_keyword = f'<span class="opt-keyword">{keyword}</span>'
-            result = result[:start] + marked_keyword + result[end:]
-
-        return result
+        # Text directly inside any opt-* span is already marked
+        engine = KeywordMarkingEngine([(keywords, 'opt-keyword')], skip_span_prefix='opt-')
+        return engine.mark_html(content)
 
     def fix_and_enhance_markers(self, html: str, keywords: list[str] | None = None,
                                original_keywords: list[str] | None = None) -> str:
@@ -124,27 +75,42 @@ class MarkerFixer:
         Returns:
             HTML with fixed markers and marked keywords
         """
+        from bs4 import BeautifulSoup
+
+        # Parse once; fixing and marking work on the same tree
+        soup = BeautifulSoup(html, 'html.parser')
+
         # First, fix incorrectly placed markers
-        html = self._move_markers_to_spans(html)
-        html = self._clean_empty_markers(html)
+        self.fix_markers_in_soup(soup)
 
         # Then, apply keyword markers using EnhancedMarker
         if keywords is not None or original_keywords is not None:
             from .enhanced_marker import EnhancedMarker
 
             enhanced_marker = EnhancedMarker()
-            html = enhanced_marker.mark_keywords(
-                html,
-                original_keywords=original_keywords or [],
-                new_keywords=keywords or []
+            engine = enhanced_marker.build_engine(
+                original_keywords=[kw for kw in (original_keywords or []) if kw.strip()],
+                new_keywords=[kw for kw in (keywords or []) if kw.strip()]
             )
+            engine.mark_soup(soup)
 
-        return html
+        return str(soup)
+
+    def fix_markers_in_soup(self, soup: "BeautifulSoup") -> None:
+        """Move span-only markers to spans and drop empty markers, in place."""
+        self._move_markers_to_spans_in_soup(soup)
+        self._clean_empty_markers_in_soup(soup)
 
     def _move_markers_to_spans(self, html: str) -> str:
         """Move span-only markers from block elements to spans."""
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html, 'html.parser')
+        self._move_markers_to_spans_in_soup(soup)
+        return str(soup)
 
+    def _move_markers_to_spans_in_soup(self, soup: "BeautifulSoup") -> None:
+        """Move span-only markers from block elements to spans, in place."""
         # Find all elements with span-only classes
         for class_name in self.SPAN_ONLY_CLASSES:
             for element in soup.find_all(class_=class_name):
@@ -166,15 +132,17 @@ class MarkerFixer:
                         element.clear()
                         element.append(new_span)
 
-        return str(soup)
-
     def _clean_empty_markers(self, html: str) -> str:
         """Remove empty marker elements."""
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html, 'html.parser')
+        self._clean_empty_markers_in_soup(soup)
+        return str(soup)
 
+    def _clean_empty_markers_in_soup(self, soup: "BeautifulSoup") -> None:
+        """Remove empty marker elements, in place."""
         # Find all spans with opt- classes
         for span in soup.find_all('span', class_=re.compile(r'^opt-')):
             if not span.get_text(strip=True):
                 span.decompose()
-
-        return str(soup)
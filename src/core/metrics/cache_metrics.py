@@ -6,6 +6,7 @@ from collections import deque
 from datetime import UTC, datetime
 from typing import Any, ClassVar
 
+from src.core.metrics.registry import MetricFamily, cache_metric_families
 from src.core.monitoring_service import monitoring_service
 
 
@@ -317,6 +318,15 @@ class CacheMetrics:
 
         return trend
 
+    def collect_metrics(self) -> list[MetricFamily]:
+        """Keyword extraction cache counters and savings for the metric registry."""
+        return [
+            *cache_metric_families("keyword_extraction", self.metrics["cache_hits"], self.metrics["cache_misses"]),
+            MetricFamily("cache_cost_saved_usd_total", "counter", "Estimated API cost saved by cache hits").add(
+                self.metrics["total_cost_saved"], cache="keyword_extraction"
+            ),
+        ]
+
     def get_top_cached_items(self, limit: int = 10) -> list[dict[str, Any]]:
         """Get most frequently cached items."""
         sorted_keys = sorted(
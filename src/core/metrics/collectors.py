@@ -0,0 +1,38 @@
+"""
+Wire long-lived components into the metric registry.
+
+Per-stage latency comes from span tracing: every finished trace is walked
+and each span's duration is observed into ``stage_duration_seconds`` under
+its span name (embeddings, gap_analysis, llm1, pgvector_warmup,
+post_processing, ...). Instrumented code needs no metric calls of its own.
+
+Lazily created singletons (CPU executor, loop lag monitor, course cache,
+index calculation service) register their collectors when they are created.
+"""
+
+from src.core.metrics.registry import get_metrics_registry
+from src.core.tracing import Span, register_span_exporter
+
+_stage_duration = get_metrics_registry().histogram(
+    "stage_duration_seconds", "Duration of traced pipeline stages", ["stage"]
+)
+
+
+def observe_trace_stages(root: Span):
+    """Span exporter: observe the duration of every finished span in a trace."""
+    for current, _ in root.walk():
+        if current.finished:
+            _stage_duration.observe(current.elapsed_ms() / 1000, stage=current.name)
+
+
+def register_default_collectors():
+    """Register the module-level trackers and the stage-latency span exporter (idempotent)."""
+    from src.core.metrics.cache_metrics import cache_metrics
+    from src.core.metrics.endpoint_metrics import endpoint_metrics
+    from src.middleware.lightweight_monitoring import response_tracker
+
+    registry = get_metrics_registry()
+    registry.register_collector("response_times", response_tracker.collect_metrics)
+    registry.register_collector("endpoint_metrics", endpoint_metrics.collect_metrics)
+    registry.register_collector("keyword_cache", cache_metrics.collect_metrics)
+    register_span_exporter(observe_trace_stages)
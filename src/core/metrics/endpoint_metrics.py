@@ -6,6 +6,7 @@ from collections import defaultdict
 from datetime import UTC, datetime
 from typing import Any
 
+from src.core.metrics.registry import MetricFamily
 from src.core.monitoring_service import monitoring_service
 
 
@@ -275,6 +276,14 @@ class EndpointMetrics:
 
         return summary
 
+    def collect_metrics(self) -> list[MetricFamily]:
+        """Request counts per endpoint and status code for the metric registry."""
+        requests = MetricFamily("endpoint_requests_total", "counter", "Requests by endpoint and status code")
+        for endpoint, metrics in list(self.metrics.items()):
+            for status_code, count in list(metrics["status_codes"].items()):
+                requests.add(count, endpoint=endpoint, status_code=status_code)
+        return [requests]
+
     def reset_metrics(self, endpoint: str | None = None):
         """
         Reset metrics for an endpoint or all endpoints.
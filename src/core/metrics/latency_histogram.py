@@ -0,0 +1,249 @@
+"""
+Fixed-memory latency histograms with rolling time windows.
+
+``LatencyHistogram`` is an HDR-style recorder. Values go into logarithmic
+buckets, so every reported percentile is within ``relative_accuracy`` of the
+true value. Memory is bounded by the trackable range, not by the number of
+samples. Histograms built with the same accuracy merge by adding bucket
+counts.
+
+``RollingLatencyRecorder`` adds 1m/5m/1h windows on top. Each window is a
+small ring of time slots, and a window is the merge of its live slots, so
+stats cost O(buckets) whatever the request volume.
+"""
+
+import math
+import threading
+import time
+from typing import Any
+
+# Trackable range in ms; values outside are clamped
+MIN_TRACKABLE_MS = 0.01
+MAX_TRACKABLE_MS = 3_600_000.0
+
+# Rolling windows: name -> (slot seconds, slot count)
+DEFAULT_WINDOWS: dict[str, tuple[int, int]] = {
+    "1m": (10, 6),
+    "5m": (60, 5),
+    "1h": (300, 12),
+}
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram with bounded relative error."""
+
+    __slots__ = ("_log_gamma", "count", "counts", "max", "min", "relative_accuracy", "total")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Create an empty histogram.
+
+        Args:
+            relative_accuracy: Maximum relative error of reported percentiles
+        """
+        self.relative_accuracy = relative_accuracy
+        self._log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value_ms: float, count: int = 1):
+        """Record one (or ``count``) measurements."""
+        clamped = min(max(value_ms, MIN_TRACKABLE_MS), MAX_TRACKABLE_MS)
+        index = math.ceil(math.log(clamped) / self._log_gamma)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value_ms * count
+        if value_ms < self.min:
+            self.min = value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's counts into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge histograms with different relative accuracy")
+        for index, bucket_count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> "LatencyHistogram":
+        """Return an independent snapshot."""
+        snapshot = LatencyHistogram(self.relative_accuracy)
+        snapshot.merge(self)
+        return snapshot
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable state, for sharing snapshots between processes."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "counts": sorted(self.counts.items()),
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram from ``to_dict`` output."""
+        histogram = cls(data["relative_accuracy"])
+        histogram.counts = {int(index): count for index, count in data["counts"]}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"] if data["min"] is not None else math.inf
+        histogram.max = data["max"]
+        return histogram
+
+    def percentile(self, quantile: float) -> float:
+        """
+        Value at the given quantile.
+
+        Args:
+            quantile: Quantile between 0 and 1
+
+        Returns:
+            Estimated value in ms (0 for an empty histogram)
+        """
+        if not self.count:
+            return 0.0
+        rank = quantile * (self.count - 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen > rank:
+                # Bucket midpoint: within relative_accuracy of every value in the bucket
+                gamma = math.exp(self._log_gamma)
+                value = 2 * gamma ** index / (gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        """Count, average, extremes and p50/p95/p99 in ms."""
+        if not self.count:
+            return {"count": 0, "avg_ms": 0.0, "min_ms": 0.0, "max_ms": 0.0,
+                    "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 2),
+            "min_ms": round(self.min, 2),
+            "max_ms": round(self.max, 2),
+            "p50_ms": round(self.percentile(0.50), 2),
+            "p95_ms": round(self.percentile(0.95), 2),
+            "p99_ms": round(self.percentile(0.99), 2),
+        }
+
+
+class RollingLatencyRecorder:
+    """Lifetime histogram plus rolling windows for one metric series."""
+
+    def __init__(self, relative_accuracy: float = 0.01, windows: dict[str, tuple[int, int]] | None = None):
+        """
+        Create a recorder.
+
+        Args:
+            relative_accuracy: Histogram relative accuracy
+            windows: Window name -> (slot seconds, slot count); defaults to 1m/5m/1h
+        """
+        self.relative_accuracy = relative_accuracy
+        self.windows = windows or DEFAULT_WINDOWS
+        self.lifetime = LatencyHistogram(relative_accuracy)
+        # Per window: ring of [slot epoch, histogram]
+        self._rings: dict[str, list[list]] = {
+            name: [[-1, LatencyHistogram(relative_accuracy)] for _ in range(slots)]
+            for name, (_, slots) in self.windows.items()
+        }
+        # One lock per series, so recording never contends across endpoints
+        self._lock = threading.Lock()
+
+    def record(self, value_ms: float, now: float | None = None):
+        """Record a measurement in the lifetime histogram and every window."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.lifetime.record(value_ms)
+            for name, (slot_seconds, slots) in self.windows.items():
+                epoch = int(now // slot_seconds)
+                slot = self._rings[name][epoch % slots]
+                if slot[0] > epoch:
+                    # Late sample for a slot that has already rotated past it
+                    continue
+                if slot[0] != epoch:
+                    slot[0] = epoch
+                    slot[1] = LatencyHistogram(self.relative_accuracy)
+                slot[1].record(value_ms)
+
+    def window(self, name: str, now: float | None = None) -> LatencyHistogram:
+        """
+        Merged snapshot of a rolling window.
+
+        Args:
+            name: Window name (e.g. "5m")
+            now: Reference time (defaults to now)
+
+        Returns:
+            Histogram of the measurements in the window's live slots
+        """
+        now = time.time() if now is None else now
+        slot_seconds, slots = self.windows[name]
+        current = int(now // slot_seconds)
+        merged = LatencyHistogram(self.relative_accuracy)
+        with self._lock:
+            for epoch, histogram in self._rings[name]:
+                if current - slots < epoch <= current:
+                    merged.merge(histogram)
+        return merged
+
+    def snapshot(self) -> LatencyHistogram:
+        """Copy of the lifetime histogram."""
+        with self._lock:
+            return self.lifetime.copy()
+
+    def merge(self, other: "RollingLatencyRecorder"):
+        """
+        Add another recorder's measurements (e.g. from another worker).
+
+        Window slots are merged when they cover the same time slot; a newer
+        slot replaces an older one, and an older one is ignored.
+        """
+        with other._lock:
+            lifetime = other.lifetime.copy()
+            rings = {name: [(epoch, histogram.copy()) for epoch, histogram in ring]
+                     for name, ring in other._rings.items()}
+        with self._lock:
+            self.lifetime.merge(lifetime)
+            for name, ring in rings.items():
+                own = self._rings.get(name)
+                if own is None:
+                    continue
+                for slot, (epoch, histogram) in zip(own, ring, strict=False):
+                    if epoch == slot[0]:
+                        slot[1].merge(histogram)
+                    elif epoch > slot[0]:
+                        slot[0], slot[1] = epoch, histogram
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable state (lifetime histogram and live window slots)."""
+        with self._lock:
+            return {
+                "lifetime": self.lifetime.to_dict(),
+                "rings": {
+                    name: [[epoch, histogram.to_dict()] for epoch, histogram in ring]
+                    for name, ring in self._rings.items()
+                },
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RollingLatencyRecorder":
+        """Rebuild a recorder (with the default windows) from ``to_dict`` output."""
+        lifetime = LatencyHistogram.from_dict(data["lifetime"])
+        recorder = cls(lifetime.relative_accuracy)
+        recorder.lifetime = lifetime
+        for name, ring in data["rings"].items():
+            if name in recorder._rings and len(ring) == len(recorder._rings[name]):
+                recorder._rings[name] = [[epoch, LatencyHistogram.from_dict(histogram)] for epoch, histogram in ring]
+        return recorder
@@ -0,0 +1,338 @@
+"""
+Process-wide metric registry with Prometheus text exposition.
+
+Two ways to get numbers into ``/metrics``:
+
+- Push: components hold a ``Counter``, ``Gauge`` or ``Histogram`` from the
+  registry and update it as events happen. Use this for objects that are
+  created per request (retry strategy, client pool), whose own counters
+  would disappear with them.
+- Pull: long-lived components register a named collector returning
+  ``MetricFamily`` objects built from their existing stats. Collectors run
+  only when ``/metrics`` is scraped, so recording stays free.
+
+Rendering is O(series) and needs no third-party client library.
+"""
+
+import bisect
+import logging
+import math
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRIC_PREFIX = "resume_api_"
+
+# Default latency buckets in seconds (API stages range from ms to tens of seconds)
+LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, Any]) -> str:
+    """Render a label set as ``{a="1",b="2"}`` (empty for no labels)."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class MetricFamily:
+    """One metric name with its type, help text and samples."""
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        """
+        Create an empty family.
+
+        Args:
+            name: Metric name without the registry prefix
+            kind: counter, gauge, histogram or summary
+            help_text: HELP line text
+        """
+        self.name = METRIC_PREFIX + name
+        self.kind = kind
+        self.help_text = help_text
+        self.samples: list[tuple[str, dict[str, Any], float]] = []
+
+    def add(self, value: float, suffix: str = "", **labels: Any) -> "MetricFamily":
+        """Add a sample; ``suffix`` is appended to the name (e.g. ``_sum``)."""
+        self.samples.append((suffix, labels, value))
+        return self
+
+    def render(self) -> str:
+        """Render the family in text exposition format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(
+            f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+            for suffix, labels, value in self.samples
+        )
+        return "\n".join(lines)
+
+
+class _Metric:
+    """Labelled metric updated by the instrumented code."""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple:
+        """Label values in declaration order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict[str, str]:
+        return dict(zip(self.labelnames, key, strict=True))
+
+    def collect(self) -> MetricFamily:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any):
+        """Increase the counter for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Current value for a label set."""
+        return self._values.get(self._key(labels), 0)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(f"{self.name}_total", self.kind, self.help_text)
+        with self._lock:
+            for key, value in self._values.items():
+                family.add(value, **self._labels(key))
+        return family
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def set(self, value: float, **labels: Any):
+        """Set the gauge for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: Any):
+        """Increase the gauge for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any):
+        """Decrease the gauge for a label set."""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:
+        """Current value for a label set."""
+        return self._values.get(self._key(labels), 0)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.kind, self.help_text)
+        with self._lock:
+            for key, value in self._values.items():
+                family.add(value, **self._labels(key))
+        return family
+
+
+class Histogram(_Metric):
+    """Cumulative bucket histogram."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS_S,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., sum, count]
+        self._series: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels: Any):
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.kind, self.help_text)
+        with self._lock:
+            for key, series in self._series.items():
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets, series, strict=False):
+                    cumulative += count
+                    family.add(cumulative, "_bucket", **labels, le=_format_value(bound))
+                family.add(series[-1], "_bucket", **labels, le="+Inf")
+                family.add(series[-2], "_sum", **labels)
+                family.add(series[-1], "_count", **labels)
+        return family
+
+
+class MetricsRegistry:
+    """Holds push metrics and pull collectors and renders them for scraping."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: dict[str, Callable[[], Iterable[MetricFamily]]] = {}
+
+    def _get_or_create(self, cls: type[_Metric], name: str, help_text: str, **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter (``_total`` is appended on export)."""
+        return self._get_or_create(Counter, name, help_text, labelnames=labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, help_text, labelnames=labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS_S,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, help_text, labelnames=labelnames, buckets=buckets)
+
+    def register_collector(self, name: str, collector: Callable[[], Iterable[MetricFamily]]):
+        """
+        Register a scrape-time collector, replacing any previous one with the same name.
+
+        Args:
+            name: Collector name (one per component)
+            collector: Callable returning metric families
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def unregister_collector(self, name: str):
+        """Remove a collector if registered."""
+        with self._lock:
+            self._collectors.pop(name, None)
+
+    def collect(self) -> list[MetricFamily]:
+        """Collect all families; a failing collector is logged and skipped."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+
+        families = [metric.collect() for metric in metrics]
+        for name, collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector '{name}' failed: {e}")
+
+        # Several components may emit the same family (e.g. cache hits per cache)
+        merged: dict[str, MetricFamily] = {}
+        for family in families:
+            existing = merged.get(family.name)
+            if existing is None:
+                merged[family.name] = family
+            else:
+                existing.samples.extend(family.samples)
+        return list(merged.values())
+
+    def render(self) -> str:
+        """Render every metric in Prometheus text exposition format."""
+        return "\n".join(family.render() for family in self.collect()) + "\n"
+
+
+def cache_metric_families(cache: str, hits: int, misses: int, entries: int | None = None) -> list[MetricFamily]:
+    """
+    Standard families for an in-process cache.
+
+    Args:
+        cache: Cache name label
+        hits: Lifetime hits
+        misses: Lifetime misses
+        entries: Current entry count, if known
+
+    Returns:
+        Hit/miss counters, hit ratio and entry gauge
+    """
+    total = hits + misses
+    families = [
+        MetricFamily("cache_hits_total", "counter", "Cache hits").add(hits, cache=cache),
+        MetricFamily("cache_misses_total", "counter", "Cache misses").add(misses, cache=cache),
+        MetricFamily("cache_hit_ratio", "gauge", "Lifetime cache hit ratio").add(
+            hits / total if total else 0.0, cache=cache
+        ),
+    ]
+    if entries is not None:
+        families.append(MetricFamily("cache_entries", "gauge", "Entries currently cached").add(entries, cache=cache))
+    return families
+
+
+# Global registry instance
+_metrics_registry: MetricsRegistry | None = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the shared metrics registry instance."""
+    global _metrics_registry
+    if _metrics_registry is None:
+        _metrics_registry = MetricsRegistry()
+    return _metrics_registry
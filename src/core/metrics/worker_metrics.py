@@ -0,0 +1,142 @@
+"""
+Per-worker metrics sharing for the prefork server (``src.server``).
+
+Each worker process keeps its own ``ResponseTimeTracker`` and CPU pool. In
+multi-worker mode the master sets WORKER_METRICS_DIR, and every worker
+periodically writes its mergeable state to ``worker-<pid>.json`` there. The
+stats endpoint, whichever worker serves it, merges all files (using its
+own live state instead of its file) into one view.
+
+Environment:
+- WORKER_METRICS_DIR: shared directory (set by ``src.server``; unset = single process)
+- WORKER_METRICS_INTERVAL_S: publish interval (default: 2)
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_publisher_task: asyncio.Task | None = None
+
+
+def worker_metrics_dir() -> Path | None:
+    """Shared metrics directory, or None when running a single process."""
+    directory = os.getenv("WORKER_METRICS_DIR")
+    return Path(directory) if directory else None
+
+
+def worker_state_path(directory: Path, pid: int) -> Path:
+    """State file of one worker."""
+    return directory / f"worker-{pid}.json"
+
+
+def collect_worker_state() -> dict[str, Any]:
+    """Mergeable metrics state of this process."""
+    from src.core.cpu_executor import get_cpu_executor
+    from src.middleware.lightweight_monitoring import response_tracker
+
+    return {
+        "pid": os.getpid(),
+        "published_at": time.time(),
+        "response_times": response_tracker.export_state(),
+        "cpu_pool": get_cpu_executor().get_stats(),
+    }
+
+
+def publish_worker_state(directory: Path):
+    """Write this worker's state atomically."""
+    path = worker_state_path(directory, os.getpid())
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(collect_worker_state()), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def read_worker_states(directory: Path) -> list[dict[str, Any]]:
+    """All workers' states; this process contributes its live state."""
+    own_pid = os.getpid()
+    states = [collect_worker_state()]
+    for path in sorted(directory.glob("worker-*.json")):
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            # File removed by the master or mid-replace; skip this round
+            logger.debug(f"Skipping worker metrics file {path.name}: {e}")
+            continue
+        if state.get("pid") != own_pid:
+            states.append(state)
+    return states
+
+
+def get_aggregated_stats() -> dict[str, Any] | None:
+    """
+    Response-time stats merged across workers.
+
+    Returns:
+        ``ResponseTimeTracker.get_stats`` shape plus a ``workers`` list,
+        or None when not running multiple workers
+    """
+    directory = worker_metrics_dir()
+    if directory is None:
+        return None
+
+    from src.middleware.lightweight_monitoring import ResponseTimeTracker
+
+    merged = ResponseTimeTracker()
+    workers = []
+    for state in read_worker_states(directory):
+        merged.merge_state(state["response_times"])
+        workers.append({
+            "pid": state["pid"],
+            "published_at": state["published_at"],
+            "requests": sum(
+                recorder["lifetime"]["count"]
+                for series in state["response_times"]["series"].values()
+                for recorder in series.values()
+            ),
+            "cpu_pool": state["cpu_pool"],
+        })
+
+    stats = merged.get_stats()
+    stats["workers"] = workers
+    return stats
+
+
+async def _publish_loop(directory: Path, interval: float):
+    """Publish this worker's state every interval."""
+    while True:
+        try:
+            publish_worker_state(directory)
+        except Exception as e:
+            logger.warning(f"Failed to publish worker metrics: {e}")
+        await asyncio.sleep(interval)
+
+
+async def start_worker_metrics_publisher():
+    """Start publishing on the running loop when in multi-worker mode."""
+    global _publisher_task
+    directory = worker_metrics_dir()
+    if directory is None or _publisher_task is not None:
+        return
+    interval = float(os.getenv("WORKER_METRICS_INTERVAL_S", "2"))
+    _publisher_task = asyncio.get_running_loop().create_task(_publish_loop(directory, interval))
+
+
+async def stop_worker_metrics_publisher():
+    """Stop publishing and remove this worker's state file."""
+    global _publisher_task
+    if _publisher_task is None:
+        return
+    _publisher_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await _publisher_task
+    _publisher_task = None
+    directory = worker_metrics_dir()
+    if directory is not None:
+        worker_state_path(directory, os.getpid()).unlink(missing_ok=True)
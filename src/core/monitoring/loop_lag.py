@@ -0,0 +1,288 @@
+"""
+Event-loop lag monitor with blocking-site capture.
+
+A probe task sleeps for a fixed interval and records how late it wakes up
+(scheduled vs actual time). Any lag means something held the event loop, so
+every concurrent request stalled together.
+
+The probe cannot see *what* blocked the loop, because it only runs once the
+loop is free again. A watchdog thread therefore watches the probe's heartbeat.
+When the heartbeat is older than the threshold, it samples the loop thread's
+stack with ``sys._current_frames()`` and counts the offending frame. A stall
+is sampled on every watchdog tick, so long stalls weigh more than short ones.
+
+Environment:
+- LOOP_LAG_MONITOR_ENABLED: true | false (default: true)
+- LOOP_LAG_INTERVAL_MS: probe interval (default: 100)
+- LOOP_LAG_THRESHOLD_MS: lag that counts as a stall (default: 100)
+"""
+
+import asyncio
+import bisect
+import contextlib
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any
+
+from src.core.metrics.registry import MetricFamily, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in ms (the last bucket is open-ended)
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Recent lag samples kept for percentile reporting
+LAG_HISTORY_SIZE = 1000
+
+# Distinct blocking sites kept; the least frequent site is evicted beyond this
+MAX_BLOCKING_SITES = 100
+
+# Frames captured per stack sample
+STACK_DEPTH = 30
+
+_SRC_MARKER = f"{os.sep}src{os.sep}"
+
+
+class LoopLagMonitor:
+    """Measure event-loop lag and capture the stacks that cause it."""
+
+    def __init__(self, interval_ms: float | None = None, threshold_ms: float | None = None):
+        """
+        Configure the monitor; nothing runs until ``start``.
+
+        Args:
+            interval_ms: Probe interval (default: LOOP_LAG_INTERVAL_MS or 100)
+            threshold_ms: Lag that counts as a stall (default: LOOP_LAG_THRESHOLD_MS or 100)
+        """
+        self.interval = (interval_ms or float(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))) / 1000
+        self.threshold = (threshold_ms or float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))) / 1000
+        # Watchdog sampling period; each stack sample stands for this much blocked time
+        self.watchdog_tick = max(self.threshold / 2, 0.005)
+
+        self._lock = threading.Lock()
+        self._probe_task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop_thread_id: int | None = None
+        self._last_beat = time.monotonic()
+        self._in_stall = False
+
+        # Lag metrics
+        self._bucket_counts = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self._recent_ms: deque[float] = deque(maxlen=LAG_HISTORY_SIZE)
+        self._samples = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+        # Stall metrics
+        self._stalls = 0
+        self._stack_samples = 0
+        self._sites: dict[str, dict[str, Any]] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether the probe task is running."""
+        return self._probe_task is not None and not self._probe_task.done()
+
+    def start(self):
+        """Start the probe on the running loop and the watchdog thread."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._probe_task = asyncio.get_running_loop().create_task(self._probe_loop())
+        self._watchdog = threading.Thread(target=self._watchdog_loop, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Loop lag monitor started: interval={self.interval * 1000:.0f}ms, "
+            f"threshold={self.threshold * 1000:.0f}ms"
+        )
+
+    async def stop(self):
+        """Stop the probe and the watchdog thread."""
+        self._stop.set()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._probe_task
+            self._probe_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _probe_loop(self):
+        """Sleep one interval at a time and record how late each wake-up is."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._last_beat = time.monotonic()
+            self._record_lag(lag * 1000)
+
+    def _record_lag(self, lag_ms: float):
+        """Add one lag sample to the histogram."""
+        with self._lock:
+            self._bucket_counts[bisect.bisect_left(LAG_BUCKETS_MS, lag_ms)] += 1
+            self._recent_ms.append(lag_ms)
+            self._samples += 1
+            self._total_ms += lag_ms
+            self._max_ms = max(self._max_ms, lag_ms)
+            self._in_stall = False
+
+        if lag_ms >= self.threshold * 1000:
+            top = self._top_sites(1)
+            site = f" (top blocking site: {top[0]['site']})" if top else ""
+            logger.warning(f"Event loop blocked for {lag_ms:.0f}ms{site}")
+
+    def _watchdog_loop(self):
+        """Sample the loop thread's stack while the probe heartbeat is stale."""
+        while not self._stop.wait(self.watchdog_tick):
+            if time.monotonic() - self._last_beat < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._record_stack(traceback.extract_stack(frame, limit=STACK_DEPTH))
+
+    def _record_stack(self, stack: traceback.StackSummary):
+        """Count the blocking site of one stack sample."""
+        site_frame = _blocking_frame(stack)
+        if site_frame is None:
+            return
+        site = f"{site_frame.filename}:{site_frame.lineno} in {site_frame.name}"
+
+        with self._lock:
+            if not self._in_stall:
+                self._in_stall = True
+                self._stalls += 1
+            self._stack_samples += 1
+
+            entry = self._sites.get(site)
+            if entry is None:
+                if len(self._sites) >= MAX_BLOCKING_SITES:
+                    least = min(self._sites, key=lambda key: self._sites[key]["samples"])
+                    del self._sites[least]
+                entry = self._sites[site] = {"samples": 0, "stack": traceback.format_list(stack)}
+            entry["samples"] += 1
+            entry["last_seen"] = time.time()
+
+    def _top_sites(self, limit: int) -> list[dict[str, Any]]:
+        """Most frequently sampled blocking sites."""
+        with self._lock:
+            ranked = sorted(self._sites.items(), key=lambda item: item[1]["samples"], reverse=True)[:limit]
+            return [{"site": site, **entry} for site, entry in ranked]
+
+    def get_stats(self, top: int = 10) -> dict[str, Any]:
+        """
+        Get lag histogram and top blocking sites.
+
+        Args:
+            top: Number of blocking sites to return
+
+        Returns:
+            Dictionary with lag percentiles, histogram buckets and blocking sites
+        """
+        with self._lock:
+            recent = sorted(self._recent_ms)
+            labels = [f"le_{bound}ms" for bound in LAG_BUCKETS_MS] + [f"gt_{LAG_BUCKETS_MS[-1]}ms"]
+            stats = {
+                "running": self.running,
+                "interval_ms": self.interval * 1000,
+                "threshold_ms": self.threshold * 1000,
+                "samples": self._samples,
+                "avg_lag_ms": round(self._total_ms / self._samples, 2) if self._samples else 0.0,
+                "max_lag_ms": round(self._max_ms, 2),
+                "p50_lag_ms": _percentile(recent, 0.50),
+                "p95_lag_ms": _percentile(recent, 0.95),
+                "p99_lag_ms": _percentile(recent, 0.99),
+                "histogram": dict(zip(labels, self._bucket_counts, strict=True)),
+                "stalls": self._stalls,
+                "stack_samples": self._stack_samples,
+            }
+        stats["blocking_sites"] = [
+            {
+                "site": entry["site"],
+                "samples": entry["samples"],
+                "approx_blocked_ms": round(entry["samples"] * self.watchdog_tick * 1000),
+                "last_seen": entry["last_seen"],
+                "stack": entry["stack"],
+            }
+            for entry in self._top_sites(top)
+        ]
+        return stats
+
+    def collect_metrics(self) -> list[MetricFamily]:
+        """Lag histogram and stall counter for the metric registry."""
+        lag = MetricFamily("event_loop_lag_seconds", "histogram", "Event-loop wake-up lag")
+        with self._lock:
+            cumulative = 0
+            for bound, count in zip(LAG_BUCKETS_MS, self._bucket_counts, strict=False):
+                cumulative += count
+                lag.add(cumulative, "_bucket", le=bound / 1000)
+            lag.add(self._samples, "_bucket", le="+Inf")
+            lag.add(self._total_ms / 1000, "_sum")
+            lag.add(self._samples, "_count")
+            stalls = MetricFamily("event_loop_stalls_total", "counter", "Event-loop stalls over the threshold")
+            stalls.add(self._stalls)
+        return [lag, stalls]
+
+    def reset(self):
+        """Clear all collected metrics."""
+        with self._lock:
+            self._bucket_counts = [0] * (len(LAG_BUCKETS_MS) + 1)
+            self._recent_ms.clear()
+            self._samples = 0
+            self._total_ms = 0.0
+            self._max_ms = 0.0
+            self._stalls = 0
+            self._stack_samples = 0
+            self._sites.clear()
+
+
+def _blocking_frame(stack: traceback.StackSummary) -> traceback.FrameSummary | None:
+    """Pick the innermost application frame, falling back to the innermost frame."""
+    for frame in reversed(stack):
+        if _SRC_MARKER in frame.filename and "site-packages" not in frame.filename:
+            return frame
+    return stack[-1] if stack else None
+
+
+def _percentile(sorted_values: list[float], quantile: float) -> float:
+    """Nearest-rank percentile of pre-sorted values."""
+    if not sorted_values:
+        return 0.0
+    return round(sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * quantile))], 2)
+
+
+# Global monitor instance
+_loop_lag_monitor: LoopLagMonitor | None = None
+
+
+def get_loop_lag_monitor() -> LoopLagMonitor:
+    """Get the shared loop lag monitor instance."""
+    global _loop_lag_monitor
+    if _loop_lag_monitor is None:
+        _loop_lag_monitor = LoopLagMonitor()
+        get_metrics_registry().register_collector("loop_lag", _loop_lag_monitor.collect_metrics)
+    return _loop_lag_monitor
+
+
+async def start_loop_lag_monitor():
+    """Start the shared monitor on the running loop if enabled."""
+    if os.getenv("LOOP_LAG_MONITOR_ENABLED", "true").lower() == "true":
+        get_loop_lag_monitor().start()
+
+
+async def stop_loop_lag_monitor():
+    """Stop the shared monitor if it was created."""
+    global _loop_lag_monitor
+    if _loop_lag_monitor is not None:
+        await _loop_lag_monitor.stop()
+        _loop_lag_monitor = None
+        get_metrics_registry().unregister_collector("loop_lag")
@@ -3,8 +3,10 @@ API Security monitoring and threat detection.
 Monitors for suspicious patterns and unauthorized access attempts.
 """
 import re
-from collections import defaultdict, deque
+import time
+from collections import defaultdict
 from datetime import UTC, datetime, timedelta
+from typing import ClassVar
 
 from fastapi import Request
 
@@ -12,6 +14,32 @@ from src.core.monitoring.storage.failure_storage import failure_storage
 from src.core.monitoring_service import monitoring_service
 
 
+class _RateWindow:
+    """Bucketed sliding-window request counter for one IP."""
+
+    __slots__ = ("counts", "last_bucket", "total")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.last_bucket = -1
+        self.total = 0
+
+    def add(self, bucket: int) -> int:
+        """Count a request in ``bucket`` and return the window total."""
+        size = len(self.counts)
+        # Expire the buckets skipped since the last request (at most one full lap)
+        if bucket != self.last_bucket:
+            start = max(self.last_bucket + 1, bucket - size + 1)
+            for expired in range(start, bucket + 1):
+                slot = expired % size
+                self.total -= self.counts[slot]
+                self.counts[slot] = 0
+            self.last_bucket = bucket
+        self.counts[bucket % size] += 1
+        self.total += 1
+        return self.total
+
+
 class SecurityMonitor:
     """
     API Security monitoring system.
@@ -24,6 +52,16 @@ class SecurityMonitor:
     - SQL injection/XSS detection
     """
 
+    # Rate limit window: RATE_WINDOW_BUCKETS buckets of RATE_BUCKET_SECONDS each
+    RATE_BUCKET_SECONDS: ClassVar[int] = 5
+    RATE_WINDOW_BUCKETS: ClassVar[int] = 12
+    # Drop counters of IPs idle for a full window this often (seconds)
+    COMPACT_INTERVAL_SECONDS: ClassVar[int] = 60
+
+    # Only this many leading body bytes are scanned for threat patterns
+    CONTENT_SCAN_BYTES: ClassVar[int] = 64 * 1024
+    MAX_CONTENT_CHARS: ClassVar[int] = 100000  # 100KB
+
     def __init__(self):
         """Initialize security monitor."""
         # Allowed origins
@@ -34,21 +72,23 @@ class SecurityMonitor:
             "http://localhost:8000"
         }
 
-        # Suspicious patterns
+        # Suspicious patterns (matched case-insensitively)
         self.suspicious_patterns = [
             (r"<script.*?>.*?</script>", "XSS_ATTEMPT"),
             (r"javascript:", "XSS_ATTEMPT"),
             (r"on\w+\s*=", "XSS_ATTEMPT"),
-            (r"(?i)(union|select|insert|update|delete|drop)\s+(all|from|into|table)", "SQL_INJECTION"),
-            (r"(?i)(exec|execute)\s*\(", "CODE_INJECTION"),
+            (r"(union|select|insert|update|delete|drop)\s+(all|from|into|table)", "SQL_INJECTION"),
+            (r"(exec|execute)\s*\(", "CODE_INJECTION"),
             (r"\.\./", "PATH_TRAVERSAL"),
             (r"\${.*}", "TEMPLATE_INJECTION"),
-            (r"(?i)(cmd|powershell|bash|sh)\s*[\|\;]", "COMMAND_INJECTION")
+            (r"(cmd|powershell|bash|sh)\s*[\|\;]", "COMMAND_INJECTION")
         ]
+        self._threat_scanner, self._threat_groups = self._compile_threat_scanner(self.suspicious_patterns)
 
         # Rate limiting tracking
-        self.ip_requests = defaultdict(lambda: deque(maxlen=1000))
+        self.ip_requests: dict[str, _RateWindow] = {}
         self.rate_limit_threshold = 60  # requests per minute
+        self._last_compaction = time.monotonic()
 
         # Blocked IPs
         self.blocked_ips = set()
@@ -216,22 +256,19 @@ class SecurityMonitor:
 
         return result
 
-    def _check_rate_limit(self, client_ip: str) -> dict[str, any]:
-        """Check if IP exceeds rate limit."""
-        now = datetime.now(UTC)
-        minute_ago = now - timedelta(minutes=1)
-
-        # Clean old requests
-        self.ip_requests[client_ip] = deque(
-            (req_time for req_time in self.ip_requests[client_ip] if req_time > minute_ago),
-            maxlen=1000
-        )
+    def _check_rate_limit(self, client_ip: str, now: float | None = None) -> dict[str, any]:
+        """Check if IP exceeds rate limit (O(1) per request)."""
+        now = time.monotonic() if now is None else now
+        bucket = int(now // self.RATE_BUCKET_SECONDS)
 
-        # Add current request
-        self.ip_requests[client_ip].append(now)
+        window = self.ip_requests.get(client_ip)
+        if window is None:
+            window = self.ip_requests[client_ip] = _RateWindow(self.RATE_WINDOW_BUCKETS)
+        request_count = window.add(bucket)
 
-        # Check rate
-        request_count = len(self.ip_requests[client_ip])
+        if now - self._last_compaction >= self.COMPACT_INTERVAL_SECONDS:
+            self._compact(bucket)
+            self._last_compaction = now
 
         return {
             "allowed": request_count <= self.rate_limit_threshold,
@@ -239,6 +276,38 @@ class SecurityMonitor:
             "limit": self.rate_limit_threshold
         }
 
+    def _compact(self, current_bucket: int):
+        """Drop rate counters of idle IPs and expired temporary blocks."""
+        idle_before = current_bucket - self.RATE_WINDOW_BUCKETS
+        for ip in [ip for ip, window in self.ip_requests.items() if window.last_bucket <= idle_before]:
+            del self.ip_requests[ip]
+
+        now = datetime.now(UTC)
+        for ip in [ip for ip, unblock_time in self.temp_blocked_ips.items() if unblock_time <= now]:
+            del self.temp_blocked_ips[ip]
+
+    @staticmethod
+    def _compile_threat_scanner(patterns: list[tuple[str, str]]) -> tuple[re.Pattern, dict[str, str]]:
+        """
+        Combine threat patterns into one regex.
+
+        Each pattern sits in a named group inside a lookahead, so the scan
+        advances one character at a time and a long match of one pattern
+        cannot hide another pattern that starts inside it.
+        """
+        groups = {f"t{i}": threat_type for i, (_, threat_type) in enumerate(patterns)}
+        alternatives = "|".join(f"(?P<t{i}>{pattern})" for i, (pattern, _) in enumerate(patterns))
+        return re.compile(f"(?=(?:{alternatives}))", re.IGNORECASE), groups
+
+    def _scan_threats(self, text: str) -> list[str]:
+        """Threat types of the matching patterns, in pattern order, from a single regex pass."""
+        found = set()
+        for match in self._threat_scanner.finditer(text):
+            found.add(match.lastgroup)
+            if len(found) == len(self._threat_groups):
+                break
+        return [threat_type for group, threat_type in self._threat_groups.items() if group in found]
+
     async def _check_request_content(self, request: Request) -> dict[str, any]:
         """Check request body for malicious patterns."""
         result = {"threats": []}
@@ -261,15 +330,15 @@ class SecurityMonitor:
             if not body:
                 return result
 
-            body_text = body.decode('utf-8', errors='ignore')
-
-            # Check against suspicious patterns
-            for pattern, threat_type in self.suspicious_patterns:
-                if re.search(pattern, body_text, re.IGNORECASE):
-                    result["threats"].append(threat_type)
+            # Scan a bounded prefix; threat payloads don't need the whole body
+            body_text = body[:self.CONTENT_SCAN_BYTES].decode('utf-8', errors='ignore')
+            result["threats"].extend(self._scan_threats(body_text))
 
-            # Check for overly long inputs (potential buffer overflow)
-            if len(body_text) > 100000:  # 100KB
+            # Check for overly long inputs (potential buffer overflow);
+            # a body of at most MAX_CONTENT_CHARS bytes cannot exceed it in characters
+            if len(body) > self.MAX_CONTENT_CHARS and (
+                len(body.decode('utf-8', errors='ignore')) > self.MAX_CONTENT_CHARS
+            ):
                 result["threats"].append("OVERSIZED_REQUEST")
 
         except Exception:
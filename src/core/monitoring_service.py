@@ -1,5 +1,8 @@
 """
 Azure Application Insights integration for monitoring and telemetry.
+
+The OpenCensus exporters pull in azure-identity and their HTTP stack, so they
+are imported only when monitoring is enabled.
 """
 import logging
 import os
@@ -7,24 +10,7 @@ import sys
 from datetime import UTC, datetime
 from typing import Any
 
-from opencensus.ext.azure import metrics_exporter
-from opencensus.ext.azure.log_exporter import AzureLogHandler
-from opencensus.ext.azure.trace_exporter import AzureExporter
-from opencensus.stats import (
-    aggregation as aggregation_module,
-)
-from opencensus.stats import (
-    measure as measure_module,
-)
-from opencensus.stats import (
-    stats as stats_module,
-)
-from opencensus.stats import (
-    view as view_module,
-)
-from opencensus.tags import tag_key as tag_key_module
-from opencensus.trace import tracer as tracer_module
-from opencensus.trace.samplers import ProbabilitySampler
+from src.core.tracing import Span, register_span_exporter
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +48,24 @@ class MonitoringService:
             logger.error(f"Failed to initialize monitoring: {e}")
             self.is_enabled = False
 
+    def after_fork(self):
+        """
+        Recreate exporters in a forked worker process.
+
+        OpenCensus exporters send from background threads, which do not
+        survive ``os.fork``; without this, a forked worker would queue
+        telemetry that is never sent.
+        """
+        if not self.is_enabled:
+            return
+        from opencensus.ext.azure.log_exporter import AzureLogHandler
+
+        if hasattr(self, 'logger'):
+            for handler in list(self.logger.handlers):
+                if isinstance(handler, AzureLogHandler):
+                    self.logger.removeHandler(handler)
+        self._setup_monitoring()
+
     def _setup_telemetry_client(self):
         """Setup Application Insights telemetry client for custom events."""
         from applicationinsights import TelemetryClient
@@ -180,6 +184,8 @@ class MonitoringService:
 
     def _setup_logging(self):
         """Setup Azure logging handler."""
+        from opencensus.ext.azure.log_exporter import AzureLogHandler
+
         handler = AzureLogHandler(
             connection_string=f"InstrumentationKey={self.instrumentation_key}"
         )
@@ -192,15 +198,60 @@ class MonitoringService:
 
     def _setup_tracing(self):
         """Setup distributed tracing."""
+        from opencensus.ext.azure.trace_exporter import AzureExporter
+        from opencensus.trace import tracer as tracer_module
+        from opencensus.trace.samplers import ProbabilitySampler
+
         self.tracer = tracer_module.Tracer(
             exporter=AzureExporter(
                 connection_string=f"InstrumentationKey={self.instrumentation_key}"
             ),
             sampler=ProbabilitySampler(1.0)
         )
+        register_span_exporter(self.export_spans)
+
+    def export_spans(self, root: Span):
+        """Export a finished span tree (src.core.tracing) as Application Insights dependencies."""
+        if not self.is_enabled or not hasattr(self, 'tracer'):
+            return
+        from opencensus.trace.span import SpanKind, generate_span_id
+        from opencensus.trace.span_context import SpanContext
+        from opencensus.trace.span_data import SpanData
+        from opencensus.trace.status import Status
+
+        context = SpanContext(trace_id=root.trace_id)
+        span_ids: dict[int, str] = {}
+        span_datas = []
+        for current, _depth in root.walk():
+            span_id = span_ids[id(current)] = generate_span_id()
+            attributes = {key: str(value) for key, value in current.attributes.items()}
+            span_datas.append(SpanData(
+                name=current.name,
+                context=context,
+                span_id=span_id,
+                parent_span_id=span_ids.get(id(current.parent)),
+                attributes=attributes,
+                start_time=_to_iso(current.start_wall),
+                end_time=_to_iso(current.end_wall),
+                child_span_count=len(current.children),
+                stack_trace=None,
+                annotations=None,
+                message_events=None,
+                links=None,
+                status=Status(2, current.error) if current.error else Status(0),
+                same_process_as_parent_span=None,
+                span_kind=SpanKind.UNSPECIFIED
+            ))
+
+        self.tracer.exporter.export(span_datas)
 
     def _setup_metrics(self):
         """Setup custom metrics exporter."""
+        from opencensus.ext.azure import metrics_exporter
+        from opencensus.stats import measure as measure_module
+        from opencensus.stats import stats as stats_module
+        from opencensus.tags import tag_key as tag_key_module
+
         self.stats = stats_module.stats
         self.view_manager = self.stats.view_manager
         self.stats_recorder = self.stats.stats_recorder
@@ -235,6 +286,9 @@ class MonitoringService:
 
     def _create_views(self):
         """Create and register metric views."""
+        from opencensus.stats import aggregation as aggregation_module
+        from opencensus.stats import view as view_module
+
         # Request duration view
         duration_view = view_module.View(
             "request_duration_distribution",
@@ -316,5 +370,10 @@ class MonitoringService:
             self.telemetry_client.flush()
 
 
+def _to_iso(timestamp: float) -> str:
+    """Format a Unix timestamp the way OpenCensus span data expects."""
+    return datetime.fromtimestamp(timestamp, UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
 # Global monitoring instance
 monitoring_service = MonitoringService()
@@ -3,36 +3,271 @@ Simple Prompt Manager for handling versioned prompts.
 No template engine - just basic YAML configuration and string formatting.
 """
 import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
-import yaml
-
 from src.models.prompt_config import PromptConfig
 
+_PLACEHOLDER = re.compile(r"\{([a-z_][a-z0-9_]*)\}")
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    Prompt text pre-split into literal text and placeholder names.
+
+    Rendering is a single pass over the parts: values are never scanned for
+    placeholders again, and braces that are not placeholders (JSON examples)
+    are kept as-is.
+    """
+    source: str
+    parts: tuple[str, ...]  # Literal text at even indexes, placeholder names at odd indexes
+
+    @classmethod
+    def compile(cls, text: str) -> "CompiledTemplate":
+        """Split prompt text at its {name} placeholders."""
+        return cls(source=text, parts=tuple(_PLACEHOLDER.split(text)))
+
+    @property
+    def placeholders(self) -> frozenset[str]:
+        """Names of the placeholders in the template."""
+        return frozenset(self.parts[1::2])
+
+    def render(self, variables: Mapping[str, Any]) -> str:
+        """
+        Substitute variables in one pass.
+
+        Args:
+            variables: Placeholder values; placeholders without a value are left as-is
+
+        Returns:
+            Rendered prompt text
+        """
+        out = []
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                out.append(part)
+            elif part in variables:
+                out.append(str(variables[part]))
+            else:
+                out.append(f"{{{part}}}")
+        return "".join(out)
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """A parsed prompt file with its templates compiled."""
+    task: str
+    filename: str
+    config: PromptConfig
+    templates: Mapping[str, CompiledTemplate]  # Non-empty prompts by role (system, user, ...)
+
+    @classmethod
+    def compile(cls, task: str, filename: str, config: PromptConfig) -> "CompiledPrompt":
+        """Compile every non-empty prompt of a config."""
+        templates = {role: CompiledTemplate.compile(text) for role, text in config.prompts.items() if text}
+        return cls(task=task, filename=filename, config=config, templates=MappingProxyType(templates))
+
+    @property
+    def version(self) -> str:
+        """Version declared in the prompt file."""
+        return self.config.version
+
+    @property
+    def prompts(self) -> dict[str, str]:
+        """Raw prompt texts by role."""
+        return self.config.prompts
+
+
+@dataclass(frozen=True)
+class _PromptIndex:
+    """Immutable snapshot of the prompts directory; replaced as a whole on reload."""
+    files: Mapping[tuple[str, str], tuple[int, int]]  # (task, filename) -> (mtime_ns, size)
+    prompts: Mapping[tuple[str, str], CompiledPrompt] = field(default_factory=dict)
+    errors: Mapping[tuple[str, str], Exception] = field(default_factory=dict)
+    versions: Mapping[str, tuple[str, ...]] = field(default_factory=dict)  # Newest first
+    resolved: Mapping[str, str] = field(default_factory=dict)  # Version used for "latest"
+    active: Mapping[str, str] = field(default_factory=dict)  # Version with status "active"
+
+
+def _version_key(version: str) -> tuple:
+    try:
+        return (1, tuple(map(int, version.split('.'))))
+    except ValueError:
+        # Unexpected format sorts by string below numeric versions
+        return (0, version)
+
 
 class SimplePromptManager:
     """
     Simple prompt manager that loads YAML configurations.
     No complex templating - just basic string formatting.
+
+    Every YAML file under ``<prompts_dir>/<task>/`` is parsed once into an
+    immutable index of compiled prompts, with the version each task resolves
+    to for "latest" (env var -> active -> latest) worked out at the same time.
+    Lookups are dictionary reads. At most every PROMPT_RELOAD_INTERVAL_S
+    seconds (default 5, negative disables) the files are stat-ed; if any
+    changed, only those are re-parsed and the index is swapped in one
+    assignment. A file that fails to parse keeps its last good version.
     """
 
-    def __init__(self, prompts_dir: str = "src/prompts"):
+    def __init__(self, prompts_dir: str = "src/prompts", reload_interval_s: float | None = None):
         """Initialize the prompt manager."""
         self.prompts_dir = Path(prompts_dir)
         self.logger = logging.getLogger(__name__)
-        self._cache: dict[str, PromptConfig] = {}
+        if reload_interval_s is None:
+            reload_interval_s = float(os.getenv("PROMPT_RELOAD_INTERVAL_S", "5"))
+        self.reload_interval_s = reload_interval_s
+        self._index: _PromptIndex | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
 
         # Ensure prompts directory exists
         self.prompts_dir.mkdir(parents=True, exist_ok=True)
 
-    def load_prompt_config(
-        self,
-        task: str,
-        version: str = "latest"
-    ) -> PromptConfig:
+    # --- Index -----------------------------------------------------------------
+
+    def _scan(self) -> dict[tuple[str, str], tuple[int, int]]:
+        files = {}
+        for path in self.prompts_dir.glob("*/*.yaml"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Removed while scanning
+            files[(path.parent.name, path.name)] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _build_index(
+        self, files: dict[tuple[str, str], tuple[int, int]], previous: _PromptIndex | None
+    ) -> _PromptIndex:
+        import yaml
+
+        prompts, errors = {}, {}
+        for key, stamp in files.items():
+            if previous is not None and previous.files.get(key) == stamp:
+                # Unchanged since the last index
+                if key in previous.prompts:
+                    prompts[key] = previous.prompts[key]
+                if key in previous.errors:
+                    errors[key] = previous.errors[key]
+                continue
+            task, filename = key
+            try:
+                with open(self.prompts_dir / task / filename, encoding='utf-8') as f:
+                    data = yaml.safe_load(f)
+                prompts[key] = CompiledPrompt.compile(task, filename, PromptConfig(**data))
+            except Exception as e:
+                errors[key] = e
+                if previous is not None and key in previous.prompts:
+                    prompts[key] = previous.prompts[key]
+                    self.logger.warning(f"Keeping last good prompt {task}/{filename}; reload failed: {e}")
+
+        versions: dict[str, set[str]] = {}
+        for task, filename in files:
+            version = self._version_from_filename(filename)
+            if version is not None:
+                versions.setdefault(task, set()).add(version)
+        sorted_versions = {
+            task: tuple(sorted(found, key=_version_key, reverse=True)) for task, found in versions.items()
+        }
+
+        active = {}
+        for task, task_versions in sorted_versions.items():
+            for version in task_versions:
+                compiled = prompts.get((task, f"v{version}.yaml"))
+                if compiled is not None and compiled.config.metadata.status == "active":
+                    active[task] = version
+                    break
+
+        resolved = {}
+        for task, task_versions in sorted_versions.items():
+            # Format: TASK_PROMPT_VERSION (e.g., GAP_ANALYSIS_PROMPT_VERSION)
+            env_version = os.getenv(f"{task.upper().replace('-', '_')}_PROMPT_VERSION")
+            if env_version and env_version not in ("latest", "active"):
+                resolved[task] = env_version
+            else:
+                resolved[task] = active.get(task) or task_versions[0]
+
+        self.logger.info(f"Compiled {len(prompts)} prompt files ({len(errors)} failed) from {self.prompts_dir}")
+        return _PromptIndex(
+            files=MappingProxyType(files),
+            prompts=MappingProxyType(prompts),
+            errors=MappingProxyType(errors),
+            versions=MappingProxyType(sorted_versions),
+            resolved=MappingProxyType(resolved),
+            active=MappingProxyType(active),
+        )
+
+    def _current_index(self, force_check: bool = False) -> _PromptIndex:
+        index = self._index
+        now = time.monotonic()
+        stale = (
+            index is None
+            or force_check
+            or (self.reload_interval_s >= 0 and now - self._checked_at >= self.reload_interval_s)
+        )
+        if not stale:
+            return index
+        with self._lock:
+            index = self._index
+            files = self._scan()
+            if index is None or files != dict(index.files):
+                if index is not None:
+                    self.logger.info(f"Prompt files changed under {self.prompts_dir}; reloading")
+                index = self._build_index(files, index)
+                self._index = index
+            self._checked_at = now
+        return index
+
+    def reload(self) -> None:
+        """Re-read the environment and re-check every prompt file now."""
+        with self._lock:
+            self._index = self._build_index(self._scan(), None)
+            self._checked_at = time.monotonic()
+
+    @staticmethod
+    def _version_from_filename(filename: str) -> str | None:
+        # v1.0.0.yaml -> 1.0.0; language-specific files (v1.0.0-zh-TW.yaml) -> 1.0.0
+        stem = filename[:-len(".yaml")]
+        if not stem.startswith('v'):
+            return None
+        return stem[1:].split('-')[0]
+
+    def _get_compiled(self, task: str, filename: str) -> CompiledPrompt:
+        key = (task, filename)
+        index = self._current_index()
+        if key not in index.prompts and key not in index.errors and (self.prompts_dir / task / filename).exists():
+            # Added since the last check
+            index = self._current_index(force_check=True)
+        if key in index.prompts:
+            return index.prompts[key]
+        if key in index.errors:
+            raise index.errors[key]
+        raise FileNotFoundError(f"Prompt file not found: {self.prompts_dir / task / filename}")
+
+    # --- Loading ---------------------------------------------------------------
+
+    def _resolve_version(self, task: str, version: str) -> str:
+        if version not in ("latest", "active"):
+            return version
+        index = self._current_index()
+        if task not in index.resolved:
+            raise FileNotFoundError(f"No prompt versions found for task: {task}")
+        if version == "active":
+            return index.active.get(task) or index.versions[task][0]
+        return index.resolved[task]
+
+    def load_compiled_prompt(self, task: str, version: str = "latest") -> CompiledPrompt:
         """
-        Load prompt configuration for a specific task and version.
+        Load the compiled prompt for a task and version.
 
         Version selection priority:
         1. Explicit version parameter (if not "latest")
@@ -41,60 +276,47 @@ class SimplePromptManager:
         4. Latest version
 
         Args:
-            task: Task identifier (e.g., 'keyword_extraction')
+            task: Task identifier (e.g., 'gap_analysis')
             version: Version string, 'latest', or 'active'
 
         Returns:
-            PromptConfig instance
+            CompiledPrompt instance
         """
-        import os
-
-        # Check for environment variable override
-        # Format: TASK_PROMPT_VERSION (e.g., GAP_ANALYSIS_PROMPT_VERSION)
-        env_key = f"{task.upper().replace('-', '_')}_PROMPT_VERSION"
-        env_version = os.getenv(env_key)
-
-        if env_version and version == "latest":
-            # Environment variable takes precedence over "latest"
-            self.logger.info(f"Using version from environment: {env_key}={env_version}")
-            version = env_version
-        elif version == "latest" or version == "active":
-            # Try to find active version first
-            active_version = self.get_active_version(task)
-            if active_version:
-                self.logger.info(f"Using active version: {active_version}")
-                version = active_version
-            else:
-                # Fall back to latest version
-                version = self._get_latest_version(task)
-                self.logger.info(f"Using latest version: {version}")
-
-        # Check cache
-        cache_key = f"{task}:{version}"
-        if cache_key in self._cache:
-            self.logger.debug(f"Loading from cache: {cache_key}")
-            return self._cache[cache_key]
-
-        # Load from file
+        version = self._resolve_version(task, version)
         # Handle version prefix - don't add 'v' if already present
         version_str = version if version.startswith('v') else f"v{version}"
-        file_path = self.prompts_dir / task / f"{version_str}.yaml"
+        return self._get_compiled(task, f"{version_str}.yaml")
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"Prompt file not found: {file_path}")
+    def load_prompt_config(
+        self,
+        task: str,
+        version: str = "latest"
+    ) -> PromptConfig:
+        """
+        Load prompt configuration for a specific task and version.
 
-        with open(file_path, encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        Version selection follows load_compiled_prompt.
 
-        # Create config object
-        config = PromptConfig(**data)
+        Args:
+            task: Task identifier (e.g., 'keyword_extraction')
+            version: Version string, 'latest', or 'active'
 
-        # Cache it
-        self._cache[cache_key] = config
+        Returns:
+            PromptConfig instance
+        """
+        return self.load_compiled_prompt(task, version).config
 
-        self.logger.info(f"Loaded prompt config: task={task}, version={version}")
+    def preload_all(self) -> int:
+        """
+        Parse and compile every prompt file of every task.
 
-        return config
+        Returns:
+            Number of compiled prompt files
+        """
+        index = self._current_index(force_check=True)
+        for (task, filename), error in index.errors.items():
+            self.logger.warning(f"Could not preload prompt {task}/{filename}: {error}")
+        return len(index.prompts)
 
     def load_prompt_config_by_filename(
         self,
@@ -111,30 +333,11 @@ class SimplePromptManager:
         Returns:
             PromptConfig instance
         """
-        # Check cache using filename
-        cache_key = f"{task}:{filename}"
-        if cache_key in self._cache:
-            self.logger.debug(f"Loading from cache: {cache_key}")
-            return self._cache[cache_key]
-
-        # Load from file
-        file_path = self.prompts_dir / task / filename
-
-        if not file_path.exists():
-            raise FileNotFoundError(f"Prompt file not found: {file_path}")
-
-        with open(file_path, encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-
-        # Create config object
-        config = PromptConfig(**data)
-
-        # Cache it
-        self._cache[cache_key] = config
+        return self._get_compiled(task, filename).config
 
-        self.logger.info(f"Loaded prompt config: task={task}, filename={filename}")
-
-        return config
+    def list_filenames(self, task: str) -> list[str]:
+        """List the prompt files of a task."""
+        return sorted(filename for file_task, filename in self._current_index().files if file_task == task)
 
     def format_prompt(self, template: str, variables: dict[str, str]) -> str:
         """
@@ -153,50 +356,13 @@ class SimplePromptManager:
             raise ValueError(f"Missing required variable in prompt: {e}") from e
 
     def list_versions(self, task: str) -> list[str]:
-        """List all available versions for a task."""
-        task_dir = self.prompts_dir / task
-        if not task_dir.exists():
-            return []
-
-        versions = []
-        for file in task_dir.glob("v*.yaml"):
-            # Extract version from filename (v1.0.0.yaml -> 1.0.0)
-            # Handle language-specific files (v1.0.0-zh-TW.yaml -> 1.0.0)
-            filename = file.stem
-            if filename.startswith('v'):
-                # Remove 'v' prefix and language suffix if present
-                version_str = filename[1:]
-                # Remove language suffix (e.g., -zh-TW)
-                if '-' in version_str:
-                    version_str = version_str.split('-')[0]
-                versions.append(version_str)
-
-        # Remove duplicates (same version may have multiple language files)
-        versions = list(set(versions))
-
-        # Sort versions in descending order
-        try:
-            versions.sort(reverse=True, key=lambda v: tuple(map(int, v.split('.'))))
-        except ValueError:
-            # Fallback to string sorting if version format is unexpected
-            versions.sort(reverse=True)
-
-        return versions
+        """List all available versions for a task, newest first."""
+        # Language-specific files (v1.0.0-zh-TW.yaml) count as their version
+        return list(self._current_index().versions.get(task, ()))
 
     def get_active_version(self, task: str) -> str | None:
         """Get the currently active version for a task."""
-        versions = self.list_versions(task)
-
-        for version in versions:
-            try:
-                config = self.load_prompt_config(task, version)
-                if config.metadata.status == "active":
-                    return version
-            except Exception as e:
-                self.logger.warning(f"Error loading version {version}: {e}")
-                continue
-
-        return None
+        return self._current_index().active.get(task)
 
     def get_resolved_version(self, task: str, requested_version: str = "latest") -> str:
         """
@@ -212,28 +378,12 @@ class SimplePromptManager:
         Returns:
             The actual version string that will be used
         """
-        import os
-
-        # If specific version requested, use it
-        if requested_version not in ["latest", "active"]:
-            return requested_version
-
-        # Check environment variable
-        env_key = f"{task.upper().replace('-', '_')}_PROMPT_VERSION"
-        env_version = os.getenv(env_key)
-        if env_version:
-            return env_version
-
-        # Check active version
-        active_version = self.get_active_version(task)
-        if active_version:
-            return active_version
-
-        # Fall back to latest
-        return self._get_latest_version(task)
+        return self._resolve_version(task, requested_version)
 
     def save_prompt_config(self, task: str, config: PromptConfig) -> Path:
         """Save a prompt configuration to file."""
+        import yaml
+
         # Ensure task directory exists
         task_dir = self.prompts_dir / task
         task_dir.mkdir(parents=True, exist_ok=True)
@@ -250,27 +400,11 @@ class SimplePromptManager:
 
         self.logger.info(f"Saved prompt config to {file_path}")
 
-        # Clear cache for this task
-        self._clear_cache_for_task(task)
+        # Pick up the new file on the next lookup
+        self._current_index(force_check=True)
 
         return file_path
 
-    def _get_latest_version(self, task: str) -> str:
-        """Get the latest version for a task."""
-        versions = self.list_versions(task)
-        if not versions:
-            raise FileNotFoundError(f"No prompt versions found for task: {task}")
-        return versions[0]
-
-    def _clear_cache_for_task(self, task: str):
-        """Clear cache entries for a specific task."""
-        keys_to_remove = [
-            key for key in self._cache
-            if key.startswith(f"{task}:")
-        ]
-        for key in keys_to_remove:
-            del self._cache[key]
-
     def get_prompt_info(self, task: str, version: str) -> dict[str, Any]:
         """Get summary information about a prompt configuration."""
         config = self.load_prompt_config(task, version)
@@ -291,5 +425,29 @@ class SimplePromptManager:
         }
 
 
+# Shared managers by prompts directory
+_managers: dict[Path, SimplePromptManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_prompt_manager(prompts_dir: str = "src/prompts") -> SimplePromptManager:
+    """
+    Get the shared prompt manager for a prompts directory.
+
+    Services loading from the same directory share one compiled index.
+
+    Args:
+        prompts_dir: Prompts directory
+
+    Returns:
+        SimplePromptManager instance
+    """
+    key = Path(prompts_dir).resolve()
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = SimplePromptManager(prompts_dir)
+        return _managers[key]
+
+
 # Global instance
-prompt_manager = SimplePromptManager()
+prompt_manager = get_prompt_manager()
@@ -0,0 +1,181 @@
+"""
+In-process single-flight deduplication of concurrent identical requests.
+
+Bubble.io retries and double clicks send the same analysis twice while the
+first one is still running, and each copy pays the full LLM cost.
+``SingleFlight.do`` runs the work once per key: the first caller starts it
+as a task, concurrent callers with the same key await that task, and the
+key is released as soon as it finishes (results are not cached).
+
+Cancellation follows the waiters, not the caller that started the work:
+a waiter that is cancelled or whose client disconnects simply stops
+waiting, and the shared task is cancelled only when no waiter is left.
+
+Environment:
+- SINGLE_FLIGHT_ENABLED: true | false (default: true)
+- SINGLE_FLIGHT_DISCONNECT_POLL_S: client disconnect check interval (default: 0.5)
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from src.core.metrics.registry import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_WHITESPACE = re.compile(r"\s+")
+
+_executions = get_metrics_registry().counter(
+    "single_flight_executions_total", "Requests that started their own execution", ["operation"]
+)
+_coalesced = get_metrics_registry().counter(
+    "single_flight_coalesced_total", "Requests that awaited an identical in-flight execution", ["operation"]
+)
+_abandoned = get_metrics_registry().counter(
+    "single_flight_abandoned_total", "Executions cancelled because every waiter left", ["operation"]
+)
+
+
+class ClientDisconnectedError(Exception):
+    """The waiting client went away before the shared result was ready."""
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def request_key(operation: str, payload: dict[str, Any]) -> str:
+    """
+    Hash of an operation's normalized inputs.
+
+    Strings are whitespace-collapsed and stripped; dict keys are sorted.
+
+    Args:
+        operation: Operation name, part of the key
+        payload: Every input that affects the result
+
+    Returns:
+        SHA256 hex digest
+    """
+    canonical = json.dumps(
+        {"operation": operation, "payload": _normalize(payload)},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    __slots__ = ("task", "waiters", "joined")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        self.joined = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution."""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._flights: dict[str, _Flight] = {}
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def running(self, key: str) -> bool:
+        """Whether an execution for key is in flight."""
+        flight = self._flights.get(key)
+        return flight is not None and not flight.task.done()
+
+    def _release(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> T:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Normalized input hash (see request_key)
+            fn: Starts the work; only called by the first caller
+            is_disconnected: Polled while waiting; a disconnected client stops waiting
+
+        Returns:
+            The result of fn; a deep copy for each caller when the execution was shared
+
+        Raises:
+            ClientDisconnectedError: is_disconnected reported the client gone
+            Exception: Whatever fn raised, for every caller
+        """
+        if not self.enabled():
+            return await fn()
+
+        flight = self._flights.get(key)
+        if flight is None or flight.task.done():
+            flight = self._flights[key] = _Flight(asyncio.create_task(fn()))
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._release(key, flight))
+            _executions.inc(operation=self.operation)
+        else:
+            _coalesced.inc(operation=self.operation)
+            logger.info(f"[SingleFlight] {self.operation}: joined in-flight execution ({flight.waiters} waiting)")
+
+        flight.waiters += 1
+        flight.joined += 1
+        try:
+            await self._wait(flight.task, is_disconnected)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is left to receive the result; stop paying for it
+                flight.task.cancel()
+                self._release(key, flight)
+                _abandoned.inc(operation=self.operation)
+
+        result = flight.task.result()
+        # Callers post-process their result in place; shared results must not alias
+        return copy.deepcopy(result) if flight.joined > 1 else result
+
+    @staticmethod
+    async def _wait(task: asyncio.Task, is_disconnected: Callable[[], Awaitable[bool]] | None):
+        """Wait for task without propagating this waiter's cancellation to it."""
+        poll_s = float(os.getenv("SINGLE_FLIGHT_DISCONNECT_POLL_S", "0.5")) if is_disconnected else None
+        while not task.done():
+            await asyncio.wait({task}, timeout=poll_s)
+            if not task.done() and await is_disconnected():
+                raise ClientDisconnectedError("Client disconnected while waiting for the result")
+
+
+_single_flights: dict[str, SingleFlight] = {}
+
+
+def get_single_flight(operation: str) -> SingleFlight:
+    """Get the shared single-flight group for an operation."""
+    if operation not in _single_flights:
+        _single_flights[operation] = SingleFlight(operation)
+    return _single_flights[operation]
@@ -0,0 +1,259 @@
+"""
+Lightweight span tracing for per-request timing.
+
+Replaces the hand-written timing dicts in services. A request (or any unit of
+work) opens a trace, and code anywhere below it opens named spans:
+
+    with start_trace("index_cal_and_gap_analysis") as root:
+        with span("embedding"):
+            ...
+        root.duration_ms("embedding")
+
+The current span lives in a ``ContextVar``. ``asyncio.create_task`` and
+``asyncio.to_thread`` copy the context, so spans opened in child tasks and
+worker threads nest under the span that was current when they were started.
+
+Outside a trace, ``span()`` returns a shared no-op object, so instrumented
+code costs one ContextVar lookup when nobody is tracing.
+
+Finished root spans are passed to the registered exporters
+(``MonitoringService`` registers one for Application Insights).
+"""
+
+import logging
+import os
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+_exporters: list[Callable[["Span"], None]] = []
+
+
+class Span:
+    """A timed unit of work with child spans."""
+
+    __slots__ = ("attributes", "children", "end", "error", "name", "parent", "start", "start_wall", "trace_id")
+
+    def __init__(self, name: str, parent: "Span | None" = None, attributes: dict[str, Any] | None = None):
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.attributes = attributes or {}
+        self.children: list[Span] = []
+        self.error: str | None = None
+        self.start_wall = time.time()
+        self.start = time.perf_counter()
+        self.end: float | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the span has ended."""
+        return self.end is not None
+
+    @property
+    def end_wall(self) -> float:
+        """Wall-clock end time (now for unfinished spans)."""
+        return self.start_wall + self.elapsed_ms() / 1000
+
+    def elapsed_ms(self) -> float:
+        """Duration in ms, or time since start for unfinished spans."""
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def offset_ms(self, origin: "Span") -> float:
+        """Start time in ms relative to another span's start."""
+        return (self.start - origin.start) * 1000
+
+    def end_offset_ms(self, origin: "Span") -> float:
+        """End time (now for unfinished spans) in ms relative to another span's start."""
+        return self.offset_ms(origin) + self.elapsed_ms()
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def find(self, name: str) -> "Span | None":
+        """Find the first span with the given name in this subtree (depth first)."""
+        stack = [self]
+        while stack:
+            current = stack.pop()
+            if current.name == name:
+                return current
+            stack.extend(reversed(current.children))
+        return None
+
+    def duration_ms(self, name: str, digits: int = 2) -> float | None:
+        """Rounded duration of a named span in this subtree, None if it never ran."""
+        found = self.find(name)
+        return round(found.elapsed_ms(), digits) if found is not None else None
+
+    def walk(self, depth: int = 0) -> Iterator[tuple["Span", int]]:
+        """Yield this span and its descendants with their depth."""
+        yield self, depth
+        for child in list(self.children):
+            yield from child.walk(depth + 1)
+
+    def to_dict(self, origin: "Span | None" = None) -> dict[str, Any]:
+        """
+        Serialize the span tree with offsets relative to ``origin``.
+
+        Args:
+            origin: Span whose start is time zero (defaults to this span)
+
+        Returns:
+            Nested dictionary with start_ms, end_ms and duration_ms per span
+        """
+        origin = origin or self
+        data = {
+            "name": self.name,
+            "start_ms": round(self.offset_ms(origin), 2),
+            "end_ms": round(self.end_offset_ms(origin), 2),
+            "duration_ms": round(self.elapsed_ms(), 2),
+        }
+        if self.attributes:
+            data["attributes"] = dict(self.attributes)
+        if self.error:
+            data["error"] = self.error
+        if not self.finished:
+            data["unfinished"] = True
+        if self.children:
+            data["children"] = [child.to_dict(origin) for child in list(self.children)]
+        return data
+
+
+class _SpanScope:
+    """Context manager that opens a span under the current one."""
+
+    __slots__ = ("_attributes", "_name", "_span", "_token")
+
+    def __init__(self, name: str, attributes: dict[str, Any]):
+        self._name = name
+        self._attributes = attributes
+        self._span: Span | None = None
+        self._token = None
+
+    def __enter__(self) -> Span:
+        parent = _current_span.get()
+        self._span = Span(self._name, parent, self._attributes)
+        if parent is not None:
+            parent.children.append(self._span)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        current = self._span
+        current.end = time.perf_counter()
+        if exc_value is not None:
+            current.error = f"{exc_type.__name__}: {exc_value}"
+        _current_span.reset(self._token)
+        if current.parent is None:
+            _export(current)
+        return False
+
+
+class _NoopSpan:
+    """Shared stand-in returned by ``span()`` when no trace is active."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        """Ignore attributes."""
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes: Any) -> "_SpanScope | _NoopSpan":
+    """
+    Open a span under the current one; a no-op outside a trace.
+
+    Args:
+        name: Span name
+        **attributes: Span attributes
+
+    Returns:
+        Context manager yielding the span
+    """
+    if _current_span.get() is None:
+        return _NOOP_SPAN
+    return _SpanScope(name, attributes)
+
+
+def start_trace(name: str, **attributes: Any) -> _SpanScope:
+    """
+    Start a trace, or a child span if a trace is already active.
+
+    Args:
+        name: Root span name
+        **attributes: Span attributes
+
+    Returns:
+        Context manager yielding the root span
+    """
+    return _SpanScope(name, attributes)
+
+
+def current_span() -> Span | None:
+    """Return the active span, if any."""
+    return _current_span.get()
+
+
+async def traced(name: str, awaitable: Awaitable[T], **attributes: Any) -> T:
+    """
+    Await inside a span; wrap coroutines with this before ``create_task``.
+
+    Args:
+        name: Span name
+        awaitable: Awaitable to run
+        **attributes: Span attributes
+
+    Returns:
+        The awaitable's result
+    """
+    with span(name, **attributes):
+        return await awaitable
+
+
+def include_spans_in_response() -> bool:
+    """Whether endpoints should return their span tree in response metadata."""
+    return os.getenv("SPAN_TRACE_IN_RESPONSE", "false").lower() == "true"
+
+
+def register_span_exporter(exporter: Callable[[Span], None]):
+    """
+    Register a callback receiving every finished root span.
+
+    Args:
+        exporter: Callable taking the root span
+    """
+    if exporter not in _exporters:
+        _exporters.append(exporter)
+
+
+def unregister_span_exporter(exporter: Callable[[Span], None]):
+    """Remove a registered exporter."""
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
+def _export(root: Span):
+    """Hand a finished trace to the exporters; exporter errors are logged only."""
+    for exporter in list(_exporters):
+        try:
+            exporter(root)
+        except Exception as e:
+            logger.warning(f"Span exporter failed for trace '{root.name}': {e}")
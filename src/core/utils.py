@@ -1,7 +1,14 @@
 """
 Core utility functions for the application.
 """
+from collections.abc import Sequence
 from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import httpx
 
 
 def stable_percentage_round(value: float) -> int:
@@ -31,3 +38,43 @@ def stable_percentage_round(value: float) -> int:
     rounded = decimal_percent.quantize(Decimal('1'), rounding=ROUND_HALF_UP)
 
     return int(rounded)
+
+
+def cosine_similarity(a: Sequence[float] | np.ndarray, b: Sequence[float] | np.ndarray) -> float:
+    """
+    Cosine similarity of two vectors.
+
+    Normalizes each vector before the dot product, like
+    ``sklearn.metrics.pairwise.cosine_similarity``, so scores match it to
+    the last bit without importing scikit-learn. A zero vector scores 0.
+
+    Args:
+        a: First vector
+        b: Second vector
+
+    Returns:
+        Similarity between -1 and 1
+    """
+    vec_a = np.asarray(a, dtype=np.float64).ravel()
+    vec_b = np.asarray(b, dtype=np.float64).ravel()
+    norm_a = np.linalg.norm(vec_a)
+    norm_b = np.linalg.norm(vec_b)
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return float(np.dot(vec_a / norm_a, vec_b / norm_b))
+
+
+def http_client_limits() -> "httpx.Limits":
+    """
+    Connection limits for long-lived Azure clients.
+
+    httpx closes idle keep-alive connections after 5 seconds by default, which
+    throws away connections opened by the start-up warm-up (and between bursts
+    of requests). HTTP_KEEPALIVE_EXPIRY_S keeps them for longer; stay below the
+    load balancer's idle timeout (4 minutes on Azure).
+    """
+    import os
+
+    import httpx
+
+    return httpx.Limits(keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY_S", "120")))
@@ -0,0 +1,329 @@
+"""
+Declarative start-up warm-up and readiness.
+
+Start-up work is a list of ``WarmupStep``s. Blocking steps run inside the
+start-up handler, before the server accepts connections. The rest run in a
+background task once the server is up, so ``/health`` (liveness) answers at
+once while ``/ready`` answers 503 until every step has finished and every
+required step has succeeded. Container Apps only routes traffic to a replica
+once its readiness probe passes, so requests never pay for cold caches, cold
+connections or unread prompt files.
+
+Each step records its status, duration and error; the report is what
+``/ready`` returns and what start-up metrics are built from.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+from collections.abc import Callable, Collection
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.core.metrics.registry import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Step statuses
+PENDING = "pending"
+RUNNING = "running"
+OK = "ok"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+# Steps that only load read-only data; the prefork server runs them before forking
+PRELOAD_STEPS = ("dependencies", "prompts", "standardization", "tokenizer")
+
+# Database connections to open and prime
+WARMUP_DB_CONNECTIONS = int(os.getenv("WARMUP_DB_CONNECTIONS", "5"))
+
+_step_seconds = get_metrics_registry().gauge(
+    "warmup_step_seconds", "Duration of each start-up warm-up step", ["step", "status"]
+)
+_ready_gauge = get_metrics_registry().gauge("ready", "1 once start-up warm-up has completed")
+
+
+class WarmupSkipped(Exception):  # noqa: N818 - control flow, not an error
+    """Raised by a step that has nothing to do (e.g. no snapshot configured)."""
+
+
+@dataclass(frozen=True)
+class WarmupStep:
+    """One named unit of start-up work."""
+    name: str
+    run: Callable[[], Any]  # Sync (run in a thread) or async; returns a JSON-able detail
+    required: bool = False  # Readiness fails if a required step fails
+    blocking: bool = False  # Run before the server accepts connections
+
+
+@dataclass
+class StepResult:
+    """Outcome of one warm-up step."""
+    status: str = PENDING
+    duration_ms: float = 0.0
+    detail: Any = None
+    error: str | None = None
+    required: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form."""
+        return {
+            "status": self.status,
+            "required": self.required,
+            "duration_ms": self.duration_ms,
+            "detail": self.detail,
+            "error": self.error,
+        }
+
+
+@dataclass
+class WarmupRunner:
+    """Runs warm-up steps in order and tracks readiness."""
+    steps: list[WarmupStep]
+    step_timeout_s: float = 30.0
+    results: dict[str, StepResult] = field(init=False)
+
+    def __post_init__(self):
+        self.results = {step.name: StepResult(required=step.required) for step in self.steps}
+
+    async def run(self, blocking: bool | None = None, names: Collection[str] | None = None) -> None:
+        """
+        Run pending steps in declaration order.
+
+        Args:
+            blocking: Only run blocking (True) or background (False) steps; None runs all
+            names: Only run the named steps
+        """
+        for step in self.steps:
+            if self.results[step.name].status != PENDING:
+                continue
+            if blocking is not None and step.blocking != blocking:
+                continue
+            if names is not None and step.name not in names:
+                continue
+            await self._run_step(step)
+        _ready_gauge.set(1 if self.ready else 0)
+
+    async def _run_step(self, step: WarmupStep) -> None:
+        result = self.results[step.name]
+        result.status = RUNNING
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(step.run):
+                detail = await asyncio.wait_for(step.run(), self.step_timeout_s)
+            else:
+                # Sync steps (file loading, regex compilation) must not block the event loop
+                detail = await asyncio.wait_for(asyncio.to_thread(step.run), self.step_timeout_s)
+            result.status, result.detail = OK, detail
+        except WarmupSkipped as e:
+            result.status, result.detail = SKIPPED, str(e)
+        except TimeoutError:
+            result.status, result.error = FAILED, f"timed out after {self.step_timeout_s:.0f}s"
+        except Exception as e:
+            result.status, result.error = FAILED, f"{type(e).__name__}: {e}"
+        result.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        _step_seconds.set(result.duration_ms / 1000, step=step.name, status=result.status)
+
+        log = logger.warning if result.status == FAILED else logger.info
+        log(f"[Warmup] {step.name}: {result.status} in {result.duration_ms:.0f}ms"
+            + (f" ({result.error})" if result.error else ""))
+
+    def succeeded(self, name: str) -> bool:
+        """Whether the named step ran successfully."""
+        result = self.results.get(name)
+        return result is not None and result.status == OK
+
+    @property
+    def finished(self) -> bool:
+        """Every step has run."""
+        return all(result.status in (OK, SKIPPED, FAILED) for result in self.results.values())
+
+    @property
+    def ready(self) -> bool:
+        """Every step has run and no required step failed."""
+        return self.finished and not any(
+            result.required and result.status == FAILED for result in self.results.values()
+        )
+
+    def report(self) -> dict[str, Any]:
+        """Readiness status plus per-step results."""
+        if self.ready:
+            status = "ready"
+        elif self.finished:
+            status = "failed"
+        else:
+            status = "warming"
+        return {
+            "status": status,
+            "ready": self.ready,
+            "steps": {name: result.to_dict() for name, result in self.results.items()},
+        }
+
+
+# --- Steps -------------------------------------------------------------------
+
+def _warm_dependencies() -> dict[str, Any]:
+    """Load standardization dictionaries (snapshot or YAML)."""
+    from src.core.dependencies import initialize_dependencies
+    initialize_dependencies()
+    return {}
+
+
+def _warm_prompts() -> dict[str, Any]:
+    """Parse and compile every prompt YAML into the shared prompt registry."""
+    from src.core.simple_prompt_manager import prompt_manager
+    return {"prompt_configs": prompt_manager.preload_all()}
+
+
+def _warm_standardization() -> dict[str, Any]:
+    """Compile standardization rules and build language detection tables."""
+    from src.core.dependencies import (
+        get_chinese_standardizer,
+        get_english_standardizer,
+        get_multilingual_standardizer,
+    )
+    from src.services.language_detection.composition import warm_up
+
+    standardizers = [
+        get_english_standardizer(),
+        get_chinese_standardizer(),
+        *get_multilingual_standardizer().standardizers.values(),
+    ]
+    rules = sum(standardizer.compile_rules() for standardizer in standardizers if standardizer is not None)
+    warm_up()
+    return {"compiled_rules": rules}
+
+
+def _warm_tokenizer() -> dict[str, Any]:
+    """Load the BPE tokenizer used for input token budgets."""
+    from src.services.token_budget import get_tokenizer
+    return {"exact": get_tokenizer().exact}
+
+
+async def _warm_azure_connections() -> dict[str, Any]:
+    """Open a keep-alive connection (TCP + TLS) to each Azure endpoint the long-lived clients use."""
+    from src.services.index_calculation_v2 import get_index_calculation_service_v2
+    from src.services.keyword_extraction_v2 import get_keyword_extraction_service_v2
+
+    clients = {}
+    for get_client in (
+        lambda: get_index_calculation_service_v2().embedding_client,
+        lambda: get_keyword_extraction_service_v2().openai_client,
+    ):
+        client = get_client()
+        http = getattr(client, "client", None)
+        endpoint = getattr(client, "endpoint", None)
+        if http is not None and endpoint:
+            clients[id(http)] = (http, endpoint)
+    if not clients:
+        raise WarmupSkipped("no long-lived Azure clients")
+
+    async def _connect(http, endpoint: str) -> str:
+        # Any HTTP status means the connection is up and now pooled
+        await http.get(f"{endpoint}/", timeout=5.0)
+        return endpoint
+
+    results = await asyncio.gather(
+        *(_connect(http, endpoint) for http, endpoint in clients.values()), return_exceptions=True
+    )
+    failures = [str(result) for result in results if isinstance(result, BaseException)]
+    if len(failures) == len(results):
+        raise ConnectionError("; ".join(failures))
+    return {"connections": len(results) - len(failures), "failures": failures}
+
+
+async def _warm_pgvector() -> dict[str, Any]:
+    """Open pool connections, prime the availability statement on each and check the database."""
+    from src.services.course_availability import warm_connection
+    from src.services.course_search_singleton import get_course_search_service
+
+    service = await get_course_search_service()
+    pool = service._connection_pool
+    if pool is None:
+        raise RuntimeError("course search connection pool not initialized")
+
+    connections = [await pool.acquire() for _ in range(min(pool.get_max_size(), WARMUP_DB_CONNECTIONS))]
+    try:
+        for conn in connections:
+            await warm_connection(conn)
+        course_count = await connections[0].fetchval("SELECT COUNT(*) FROM courses WHERE platform = 'coursera'")
+    finally:
+        for conn in connections:
+            await pool.release(conn)
+    return {"connections": len(connections), "courses": course_count}
+
+
+async def _warm_hot_caches() -> dict[str, Any]:
+    """Fill the course availability cache from the snapshot saved at the last shutdown."""
+    path = os.getenv("COURSE_CACHE_SNAPSHOT_PATH")
+    if not path:
+        raise WarmupSkipped("COURSE_CACHE_SNAPSHOT_PATH not set")
+    from src.services.dynamic_course_cache import get_course_cache
+    return {"course_availability": await get_course_cache().load_snapshot(path)}
+
+
+async def save_hot_caches() -> None:
+    """Write hot cache snapshots for the next start-up (called at shutdown)."""
+    path = os.getenv("COURSE_CACHE_SNAPSHOT_PATH")
+    if not path:
+        return
+    try:
+        from src.services.dynamic_course_cache import get_course_cache
+        await get_course_cache().save_snapshot(path)
+    except Exception as e:
+        logger.warning(f"[Warmup] Could not save course cache snapshot: {e}")
+
+
+def default_warmup_steps() -> list[WarmupStep]:
+    """
+    The application's warm-up plan.
+
+    WARMUP_REQUIRED_STEPS (comma-separated) overrides which steps must
+    succeed before the instance reports ready.
+    """
+    required = {
+        name.strip()
+        for name in os.getenv("WARMUP_REQUIRED_STEPS", "dependencies,prompts,standardization").split(",")
+        if name.strip()
+    }
+    steps = [
+        ("dependencies", _warm_dependencies, True),
+        ("prompts", _warm_prompts, False),
+        ("standardization", _warm_standardization, False),
+        ("tokenizer", _warm_tokenizer, False),
+        ("azure_connections", _warm_azure_connections, False),
+        ("pgvector", _warm_pgvector, False),
+        ("hot_caches", _warm_hot_caches, False),
+    ]
+    return [WarmupStep(name, run, required=name in required, blocking=blocking) for name, run, blocking in steps]
+
+
+# Global runner instance
+_runner: WarmupRunner | None = None
+
+
+def get_warmup_runner() -> WarmupRunner:
+    """
+    Get the process-wide warm-up runner (singleton pattern).
+
+    With WARMUP_ENABLED=false the plan is empty and the instance is ready at once.
+
+    Returns:
+        WarmupRunner instance
+    """
+    global _runner
+    if _runner is None:
+        enabled = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+        _runner = WarmupRunner(
+            steps=default_warmup_steps() if enabled else [],
+            step_timeout_s=float(os.getenv("WARMUP_STEP_TIMEOUT_S", "30")),
+        )
+    return _runner
+
+
+def reset_warmup_runner() -> None:
+    """Reset the global runner (for testing)."""
+    global _runner
+    _runner = None
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 """
 Validate standardization dictionaries for duplicates, conflicts, and other issues.
+
+With --build-snapshot, also compile all dictionaries into the binary snapshot
+loaded by the standardizers at startup (see src/services/standardization/snapshot.py).
 """
 
+import argparse
 import sys
 from collections import defaultdict
 from pathlib import Path
@@ -149,11 +153,54 @@ def validate_patterns(patterns_file: Path) -> tuple[int, list[str]]:
     return pattern_count, issues
 
 
+def build_snapshot(data_dir: Path) -> int:
+    """Compile all dictionaries into the binary snapshot."""
+    # Make the project root importable when run as a standalone script
+    project_root = data_dir.parent.parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+    from src.services.standardization.snapshot import build_snapshot as compile_snapshot
+
+    print("\nBuilding dictionary snapshot...")
+    print("-" * 30)
+    try:
+        snapshot_path = compile_snapshot(data_dir)
+    except Exception as e:
+        print(f"❌ Failed to build snapshot: {e}")
+        return 1
+
+    print(f"✓ Snapshot written to {snapshot_path} ({snapshot_path.stat().st_size} bytes)")
+    return 0
+
+
 def main():
     """Run validation on all dictionary files."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--build-snapshot", action="store_true",
+        help="Compile all dictionaries into the binary startup snapshot"
+    )
+    parser.add_argument(
+        "--skip-validation", action="store_true",
+        help="Only build the snapshot, skipping validation checks"
+    )
+    args = parser.parse_args()
+
     # Get the data directory
-    data_dir = Path(__file__).parent
+    data_dir = Path(__file__).resolve().parent
+
+    if args.skip_validation:
+        return build_snapshot(data_dir) if args.build_snapshot else 0
+
+    exit_code = validate(data_dir)
+    if args.build_snapshot and build_snapshot(data_dir) != 0:
+        return 1
+    return exit_code
+
 
+def validate(data_dir: Path) -> int:
+    """Run all validation checks and return the exit code."""
     print("Keyword Standardization Dictionary Validation")
     print("=" * 60)
 
@@ -13,6 +13,7 @@ from typing import Any
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 
+from src.core.single_flight import ClientDisconnectedError
 from src.services.error_handler_factory import get_error_handler_factory
 
 logger = logging.getLogger(__name__)
@@ -59,6 +60,11 @@ def handle_tailor_resume_errors(api_name: str | None = None):
                 # Let FastAPI handle HTTP exceptions normally
                 raise
 
+            except ClientDisconnectedError:
+                # Nobody reads this response; not an error of the API
+                logger.info(f"Client disconnected during {api_name or endpoint}")
+                return JSONResponse(status_code=499, content={"detail": "Client closed request"})
+
             except Exception as e:
                 # Handle all other exceptions with factory
                 logger.error(
@@ -128,6 +134,11 @@ def handle_api_errors(api_name: str | None = None):
                 # Let FastAPI handle HTTP exceptions normally
                 raise
 
+            except ClientDisconnectedError:
+                # Nobody reads this response; not an error of the API
+                logger.info(f"Client disconnected during {api_name or endpoint}")
+                return JSONResponse(status_code=499, content={"detail": "Client closed request"})
+
             except Exception as e:
                 # Handle all other exceptions with factory
                 logger.error(
@@ -5,13 +5,14 @@ Following FHS architecture principles.
 import asyncio
 import logging
 import os
+import time
 from datetime import UTC, datetime
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from src.api.v1 import router as v1_router
@@ -133,8 +134,14 @@ def create_app() -> FastAPI:
         if os.getenv('LIGHTWEIGHT_MONITORING', 'true').lower() == 'true':
             # Try to get stats from the global response_tracker
             try:
+                from src.core.metrics.worker_metrics import get_aggregated_stats
                 from src.middleware.lightweight_monitoring import response_tracker
-                stats = response_tracker.get_stats()
+
+                # Prefork mode: merge every worker's histograms; otherwise this process only
+                stats = get_aggregated_stats() or response_tracker.get_stats()
+
+                from src.core.cpu_executor import get_cpu_executor
+                stats["cpu_pool"] = get_cpu_executor().get_stats()
                 return {
                     "success": True,
                     "data": stats,
@@ -153,6 +160,31 @@ def create_app() -> FastAPI:
             "timestamp": datetime.utcnow().isoformat()
         }
 
+    # Prometheus scrape endpoint (all environments, no request content exposed)
+    if os.getenv("PROMETHEUS_METRICS_ENABLED", "true").lower() == "true":
+        from src.core.metrics.collectors import register_default_collectors
+        from src.core.metrics.registry import CONTENT_TYPE, get_metrics_registry
+        register_default_collectors()
+
+        @app.get("/metrics", include_in_schema=False)
+        async def get_prometheus_metrics():
+            """Expose internal counters in Prometheus text format."""
+            return Response(get_metrics_registry().render(), headers={"Content-Type": CONTENT_TYPE})
+
+    # Event-loop lag endpoint (dev/staging only)
+    @app.get("/api/v1/monitoring/loop-lag")
+    async def get_loop_lag_stats(top: int = 10):
+        """Get event-loop lag histogram and top blocking sites (non-production only)."""
+        if os.getenv("ENVIRONMENT", "local") == "production":
+            raise HTTPException(403, "Not available in production")
+
+        from src.core.monitoring.loop_lag import get_loop_lag_monitor
+        return {
+            "success": True,
+            "data": get_loop_lag_monitor().get_stats(top=min(max(top, 1), 50)),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
     # Error storage info endpoint (dev/staging only)
     @app.get("/api/v1/debug/storage-info")
     async def get_storage_info():
@@ -229,6 +261,22 @@ def create_app() -> FastAPI:
             "timestamp": datetime.utcnow().isoformat()
         }
 
+    # Readiness probe: 503 until the start-up warm-up has completed
+    @app.get("/ready")
+    async def readiness_check():
+        """Readiness endpoint; traffic should only be routed here once it returns 200."""
+        from src.core.warmup import get_warmup_runner
+
+        report = get_warmup_runner().report()
+        return JSONResponse(
+            status_code=200 if report["ready"] else 503,
+            content={
+                "success": report["ready"],
+                "data": report,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        )
+
     # Debug endpoint for monitoring
     @app.get("/debug/monitoring")
     async def debug_monitoring():
@@ -535,6 +583,27 @@ def create_app() -> FastAPI:
         """Application startup event handler."""
         logger.info("Starting Azure Container API application")
 
+        # Start CPU worker pool so workers are warm before the first request
+        try:
+            from src.core.cpu_executor import get_cpu_executor
+            get_cpu_executor().start()
+        except Exception as e:
+            logger.error(f"Failed to start CPU worker pool: {e}")
+
+        # Start event-loop lag monitor
+        try:
+            from src.core.monitoring.loop_lag import start_loop_lag_monitor
+            await start_loop_lag_monitor()
+        except Exception as e:
+            logger.error(f"Failed to start loop lag monitor: {e}")
+
+        # Publish this worker's metrics for cross-worker stats (prefork mode only)
+        try:
+            from src.core.metrics.worker_metrics import start_worker_metrics_publisher
+            await start_worker_metrics_publisher()
+        except Exception as e:
+            logger.error(f"Failed to start worker metrics publisher: {e}")
+
         # Initialize resource manager
         try:
             from src.core.resource_manager import start_resource_manager
@@ -560,6 +629,26 @@ def create_app() -> FastAPI:
         """Application shutdown event handler."""
         logger.info("Shutting down Azure Container API application")
 
+        # Save hot caches so the next instance warms up from them
+        from src.core.warmup import save_hot_caches
+        await save_hot_caches()
+
+        # Stop async job workers; unfinished jobs are marked failed
+        from src.services.job_queue import shutdown_job_queue
+        await shutdown_job_queue()
+
+        # Stop CPU worker pool
+        from src.core.cpu_executor import shutdown_cpu_executor
+        shutdown_cpu_executor(wait=False)
+
+        # Stop event-loop lag monitor
+        from src.core.monitoring.loop_lag import stop_loop_lag_monitor
+        await stop_loop_lag_monitor()
+
+        # Stop publishing worker metrics
+        from src.core.metrics.worker_metrics import stop_worker_metrics_publisher
+        await stop_worker_metrics_publisher()
+
         # Cleanup resource manager
         try:
             from src.core.resource_manager import shutdown_resource_manager
@@ -586,109 +675,70 @@ def create_app() -> FastAPI:
 # Create app instance
 app = create_app()
 
+# Wall-clock time the app object was ready; process start to here is interpreter start-up plus imports
+_APP_CREATED_AT = time.time()
+
+
+def _import_phase_seconds() -> float | None:
+    """Seconds from process start until the app object was created (None if unknown)."""
+    try:
+        import psutil
+        return max(0.0, _APP_CREATED_AT - psutil.Process().create_time())
+    except Exception:
+        return None
+
 
 # Startup event to preload heavy resources
 @app.on_event("startup")
 async def startup_event():
     """
-    Initialize heavy resources at application startup.
-    This ensures all standardization dictionaries are loaded once and reused.
+    Run the start-up warm-up plan (see src.core.warmup).
+
+    Blocking steps (standardization dictionaries) finish before the server
+    accepts connections; the rest run in the background and gate /ready.
     """
-    from src.core.dependencies import initialize_dependencies
+    from src.core.warmup import get_warmup_runner
 
     logger.info("🚀 Starting application initialization...")
-    start_time = datetime.now(UTC)
-
-    try:
-        # Initialize all dependencies (standardizers, prompt service, etc.)
-        initialize_dependencies()
-
-        # 🔧 Pre-initialize Course Search connection pool to avoid first-request delay
-        logger.info("🗄️ Pre-initializing Course Search database connection pool...")
-        pool_start_time = datetime.now(UTC)
+    start = time.perf_counter()
+    runner = get_warmup_runner()
+    await runner.run(blocking=True)
 
-        from src.services.course_search_singleton import get_course_search_service
-        course_service = await get_course_search_service()
+    warmup_task = asyncio.create_task(_finish_warmup(runner, start))
+    _background_tasks.append(warmup_task)
 
-        pool_elapsed = (datetime.now(UTC) - pool_start_time).total_seconds()
-        logger.info(f"✅ Course Search connection pool initialized in {pool_elapsed:.2f}s")
-
-        # 🔥 Warm up connection pool and pgvector indexes
-        logger.info("🔥 Warming up connection pool and database indexes...")
-        warmup_start = datetime.now(UTC)
-        try:
-            pool = course_service._connection_pool
-            if pool:
-                # Step 1: Force create connections
-                connections = []
-                num_connections = min(pool._maxsize, 5)  # Warm up 5 connections
-                logger.info(f"   Creating {num_connections} connections...")
-
-                for _i in range(num_connections):
-                    conn = await pool.acquire()
-                    connections.append(conn)
-
-                # Step 2: Warm up pgvector indexes with test queries
-                logger.info("   Warming up pgvector indexes...")
-                test_embedding = [0.1] * 1536  # Test embedding vector
-
-                # Run a test query on first 2 connections to warm up indexes
-                for conn in connections[:2]:
-                    try:
-                        # Simple vector similarity query to load indexes
-                        await conn.fetchval(
-                            """
-                            SELECT COUNT(*)
-                            FROM courses
-                            WHERE platform = 'coursera'
-                            AND embedding IS NOT NULL
-                            AND 1 - (embedding <=> $1::vector) >= 0.01
-                            LIMIT 1
-                            """,
-                            test_embedding
-                        )
-                    except Exception as e:
-                        logger.warning(f"   Warmup query failed: {e}")
-
-                # Step 3: Release all connections back to pool
-                for conn in connections:
-                    await pool.release(conn)
+    # 🧹 Start background cache cleanup task
+    logger.info("🧹 Starting dynamic cache background cleanup task...")
+    try:
+        from src.services.dynamic_course_cache import start_background_cleanup
+        cleanup_task = asyncio.create_task(start_background_cleanup())
+        _background_tasks.append(cleanup_task)
+        logger.info("✅ Dynamic cache background cleanup task started")
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to start cache cleanup task: {e}")
+        # Don't fail startup for cache cleanup
 
-                warmup_elapsed = (datetime.now(UTC) - warmup_start).total_seconds()
-                logger.info(f"✅ Connection pool warmed up in {warmup_elapsed:.2f}s")
-            else:
-                logger.warning("⚠️ No connection pool available for warmup")
-        except Exception as e:
-            logger.warning(f"⚠️ Connection pool warmup failed: {e}")
-            # Don't fail startup, warmup is optional
 
-        # Test the connection pool with a simple query
-        db_health_status = "unknown"
-        try:
-            if course_service._connection_pool:
-                # Test with a simple query
-                async with course_service._connection_pool.acquire() as conn:
-                    course_count = await conn.fetchval(
-                        "SELECT COUNT(*) FROM courses WHERE platform = 'coursera'"
-                    )
-                    logger.info(f"✅ Database connection test passed - Found {course_count} courses")
-                    db_health_status = "healthy"
-            else:
-                logger.warning("⚠️ Connection pool not initialized")
-                db_health_status = "not_initialized"
-        except Exception as e:
-            logger.error(f"❌ Database connection test error: {e}")
-            db_health_status = "error"
-            # Don't fail startup, but log the issue
+async def _finish_warmup(runner, start: float):
+    """Run the background warm-up steps, then report start-up metrics."""
+    try:
+        await runner.run(blocking=False)
+        elapsed_time = time.perf_counter() - start
+        report = runner.report()
+        logger.info(f"✅ Application warm-up completed in {elapsed_time:.2f} seconds (status={report['status']})")
 
-        elapsed_time = (datetime.now(UTC) - start_time).total_seconds()
-        logger.info(f"✅ Application startup completed in {elapsed_time:.2f} seconds")
+        pgvector = runner.results.get("pgvector")
+        db_status = pgvector.status if pgvector else None
+        db_health_status = {"ok": "healthy", "failed": "error"}.get(db_status, "not_initialized")
 
         # 📊 階段 2: 監控改善 - 詳細啟動指標
         startup_metrics = {
             "total_startup_time": elapsed_time,
-            "db_pool_init_time": pool_elapsed,
+            "db_pool_init_time": pgvector.duration_ms / 1000 if pgvector else 0.0,
             "db_health_status": db_health_status,
+            "import_time": _import_phase_seconds(),
+            "phases": {name: round(result.duration_ms / 1000, 3) for name, result in runner.results.items()},
+            "ready": report["ready"],
             "environment": os.getenv("ENVIRONMENT", "unknown"),
             "version": settings.app_version
         }
@@ -697,24 +747,12 @@ async def startup_event():
         if monitoring_service.is_enabled:
             monitoring_service.track_event("ApplicationStartup", startup_metrics)
 
-        # 🧹 Start background cache cleanup task
-        logger.info("🧹 Starting dynamic cache background cleanup task...")
-        try:
-            from src.services.dynamic_course_cache import start_background_cleanup
-            cleanup_task = asyncio.create_task(start_background_cleanup())
-            _background_tasks.append(cleanup_task)
-            logger.info("✅ Dynamic cache background cleanup task started")
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to start cache cleanup task: {e}")
-            # Don't fail startup for cache cleanup
-
         logger.info(
-            f"📊 Startup Metrics: Total={elapsed_time:.2f}s, "
-            f"DB Pool={pool_elapsed:.2f}s, DB Health={db_health_status}"
+            f"📊 Startup Metrics: Total={elapsed_time:.2f}s, DB Health={db_health_status}, "
+            f"Phases={startup_metrics['phases']}"
         )
     except Exception as e:
         logger.error(f"❌ Failed to initialize application: {e}", exc_info=True)
-        # Don't prevent startup, but log the error
         if monitoring_service.is_enabled:
             monitoring_service.track_error(
                 error_type="STARTUP_ERROR",
@@ -19,7 +19,7 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         # Get API key from environment variable
         self.api_key = os.getenv("CONTAINER_APP_API_KEY")
-        self.bypass_paths = {"/", "/health", "/docs", "/redoc", "/openapi.json"}
+        self.bypass_paths = {"/", "/health", "/ready", "/docs", "/redoc", "/openapi.json"}
 
     async def dispatch(self, request: Request, call_next) -> Response:
         """Process request and validate API key."""
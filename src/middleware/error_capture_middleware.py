@@ -183,7 +183,7 @@ class ErrorCaptureMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next) -> Response:
         """Capture request/response for errors"""
-        if not self.enabled or request.url.path == "/health":
+        if not self.enabled or request.url.path in ("/health", "/ready"):
             return await call_next(request)
 
         # Capture request data
@@ -15,37 +15,70 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
 # Business events logger with dual output support
+from src.core.metrics.latency_histogram import DEFAULT_WINDOWS, LatencyHistogram, RollingLatencyRecorder
+from src.core.metrics.registry import MetricFamily
 from src.core.monitoring_logger import get_business_logger
 
 business_logger = get_business_logger()
 
+# Endpoint label of requests that matched no route
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(request: Request) -> str:
+    """
+    Path template of the route that handled a request (e.g. ``/api/v1/jobs/{job_id}``).
+
+    Series are keyed by template rather than raw path, so path parameters and
+    requests for arbitrary URLs cannot add recorders and metric series without
+    bound. Only meaningful once routing has run (after ``call_next``).
+    """
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
 
 class ResponseTimeTracker:
-    """In-memory response time tracking with percentile calculations"""
+    """
+    Streaming response time tracking per endpoint and status class.
+
+    Each (endpoint, status class) series has its own histogram recorder and
+    lock, so concurrent requests only contend when they hit the same series.
+    Percentiles come from fixed-memory histograms instead of sorted samples,
+    which keeps memory constant and stats O(buckets).
+    """
+
+    WINDOWS: ClassVar[tuple[str, ...]] = tuple(DEFAULT_WINDOWS)
 
-    def __init__(self, max_samples: int = 1000):
+    def __init__(self, relative_accuracy: float = 0.01):
         self.lock = Lock()
-        self.max_samples = max_samples
-        # Store response times per endpoint
-        self.times = defaultdict(lambda: deque(maxlen=max_samples))
+        self.relative_accuracy = relative_accuracy
+        # Recorders per endpoint and status class ("2xx", "4xx", ...)
+        self.recorders: dict[str, dict[str, RollingLatencyRecorder]] = {}
         # Error counts per error code
         self.error_counts = defaultdict(int)
         # Last error examples
         self.last_errors = defaultdict(lambda: deque(maxlen=10))
 
+    def _recorder(self, endpoint: str, status_class: str) -> RollingLatencyRecorder:
+        """Get or create the recorder for a series."""
+        series = self.recorders.get(endpoint)
+        recorder = series.get(status_class) if series is not None else None
+        if recorder is None:
+            with self.lock:
+                series = self.recorders.setdefault(endpoint, {})
+                recorder = series.get(status_class)
+                if recorder is None:
+                    recorder = series[status_class] = RollingLatencyRecorder(self.relative_accuracy)
+        return recorder
+
     def add_request(self, endpoint: str, duration_ms: float, status_code: int,
                    error_code: str | None = None):
         """Add a request measurement"""
-        with self.lock:
-            # Store response time
-            self.times[endpoint].append({
-                "duration_ms": duration_ms,
-                "status_code": status_code,
-                "timestamp": time.time()
-            })
-
-            # Track errors
-            if status_code >= 400 and error_code:
+        self._recorder(endpoint, f"{status_code // 100}xx").record(duration_ms)
+
+        # Track errors
+        if status_code >= 400 and error_code:
+            with self.lock:
                 self.error_counts[error_code] += 1
                 self.last_errors[error_code].append({
                     "endpoint": endpoint,
@@ -53,53 +86,113 @@ class ResponseTimeTracker:
                     "duration_ms": duration_ms
                 })
 
-    def get_stats(self) -> dict:
-        """Get current statistics"""
-        with self.lock:
-            stats = {
-                "endpoints": {},
-                "errors": {},
-                "summary": {
-                    "total_endpoints": len(self.times),
-                    "total_errors": sum(self.error_counts.values())
-                }
-            }
+    def get_stats(self, now: float | None = None) -> dict:
+        """
+        Get current statistics.
 
-            # Calculate percentiles for each endpoint
-            for endpoint, times in self.times.items():
-                if times:
-                    durations = [t["duration_ms"] for t in times]
-                    durations.sort()
-
-                    stats["endpoints"][endpoint] = {
-                        "count": len(times),
-                        "avg_ms": sum(durations) / len(durations),
-                        "min_ms": durations[0],
-                        "max_ms": durations[-1],
-                        "p50_ms": self._percentile(durations, 0.50),
-                        "p95_ms": self._percentile(durations, 0.95),
-                        "p99_ms": self._percentile(durations, 0.99)
-                    }
-
-            # Error statistics
-            for error_code, count in self.error_counts.items():
-                stats["errors"][error_code] = {
+        Top-level endpoint fields cover the process lifetime; ``windows`` holds
+        the same fields for the rolling 1m/5m/1h windows and ``by_status_class``
+        splits the lifetime figures per status class.
+        """
+        now = time.time() if now is None else now
+        with self.lock:
+            series_by_endpoint = {endpoint: dict(series) for endpoint, series in self.recorders.items()}
+            errors = {
+                error_code: {
                     "count": count,
                     "last_seen": (
-                        list(self.last_errors[error_code])[-1]["timestamp"]
+                        self.last_errors[error_code][-1]["timestamp"]
                         if self.last_errors[error_code] else None
                     ),
                     "recent_examples": list(self.last_errors[error_code])[-3:]
                 }
+                for error_code, count in self.error_counts.items()
+            }
+
+        endpoints = {}
+        for endpoint, series in series_by_endpoint.items():
+            lifetime = LatencyHistogram(self.relative_accuracy)
+            windows = {name: LatencyHistogram(self.relative_accuracy) for name in self.WINDOWS}
+            by_status_class = {}
+            for status_class, recorder in sorted(series.items()):
+                snapshot = recorder.snapshot()
+                lifetime.merge(snapshot)
+                by_status_class[status_class] = snapshot.summary()
+                for name, histogram in windows.items():
+                    histogram.merge(recorder.window(name, now))
+
+            endpoints[endpoint] = {
+                **lifetime.summary(),
+                "windows": {name: histogram.summary() for name, histogram in windows.items()},
+                "by_status_class": by_status_class,
+            }
+
+        return {
+            "endpoints": endpoints,
+            "errors": errors,
+            "summary": {
+                "total_endpoints": len(endpoints),
+                "total_errors": sum(error["count"] for error in errors.values())
+            }
+        }
+
+    def export_state(self) -> dict:
+        """JSON-serializable state, for aggregating trackers across worker processes."""
+        with self.lock:
+            series_by_endpoint = {endpoint: dict(series) for endpoint, series in self.recorders.items()}
+            errors = {code: count for code, count in self.error_counts.items()}
+            last_errors = {code: list(examples) for code, examples in self.last_errors.items()}
+        return {
+            "series": {
+                endpoint: {status_class: recorder.to_dict() for status_class, recorder in series.items()}
+                for endpoint, series in series_by_endpoint.items()
+            },
+            "error_counts": errors,
+            "last_errors": last_errors,
+        }
+
+    def merge_state(self, state: dict):
+        """Add the measurements of another tracker's ``export_state`` output."""
+        for endpoint, series in state["series"].items():
+            for status_class, recorder_state in series.items():
+                self._recorder(endpoint, status_class).merge(RollingLatencyRecorder.from_dict(recorder_state))
+        with self.lock:
+            for error_code, count in state["error_counts"].items():
+                self.error_counts[error_code] += count
+            for error_code, examples in state["last_errors"].items():
+                merged = sorted([*self.last_errors[error_code], *examples], key=lambda example: example["timestamp"])
+                self.last_errors[error_code].clear()
+                self.last_errors[error_code].extend(merged)
+
+    def reset(self):
+        """Clear all recorded measurements and errors."""
+        with self.lock:
+            self.recorders.clear()
+            self.error_counts.clear()
+            self.last_errors.clear()
+
+    def collect_metrics(self) -> list[MetricFamily]:
+        """Request latency summaries and error counts for the metric registry."""
+        latency = MetricFamily(
+            "http_request_duration_seconds", "summary", "HTTP request latency by endpoint and status class"
+        )
+        with self.lock:
+            series_by_endpoint = {endpoint: dict(series) for endpoint, series in self.recorders.items()}
+            error_counts = dict(self.error_counts)
 
-            return stats
+        for endpoint, series in series_by_endpoint.items():
+            for status_class, recorder in series.items():
+                snapshot = recorder.snapshot()
+                labels = {"endpoint": endpoint, "status_class": status_class}
+                for quantile in (0.5, 0.95, 0.99):
+                    latency.add(snapshot.percentile(quantile) / 1000, **labels, quantile=quantile)
+                latency.add(snapshot.total / 1000, "_sum", **labels)
+                latency.add(snapshot.count, "_count", **labels)
 
-    def _percentile(self, sorted_values: list, p: float) -> float:
-        """Calculate percentile from sorted values"""
-        if not sorted_values:
-            return 0
-        index = int(len(sorted_values) * p)
-        return sorted_values[min(index, len(sorted_values) - 1)]
+        errors = MetricFamily("http_errors_total", "counter", "HTTP errors by error code")
+        for error_code, count in error_counts.items():
+            errors.add(count, error_code=error_code)
+        return [latency, errors]
 
 
 # Global tracker instance
@@ -141,15 +234,15 @@ class LightweightMonitoringMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next) -> Response:
         """Process request with minimal monitoring."""
-        # Skip health checks
-        if request.url.path == "/health":
+        # Skip health and readiness probes
+        if request.url.path in ("/health", "/ready"):
             return await call_next(request)
 
         # Track timing
         start_time = time.perf_counter()
 
         # Extract key information
-        endpoint = request.url.path
+        path = request.url.path
         method = request.method
 
         error_code = None
@@ -191,6 +284,7 @@ class LightweightMonitoringMiddleware(BaseHTTPMiddleware):
                         logging.debug(f"Failed to parse response body for error details: {e}")
 
             # Track the request
+            endpoint = route_template(request)
             response_tracker.add_request(
                 endpoint=f"{method} {endpoint}",
                 duration_ms=duration_ms,
@@ -204,7 +298,7 @@ class LightweightMonitoringMiddleware(BaseHTTPMiddleware):
                 business_logger.log(
                     log_level,
                     f"{'Slow' if duration_ms > 2000 else 'Error'} request - "
-                    f"Endpoint: {method} {endpoint}, Status: {response.status_code}, "
+                    f"Endpoint: {method} {path}, Status: {response.status_code}, "
                     f"Duration: {duration_ms:.0f}ms, Error: {error_code or 'None'}"
                 )
 
@@ -254,6 +348,7 @@ class LightweightMonitoringMiddleware(BaseHTTPMiddleware):
                 error_code = "LLM_SERVICE_ERROR"
 
             # Track the error
+            endpoint = route_template(request)
             response_tracker.add_request(
                 endpoint=f"{method} {endpoint}",
                 duration_ms=duration_ms,
@@ -263,7 +358,7 @@ class LightweightMonitoringMiddleware(BaseHTTPMiddleware):
 
             # Log critical error
             business_logger.critical(
-                f"Request failed - Endpoint: {method} {endpoint}, "
+                f"Request failed - Endpoint: {method} {path}, "
                 f"Error: {error_code}, Message: {error_message}, "
                 f"Duration: {duration_ms:.0f}ms",
                 exc_info=True
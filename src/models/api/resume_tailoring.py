@@ -356,6 +356,13 @@ class TailoringResult(BaseModel):
         default=0,
         description="Post-processing time in milliseconds"
     )
+    post_processing_breakdown: dict[str, int] = Field(
+        default_factory=dict,
+        description=(
+            "Post-processing time per stage "
+            "(merge, parse, keyword detection, keyword marking, serialize, metrics)"
+        )
+    )
     stage_timings: dict[str, int] = Field(
         default_factory=lambda: {
             "llm1_start_time_ms": 0,
@@ -0,0 +1,165 @@
+"""
+Production server entry point: preload once, then fork workers.
+
+    python -m src.server
+
+``uvicorn --workers N`` starts every worker as a fresh interpreter, so each
+one loads its own standardization dictionaries, prompts and lookup tables.
+This launcher loads that read-only data once in the master. It then calls
+``gc.freeze()`` so the collector never writes to those objects, which keeps
+their memory pages shared copy-on-write. Finally it binds the socket and
+forks the workers, each running a uvicorn server on the shared socket.
+
+Per-connection resources (database pools, OpenAI clients, CPU pool, event
+loop) are still created and warmed in each worker by the app's startup
+handlers (see ``src.core.warmup``).
+Workers publish their metrics to a shared directory so that
+``/api/v1/monitoring/stats`` reports all of them
+(see ``src.core.metrics.worker_metrics``).
+
+Environment:
+- WEB_CONCURRENCY: worker processes (default: 1; 1 serves in-process without forking)
+- HOST / PORT: bind address (default: 0.0.0.0:8000)
+- LOG_LEVEL: uvicorn log level (default: info)
+"""
+
+import asyncio
+import contextlib
+import gc
+import logging
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import uvicorn
+
+from src.core.metrics.worker_metrics import worker_state_path
+
+logger = logging.getLogger(__name__)
+
+# A worker that dies sooner than this after starting is restarted with a delay
+MIN_WORKER_UPTIME_S = 5.0
+RESTART_DELAY_S = 1.0
+
+
+def preload():
+    """
+    Import the app and load shared read-only data before forking.
+
+    Returns:
+        The FastAPI application
+    """
+    start = time.perf_counter()
+    from src.core.warmup import PRELOAD_STEPS, get_warmup_runner
+    from src.main import app
+
+    # Run the data-loading warm-up steps once here; workers inherit the results and skip them
+    runner = get_warmup_runner()
+    asyncio.run(runner.run(names=PRELOAD_STEPS))
+
+    statuses = ", ".join(f"{name}={runner.results[name].status}" for name in PRELOAD_STEPS if name in runner.results)
+
+    # Move everything loaded so far out of the collector's reach so workers never dirty those pages
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        f"Preloaded app ({statuses}) in "
+        f"{(time.perf_counter() - start) * 1000:.0f}ms ({gc.get_freeze_count()} objects frozen)"
+    )
+    return app
+
+
+def _run_worker(config: uvicorn.Config, sock) -> int:
+    """Worker process body: serve on the inherited socket until told to stop."""
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, signal.SIG_DFL)
+
+    from src.core.monitoring_service import monitoring_service
+    monitoring_service.after_fork()
+
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    except Exception:
+        logger.exception("Worker crashed")
+        return 1
+    return 0
+
+
+def _spawn(config: uvicorn.Config, sock) -> int:
+    """Fork one worker and return its pid."""
+    pid = os.fork()
+    if pid == 0:
+        code = _run_worker(config, sock)
+        logging.shutdown()
+        os._exit(code)
+    return pid
+
+
+def serve():
+    """Run the server in single-process or prefork mode."""
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    host = os.getenv("HOST", "0.0.0.0")  # noqa: S104 - container entry point
+    port = int(os.getenv("PORT", "8000"))
+    log_level = os.getenv("LOG_LEVEL", "info").lower()
+
+    metrics_dir = None
+    if workers > 1:
+        metrics_dir = tempfile.mkdtemp(prefix="resume-api-metrics-")
+        os.environ["WORKER_METRICS_DIR"] = metrics_dir
+        # Share the cores between the workers' CPU pools unless configured explicitly
+        os.environ.setdefault("CPU_POOL_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+
+    app = preload()
+    config = uvicorn.Config(app, host=host, port=port, log_level=log_level)
+
+    if workers == 1:
+        uvicorn.Server(config).run()
+        return
+
+    sock = config.bind_socket()
+    children: dict[int, float] = {}
+    stopping = False
+
+    def handle_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+
+    for _ in range(workers):
+        children[_spawn(config, sock)] = time.monotonic()
+    logger.info(f"Started {workers} workers on {host}:{port} (master pid {os.getpid()})")
+
+    try:
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = children.pop(pid, None)
+            if started is None:
+                continue
+            worker_state_path(Path(metrics_dir), pid).unlink(missing_ok=True)
+            if stopping:
+                continue
+            logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting")
+            if time.monotonic() - started < MIN_WORKER_UPTIME_S:
+                time.sleep(RESTART_DELAY_S)
+            children[_spawn(config, sock)] = time.monotonic()
+    finally:
+        sock.close()
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        logger.info("All workers stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    serve()
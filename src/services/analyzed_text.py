@@ -0,0 +1,98 @@
+"""
+Request-scoped normalized document shared across analysis services.
+
+Within one request the same resume and job description used to be cleaned,
+lowercased, normalized and hashed independently by index calculation, keyword
+matching, gap analysis and structure analysis. ``AnalyzedText`` is created
+once per input at the API layer and computes each derived form lazily, at
+most once. Language detection is not part of it: no service in this pipeline
+detects the language (the request carries it), and the detectors in
+``src.services.language_detection`` remain the single implementation.
+
+``AnalyzedText`` subclasses ``str`` so it can be passed to any service that
+expects the raw text; services that know about it use the memoized views.
+"""
+
+import hashlib
+import re
+
+from src.services.text_processing import clean_html_text
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+class AnalyzedText(str):
+    """
+    Raw input text with lazily memoized derived views.
+
+    Views:
+    - clean_text: HTML stripped, entities decoded, whitespace collapsed
+    - lower_text: lowercase clean text
+    - normalized_text: cache-key normalization used by index calculation
+    - content_hash: SHA256 of the normalized text
+    """
+
+    def __new__(cls, value: str = ""):
+        instance = super().__new__(cls, value or "")
+        instance._memo = {}
+        return instance
+
+    @property
+    def raw(self) -> str:
+        """Original text as a plain str."""
+        return str.__str__(self)
+
+    @property
+    def clean_text(self) -> str:
+        """Plain text with HTML removed and whitespace normalized."""
+        if "clean_text" not in self._memo:
+            self._memo["clean_text"] = clean_html_text(self.raw)
+        return self._memo["clean_text"]
+
+    @property
+    def lower_text(self) -> str:
+        """Lowercase clean text for case-insensitive matching."""
+        if "lower_text" not in self._memo:
+            self._memo["lower_text"] = self.clean_text.lower()
+        return self._memo["lower_text"]
+
+    @property
+    def normalized_text(self) -> str:
+        """Clean, lowercased text with collapsed whitespace (cache-key form)."""
+        if "normalized_text" not in self._memo:
+            self._memo["normalized_text"] = _WHITESPACE_PATTERN.sub(' ', self.clean_text.strip().lower())
+        return self._memo["normalized_text"]
+
+    @property
+    def content_hash(self) -> str:
+        """SHA256 hex digest of the normalized text."""
+        if "content_hash" not in self._memo:
+            self._memo["content_hash"] = hashlib.sha256(self.normalized_text.encode('utf-8')).hexdigest()
+        return self._memo["content_hash"]
+
+    def cache_key(self, cache_type: str) -> str:
+        """
+        SHA256 cache key for a given cache type.
+
+        Matches the key format of IndexCalculationServiceV2._generate_cache_key.
+        """
+        memo_key = f"cache_key:{cache_type}"
+        if memo_key not in self._memo:
+            cache_input = f"{cache_type}:{self.normalized_text}"
+            self._memo[memo_key] = hashlib.sha256(cache_input.encode('utf-8')).hexdigest()
+        return self._memo[memo_key]
+
+
+def as_analyzed_text(text: str | None) -> AnalyzedText:
+    """
+    Return the text as an AnalyzedText, reusing it if it already is one.
+
+    Args:
+        text: Raw text or an existing AnalyzedText
+
+    Returns:
+        AnalyzedText sharing memoized views with the input when possible
+    """
+    if isinstance(text, AnalyzedText):
+        return text
+    return AnalyzedText(text or "")
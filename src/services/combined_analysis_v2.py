@@ -8,12 +8,16 @@ import asyncio
 import logging
 import os
 import time
-from typing import Any
+from collections.abc import Callable
+from typing import Any, ClassVar
 
 from src.core.monitoring_service import monitoring_service
+from src.core.tracing import Span, current_span, include_spans_in_response, span, start_trace, traced
+from src.services.analyzed_text import as_analyzed_text
 from src.services.base import BaseService
 from src.services.gap_analysis_v2 import GapAnalysisServiceV2
 from src.services.index_calculation_v2 import IndexCalculationServiceV2
+from src.services.job_queue import report_job_progress
 from src.services.resource_pool_manager import ResourcePoolManager
 from src.services.resume_structure_analyzer import ResumeStructureAnalyzer
 from src.utils.adaptive_retry import AdaptiveRetryStrategy
@@ -22,6 +26,14 @@ from src.utils.feature_flags import FeatureFlags
 logger = logging.getLogger(__name__)
 
 
+def _timeline_entry(root: Span, name: str) -> dict[str, float]:
+    """Start/end offsets (ms from the analysis start) of a finished phase span."""
+    phase = root.find(name)
+    if phase is None or not phase.finished:
+        return {"start": 0, "end": 0}
+    return {"start": round(phase.offset_ms(root), 2), "end": round(phase.end_offset_ms(root), 2)}
+
+
 class PartialFailureError(Exception):
     """Exception for partial failures with available data."""
 
@@ -48,6 +60,9 @@ class CombinedAnalysisServiceV2(BaseService):
     - Resource efficiency: 90% reduction in initialization overhead
     """
 
+    # pgvector is warmed once per process, not once per request
+    _pgvector_warmed: ClassVar[bool] = False
+
     def __init__(
         self,
         index_service: IndexCalculationServiceV2 | None = None,
@@ -116,8 +131,8 @@ class CombinedAnalysisServiceV2(BaseService):
         Execute combined analysis with V2 optimizations.
 
         Args:
-            resume: Resume content (HTML or plain text)
-            job_description: Job description content
+            resume: Resume content (HTML or plain text, or a request-scoped AnalyzedText)
+            job_description: Job description content (str or AnalyzedText)
             keywords: List of keywords to analyze
             language: Output language (en or zh-TW)
             analysis_options: Additional analysis options
@@ -132,11 +147,18 @@ class CombinedAnalysisServiceV2(BaseService):
         start_time = time.time()
         self.stats["total_requests"] += 1
 
+        # Share one normalized document per input across all downstream services
+        resume = as_analyzed_text(resume)
+        job_description = as_analyzed_text(job_description)
+
         try:
             # Execute parallel analysis with resource pooling
-            result = await self._execute_parallel_analysis(
-                resume, job_description, keywords, language, analysis_options
-            )
+            with start_trace("combined_analysis", language=language) as trace:
+                result = await self._execute_parallel_analysis(
+                    resume, job_description, keywords, language, analysis_options
+                )
+            if include_spans_in_response():
+                result["metadata"]["spans"] = trace.to_dict()
 
             # Success - update statistics
             self.stats["successful_requests"] += 1
@@ -174,81 +196,45 @@ class CombinedAnalysisServiceV2(BaseService):
 
         V3 Optimization (Plan B):
         - Keywords and Embeddings start simultaneously at T=0
-        - Gap Analysis starts immediately after Keywords (50ms)
-        - Index calculation runs in background
-        """
-        import asyncio
-
-        # Detailed timing tracking for V3 optimization
-        detailed_timings = {
-            "start": time.time(),
-            "embedding_start": None,
-            "resume_embedding_start": None,
-            "resume_embedding_end": None,
-            "jd_embedding_start": None,
-            "jd_embedding_end": None,
-            "embedding_end": None,
-            "keyword_match_start": None,
-            "keyword_match_end": None,
-            "index_llm_start": None,
-            "index_llm_end": None,
-            "gap_context_start": None,
-            "gap_context_end": None,
-            "gap_llm_start": None,
-            "gap_llm_end": None,
-            "end": None
-        }
+        - Gap Analysis starts immediately after Keywords (50ms), unless the
+          prompt version references {similarity_score}; then it waits for the index
+        - Index calculation runs in background once embeddings are ready
 
-        phase_timings = {}
+        Phase timings come from the span tree (src.core.tracing): each phase
+        runs in a named span under the analysis root span.
+        """
+        # Spans need a root; analyze() opens it, direct callers get their own
+        root = current_span()
+        if root is None:
+            with start_trace("combined_analysis", language=language):
+                return await self._execute_parallel_analysis(
+                    resume, job_description, keywords, language, analysis_options
+                )
 
         # V3 TRUE PARALLEL: Start Keywords, Embeddings, and Structure simultaneously at T=0
-        phase1_start = time.time()
-        detailed_timings["embedding_start"] = phase1_start
-        detailed_timings["keyword_match_start"] = phase1_start
-
-        # V4 Enhancement: Add structure analysis timing
-        if self.enable_structure_analysis:
-            detailed_timings["structure_start"] = phase1_start
-
-        # Add pgvector warmup timing
-        detailed_timings["pgvector_warmup_start"] = phase1_start
-
-        # Create async tasks for parallel execution
+        # Tasks copy the current context, so each task's span nests under the root
         keyword_task = asyncio.create_task(
-            asyncio.to_thread(self._quick_keyword_match, resume, keywords)
+            traced("keyword_matching", asyncio.to_thread(self._quick_keyword_match, resume, keywords))
         )
 
         # V4 Enhancement: Add structure analysis task
         # Test ID: RS-001-IT - Parallel execution timing
         structure_task = None
-        structure_actual_end_time = None
         if self.enable_structure_analysis:
             structure_task = asyncio.create_task(
-                self.structure_analyzer.analyze_structure(resume)
+                traced("structure_analysis", self.structure_analyzer.analyze_structure(resume))
             )
-            # Add callback to record actual completion time
-            def record_structure_end(task):
-                nonlocal structure_actual_end_time
-                structure_actual_end_time = time.time()
-                detailed_timings["structure_actual_end"] = structure_actual_end_time
-            structure_task.add_done_callback(record_structure_end)
 
         # NEW: Add pgvector warmup task - runs in parallel with other tasks
         # This warmup is effectively "free" as it's hidden by Structure Analysis duration
-        warmup_task = asyncio.create_task(self._warmup_pgvector())
-        warmup_actual_end_time = None
-        def record_warmup_end(task):
-            nonlocal warmup_actual_end_time
-            warmup_actual_end_time = time.time()
-            detailed_timings["pgvector_warmup_actual_end"] = warmup_actual_end_time
-        warmup_task.add_done_callback(record_warmup_end)
+        warmup_task = asyncio.create_task(traced("pgvector_warmup", self._warmup_pgvector()))
 
         # Start embeddings generation in parallel
         embedding_task = None
         if os.getenv('RESOURCE_POOL_ENABLED', 'true').lower() == 'false':
             # Direct embedding generation without resource pool
             embedding_task = asyncio.create_task(
-                self._generate_embeddings_parallel(None, resume, job_description)
+                traced("embeddings", self._generate_embeddings_parallel(None, resume, job_description))
             )
         else:
             # Use resource pool for production
@@ -260,103 +246,66 @@ class CombinedAnalysisServiceV2(BaseService):
                     self.stats["resource_pool_hits"] += 1
                     return result
 
-            embedding_task = asyncio.create_task(_generate_with_pool())
-
-        # Wait for keywords to complete (should be ~50ms)
-        await keyword_task
-        detailed_timings["keyword_match_end"] = time.time()
+            embedding_task = asyncio.create_task(traced("embeddings", _generate_with_pool()))
 
-        # Wait for embeddings to complete for Index Calculation
-        await embedding_task
-        detailed_timings["embedding_end"] = time.time()
-        phase_timings["embedding_generation"] = detailed_timings["embedding_end"] - phase1_start
+        # Gap Analysis depends on keyword coverage (~50ms), plus the similarity score only
+        # for prompt versions that reference it; Index Calculation depends on embeddings
+        keyword_coverage = await keyword_task
+        index_task = asyncio.create_task(traced(
+            "index_calculation",
+            self._calculate_index_after_embeddings(embedding_task, resume, job_description, keywords)
+        ))
 
         # Note: We don't wait for warmup_task here - it runs in background
         # It will complete during Structure Analysis phase (2000ms)
 
-        # Start Index Calculation after embeddings are ready
-        index_start = time.time()
-        detailed_timings["index_llm_start"] = index_start
-
-        if self.retry_strategy:
-            index_result = await self.retry_strategy.execute_with_retry(
-                lambda: self.index_service.calculate_index(
-                    resume=resume,
-                    job_description=job_description,
-                    keywords=keywords
-                ),
-                error_classifier=self._classify_index_error,
-                get_retry_after=self._get_retry_after_from_error
-            )
+        if self.gap_service.requires_similarity_score():
+            gap_context, pending_index = await index_task, None
         else:
-            index_result = await self.index_service.calculate_index(
-                resume=resume,
-                job_description=job_description,
-                keywords=keywords
+            gap_context, pending_index = {"keyword_coverage": keyword_coverage}, index_task
+
+        # Course lookups start per skill while the Gap Analysis response is still streaming
+        course_pipeline = None
+        if os.getenv("COURSE_AVAILABILITY_PIPELINING_ENABLED", "true").lower() == "true":
+            from src.services.course_availability import CourseAvailabilityPipeline
+            course_pipeline = CourseAvailabilityPipeline()
+
+        gap_task = asyncio.create_task(traced(
+            "gap_analysis",
+            self._run_gap_analysis(
+                resume, job_description, gap_context, language, analysis_options, pending_index,
+                on_skill_query=course_pipeline.submit if course_pipeline else None
             )
+        ))
 
-        detailed_timings["index_llm_end"] = time.time()
-        phase_timings["index_calculation"] = detailed_timings["index_llm_end"] - index_start
-
-        # Now start Gap Analysis with complete index_result including real similarity_score
-        gap_start = time.time()
-        detailed_timings["gap_context_start"] = gap_start
-        detailed_timings["gap_llm_start"] = gap_start
-
-        if self.retry_strategy:
-            gap_result = await self.retry_strategy.execute_with_retry(
-                lambda: self.gap_service.analyze_with_context(
-                    resume=resume,
-                    job_description=job_description,
-                    index_result=index_result,  # Full index result with real similarity_score
-                    language=language,
-                    options=analysis_options
-                ),
-                error_classifier=self._classify_gap_error,
-                get_retry_after=self._get_retry_after_from_error
-            )
-        else:
-            gap_result = await self.gap_service.analyze_with_context(
-                resume=resume,
-                job_description=job_description,
-                index_result=index_result,  # Full index result with real similarity_score
-                language=language,
-                options=analysis_options
-            )
-        detailed_timings["gap_llm_end"] = time.time()
-        phase_timings["gap_analysis"] = detailed_timings["gap_llm_end"] - gap_start
-
-        detailed_timings["end"] = time.time()
+        try:
+            index_result, gap_result = await asyncio.gather(index_task, gap_task)
+        except BaseException:
+            # One side failed; don't leave the other running (or billing LLM tokens)
+            for task in (index_task, gap_task):
+                task.cancel()
+            if course_pipeline:
+                course_pipeline.cancel()
+            raise
 
         # Calculate parallel processing efficiency
-        total_sequential_time = sum(phase_timings.values())
-        total_actual_time = detailed_timings["end"] - detailed_timings["start"]
+        phase_timings_ms = {
+            "embedding_generation": root.duration_ms("embeddings"),
+            "index_calculation": root.duration_ms("index_calculation"),
+            "gap_analysis": root.duration_ms("gap_analysis"),
+        }
+        total_sequential_time = sum(phase_timings_ms.values())
+        total_actual_time = root.elapsed_ms()
         efficiency = 1 - (total_actual_time / total_sequential_time) if total_sequential_time > 0 else 0
         self.stats["parallel_efficiency"] = efficiency
 
         # Calculate detailed timing breakdown
         timing_breakdown = {
-            "total_time": round((detailed_timings["end"] - detailed_timings["start"]) * 1000, 2),
-            "keyword_matching_time": (
-                round((detailed_timings["keyword_match_end"] - detailed_timings["keyword_match_start"]) * 1000, 2)
-                if detailed_timings["keyword_match_end"] and detailed_timings["keyword_match_start"]
-                else None
-            ),
-            "embedding_time": (
-                round((detailed_timings["embedding_end"] - detailed_timings["embedding_start"]) * 1000, 2)
-                if detailed_timings["embedding_end"] and detailed_timings["embedding_start"]
-                else None
-            ),
-            "index_calculation_time": (
-                round((detailed_timings["index_llm_end"] - detailed_timings["index_llm_start"]) * 1000, 2)
-                if detailed_timings["index_llm_end"] and detailed_timings["index_llm_start"]
-                else None
-            ),
-            "gap_analysis_time": (
-                round((detailed_timings["gap_llm_end"] - detailed_timings["gap_llm_start"]) * 1000, 2)
-                if detailed_timings["gap_llm_end"] and detailed_timings["gap_llm_start"]
-                else None
-            ),
+            "total_time": round(total_actual_time, 2),
+            "keyword_matching_time": root.duration_ms("keyword_matching"),
+            "embedding_time": root.duration_ms("embeddings"),
+            "index_calculation_time": root.duration_ms("index_calculation"),
+            "gap_analysis_time": root.duration_ms("gap_analysis"),
         }
 
         # Log V3 optimization performance with enhanced course availability tracking
@@ -430,9 +379,6 @@ class CombinedAnalysisServiceV2(BaseService):
             try:
                 from src.services.course_availability import check_course_availability
 
-                # Track course availability timing
-                detailed_timings["course_availability_start"] = time.time()
-
                 # Log the state BEFORE enhancement
                 logger.info("[COURSE_DETAILS_DEBUG] SkillSearchQueries BEFORE enhancement:")
                 for idx, skill in enumerate(gap_result["SkillSearchQueries"]):
@@ -446,9 +392,14 @@ class CombinedAnalysisServiceV2(BaseService):
 
                 # Execute batch check for course availability
                 # NOTE: pgvector should already be warmed up from parallel phase
-                enhanced_skills = await check_course_availability(
-                    gap_result["SkillSearchQueries"]
-                )
+                with span("course_availability", skill_count=len(gap_result["SkillSearchQueries"])):
+                    if course_pipeline:
+                        # Only waits for lookups still running after the LLM finished
+                        enhanced_skills = await course_pipeline.resolve(gap_result["SkillSearchQueries"])
+                    else:
+                        enhanced_skills = await check_course_availability(
+                            gap_result["SkillSearchQueries"]
+                        )
 
                 # Update gap result with enhanced skills
                 gap_result["SkillSearchQueries"] = enhanced_skills
@@ -472,17 +423,12 @@ class CombinedAnalysisServiceV2(BaseService):
                             f"name={first_course.get('name', 'N/A')[:30]}"
                         )
 
-                detailed_timings["course_availability_end"] = time.time()
-
                 logger.info(
                     f"[CourseAvailability] Checked {len(enhanced_skills)} skills for course availability"
                 )
 
                 # Add to timing breakdown
-                timing_breakdown["course_availability_time"] = round(
-                    (detailed_timings["course_availability_end"] -
-                     detailed_timings["course_availability_start"]) * 1000, 2
-                )
+                timing_breakdown["course_availability_time"] = root.duration_ms("course_availability")
 
             except Exception as e:
                 # Error doesn't interrupt main flow - Graceful Degradation
@@ -494,6 +440,10 @@ class CombinedAnalysisServiceV2(BaseService):
                 })
                 # Continue execution, skills remain unchanged (no has_available_courses field)
 
+        if course_pipeline:
+            # Gap Analysis returned no skill queries (or the check failed); drop leftover lookups
+            course_pipeline.cancel()
+
         # V4 Enhancement: Get structure analysis result
         # Test ID: RS-003-IT - Error handling flow
         resume_structure = None
@@ -506,26 +456,13 @@ class CombinedAnalysisServiceV2(BaseService):
                     timeout=structure_timeout
                 )
 
-                # IMPORTANT: Use actual completion time from callback, not current time
-                # The callback records when structure analysis ACTUALLY finished
-                if "structure_actual_end" in detailed_timings:
-                    # This is the real end time when the task completed
-                    actual_end = detailed_timings["structure_actual_end"]
-                    detailed_timings["structure_end"] = actual_end
-
-                    # Calculate actual execution time (from start to actual completion)
-                    actual_execution_time = actual_end - detailed_timings["structure_start"]
-                    timing_breakdown["structure_analysis_time"] = round(actual_execution_time * 1000, 2)
+                # The span ended when structure analysis ACTUALLY finished, not when we checked it
+                structure_span = root.find("structure_analysis")
+                timing_breakdown["structure_analysis_time"] = round(structure_span.elapsed_ms(), 2)
 
-                    # Calculate wait time (from actual completion to when we checked it)
-                    wait_time = time.time() - actual_end
-                    timing_breakdown["structure_wait_time"] = round(wait_time * 1000, 2)
-                else:
-                    # Fallback if callback didn't fire (shouldn't happen)
-                    detailed_timings["structure_end"] = time.time()
-                    timing_breakdown["structure_analysis_time"] = round(
-                        (detailed_timings["structure_end"] - detailed_timings["structure_start"]) * 1000, 2
-                    )
+                # Calculate wait time (from actual completion to when we checked it)
+                wait_time = root.elapsed_ms() - structure_span.end_offset_ms(root)
+                timing_breakdown["structure_wait_time"] = round(wait_time, 2)
 
                 logger.info(
                     f"Structure analysis completed in {timing_breakdown['structure_analysis_time']}ms"
@@ -542,10 +479,6 @@ class CombinedAnalysisServiceV2(BaseService):
         if warmup_task.done():
             try:
                 warmup_metrics = warmup_task.result()
-                detailed_timings["pgvector_warmup_end"] = (
-                    detailed_timings["pgvector_warmup_start"] +
-                    warmup_metrics["duration_ms"] / 1000
-                )
                 timing_breakdown["pgvector_warmup_time"] = warmup_metrics["duration_ms"]
 
                 if warmup_metrics["completed"]:
@@ -570,52 +503,24 @@ class CombinedAnalysisServiceV2(BaseService):
                 "language_detected": language,
                 "processing_approach": "v3_true_parallel",
                 "optimization": "Plan B - Gap starts after keywords only",
-                "phase_timings_ms": {
-                    phase: round(timing * 1000, 2)
-                    for phase, timing in phase_timings.items()
-                },
+                "phase_timings_ms": phase_timings_ms,
                 "detailed_timings_ms": timing_breakdown,
+                # Offsets in ms from the start of the analysis, taken from the span tree
                 "execution_timeline": {
                     "parallel_tasks": {
-                        "keywords": {
-                            "start": 0,
-                            "end": timing_breakdown.get("keyword_matching_time", 0)
-                        },
-                        "embeddings": {
-                            "start": 0,
-                            "end": timing_breakdown.get("embedding_time", 0)
-                        },
+                        "keywords": _timeline_entry(root, "keyword_matching"),
+                        "embeddings": _timeline_entry(root, "embeddings"),
                         "structure_analysis": {
-                            "start": 0,
-                            # Use actual execution time, not the total time including wait
-                            "end": timing_breakdown.get("structure_analysis_time", 0),
+                            **_timeline_entry(root, "structure_analysis"),
                             "wait_time": timing_breakdown.get("structure_wait_time", 0),
-                            "actual_completed": "structure_actual_end" in detailed_timings
+                            "actual_completed": "structure_analysis_time" in timing_breakdown
                         },
-                        "pgvector_warmup": {
-                            "start": 0,
-                            "end": timing_breakdown.get("pgvector_warmup_time", 0)
-                        }
+                        "pgvector_warmup": _timeline_entry(root, "pgvector_warmup")
                     },
                     "sequential_tasks": {
-                        "index_calculation": {
-                            "start": timing_breakdown.get("embedding_time", 0),
-                            "end": (timing_breakdown.get("embedding_time", 0) +
-                                   timing_breakdown.get("index_calculation_time", 0))
-                        },
-                        "gap_analysis": {
-                            "start": (timing_breakdown.get("embedding_time", 0) +
-                                     timing_breakdown.get("index_calculation_time", 0)),
-                            "end": (timing_breakdown.get("embedding_time", 0) +
-                                   timing_breakdown.get("index_calculation_time", 0) +
-                                   timing_breakdown.get("gap_analysis_time", 0))
-                        },
-                        "course_availability": {
-                            "start": (timing_breakdown.get("embedding_time", 0) +
-                                     timing_breakdown.get("index_calculation_time", 0) +
-                                     timing_breakdown.get("gap_analysis_time", 0)),
-                            "end": timing_breakdown.get("total_time", 0)
-                        }
+                        "index_calculation": _timeline_entry(root, "index_calculation"),
+                        "gap_analysis": _timeline_entry(root, "gap_analysis"),
+                        "course_availability": _timeline_entry(root, "course_availability")
                     }
                 },
                 "parallel_efficiency": round(efficiency * 100, 1),
@@ -669,6 +574,74 @@ class CombinedAnalysisServiceV2(BaseService):
 
         return result
 
+    async def _calculate_index_after_embeddings(
+        self,
+        embedding_task: asyncio.Task,
+        resume: str,
+        job_description: str,
+        keywords: list[str]
+    ) -> dict[str, Any]:
+        """Run Index Calculation once embeddings are ready."""
+        await embedding_task
+
+        if self.retry_strategy:
+            index_result = await self.retry_strategy.execute_with_retry(
+                lambda: self.index_service.calculate_index(
+                    resume=resume,
+                    job_description=job_description,
+                    keywords=keywords
+                ),
+                error_classifier=self._classify_index_error,
+                get_retry_after=self._get_retry_after_from_error
+            )
+        else:
+            index_result = await self.index_service.calculate_index(
+                resume=resume,
+                job_description=job_description,
+                keywords=keywords
+            )
+
+        # Async job clients can show the score while Gap Analysis is still running
+        await report_job_progress("index_calculation", index_result)
+        return index_result
+
+    async def _run_gap_analysis(
+        self,
+        resume: str,
+        job_description: str,
+        index_context: dict[str, Any],
+        language: str,
+        analysis_options: dict[str, Any] | None,
+        pending_index: asyncio.Task | None,
+        on_skill_query: Callable[[dict[str, Any]], None] | None = None
+    ) -> dict[str, Any]:
+        """
+        Run Gap Analysis from whatever index context its prompt needs.
+
+        Args:
+            index_context: Full index result, or just keyword coverage
+            pending_index: Index Calculation task still running when index_context is partial
+            on_skill_query: Receives each skill query while the response streams
+        """
+        def _analyze():
+            return self.gap_service.analyze_with_context(
+                resume=resume,
+                job_description=job_description,
+                index_result=index_context,
+                language=language,
+                options=analysis_options,
+                pending_index_result=pending_index,
+                on_skill_query=on_skill_query
+            )
+
+        if self.retry_strategy:
+            return await self.retry_strategy.execute_with_retry(
+                _analyze,
+                error_classifier=self._classify_gap_error,
+                get_retry_after=self._get_retry_after_from_error
+            )
+        return await _analyze()
+
     async def _generate_embeddings_parallel(
         self,
         client: Any,
@@ -693,10 +666,10 @@ class CombinedAnalysisServiceV2(BaseService):
         # Generate embeddings in parallel
         async with asyncio.TaskGroup() as tg:
             resume_task = tg.create_task(
-                self._create_embedding(client, clean_resume)
+                traced("resume_embedding", self._create_embedding(client, clean_resume))
             )
             job_task = tg.create_task(
-                self._create_embedding(client, clean_job_desc)
+                traced("jd_embedding", self._create_embedding(client, clean_job_desc))
             )
 
         return {
@@ -710,6 +683,8 @@ class CombinedAnalysisServiceV2(BaseService):
 
         This runs in parallel with other tasks during the initial phase,
         so the warmup cost is effectively zero (hidden by Structure Analysis).
+        It is skipped once the start-up warm-up or an earlier request has
+        warmed the pool in this process.
 
         Returns:
             Dictionary with warmup metrics
@@ -722,6 +697,12 @@ class CombinedAnalysisServiceV2(BaseService):
             "error": None
         }
 
+        # Start-up warm-up (or an earlier request) already did this in this process
+        from src.core.warmup import get_warmup_runner
+        if CombinedAnalysisServiceV2._pgvector_warmed or get_warmup_runner().succeeded("pgvector"):
+            warmup_metrics.update(completed=True, skipped=True)
+            return warmup_metrics
+
         try:
             # Get or initialize connection pool via singleton
             from src.services.course_search_singleton import get_course_search_service
@@ -752,6 +733,7 @@ class CombinedAnalysisServiceV2(BaseService):
                         warmup_metrics["connections_warmed"] += 1
 
                 warmup_metrics["completed"] = True
+                CombinedAnalysisServiceV2._pgvector_warmed = True
                 logger.info("✅ [pgvector warmup] Successfully warmed up connection pool and indexes")
             else:
                 logger.warning("⚠️ [pgvector warmup] Connection pool not available")
@@ -776,10 +758,9 @@ class CombinedAnalysisServiceV2(BaseService):
         Returns:
             Keyword coverage dictionary
         """
-        from src.services.text_processing import clean_html_text
-
-        # Clean HTML if present
-        resume_text = clean_html_text(resume)
+        # Clean HTML if present (memoized on the shared AnalyzedText)
+        resume_doc = as_analyzed_text(resume)
+        resume_text = resume_doc.clean_text
 
         # Handle empty inputs
         if not keywords or not resume_text:
@@ -796,7 +777,7 @@ class CombinedAnalysisServiceV2(BaseService):
             keywords = [k.strip() for k in keywords.split(",") if k.strip()]
 
         # Prepare resume text for matching (case insensitive)
-        resume_search_text = resume_text.lower()
+        resume_search_text = resume_doc.lower_text
 
         covered = []
         missed = []
@@ -936,9 +917,7 @@ class CombinedAnalysisServiceV2(BaseService):
         Returns:
             Cleaned text suitable for embedding
         """
-        # Import here to avoid circular imports
-        from src.services.text_processing import clean_html_text
-        return clean_html_text(text)
+        return as_analyzed_text(text).clean_text
 
     def _classify_index_error(self, error: Exception) -> str:
         """Classify index calculation errors for adaptive retry."""
@@ -6,9 +6,10 @@ import asyncio
 import logging
 import os
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import asyncpg
+if TYPE_CHECKING:
+    import asyncpg
 
 from src.core.monitoring_service import monitoring_service
 from src.services.llm_factory import get_embedding_client
@@ -260,7 +261,7 @@ FROM (
 class CourseAvailabilityChecker:
     """Service for checking course availability for skills"""
 
-    def __init__(self, connection_pool: asyncpg.Pool | None = None):
+    def __init__(self, connection_pool: "asyncpg.Pool | None" = None):
         """
         Initialize the course availability checker
 
@@ -974,6 +975,29 @@ class CourseAvailabilityChecker:
         return result_projects, result_certifications
 
 
+async def warm_connection(conn: "asyncpg.Connection", embedding: list[float] | None = None) -> None:
+    """
+    Run the availability query once on a pooled connection.
+
+    asyncpg caches prepared statements per connection, so this moves parsing,
+    planning and codec introspection for AVAILABILITY_QUERY out of the first
+    real request on that connection, and pulls the vector index into memory.
+
+    Args:
+        conn: Connection acquired from the shared pool
+        embedding: Probe vector (defaults to a constant 1536-d vector)
+    """
+    await conn.fetchrow(
+        AVAILABILITY_QUERY,
+        embedding or [0.1] * 1536,
+        MIN_SIMILARITY_THRESHOLD,
+        "SKILL",
+        SIMILARITY_THRESHOLDS.get("SKILL", SIMILARITY_THRESHOLDS["DEFAULT"]),
+        SIMILARITY_THRESHOLDS.get("FIELD", SIMILARITY_THRESHOLDS["DEFAULT"]),
+        SIMILARITY_THRESHOLDS.get("DEFAULT", SIMILARITY_THRESHOLDS["DEFAULT"]),
+    )
+
+
 # Global instance
 _checker_instance: CourseAvailabilityChecker | None = None
 
@@ -1009,3 +1033,85 @@ async def check_course_availability(
         await _checker_instance.initialize()
 
     return await _checker_instance.check_course_availability(skill_queries)
+
+
+_ENHANCEMENT_KEYS = ("resume_enhancement_project", "resume_enhancement_certification")
+
+
+class CourseAvailabilityPipeline:
+    """
+    Course availability lookups started while Gap Analysis is still generating.
+
+    ``submit`` is called for each skill query as soon as the streamed response
+    contains it; each skill gets its own embedding + availability lookup task.
+    ``resolve`` then merges those results into the final SkillSearchQueries,
+    looks up any skill that was not streamed, and rebuilds the enhancement
+    data that check_course_availability attaches to the first skill.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(skill: dict[str, Any]) -> str:
+        return str(skill.get("skill_name", "")).strip().lower()
+
+    def submit(self, skill: dict[str, Any]):
+        """Start the lookup for one skill query (duplicates are ignored)."""
+        key = self._key(skill)
+        if key and key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(check_course_availability([dict(skill)]))
+
+    def cancel(self):
+        """Cancel lookups that are still running."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    async def resolve(self, skill_queries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Enhance the final skill queries with the pipelined lookups.
+
+        Args:
+            skill_queries: SkillSearchQueries of the parsed Gap Analysis result
+
+        Returns:
+            Enhanced skill queries, as check_course_availability returns them
+        """
+        try:
+            missing = []
+            pipelined = 0
+            for skill in skill_queries:
+                task = self._tasks.pop(self._key(skill), None)
+                try:
+                    enhanced = (await task)[0] if task else None
+                except Exception as e:
+                    logger.warning(f"[CourseAvailability] Pipelined lookup failed for {skill.get('skill_name')}: {e}")
+                    enhanced = None
+                if enhanced is None:
+                    missing.append(skill)
+                else:
+                    skill.update({k: v for k, v in enhanced.items() if k not in _ENHANCEMENT_KEYS})
+                    pipelined += 1
+        finally:
+            # Skills the final response no longer contains (e.g. after a retry)
+            self.cancel()
+
+        if not pipelined:
+            return await check_course_availability(skill_queries)
+
+        if missing:
+            for skill, enhanced in zip(missing, await check_course_availability(missing), strict=False):
+                if enhanced is not skill:
+                    skill.update(enhanced)
+
+        # Enhancement data covers all skills, not just those of one lookup
+        for skill in skill_queries:
+            for key in _ENHANCEMENT_KEYS:
+                skill.pop(key, None)
+        if _checker_instance is not None:
+            projects, certifications = _checker_instance._build_enhancement_data(skill_queries, skill_queries)
+            skill_queries[0]["resume_enhancement_project"] = projects
+            skill_queries[0]["resume_enhancement_certification"] = certifications
+
+        return skill_queries
@@ -3,6 +3,8 @@ import hashlib
 from datetime import datetime, timedelta
 from typing import Any
 
+from src.core.cache_backends import get_shared_cache
+
 
 class CourseSearchCache:
     """記憶體快取服務"""
@@ -11,6 +13,8 @@ class CourseSearchCache:
         self.cache = {}
         self.ttl = timedelta(seconds=ttl_seconds)
         self.max_size = max_size
+        # 多 worker 共用的第二層快取 (CACHE_BACKEND 為 sqlite/redis 時)
+        self.shared = get_shared_cache("course_search", ttl_seconds)
 
     def get_cache_key(self, skill_name: str, search_context: str,
                      category: str, threshold: float) -> str:
@@ -19,7 +23,7 @@ class CourseSearchCache:
         # Use SHA256 instead of MD5 for better security practices
         return hashlib.sha256(cache_str.encode()).hexdigest()[:16]  # Truncate for cache efficiency
 
-    def get(self, key: str) -> dict | None:
+    async def get(self, key: str) -> dict | None:
         """從快取取得資料"""
         if key in self.cache:
             data, timestamp = self.cache[key]
@@ -28,10 +32,21 @@ class CourseSearchCache:
             else:
                 # 過期, 移除
                 del self.cache[key]
+        if self.shared is not None:
+            data = await self.shared.aget(key)
+            if data is not None:
+                self._store(key, data)
+                return data
         return None
 
-    def set(self, key: str, data: Any):
+    async def set(self, key: str, data: Any):
         """存入快取"""
+        self._store(key, data)
+        if self.shared is not None:
+            await self.shared.aset(key, data)
+
+    def _store(self, key: str, data: Any):
+        """存入本地快取"""
         # 檢查大小限制
         if len(self.cache) >= self.max_size:
             # 移除最舊的項目
@@ -44,6 +59,8 @@ class CourseSearchCache:
     def clear(self):
         """清空快取"""
         self.cache.clear()
+        if self.shared is not None:
+            self.shared.clear()
 
     def stats(self) -> dict:
         """取得快取統計"""
@@ -8,9 +8,6 @@ import logging
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-import asyncpg
-from pgvector.asyncpg import register_vector
-
 from src.core.monitoring_service import monitoring_service
 from src.services.llm_factory import get_embedding_client
 
@@ -76,6 +73,7 @@ class CourseSearchService:
             import logging
             import time
 
+            import asyncpg
             from pgvector.asyncpg import register_vector
 
             logger = logging.getLogger(__name__)
@@ -125,6 +123,8 @@ class CourseSearchService:
         Returns:
             相似課程列表, 包含相似度分數
         """
+        from pgvector.asyncpg import register_vector
+
         start_time = datetime.now()
 
         try:
@@ -272,6 +272,9 @@ class CourseSearchService:
         Returns:
             相似課程列表
         """
+        import asyncpg
+        from pgvector.asyncpg import register_vector
+
         await self.initialize()
 
         # 建立資料庫連線
@@ -357,6 +360,8 @@ class CourseSearchService:
 
     async def get_popular_categories(self) -> list[dict[str, Any]]:
         """取得熱門課程分類"""
+        import asyncpg
+
         await self.initialize()
 
         conn = await asyncpg.connect(
@@ -434,7 +439,7 @@ class CourseSearchService:
         )
 
         # 檢查快取
-        cached_result = self.cache.get(cache_key)
+        cached_result = await self.cache.get(cache_key)
         if cached_result:
             monitoring_service.track_event("CourseSearchCacheHit", {
                 "skill_name": skill_name,
@@ -512,7 +517,7 @@ class CourseSearchService:
             )
 
             # 存入快取
-            self.cache.set(cache_key, response.model_dump())
+            await self.cache.set(cache_key, response.model_dump())
 
             # 記錄監控
             self._track_search_success(skill_name, search_context, courses, duration_ms)
@@ -584,6 +589,8 @@ class CourseSearchService:
         threshold: float
     ) -> list[dict[str, Any]]:
         """執行向量搜尋 (第二版)"""
+        from pgvector.asyncpg import register_vector
+
         # 從連線池取得連線
         async with self._connection_pool.acquire() as conn:
             # 註冊 vector 類型
@@ -861,7 +868,7 @@ class CourseSearchService:
 
             for course_id in course_ids:
                 cache_key = f"course_detail:{course_id}:{request.full_description}:{request.description_max_length}"
-                cached = self.cache.get(cache_key)
+                cached = await self.cache.get(cache_key)
                 if cached:
                     cached_courses.append(cached)
                 else:
@@ -940,7 +947,7 @@ class CourseSearchService:
                             f"course_detail:{row['id']}:"
                             f"{request.full_description}:{request.description_max_length}"
                         )
-                        self.cache.set(cache_key, course)
+                        await self.cache.set(cache_key, course)
 
                 track_time("db_operations", "Query uncached courses", db_start)
 
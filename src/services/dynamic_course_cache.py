@@ -14,12 +14,16 @@ Features:
 import asyncio
 import contextlib
 import hashlib
+import json
 import logging
+import os
 from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, ClassVar
 
+from src.core.cache_backends import get_shared_cache
+from src.core.metrics.registry import MetricFamily, cache_metric_families, get_metrics_registry
 from src.core.monitoring_service import monitoring_service
 
 logger = logging.getLogger(__name__)
@@ -82,6 +86,9 @@ class DynamicCourseCache:
         # Thread safety
         self._lock = asyncio.Lock()
 
+        # Second tier shared between workers (None unless CACHE_BACKEND is sqlite/redis)
+        self._shared = get_shared_cache("course_availability", self._ttl.total_seconds())
+
         # Statistics tracking
         self._stats = CacheStats()
 
@@ -160,31 +167,45 @@ class DynamicCourseCache:
         async with self._lock:
             self._stats.total_requests += 1
 
-            # Check if key exists
-            if cache_key not in self._cache:
-                self._stats.cache_misses += 1
-                self._track_operation("cache_miss", start_time)
-                return None
-
-            item = self._cache[cache_key]
+            item = self._cache.get(cache_key)
 
             # Check TTL expiration
-            if self._is_expired(item):
+            expired = item is not None and self._is_expired(item)
+            if expired:
                 logger.debug(f"[DynamicCourseCache] Cache key expired: {cache_key}")
                 self._remove_item(cache_key)
+                item = None
+
+            if item is not None:
+                # Update LRU tracking
+                self._update_access(cache_key, item)
+
+                # Track cache hit
+                self._stats.cache_hits += 1
+                self._track_operation("cache_hit", start_time)
+
+                logger.debug(f"[DynamicCourseCache] Cache hit: {cache_key}")
+                return item.data.copy()  # Return copy to prevent modification
+
+            if self._shared is None:
                 self._stats.cache_misses += 1
-                self._track_operation("cache_miss_expired", start_time)
+                self._track_operation("cache_miss_expired" if expired else "cache_miss", start_time)
                 return None
 
-            # Update LRU tracking
-            self._update_access(cache_key, item)
+        # Another worker may have cached it; look up outside the lock
+        data = await self._shared.aget(cache_key)
 
-            # Track cache hit
-            self._stats.cache_hits += 1
-            self._track_operation("cache_hit", start_time)
+        async with self._lock:
+            if data is None:
+                self._stats.cache_misses += 1
+                self._track_operation("cache_miss_expired" if expired else "cache_miss", start_time)
+                return None
 
-            logger.debug(f"[DynamicCourseCache] Cache hit: {cache_key}")
-            return item.data.copy()  # Return copy to prevent modification
+            self._store(cache_key, data)
+            self._stats.cache_hits += 1
+            self._track_operation("cache_hit_shared", start_time)
+            logger.debug(f"[DynamicCourseCache] Shared cache hit: {cache_key}")
+            return data.copy()
 
     async def set(self, cache_key: str, data: dict[str, Any]) -> None:
         """
@@ -197,25 +218,31 @@ class DynamicCourseCache:
         start_time = datetime.now()
 
         async with self._lock:
-            # Create cache item
-            item = CacheItem(
-                data=data.copy(),  # Store copy to prevent external modification
-                timestamp=datetime.now(),
-                access_count=1,
-                last_access=datetime.now()
-            )
-
-            # Check capacity and evict if necessary
-            if cache_key not in self._cache and len(self._cache) >= self._max_size:
-                self._evict_lru()
-
-            # Store item
-            self._cache[cache_key] = item
-            self._access_order.append(cache_key)
-
+            self._store(cache_key, data)
             self._track_operation("cache_set", start_time)
             logger.debug(f"[DynamicCourseCache] Cache set: {cache_key}")
 
+        if self._shared is not None:
+            await self._shared.aset(cache_key, data)
+
+    def _store(self, cache_key: str, data: dict[str, Any]) -> None:
+        """Store item locally with capacity management (caller holds the lock)."""
+        # Create cache item
+        item = CacheItem(
+            data=data.copy(),  # Store copy to prevent external modification
+            timestamp=datetime.now(),
+            access_count=1,
+            last_access=datetime.now()
+        )
+
+        # Check capacity and evict if necessary
+        if cache_key not in self._cache and len(self._cache) >= self._max_size:
+            self._evict_lru()
+
+        # Store item
+        self._cache[cache_key] = item
+        self._access_order.append(cache_key)
+
     async def clear(self) -> None:
         """Clear all cache items."""
         async with self._lock:
@@ -223,6 +250,65 @@ class DynamicCourseCache:
             self._cache.clear()
             self._access_order.clear()
             logger.info(f"[DynamicCourseCache] Cleared {cleared_count} items")
+        if self._shared is not None:
+            await self._shared.aclear()
+
+    async def save_snapshot(self, path: str) -> int:
+        """
+        Write live items to a JSON snapshot, least recently used first.
+
+        Args:
+            path: Snapshot file path (written atomically)
+
+        Returns:
+            Number of items written
+        """
+        async with self._lock:
+            items = [
+                {"key": key, "data": item.data, "timestamp": item.timestamp.isoformat()}
+                for key in self._access_order
+                if (item := self._cache.get(key)) is not None and not self._is_expired(item)
+            ]
+        # The access order may list a key more than once; keep its most recent position
+        latest = {entry["key"]: entry for entry in items}
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "items": list(latest.values())}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        logger.info(f"[DynamicCourseCache] Saved {len(latest)} items to snapshot {path}")
+        return len(latest)
+
+    async def load_snapshot(self, path: str) -> int:
+        """
+        Fill the cache from a snapshot written by ``save_snapshot``.
+
+        Items keep their original timestamp, so expired items are skipped and
+        the rest expire on schedule.
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            Number of items loaded (0 if the file does not exist)
+        """
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+
+        loaded = 0
+        async with self._lock:
+            for entry in snapshot.get("items", [])[-self._max_size:]:
+                item = CacheItem(data=entry["data"], timestamp=datetime.fromisoformat(entry["timestamp"]))
+                if self._is_expired(item) or entry["key"] in self._cache:
+                    continue
+                if len(self._cache) >= self._max_size:
+                    self._evict_lru()
+                self._cache[entry["key"]] = item
+                self._access_order.append(entry["key"])
+                loaded += 1
+        logger.info(f"[DynamicCourseCache] Loaded {loaded} items from snapshot {path}")
+        return loaded
 
     async def cleanup_expired(self) -> int:
         """
@@ -260,6 +346,12 @@ class DynamicCourseCache:
 
             return self._stats
 
+    def collect_metrics(self) -> list[MetricFamily]:
+        """Cache counters for the metric registry (lock-free reads of plain counters)."""
+        return cache_metric_families(
+            "course_availability", self._stats.cache_hits, self._stats.cache_misses, len(self._cache)
+        )
+
     async def get_top_items(self, limit: int = 10) -> list[dict[str, Any]]:
         """
         Get most frequently accessed cache items.
@@ -348,7 +440,7 @@ class DynamicCourseCache:
         duration_ms = (datetime.now() - start_time).total_seconds() * 1000
 
         # Update average retrieval time
-        if operation in ["cache_hit", "cache_miss"]:
+        if operation in ["cache_hit", "cache_hit_shared", "cache_miss"]:
             current_avg = self._stats.avg_retrieval_time_ms
             total_ops = self._stats.cache_hits + self._stats.cache_misses
 
@@ -387,6 +479,7 @@ def get_course_cache() -> DynamicCourseCache:
 
     if _cache_instance is None:
         _cache_instance = DynamicCourseCache()
+        get_metrics_registry().register_collector("course_cache", _cache_instance.collect_metrics)
         logger.info("[DynamicCourseCache] Created global cache instance")
 
     return _cache_instance
@@ -7,6 +7,8 @@ import logging
 import httpx
 from pydantic import BaseModel
 
+from src.core.utils import http_client_limits
+
 
 class EmbeddingResponse(BaseModel):
     """Response model for embedding API."""
@@ -31,6 +33,7 @@ class AzureEmbeddingClient:
         # Set up HTTP client
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(30.0, read=60.0),
+            limits=http_client_limits(),
             headers={
                 "api-key": self.api_key,
                 "Content-Type": "application/json",
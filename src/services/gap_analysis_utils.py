@@ -89,6 +89,107 @@ def parse_skill_development_priorities(skill_content: str) -> list[dict[str, str
     return skills
 
 
+# Response sections in output order
+GAP_SECTIONS = (
+    "core_strengths",
+    "key_gaps",
+    "quick_improvements",
+    "overall_assessment",
+    "skill_development_priorities",
+)
+
+# Sections that can be generated by separate completions. Key gaps, quick
+# improvements and skill priorities share one skill-vs-presentation
+# classification (no skill in both lists, priorities taken from key gaps),
+# so they stay together.
+GAP_SECTION_GROUPS = {
+    "strengths": ("core_strengths",),
+    "gaps": ("key_gaps", "quick_improvements", "skill_development_priorities"),
+    "assessment": ("overall_assessment",),
+}
+
+
+def section_instruction(sections: tuple[str, ...]) -> str:
+    """Instruction appended after the shared prompt to request only some sections."""
+    tags = ", ".join(f"<{name}>" for name in sections)
+    return (
+        f"Output ONLY these sections of the <gap_analysis> format: {tags}. "
+        "Apply all analysis rules above, but do not write any other section."
+    )
+
+
+def merge_gap_sections(responses: dict[tuple[str, ...], str]) -> str:
+    """
+    Merge partial responses into one <gap_analysis> response.
+
+    Args:
+        responses: Response text keyed by the sections it was asked for
+
+    Returns:
+        Response text in the format parse_gap_response expects
+    """
+    parts = []
+    for sections, content in responses.items():
+        for name in sections:
+            match = re.search(rf'<{name}>(.*?)</{name}>', content, re.S)
+            if match:
+                parts.append((GAP_SECTIONS.index(name), f"<{name}>\n{match.group(1).strip()}\n</{name}>"))
+    return "<gap_analysis>\n" + "\n\n".join(text for _, text in sorted(parts)) + "\n</gap_analysis>"
+
+
+class SkillQueryStreamParser:
+    """
+    Incremental parser for skill queries in a streamed gap analysis response.
+
+    Each ``SKILL_N::Name::CATEGORY::Description`` line inside
+    <skill_development_priorities> is returned by ``feed`` once the line is
+    complete, so work for that skill can start before the response ends.
+    """
+
+    OPEN_TAG = "<skill_development_priorities>"
+    CLOSE_TAG = "</skill_development_priorities>"
+
+    def __init__(self):
+        self._buffer = ""
+        self._start = -1
+        self._emitted = 0
+        self._closed = False
+
+    def feed(self, delta: str) -> list[dict[str, str]]:
+        """
+        Add streamed text and return the skill queries completed by it.
+
+        Args:
+            delta: Next chunk of the response content
+
+        Returns:
+            Skill dictionaries (as parse_skill_development_priorities builds them)
+        """
+        if self._closed or not delta:
+            return []
+        self._buffer += delta
+
+        if self._start < 0:
+            index = self._buffer.find(self.OPEN_TAG)
+            if index < 0:
+                return []
+            self._start = index + len(self.OPEN_TAG)
+
+        body = self._buffer[self._start:]
+        end = body.find(self.CLOSE_TAG)
+        if end >= 0:
+            body = body[:end]
+            self._closed = True
+        else:
+            # Only lines already terminated by a newline are complete
+            body = body[:body.rfind("\n") + 1]
+
+        skills = parse_skill_development_priorities(body)
+        completed = skills[self._emitted:]
+        self._emitted = len(skills)
+        return completed
+
+
 def parse_gap_response(content: str) -> dict[str, Any]:
     """
     Parse LLM gap analysis response from XML format.
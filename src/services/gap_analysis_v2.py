@@ -4,14 +4,25 @@ Enhanced Gap Analysis Service V2 for Azure Container API.
 Improved gap analysis with context-aware processing and index result integration.
 Key component of Index Cal and Gap Analysis V2 refactoring.
 """
+import asyncio
 import logging
 import os
 import time
+from collections.abc import Callable
 from typing import Any
 
 from src.core.config import get_settings
-from src.core.simple_prompt_manager import prompt_manager
-from src.services.gap_analysis_utils import parse_gap_response
+from src.core.simple_prompt_manager import CompiledPrompt, prompt_manager
+from src.services.gap_analysis_utils import (
+    GAP_SECTION_GROUPS,
+    SkillQueryStreamParser,
+    merge_gap_sections,
+    parse_gap_response,
+    section_instruction,
+)
+from src.services.output_budget import complete_with_continuation
+from src.services.prompt_layout import build_cacheable_messages
+from src.services.token_budget import compact_inputs, count_tokens
 from src.services.token_tracking_mixin import TokenTrackingMixin
 from src.services.unified_prompt_service import UnifiedPromptService
 
@@ -92,7 +103,9 @@ class GapAnalysisServiceV2(TokenTrackingMixin):
         job_description: str,
         index_result: dict[str, Any],
         language: str = "en",
-        options: dict[str, Any] | None = None
+        options: dict[str, Any] | None = None,
+        pending_index_result: "asyncio.Future[dict[str, Any]] | None" = None,
+        on_skill_query: Callable[[dict[str, Any]], None] | None = None
     ) -> dict[str, Any]:
         """
         Analyze gap with enhanced context from index calculation results.
@@ -100,9 +113,14 @@ class GapAnalysisServiceV2(TokenTrackingMixin):
         Args:
             resume: Resume content (HTML or plain text)
             job_description: Job description content
-            index_result: Results from IndexCalculationServiceV2
+            index_result: Results from IndexCalculationServiceV2, or only its
+                ``keyword_coverage`` when the prompt does not need the similarity score
             language: Output language (en or zh-TW)
             options: Additional analysis options
+            pending_index_result: Still-running index calculation; awaited after the
+                LLM call for skill priorities and metadata
+            on_skill_query: Streams the LLM response when given and is called with
+                each skill query as soon as its line is complete
 
         Returns:
             Enhanced gap analysis results with context awareness
@@ -111,8 +129,13 @@ class GapAnalysisServiceV2(TokenTrackingMixin):
         self.v2_stats["context_enhanced_calls"] += 1
 
         try:
+            # Compact text within the input token budget; index_result still reflects the full inputs
+            compacted = compact_inputs("gap_analysis", resume=resume, job_description=job_description)
+            resume = compacted.texts["resume"]
+            job_description = compacted.texts["job_description"]
+
             # Build enhanced prompt with index context
-            enhanced_prompt = self._build_enhanced_prompt(
+            messages = self._build_enhanced_prompt(
                 resume,
                 job_description,
                 index_result,
@@ -126,15 +149,20 @@ class GapAnalysisServiceV2(TokenTrackingMixin):
 
             # Execute enhanced analysis with all LLM config parameters
             response = await self._call_llm_with_context(
-                enhanced_prompt,
+                messages,
                 temperature=llm_config["temperature"],
                 max_tokens=llm_config["max_tokens"],
+                on_skill_query=on_skill_query,
                 **llm_config["additional_params"]
             )
 
             # Parse enhanced response
             result = self._parse_enhanced_response(response)
 
+            # The prompt only needed keyword coverage; the rest needs the full index result
+            if pending_index_result is not None:
+                index_result = await pending_index_result
+
             # Add skill priorities if requested
             if (self.enable_skill_priorities and
                 options and
@@ -152,7 +180,10 @@ class GapAnalysisServiceV2(TokenTrackingMixin):
                 "context_enhanced": True,
                 "processing_time_ms": round((time.time() - start_time) * 1000, 2),
                 "similarity_score": index_result.get("similarity_percentage", 0),
-                "keyword_coverage": index_result.get("keyword_coverage", {}).get("coverage_percentage", 0)
+                "keyword_coverage": index_result.get("keyword_coverage", {}).get("coverage_percentage", 0),
+                "input_tokens": sum(compacted.tokens_after.values()),
+                "input_tokens_saved": compacted.tokens_saved,
+                "fanout": self.fanout_enabled()
             }
 
             # Update timing statistics
@@ -171,6 +202,32 @@ class GapAnalysisServiceV2(TokenTrackingMixin):
             # Do NOT fallback to V1 - V2 should operate independently
             raise Exception(f"Gap Analysis V2 failed: {e!s}") from e
 
+    @staticmethod
+    def fanout_enabled() -> bool:
+        """Whether response sections are generated by parallel sub-prompts."""
+        return os.getenv("GAP_ANALYSIS_FANOUT_ENABLED", "false").lower() == "true"
+
+    def _load_prompt_config(self) -> CompiledPrompt:
+        """Load the compiled gap analysis prompt (GAP_ANALYSIS_PROMPT_VERSION -> active -> latest)."""
+        return prompt_manager.load_compiled_prompt("gap_analysis")
+
+    def requires_similarity_score(self) -> bool:
+        """
+        Whether the active prompt needs the embedding similarity score.
+
+        Prompts that only use keyword coverage can be built as soon as keyword
+        matching finishes, without waiting for embeddings and the index.
+
+        Returns:
+            True if the prompt references {similarity_score}
+        """
+        try:
+            prompts = self._load_prompt_config().prompts
+        except Exception:
+            # _build_enhanced_prompt falls back to a coverage-only prompt
+            return False
+        return any("{similarity_score}" in (prompts.get(role) or "") for role in ("system", "user"))
+
     def _build_enhanced_prompt(
         self,
         resume: str,
@@ -178,9 +235,9 @@ class GapAnalysisServiceV2(TokenTrackingMixin):
         index_result: dict[str, Any],
         language: str,
         options: dict[str, Any] | None
-    ) -> str:
+    ) -> list[dict[str, str]]:
         """
-        Build enhanced prompt incorporating index calculation context.
+        Build enhanced prompt messages incorporating index calculation context.
 
         Args:
             resume: Resume content
@@ -190,7 +247,7 @@ class GapAnalysisServiceV2(TokenTrackingMixin):
             options: Analysis options
 
         Returns:
-            Enhanced prompt with context information
+            System and user messages with context information
         """
         # Extract context from index results
         # Note: similarity_score is no longer used in v2.0.0 prompt
@@ -200,71 +257,32 @@ class GapAnalysisServiceV2(TokenTrackingMixin):
 
         # Load the prompt configuration
         try:
-            # Use prompt manager to load the correct version (env var -> active -> latest)
-            # Check for v2.1.7 or v2.1.8 override via environment variable
-            gap_analysis_version = os.environ.get('GAP_ANALYSIS_PROMPT_VERSION', 'latest')
-            if gap_analysis_version == '2.1.7':
-                # Load v2.1.7 specifically
-                config = prompt_manager.load_prompt_config_by_filename("gap_analysis", "v2.1.7.yaml")
-            elif gap_analysis_version == '2.1.8':
-                # Load v2.1.8 specifically
-                config = prompt_manager.load_prompt_config_by_filename("gap_analysis", "v2.1.8.yaml")
-            else:
-                config = prompt_manager.load_prompt_config("gap_analysis", version="latest")
+            config = self._load_prompt_config()
             logger.info(f"Loaded gap_analysis prompt version: {getattr(config, 'version', 'unknown')}")
 
-            # Get system and user prompts
-            system_prompt = ""
-            user_prompt = ""
-
-            if hasattr(config, 'prompts'):
-                system_prompt = config.prompts.get('system', '')
-                user_prompt = config.prompts.get('user', '')
-                logger.info(f"Loaded prompts - system length: {len(system_prompt)}, user length: {len(user_prompt)}")
-            else:
-                logger.error(
-                    f"Config has no 'prompts' attribute. "
-                    f"Config type: {type(config)}, attributes: {dir(config)}"
-                )
-                raise ValueError("Prompt config missing 'prompts' section")
-
-            # Check if prompts are empty before replacement
-            if not system_prompt or not user_prompt:
-                logger.error(f"Empty prompts detected - system: {bool(system_prompt)}, user: {bool(user_prompt)}")
+            system_template = config.templates.get("system")
+            user_template = config.templates.get("user")
+            if system_template is None or user_template is None:
+                logger.error(f"Empty prompts detected - system: {bool(system_template)}, user: {bool(user_template)}")
                 raise ValueError("System or user prompt is empty")
 
-            # Replace placeholders in prompts
-            # Note: v2.1.0 prompt uses these placeholders
-            system_prompt = system_prompt.replace("{keyword_coverage_percentage}",
-                                                  str(keyword_coverage.get('coverage_percentage', 0)))
-            system_prompt = system_prompt.replace("{covered_keywords}",
-                                                  ', '.join(covered_keywords[:10]) if covered_keywords else "None")
-            system_prompt = system_prompt.replace("{missing_keywords}",
-                                                  ', '.join(missed_keywords[:10]) if missed_keywords else "None")
-
-            # Replace placeholders in user prompt
-            user_prompt = user_prompt.replace("{job_description}", job_description)
-            user_prompt = user_prompt.replace("{resume}", resume)
-            user_prompt = user_prompt.replace("{similarity_score}",
-                                             str(index_result.get('similarity_percentage', 0)))
-            user_prompt = user_prompt.replace("{keyword_coverage_percentage}",
-                                             str(keyword_coverage.get('coverage_percentage', 0)))
-            user_prompt = user_prompt.replace("{coverage_percentage}",
-                                             str(keyword_coverage.get('coverage_percentage', 0)))
-            user_prompt = user_prompt.replace("{covered_keywords}",
-                                             ', '.join(covered_keywords[:10]) if covered_keywords else "None")
-            user_prompt = user_prompt.replace("{missing_keywords}",
-                                             ', '.join(missed_keywords[:10]) if missed_keywords else "None")
-
-            # Combine system and user prompts
-            enhanced_prompt = f"{system_prompt}\n\n{user_prompt}"
+            # Static system prompt first, request values last, so requests share a cacheable prefix
+            messages = build_cacheable_messages(system_template, user_template, {
+                "job_description": job_description,
+                "resume": resume,
+                "similarity_score": index_result.get('similarity_percentage', 0),
+                "keyword_coverage_percentage": keyword_coverage.get('coverage_percentage', 0),
+                "coverage_percentage": keyword_coverage.get('coverage_percentage', 0),
+                "covered_keywords": ', '.join(covered_keywords[:10]) if covered_keywords else "None",
+                "missing_keywords": ', '.join(missed_keywords[:10]) if missed_keywords else "None",
+            })
 
         except Exception as e:
             logger.warning(f"Failed to load v2.1.0 prompt config: {e}, using fallback")
             # Fallback to basic prompt with context
-            enhanced_prompt = f"""
-Analyze the gap between the resume and job description.
-
+            messages = [
+                {"role": "system", "content": "Analyze the gap between the resume and job description."},
+                {"role": "user", "content": f"""
 Context:
 - Keyword Coverage: {keyword_coverage.get('coverage_percentage', 0)}%
 - Covered Keywords: {', '.join(covered_keywords[:10])}
@@ -277,9 +295,10 @@ Resume:
 {resume}
 
 Please provide a comprehensive gap analysis.
-"""
+"""},
+            ]
 
-        return enhanced_prompt
+        return messages
 
     def _load_llm_config(self, language: str, resume: str = "", job_description: str = "") -> dict[str, Any]:
         """
@@ -308,17 +327,8 @@ Please provide a comprehensive gap analysis.
         }
 
         try:
-            # Load from YAML configuration using SimplePromptManager with env var support
-            # Priority: env var → active → latest
-            gap_analysis_version = os.environ.get('GAP_ANALYSIS_PROMPT_VERSION', 'latest')
-            if gap_analysis_version == '2.1.7':
-                # Load v2.1.7 specifically
-                prompt_config = prompt_manager.load_prompt_config_by_filename("gap_analysis", "v2.1.7.yaml")
-            elif gap_analysis_version == '2.1.8':
-                # Load v2.1.8 specifically
-                prompt_config = prompt_manager.load_prompt_config_by_filename("gap_analysis", "v2.1.8.yaml")
-            else:
-                prompt_config = prompt_manager.load_prompt_config("gap_analysis", version="latest")
+            # Same prompt file as _build_enhanced_prompt (env var -> active -> latest)
+            prompt_config = self._load_prompt_config().config
 
             if hasattr(prompt_config, 'llm_config'):
                 llm_config_obj = prompt_config.llm_config
@@ -381,10 +391,8 @@ Please provide a comprehensive gap analysis.
         """
         Calculate required tokens based on input size.
 
-        Uses a simple heuristic:
-        - Estimate input tokens from text length
-        - Add buffer for prompt template
-        - Ensure enough tokens for complete response
+        Counts input tokens with the o200k_base tokenizer, adds a buffer for
+        the prompt template and ensures enough tokens for a complete response.
 
         Args:
             resume: Resume content
@@ -393,17 +401,11 @@ Please provide a comprehensive gap analysis.
         Returns:
             Calculated required max_tokens
         """
-        # Rough estimation: 1 token ≈ 4 characters (English)
-        # For safety, use 1 token ≈ 3 characters
-        chars_per_token = 3
-
-        # Calculate input size
-        input_chars = len(resume) + len(job_description)
-        estimated_input_tokens = input_chars // chars_per_token
+        input_tokens = count_tokens(resume) + count_tokens(job_description)
 
         # Add buffer for prompt template and context (approximately 500 tokens)
         prompt_overhead = 500
-        total_input_tokens = estimated_input_tokens + prompt_overhead
+        total_input_tokens = input_tokens + prompt_overhead
 
         # Expected output size for Gap Analysis
         # - CoreStrengths: ~300 tokens
@@ -424,17 +426,17 @@ Please provide a comprehensive gap analysis.
         # Final calculation
         required_tokens = base_output_tokens
 
-        logger.info(f"Token calculation: input_chars={input_chars}, "
-                   f"estimated_input_tokens={estimated_input_tokens}, "
+        logger.info(f"Token calculation: input_tokens={input_tokens}, "
                    f"required_output_tokens={required_tokens}")
 
         return required_tokens
 
     async def _call_llm_with_context(
         self,
-        prompt: str,
+        messages: list[dict[str, str]],
         temperature: float = 0.3,
         max_tokens: int = 3000,
+        on_skill_query: Callable[[dict[str, Any]], None] | None = None,
         **kwargs
     ) -> str:
         """
@@ -443,9 +445,10 @@ Please provide a comprehensive gap analysis.
         Uses LLM Factory for consistent model selection across V1/V2.
 
         Args:
-            prompt: Enhanced prompt with context
+            messages: System and user messages from _build_enhanced_prompt
             temperature: Temperature for response consistency
-            max_tokens: Maximum tokens for response
+            max_tokens: Static response budget, used until enough completion lengths are observed
+            on_skill_query: Called with each skill query parsed from the streamed response
             **kwargs: Additional LLM parameters (seed, top_p, etc.)
 
         Returns:
@@ -457,45 +460,116 @@ Please provide a comprehensive gap analysis.
         openai_client = get_llm_client(api_name="gap_analysis")
 
         try:
-            # Build messages array properly
-            messages = [{"role": "user", "content": prompt}]
-
-            # Call LLM with V2 optimized parameters - using proper method signature
-            response = await openai_client.chat_completion(
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+            prompt_version = self._load_prompt_config().version
+            on_delta = None
+            if on_skill_query is not None:
+                skill_parser = SkillQueryStreamParser()
+
+                def on_delta(delta: str):
+                    for skill in skill_parser.feed(delta):
+                        on_skill_query(skill)
+
+            if self.fanout_enabled():
+                return await self._call_llm_fanout(
+                    openai_client, messages, prompt_version, temperature, max_tokens, on_delta
+                )
 
-            # Validate response structure
-            if not response or 'choices' not in response:
-                logger.error(f"[GAP_V2] Invalid LLM response structure: {response}")
-                raise ValueError("Invalid response from LLM: missing 'choices'")
+            return await self._complete(
+                openai_client, messages, "gap_analysis", prompt_version, temperature, max_tokens, on_delta
+            )
 
-            if not response['choices'] or len(response['choices']) == 0:
-                logger.error("[GAP_V2] Empty choices in LLM response")
-                raise ValueError("Invalid response from LLM: empty choices")
+        finally:
+            # Safe close handling - check if client has close method
+            if hasattr(openai_client, 'close'):
+                await openai_client.close()
 
-            if 'message' not in response['choices'][0]:
-                logger.error(f"[GAP_V2] Missing message in choice: {response['choices'][0]}")
-                raise ValueError("Invalid response from LLM: missing message")
+    async def _call_llm_fanout(
+        self,
+        openai_client: Any,
+        messages: list[dict[str, str]],
+        prompt_version: str,
+        temperature: float,
+        max_tokens: int,
+        on_delta: Callable[[str], None] | None
+    ) -> str:
+        """
+        Generate independent response sections with parallel completions.
 
-            if 'content' not in response['choices'][0]['message']:
-                logger.error(f"[GAP_V2] Missing content in message: {response['choices'][0]['message']}")
-                raise ValueError("Invalid response from LLM: missing content")
+        Every sub-request repeats the same system and user messages, so they share
+        one cacheable prefix, and adds a short instruction naming its sections.
+        Wall-clock time follows the longest section group instead of the sum.
 
-            content = response['choices'][0]['message']['content']
-            if not content:
-                logger.error("[GAP_V2] Empty content in LLM response")
-                raise ValueError("Invalid response from LLM: empty content")
+        Returns:
+            Merged response text in the single-completion format
+        """
+        tasks = {
+            sections: asyncio.create_task(self._complete(
+                openai_client,
+                [*messages, {"role": "user", "content": section_instruction(sections)}],
+                f"gap_analysis_{group}",
+                prompt_version,
+                temperature,
+                max_tokens,
+                on_delta if "skill_development_priorities" in sections else None
+            ))
+            for group, sections in GAP_SECTION_GROUPS.items()
+        }
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
 
-            # Extract response text (following V1 pattern)
-            return content.strip()
+        return merge_gap_sections({sections: task.result() for sections, task in tasks.items()})
 
-        finally:
-            # Safe close handling - check if client has close method
-            if hasattr(openai_client, 'close'):
-                await openai_client.close()
+    async def _complete(
+        self,
+        openai_client: Any,
+        messages: list[dict[str, str]],
+        operation: str,
+        prompt_version: str,
+        temperature: float,
+        max_tokens: int,
+        on_delta: Callable[[str], None] | None
+    ) -> str:
+        """Run one completion (budgeted, continued once if truncated) and return its validated text."""
+        response = await complete_with_continuation(
+            openai_client,
+            messages,
+            operation=operation,
+            prompt_version=prompt_version,
+            max_tokens=max_tokens,
+            on_delta=on_delta,
+            temperature=temperature
+        )
+
+        # Validate response structure
+        if not response or 'choices' not in response:
+            logger.error(f"[GAP_V2] Invalid LLM response structure: {response}")
+            raise ValueError("Invalid response from LLM: missing 'choices'")
+
+        if not response['choices'] or len(response['choices']) == 0:
+            logger.error("[GAP_V2] Empty choices in LLM response")
+            raise ValueError("Invalid response from LLM: empty choices")
+
+        if 'message' not in response['choices'][0]:
+            logger.error(f"[GAP_V2] Missing message in choice: {response['choices'][0]}")
+            raise ValueError("Invalid response from LLM: missing message")
+
+        if 'content' not in response['choices'][0]['message']:
+            logger.error(f"[GAP_V2] Missing content in message: {response['choices'][0]['message']}")
+            raise ValueError("Invalid response from LLM: missing content")
+
+        content = response['choices'][0]['message']['content']
+        if not content:
+            logger.error("[GAP_V2] Empty content in LLM response")
+            raise ValueError("Invalid response from LLM: empty content")
+
+        self.track_openai_usage(response, operation, prompt_version=prompt_version)
+
+        # Extract response text (following V1 pattern)
+        return content.strip()
 
     def _parse_enhanced_response(self, response: str) -> dict[str, Any]:
         """
@@ -0,0 +1,211 @@
+"""
+Idempotency-Key support for the analysis endpoints.
+
+Bubble.io workflows retry on timeouts, and a retry that arrives after the
+first attempt finished would otherwise run the whole LLM pipeline again.
+When a request carries an ``Idempotency-Key`` header, its result is stored
+(zlib-compressed JSON) for ``IDEMPOTENCY_TTL_S``; a repeat with the same key
+gets the stored result, and a repeat that arrives while the first attempt
+is still running waits for that attempt (see ``src.core.single_flight``).
+
+Keys are scoped per operation and bound to the request's input hash: reusing
+a key for different inputs is rejected instead of returning the wrong result.
+Only successful results are stored, so a retry after an error runs again.
+
+Results are kept in the shared cache backend when one is configured
+(``CACHE_BACKEND=sqlite|redis``, so a retry routed to another worker still
+hits), otherwise in a dedicated in-process LRU of ``IDEMPOTENCY_MAX_ENTRIES``.
+Waiting for an in-progress attempt only works within one process.
+
+Environment:
+- IDEMPOTENCY_ENABLED: true | false (default: true)
+- IDEMPOTENCY_TTL_S: lifetime of a stored result (default: 3600)
+- IDEMPOTENCY_MAX_ENTRIES: in-process store size (default: 500)
+"""
+
+import json
+import logging
+import os
+import zlib
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from src.core.cache_backends import CacheBackend, InProcessBackend, get_cache_backend
+from src.core.metrics.registry import get_metrics_registry
+from src.core.single_flight import get_single_flight
+from src.services.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+_NAMESPACE = "idempotency:"
+
+_replays = get_metrics_registry().counter(
+    "idempotency_replays_total", "Requests answered from a stored result", ["operation"]
+)
+_stored = get_metrics_registry().counter(
+    "idempotency_stored_total", "Results stored under an Idempotency-Key", ["operation"]
+)
+_stored_bytes = get_metrics_registry().histogram(
+    "idempotency_stored_bytes", "Compressed size of stored results", ["operation"],
+    buckets=(1024, 4096, 16384, 65536, 262144),
+)
+
+
+class IdempotencyStore:
+    """Compressed results under (operation, Idempotency-Key) with their input hash."""
+
+    def __init__(self, backend: CacheBackend | None = None, ttl_seconds: float | None = None):
+        if backend is None:
+            backend = get_cache_backend()
+            if not backend.shared:
+                backend = InProcessBackend(max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "500")))
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds or float(os.getenv("IDEMPOTENCY_TTL_S", "3600"))
+        # Input hash of each key whose first attempt is still running
+        self._running: dict[str, str] = {}
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.getenv("IDEMPOTENCY_ENABLED", "true").lower() == "true"
+
+    async def load(self, scoped_key: str) -> dict[str, Any] | None:
+        """Stored record ({"fingerprint", "result"}), or None."""
+        data = await self.backend.aget(_NAMESPACE + scoped_key)
+        if data is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(data))
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Dropping undecodable idempotency record: {e}")
+            await self.backend.adelete(_NAMESPACE + scoped_key)
+            return None
+
+    async def save(self, operation: str, scoped_key: str, fingerprint: str, result: Any):
+        """Store a result; results that are not JSON-serializable are skipped."""
+        try:
+            payload = json.dumps(
+                {"fingerprint": fingerprint, "result": result}, ensure_ascii=False, separators=(",", ":")
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not storing {operation} result for idempotent replay: {e}")
+            return
+        data = zlib.compress(payload.encode("utf-8"), 6)
+        await self.backend.aset(_NAMESPACE + scoped_key, data, self.ttl_seconds)
+        _stored.inc(operation=operation)
+        _stored_bytes.observe(len(data), operation=operation)
+
+    async def run(
+        self,
+        operation: str,
+        idempotency_key: str,
+        fingerprint: str,
+        fn: Callable[[], Awaitable[T]],
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> T:
+        """
+        Replay, join or start the attempt identified by an Idempotency-Key.
+
+        Args:
+            operation: Operation name; keys are scoped per operation
+            idempotency_key: Client-supplied Idempotency-Key header value
+            fingerprint: Normalized input hash (see request_key)
+            fn: Runs the operation; only called when nothing is stored or running
+            is_disconnected: Polled while waiting for a running attempt
+
+        Returns:
+            The stored, shared or fresh result
+
+        Raises:
+            ValidationError: The key is too long or was used for different inputs
+        """
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters",
+                field_errors={IDEMPOTENCY_HEADER: ["too long"]},
+            )
+        scoped_key = f"{operation}:{idempotency_key}"
+
+        record = await self.load(scoped_key)
+        if record is not None:
+            self._check_fingerprint(record["fingerprint"], fingerprint)
+            _replays.inc(operation=operation)
+            logger.info(f"[Idempotency] {operation}: replaying stored result")
+            return record["result"]
+
+        flight = get_single_flight(f"{operation}_idempotency")
+        if flight.running(scoped_key):
+            self._check_fingerprint(self._running.get(scoped_key), fingerprint)
+        else:
+            self._running[scoped_key] = fingerprint
+
+        async def execute():
+            result = await fn()
+            await self.save(operation, scoped_key, fingerprint, result)
+            return result
+
+        try:
+            return await flight.do(scoped_key, execute, is_disconnected=is_disconnected)
+        finally:
+            if not flight.running(scoped_key):
+                self._running.pop(scoped_key, None)
+
+    @staticmethod
+    def _check_fingerprint(expected: str | None, actual: str):
+        if expected is not None and expected != actual:
+            raise ValidationError(
+                f"{IDEMPOTENCY_HEADER} was already used for a request with different inputs",
+                field_errors={IDEMPOTENCY_HEADER: ["reused with a different request body"]},
+            )
+
+
+_idempotency_store: IdempotencyStore | None = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Get the process-wide idempotency store."""
+    global _idempotency_store
+    if _idempotency_store is None:
+        _idempotency_store = IdempotencyStore()
+    return _idempotency_store
+
+
+def reset_idempotency_store():
+    """Forget the store (tests and cache backend changes)."""
+    global _idempotency_store
+    _idempotency_store = None
+
+
+async def run_deduplicated(
+    operation: str,
+    fingerprint: str,
+    fn: Callable[[], Awaitable[T]],
+    idempotency_key: str | None = None,
+    is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+) -> T:
+    """
+    Run an analysis once per concurrent identical request and per Idempotency-Key.
+
+    Identical inputs in flight at the same time share one execution whether or
+    not a key is given; with a key, the result is also stored for later retries.
+
+    Args:
+        operation: Operation name
+        fingerprint: Normalized input hash (see request_key)
+        fn: Runs the operation
+        idempotency_key: Idempotency-Key header value, if any
+        is_disconnected: Polled while waiting; a disconnected client stops waiting
+
+    Returns:
+        The result of fn (possibly stored or shared)
+    """
+    def shared() -> Awaitable[T]:
+        return get_single_flight(operation).do(fingerprint, fn)
+
+    if not idempotency_key or not IdempotencyStore.enabled():
+        return await get_single_flight(operation).do(fingerprint, fn, is_disconnected=is_disconnected)
+    return await get_idempotency_store().run(operation, idempotency_key, fingerprint, shared, is_disconnected)
@@ -6,12 +6,9 @@ import math
 import re
 import time
 
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-
 from src.core.config import get_settings
 from src.core.monitoring_service import monitoring_service
-from src.core.utils import stable_percentage_round
+from src.core.utils import cosine_similarity, stable_percentage_round
 from src.services.llm_factory import get_embedding_client
 from src.services.text_processing import clean_html_text
 
@@ -182,10 +179,7 @@ async def compute_similarity(
             raise ValueError(f"Expected 2 embeddings, got {len(embeddings)}")
 
         # Calculate cosine similarity
-        resume_embedding = np.array(embeddings[0]).reshape(1, -1)
-        job_embedding = np.array(embeddings[1]).reshape(1, -1)
-
-        raw_similarity = float(cosine_similarity(resume_embedding, job_embedding)[0][0])
+        raw_similarity = cosine_similarity(embeddings[0], embeddings[1])
 
         # Debug logging for consistency issue
         monitoring_service.track_event(
@@ -195,8 +189,8 @@ async def compute_similarity(
                 "job_desc_length": len(job_description),
                 "raw_similarity": raw_similarity,
                 "embedding_time_ms": round(embedding_time * 1000, 2),
-                "resume_embedding_sample": str(resume_embedding[0][:5].tolist()),  # First 5 values
-                "job_embedding_sample": str(job_embedding[0][:5].tolist())
+                "resume_embedding_sample": str(list(embeddings[0][:5])),  # First 5 values
+                "job_embedding_sample": str(list(embeddings[1][:5]))
             }
         )
 
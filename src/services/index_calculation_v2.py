@@ -9,7 +9,6 @@ Key improvements over V1:
 - Backward-compatible API interface
 """
 import asyncio
-import hashlib
 import logging
 import math
 import re
@@ -17,12 +16,13 @@ import time
 from datetime import datetime, timedelta
 from typing import Any
 
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-
+from src.core.cache_backends import get_shared_cache
 from src.core.config import get_settings
+from src.core.metrics.registry import MetricFamily, cache_metric_families, get_metrics_registry
 from src.core.monitoring_service import monitoring_service
-from src.core.utils import stable_percentage_round
+from src.core.tracing import Span, span, start_trace
+from src.core.utils import cosine_similarity, stable_percentage_round
+from src.services.analyzed_text import as_analyzed_text
 from src.services.base import BaseService
 from src.services.exceptions import ServiceError
 from src.services.llm_factory import get_embedding_client
@@ -32,7 +32,6 @@ from src.services.openai_client import (
     AzureOpenAIRateLimitError,
     AzureOpenAIServerError,
 )
-from src.services.text_processing import clean_html_text
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +89,9 @@ class IndexCalculationServiceV2(BaseService):
         # Cache storage with LRU eviction
         self._cache: dict[str, CacheEntry] = {}
         self._cache_access_order: list[str] = []  # For LRU tracking
+        # Second tier shared between workers (None unless CACHE_BACKEND is sqlite/redis);
+        # embeddings are stored there as raw float32
+        self._shared_cache = get_shared_cache("index_embedding", cache_ttl_minutes * 60) if enable_cache else None
 
         # Service statistics
         self.calculation_stats = {
@@ -224,19 +226,15 @@ class IndexCalculationServiceV2(BaseService):
         Returns:
             SHA256 hash as cache key
         """
-        # Normalize text for consistent caching
-        normalized_text = self._normalize_text(text)
-        cache_input = f"{cache_type}:{normalized_text}"
-        return hashlib.sha256(cache_input.encode('utf-8')).hexdigest()
+        # Normalized text and key are memoized on the request-scoped AnalyzedText
+        return as_analyzed_text(text).cache_key(cache_type)
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text for consistent cache keys."""
         # Clean HTML and normalize whitespace
-        cleaned = clean_html_text(text)
-        normalized = re.sub(r'\s+', ' ', cleaned.strip().lower())
-        return normalized
+        return as_analyzed_text(text).normalized_text
 
-    def _get_cached_result(self, cache_key: str) -> Any | None:
+    async def _get_cached_result(self, cache_key: str) -> Any | None:
         """
         Get cached result if available and not expired.
 
@@ -246,16 +244,19 @@ class IndexCalculationServiceV2(BaseService):
         Returns:
             Cached result or None if not found/expired
         """
-        if not self.enable_cache or cache_key not in self._cache:
+        if not self.enable_cache:
             return None
 
-        entry = self._cache[cache_key]
+        entry = self._cache.get(cache_key)
 
         # Check expiration
-        if entry.is_expired():
+        if entry is not None and entry.is_expired():
             self._remove_from_cache(cache_key)
             self._cache_stats["evictions"] += 1
-            return None
+            entry = None
+
+        if entry is None:
+            return await self._get_shared_result(cache_key)
 
         # Update LRU order
         self._update_cache_access(cache_key)
@@ -264,7 +265,19 @@ class IndexCalculationServiceV2(BaseService):
 
         return entry.value
 
-    def _cache_result(self, cache_key: str, result: Any):
+    async def _get_shared_result(self, cache_key: str) -> Any | None:
+        """Look up a local miss in the shared cache tier, keeping a local copy on a hit."""
+        if self._shared_cache is None:
+            return None
+        value = await self._shared_cache.aget(cache_key)
+        if value is None:
+            return None
+        self._store_local(cache_key, value)
+        self._cache_stats["hits"] += 1
+        self.calculation_stats["cache_hits"] += 1
+        return value
+
+    async def _cache_result(self, cache_key: str, result: Any):
         """
         Cache result with LRU eviction policy.
 
@@ -275,6 +288,12 @@ class IndexCalculationServiceV2(BaseService):
         if not self.enable_cache:
             return
 
+        self._store_local(cache_key, result)
+        if self._shared_cache is not None:
+            await self._shared_cache.aset(cache_key, result)
+
+    def _store_local(self, cache_key: str, result: Any):
+        """Store result in the in-process LRU cache."""
         # Check cache size and evict if necessary
         if len(self._cache) >= self.cache_max_size:
             self._evict_lru()
@@ -340,7 +359,7 @@ class IndexCalculationServiceV2(BaseService):
         cache_key = self._generate_cache_key(text, "embedding")
 
         # Try cache first
-        cached_embedding = self._get_cached_result(cache_key)
+        cached_embedding = await self._get_cached_result(cache_key)
         if cached_embedding is not None:
             return cached_embedding
 
@@ -377,7 +396,7 @@ class IndexCalculationServiceV2(BaseService):
             raise ServiceError(f"Failed to create embeddings: {e}") from e
 
         # Cache the result
-        self._cache_result(cache_key, embedding)
+        await self._cache_result(cache_key, embedding)
 
         return embedding
 
@@ -443,10 +462,7 @@ class IndexCalculationServiceV2(BaseService):
             Tuple of (raw_similarity_percentage, transformed_similarity_percentage)
         """
         # Calculate cosine similarity
-        resume_vec = np.array(resume_embedding).reshape(1, -1)
-        job_vec = np.array(job_embedding).reshape(1, -1)
-
-        raw_similarity = float(cosine_similarity(resume_vec, job_vec)[0][0])
+        raw_similarity = cosine_similarity(resume_embedding, job_embedding)
 
         # Apply sigmoid transformation
         settings = get_settings()
@@ -499,8 +515,9 @@ class IndexCalculationServiceV2(BaseService):
         Returns:
             Dictionary containing coverage analysis
         """
-        # Clean HTML if present
-        resume_text = clean_html_text(resume_text)
+        # Clean HTML if present (memoized when an AnalyzedText is passed)
+        resume_doc = as_analyzed_text(resume_text)
+        resume_text = resume_doc.clean_text
 
         # Handle empty inputs
         if not keywords or not resume_text:
@@ -520,7 +537,7 @@ class IndexCalculationServiceV2(BaseService):
 
         # Prepare resume text for matching
         resume_search_text = (
-            resume_text.lower()
+            resume_doc.lower_text
             if not settings.keyword_match_case_sensitive
             else resume_text
         )
@@ -592,91 +609,81 @@ class IndexCalculationServiceV2(BaseService):
         Returns:
             Dictionary containing calculation results
         """
+        # Nests under the caller's trace (e.g. combined analysis) when one is active
+        with start_trace("calculate_index") as root:
+            return await self._calculate_index(root, resume, job_description, keywords, include_timing)
+
+    async def _calculate_index(
+        self,
+        root: Span,
+        resume: str,
+        job_description: str,
+        keywords: list[str] | str,
+        include_timing: bool
+    ) -> dict[str, Any]:
+        """Run the index calculation phases in spans under ``root``."""
         start_time = time.time()
-        timing_breakdown = {}
 
         # Track cache hits for this specific request
         initial_cache_hits = self._cache_stats["hits"]
 
         try:
-            # Track timing for validation
-            validation_start = time.time()
-
             # Validate inputs first
-            # Check for empty inputs
-            if not resume or not isinstance(resume, str):
-                raise ValueError("Resume must be a non-empty string")
+            with span("validation"):
+                # Check for empty inputs
+                if not resume or not isinstance(resume, str):
+                    raise ValueError("Resume must be a non-empty string")
 
-            if not job_description or not isinstance(job_description, str):
-                raise ValueError("Job description must be a non-empty string")
+                if not job_description or not isinstance(job_description, str):
+                    raise ValueError("Job description must be a non-empty string")
 
-            if not keywords:
-                raise ValueError("Keywords must be provided")
+                if not keywords:
+                    raise ValueError("Keywords must be provided")
 
-            # Validate text lengths
-            resume_length = len(resume)
-            jd_length = len(job_description)
-            total_length = resume_length + jd_length
+                # Validate text lengths
+                resume_length = len(resume)
+                jd_length = len(job_description)
+                total_length = resume_length + jd_length
 
-            # Check minimum length
-            if total_length < 100:
-                raise ValueError("Combined resume and job description text is too short (minimum 100 characters)")
+                # Check minimum length
+                if total_length < 100:
+                    raise ValueError("Combined resume and job description text is too short (minimum 100 characters)")
 
-            # Check individual minimum lengths
-            if resume_length < 10:
-                raise ValueError("Resume is too short (minimum 10 characters)")
+                # Check individual minimum lengths
+                if resume_length < 10:
+                    raise ValueError("Resume is too short (minimum 10 characters)")
 
-            if jd_length < 10:
-                raise ValueError("Job description is too short (minimum 10 characters)")
+                if jd_length < 10:
+                    raise ValueError("Job description is too short (minimum 10 characters)")
 
-            # Check maximum lengths (500KB limit)
-            max_length = 500 * 1024  # 500KB
-            if resume_length > max_length:
-                raise ValueError(f"Resume is too long (maximum {max_length} characters)")
+                # Check maximum lengths (500KB limit)
+                max_length = 500 * 1024  # 500KB
+                if resume_length > max_length:
+                    raise ValueError(f"Resume is too long (maximum {max_length} characters)")
 
-            if jd_length > max_length:
-                raise ValueError(f"Job description is too long (maximum {max_length} characters)")
-
-            if include_timing:
-                timing_breakdown["validation_ms"] = round(
-                    (time.time() - validation_start) * 1000, 2
-                )
+                if jd_length > max_length:
+                    raise ValueError(f"Job description is too long (maximum {max_length} characters)")
 
             # Parallel processing phase
-            parallel_start = time.time()
-
-            # Compute embeddings (method handles parallel vs sequential internally)
-            resume_embedding, job_embedding = await self._compute_embeddings_parallel(
-                resume, job_description
-            )
-
-            # Analyze keyword coverage synchronously (it's fast)
-            keyword_coverage = self._analyze_keyword_coverage(resume, keywords)
-
-            if include_timing:
-                timing_breakdown["embedding_generation_ms"] = round(
-                    (time.time() - parallel_start) * 1000, 2
+            with span("embedding_generation"):
+                # Compute embeddings (method handles parallel vs sequential internally)
+                resume_embedding, job_embedding = await self._compute_embeddings_parallel(
+                    resume, job_description
                 )
 
-            # Calculate similarity (depends on embeddings)
-            similarity_start = time.time()
-            raw_similarity, transformed_similarity = self._calculate_similarity(
-                resume_embedding, job_embedding
-            )
+                # Analyze keyword coverage synchronously (it's fast)
+                keyword_coverage = self._analyze_keyword_coverage(resume, keywords)
 
-            if include_timing:
-                timing_breakdown["similarity_calculation_ms"] = round(
-                    (time.time() - similarity_start) * 1000, 2
+            # Calculate similarity (depends on embeddings)
+            with span("similarity_calculation"):
+                raw_similarity, transformed_similarity = self._calculate_similarity(
+                    resume_embedding, job_embedding
                 )
-                timing_breakdown["keyword_analysis_ms"] = 0  # Included in parallel phase
 
             # Calculate total processing time
             total_time = time.time() - start_time
             processing_time_ms = round(total_time * 1000, 2)
 
-            if include_timing:
-                timing_breakdown["total_ms"] = processing_time_ms
-
             # Update statistics
             self._update_calculation_stats(
                 processing_time_ms,
@@ -711,7 +718,13 @@ class IndexCalculationServiceV2(BaseService):
 
             # Add timing breakdown only in development or if requested
             if include_timing:
-                result["timing_breakdown"] = timing_breakdown
+                result["timing_breakdown"] = {
+                    "validation_ms": root.duration_ms("validation"),
+                    "embedding_generation_ms": root.duration_ms("embedding_generation"),
+                    "similarity_calculation_ms": root.duration_ms("similarity_calculation"),
+                    "keyword_analysis_ms": 0,  # Included in parallel phase
+                    "total_ms": processing_time_ms
+                }
             else:
                 result["timing_breakdown"] = {}  # Always include for Bubble.io compatibility
 
@@ -803,12 +816,25 @@ class IndexCalculationServiceV2(BaseService):
             }
         }
 
+    def collect_metrics(self) -> list[MetricFamily]:
+        """Cache and calculation counters for the metric registry."""
+        return [
+            *cache_metric_families(
+                "index_calculation", self._cache_stats["hits"], self._cache_stats["misses"], self._cache_stats["size"]
+            ),
+            MetricFamily("index_calculations_total", "counter", "Index calculations by outcome")
+            .add(self.calculation_stats["total_calculations"], outcome="total")
+            .add(self.calculation_stats["error_count"], outcome="error"),
+        ]
+
     def clear_cache(self):
         """Clear all cached results."""
         cache_size = len(self._cache)
         self._cache.clear()
         self._cache_access_order.clear()
         self._cache_stats["size"] = 0
+        if self._shared_cache is not None:
+            self._shared_cache.clear()
         self.logger.info(f"Cleared cache of {cache_size} entries")
 
     def get_cache_info(self) -> dict[str, Any]:
@@ -851,6 +877,9 @@ def get_index_calculation_service_v2() -> IndexCalculationServiceV2:
     global _index_calculation_service_v2
     if _index_calculation_service_v2 is None:
         _index_calculation_service_v2 = IndexCalculationServiceV2()
+        get_metrics_registry().register_collector(
+            "index_calculation", _index_calculation_service_v2.collect_metrics
+        )
     return _index_calculation_service_v2
 
 def reset_index_calculation_service_v2():
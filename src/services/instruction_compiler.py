@@ -10,6 +10,7 @@ import logging
 import time
 from typing import Any
 
+from src.core.simple_prompt_manager import CompiledTemplate
 from src.services.llm_factory import get_llm_client
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,10 @@ class InstructionCompiler:
         # Use gpt41-mini for fast, lightweight processing
         self.llm_client = get_llm_client(api_name="instruction_compiler")
         self.prompt_version = "v1.0.0"
+        # Compiled once; rendering is a single pass per request
+        self.prompt_template = {
+            role: CompiledTemplate.compile(text) for role, text in self._load_prompt_template().items()
+        }
         logger.info("InstructionCompiler initialized with GPT-4.1 mini")
 
     async def compile_instructions(
@@ -51,9 +56,6 @@ class InstructionCompiler:
         """
         start_time = time.time()
         try:
-            # Load the instruction compiler prompt directly
-            prompt_template = self._load_prompt_template()
-
             # Extract only needed gap analysis components for simplified analysis
             key_gaps = gap_analysis.get("KeyGaps", "")
             quick_improvements = gap_analysis.get("QuickImprovements", "")
@@ -69,8 +71,8 @@ class InstructionCompiler:
             logger.info("Compiling optimization instructions with GPT-4.1 mini")
 
             messages = [
-                {"role": "system", "content": prompt_template["system"]},
-                {"role": "user", "content": prompt_template["user"].format(**prompt_vars)},
+                {"role": "system", "content": self.prompt_template["system"].source},
+                {"role": "user", "content": self.prompt_template["user"].render(prompt_vars)},
             ]
 
             # Track LLM call time
@@ -0,0 +1,378 @@
+"""
+Asynchronous jobs for long-running analyses.
+
+``/tailor-resume`` and ``/index-cal-and-gap-analysis`` keep the HTTP
+connection open for the whole multi-LLM run, which ties up ingress
+connections and runs into platform timeouts during bursts. The job API
+(``src.api.v1.jobs``) instead submits the same work to a bounded in-process
+queue, returns a job id at once, and lets the client poll (or receive a
+webhook) for the result.
+
+- ``JobQueue``: ``asyncio.Queue`` of at most ``JOB_QUEUE_MAX_SIZE`` waiting
+  jobs drained by ``JOB_WORKER_CONCURRENCY`` worker tasks. A full queue
+  rejects new jobs with 503 instead of growing without bound.
+- ``JobStore``: job records on a cache backend (``src.core.cache_backends``).
+  With ``sqlite`` or ``redis`` the records are persistent and shared, so a
+  poll can land on any worker; with ``memory`` only the submitting worker
+  knows the job.
+- ``report_job_progress``: services publish partial results (e.g. the index
+  calculation before the gap analysis finishes) to the job that runs them;
+  outside a job it does nothing.
+
+A job runs in the worker that accepted it. Jobs still queued or running at
+shutdown are marked failed so that pollers do not wait forever.
+
+Environment:
+- JOB_QUEUE_MAX_SIZE: waiting jobs per worker process (default: 100)
+- JOB_WORKER_CONCURRENCY: jobs running at once per worker process (default: 4)
+- JOB_STORE_BACKEND: memory | sqlite | redis (default: the shared CACHE_BACKEND, else memory)
+- JOB_STORE_MAX_ENTRIES: in-process store size (default: 1000)
+- JOB_TTL_S: lifetime of a job record (default: 86400)
+- JOB_WEBHOOK_TIMEOUT_S: webhook request timeout (default: 10)
+- JOB_WEBHOOK_ALLOWED_HOSTS: comma-separated webhook hosts (default: any public host)
+- JOB_WEBHOOK_ALLOW_PRIVATE: allow webhook hosts that resolve to private,
+  loopback, link-local or reserved addresses (default: false)
+"""
+
+import asyncio
+import contextvars
+import ipaddress
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+
+from src.constants.error_codes import ErrorCodes
+from src.core.cache_backends import (
+    CacheBackend,
+    CacheNamespace,
+    InProcessBackend,
+    create_cache_backend,
+    get_cache_backend,
+)
+from src.core.metrics.registry import get_metrics_registry
+from src.services.exceptions import ServiceError, ValidationError
+
+logger = logging.getLogger(__name__)
+
+# A runner returns the HTTP status code and JSON body the synchronous endpoint would have sent
+JobRunner = Callable[[], Awaitable[tuple[int, dict[str, Any]]]]
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+WEBHOOK_ATTEMPTS = 3
+
+_current_job: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_job", default=None)
+
+_jobs = get_metrics_registry().counter("jobs_total", "Finished jobs", ["kind", "status"])
+_rejected = get_metrics_registry().counter("jobs_rejected_total", "Jobs rejected by a full queue", ["kind"])
+_queue_depth = get_metrics_registry().gauge("job_queue_depth", "Jobs waiting for a worker")
+_queue_wait = get_metrics_registry().histogram(
+    "job_queue_wait_seconds", "Time from submission to start", ["kind"],
+    buckets=(0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+_webhook_failures = get_metrics_registry().counter(
+    "job_webhook_failures_total", "Webhook callbacks that failed after all attempts", ["kind"]
+)
+
+
+def public_view(record: dict[str, Any]) -> dict[str, Any]:
+    """Job record as returned to clients (without the callback URL)."""
+    return {key: value for key, value in record.items() if key != "webhook_url"}
+
+
+async def _resolve(host: str, port: int) -> list[str]:
+    """IP addresses a webhook host resolves to."""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def validate_webhook_url(url: str):
+    """
+    Check a client-supplied callback URL.
+
+    The host must resolve, and unless JOB_WEBHOOK_ALLOW_PRIVATE is set, every
+    address it resolves to must be public, so that callbacks cannot reach
+    internal services or the cloud metadata endpoint.
+
+    Raises:
+        ValidationError: Not an http(s) URL, or its host is not allowed
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValidationError("webhook_url must be an http(s) URL", field_errors={"webhook_url": ["invalid URL"]})
+    host = parsed.hostname.lower()
+    allowed = [name.strip().lower() for name in os.getenv("JOB_WEBHOOK_ALLOWED_HOSTS", "").split(",") if name.strip()]
+    if allowed and host not in allowed:
+        raise ValidationError(
+            f"webhook_url host {host} is not allowed", field_errors={"webhook_url": ["host not allowed"]}
+        )
+    if os.getenv("JOB_WEBHOOK_ALLOW_PRIVATE", "false").lower() == "true":
+        return
+
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        addresses = await _resolve(host, port)
+    except (OSError, ValueError) as e:
+        raise ValidationError(
+            f"webhook_url host {host} cannot be resolved", field_errors={"webhook_url": ["host not resolvable"]}
+        ) from e
+    if not addresses or not all(_is_public(address) for address in addresses):
+        raise ValidationError(
+            f"webhook_url host {host} is not a public address",
+            field_errors={"webhook_url": ["host not allowed"]},
+        )
+
+
+class JobStore:
+    """Job records on a cache backend, keyed by job id."""
+
+    def __init__(self, backend: CacheBackend | None = None, ttl_seconds: float | None = None):
+        if backend is None:
+            backend = self._backend_from_env()
+        self.ttl_seconds = ttl_seconds or float(os.getenv("JOB_TTL_S", "86400"))
+        self._records = CacheNamespace(backend, "job", self.ttl_seconds)
+
+    @staticmethod
+    def _backend_from_env() -> CacheBackend:
+        kind = os.getenv("JOB_STORE_BACKEND", "").lower()
+        if kind and kind != "memory":
+            return create_cache_backend(kind)
+        if not kind and get_cache_backend().shared:
+            return get_cache_backend()
+        return InProcessBackend(max_entries=int(os.getenv("JOB_STORE_MAX_ENTRIES", "1000")))
+
+    @property
+    def backend(self) -> CacheBackend:
+        return self._records.backend
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        return await self._records.aget(job_id)
+
+    async def put(self, record: dict[str, Any]):
+        await self._records.aset(record["job_id"], record)
+
+    async def update(self, job_id: str, **fields: Any) -> dict[str, Any] | None:
+        """Merge fields into a record; returns the updated record, or None if it expired."""
+        record = await self.get(job_id)
+        if record is None:
+            return None
+        record.update(fields, updated_at=time.time())
+        await self.put(record)
+        return record
+
+
+class JobQueue:
+    """Bounded queue of analysis jobs with a fixed number of worker tasks."""
+
+    def __init__(
+        self,
+        store: JobStore | None = None,
+        max_queued: int | None = None,
+        concurrency: int | None = None,
+    ):
+        self.store = store or JobStore()
+        self.max_queued = max_queued or int(os.getenv("JOB_QUEUE_MAX_SIZE", "100"))
+        self.concurrency = concurrency or int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+        # Created on first submit so that they belong to the serving event loop
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._active: set[str] = set()
+        # Queue slots held by submissions whose record is still being stored
+        self._reserved = 0
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queued)
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.concurrency)
+            ]
+
+    async def submit(self, kind: str, runner: JobRunner, webhook_url: str | None = None) -> dict[str, Any]:
+        """
+        Queue a job.
+
+        Args:
+            kind: Job type (the endpoint it replaces)
+            runner: Produces the endpoint's status code and response body
+            webhook_url: Receives the finished job record as a POST, if given
+
+        Returns:
+            The new job record
+
+        Raises:
+            ValidationError: Invalid webhook_url
+            ServiceError: The queue is full (503)
+        """
+        if webhook_url:
+            await validate_webhook_url(webhook_url)
+        self._ensure_workers()
+        if self._queue.qsize() + self._reserved >= self.max_queued:
+            _rejected.inc(kind=kind)
+            raise ServiceError(
+                "Job queue is full, retry later", error_code=ErrorCodes.SERVICE_UNAVAILABLE, status_code=503
+            )
+
+        now = time.time()
+        record = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": JOB_QUEUED,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "finished_at": None,
+            "partial": {},
+            "status_code": None,
+            "result": None,
+            "webhook_url": webhook_url,
+        }
+        # Hold a slot while the record is stored, so the job can always be enqueued
+        # afterwards and no record is left behind for a rejected submission
+        self._reserved += 1
+        try:
+            await self.store.put(record)
+        finally:
+            self._reserved -= 1
+        self._queue.put_nowait((record["job_id"], kind, runner, now))
+        self._active.add(record["job_id"])
+        _queue_depth.set(self._queue.qsize())
+        return record
+
+    async def _worker(self):
+        while True:
+            job_id, kind, runner, submitted_at = await self._queue.get()
+            _queue_depth.set(self._queue.qsize())
+            try:
+                _queue_wait.observe(time.time() - submitted_at, kind=kind)
+                await self._run(job_id, kind, runner)
+            except Exception as e:
+                logger.error(f"[Jobs] Worker error on job {job_id}: {e}", exc_info=True)
+            # A cancelled worker leaves its job active for shutdown() to mark failed
+            self._active.discard(job_id)
+            self._queue.task_done()
+
+    async def _run(self, job_id: str, kind: str, runner: JobRunner):
+        await self.store.update(job_id, status=JOB_RUNNING, started_at=time.time())
+        token = _current_job.set(job_id)
+        try:
+            status_code, body = await runner()
+        except Exception as e:
+            logger.error(f"[Jobs] {kind} job {job_id} failed: {e}", exc_info=True)
+            status_code, body = 500, {
+                "success": False,
+                "error": {"code": ErrorCodes.SYSTEM_INTERNAL_ERROR, "message": "Job failed", "details": str(e)},
+            }
+        finally:
+            _current_job.reset(token)
+
+        status = JOB_SUCCEEDED if status_code < 400 else JOB_FAILED
+        _jobs.inc(kind=kind, status=status)
+        record = await self.store.update(
+            job_id, status=status, status_code=status_code, result=body, finished_at=time.time()
+        )
+        if record is not None and record.get("webhook_url"):
+            await self._notify(record)
+
+    async def _notify(self, record: dict[str, Any]):
+        """POST the finished job to its webhook, retrying transient failures."""
+        try:
+            # The host may resolve differently by the time the job finishes
+            await validate_webhook_url(record["webhook_url"])
+        except ValidationError as e:
+            _webhook_failures.inc(kind=record["kind"])
+            logger.warning(f"[Jobs] Webhook for job {record['job_id']} rejected: {e}")
+            return
+        timeout = float(os.getenv("JOB_WEBHOOK_TIMEOUT_S", "10"))
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            for attempt in range(WEBHOOK_ATTEMPTS):
+                try:
+                    response = await client.post(record["webhook_url"], json=public_view(record))
+                    if response.status_code < 500:
+                        return
+                    error = f"HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    error = str(e) or type(e).__name__
+                if attempt < WEBHOOK_ATTEMPTS - 1:
+                    await asyncio.sleep(2 ** attempt)
+        _webhook_failures.inc(kind=record["kind"])
+        logger.warning(f"[Jobs] Webhook for job {record['job_id']} failed: {error}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queued": self.max_queued,
+            "concurrency": self.concurrency,
+            "active": len(self._active),
+        }
+
+    async def shutdown(self):
+        """Stop the workers and fail the jobs they can no longer finish."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for job_id in list(self._active):
+            await self.store.update(
+                job_id, status=JOB_FAILED, finished_at=time.time(),
+                result={"success": False, "error": {
+                    "code": ErrorCodes.SERVICE_UNAVAILABLE, "message": "Job interrupted by server shutdown"
+                }},
+            )
+        self._active.clear()
+
+
+async def report_job_progress(stage: str, data: Any):
+    """
+    Publish a partial result to the job running the current task, if any.
+
+    Args:
+        stage: Name of the finished stage (e.g. "index_calculation")
+        data: JSON-serializable stage result
+    """
+    job_id = _current_job.get()
+    if job_id is None or _job_queue is None:
+        return
+    record = await _job_queue.store.get(job_id)
+    if record is None:
+        return
+    # Stage results may carry numpy scalars; the record must stay JSON
+    record["partial"][stage] = json.loads(json.dumps(data, default=str))
+    await _job_queue.store.update(job_id, partial=record["partial"])
+
+
+_job_queue: JobQueue | None = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
+
+
+async def shutdown_job_queue():
+    """Stop the process-wide job queue if it was created."""
+    global _job_queue
+    if _job_queue is not None:
+        await _job_queue.shutdown()
+        _job_queue = None
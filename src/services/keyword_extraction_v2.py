@@ -9,6 +9,7 @@ import time
 from datetime import datetime, timedelta
 from typing import Any, ClassVar
 
+from src.core.cache_backends import get_shared_cache
 from src.core.metrics.cache_metrics import cache_metrics
 from src.models.keyword_extraction import KeywordExtractionRequest, StandardizedTerm
 from src.models.prompt_config import LLMConfig
@@ -29,6 +30,7 @@ from src.services.openai_client import (
     AzureOpenAIError,
 )
 from src.services.standardization import MultilingualStandardizer
+from src.services.token_budget import compact_inputs, count_tokens
 from src.services.unified_prompt_service import get_unified_prompt_service
 
 
@@ -107,6 +109,8 @@ class KeywordExtractionServiceV2(BaseService):
 
         # Cache storage
         self._cache = {}
+        # Second tier shared between workers (None unless CACHE_BACKEND is sqlite/redis)
+        self._shared_cache = get_shared_cache("keyword_extraction", cache_ttl_minutes * 60) if enable_cache else None
         self._cache_hits = 0
         self._cache_misses = 0
 
@@ -153,22 +157,26 @@ class KeywordExtractionServiceV2(BaseService):
         )
         return hashlib.sha256(cache_input.encode('utf-8')).hexdigest()
 
-    def _get_cached_result(self, cache_key: str) -> dict[str, Any] | None:
+    async def _get_cached_result(self, cache_key: str) -> dict[str, Any] | None:
         """Get cached result if available."""
-        if not self.enable_cache or cache_key not in self._cache:
+        if not self.enable_cache:
             return None
 
-        cached_entry = self._cache[cache_key]
-        cached_time = cached_entry['timestamp']
-
-        expiry_time = cached_time + timedelta(minutes=self.cache_ttl_minutes)
-        if datetime.utcnow() > expiry_time:
+        cached_entry = self._cache.get(cache_key)
+        if cached_entry is not None:
+            expiry_time = cached_entry['timestamp'] + timedelta(minutes=self.cache_ttl_minutes)
+            if datetime.utcnow() <= expiry_time:
+                return cached_entry['result']
             del self._cache[cache_key]
-            return None
 
-        return cached_entry['result']
+        if self._shared_cache is None:
+            return None
+        result = await self._shared_cache.aget(cache_key)
+        if result is not None:
+            self._cache[cache_key] = {'result': result, 'timestamp': datetime.utcnow()}
+        return result
 
-    def _cache_result(self, cache_key: str, result: dict[str, Any]):
+    async def _cache_result(self, cache_key: str, result: dict[str, Any]):
         """Cache the extraction result."""
         if not self.enable_cache:
             return
@@ -177,6 +185,8 @@ class KeywordExtractionServiceV2(BaseService):
             'result': result.copy(),
             'timestamp': datetime.utcnow()
         }
+        if self._shared_cache is not None:
+            await self._shared_cache.aset(cache_key, result)
 
         if len(self._cache) % 100 == 0:
             self._cleanup_expired_cache()
@@ -232,7 +242,7 @@ class KeywordExtractionServiceV2(BaseService):
             )
 
             cache_start = time.time()
-            cached_result = self._get_cached_result(cache_key)
+            cached_result = await self._get_cached_result(cache_key)
             cache_retrieval_time = (time.time() - cache_start) * 1000
 
             if cached_result is not None:
@@ -253,8 +263,7 @@ class KeywordExtractionServiceV2(BaseService):
                     processing_time_ms=cache_retrieval_time,
                     model="gpt-4o-2",
                     actual_tokens={
-                        "input": len(job_description) // 4,  # Rough estimate: 1 token
-                        # per 4 chars
+                        "input": count_tokens(job_description),
                         "output": len(str(cached_result.get('keywords', []))) // 4
                     }
                 )
@@ -295,7 +304,7 @@ class KeywordExtractionServiceV2(BaseService):
             }
 
             # 5. Cache result
-            self._cache_result(cache_key, result)
+            await self._cache_result(cache_key, result)
 
             # Track actual OpenAI API token usage for cache miss
             if 'llm_config_used' in extraction_result:
@@ -307,7 +316,7 @@ class KeywordExtractionServiceV2(BaseService):
                     processing_time_ms=processing_time,
                     model="gpt-4o-2",
                     actual_tokens={
-                        "input": len(job_description) // 4 + 200,  # JD + prompt
+                        "input": count_tokens(job_description) + 200,  # JD + prompt
                         # template
                         "output": result.get('keyword_count', 0) * 10  # Estimate per
                         # keyword
@@ -515,6 +524,10 @@ class KeywordExtractionServiceV2(BaseService):
         This is the key difference - all LLM parameters come from YAML!
         """
         # 1. Get prompt and LLM config from UnifiedPromptService
+        # Drop JD boilerplate (EEO, benefits) and fit the input token budget
+        job_description = compact_inputs("keyword_extraction", job_description=job_description).texts[
+            "job_description"
+        ]
         try:
             formatted_prompt, llm_config = (
                 self.unified_prompt_service.get_prompt_with_config(
@@ -778,6 +791,8 @@ class KeywordExtractionServiceV2(BaseService):
         """Clear all cached results."""
         cache_size = len(self._cache)
         self._cache.clear()
+        if self._shared_cache is not None:
+            self._shared_cache.clear()
         self.logger.info(f"Cleared cache of {cache_size} entries")
 
     def get_cache_info(self) -> dict[str, Any]:
@@ -3,15 +3,14 @@ Keyword Standardization Service
 
 This module provides keyword standardization functionality using both
 dictionary mapping and pattern-based rules to normalize technical terms.
-All mappings are loaded from external YAML files for easy maintenance.
+All mappings are loaded from external YAML files for easy maintenance,
+served from the compiled dictionary snapshot when it is up to date.
 """
 
 import logging
 import re
 from pathlib import Path
 
-import yaml
-
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +49,22 @@ class KeywordStandardizer:
             f"dictionary entries and {len(self.patterns)} patterns from {self.data_dir}"
         )
 
+    @staticmethod
+    def _read_source(filepath: Path):
+        """
+        Read a parsed YAML source, using the dictionary snapshot when it is fresh.
+
+        Args:
+            filepath: Path of the YAML file
+
+        Returns:
+            Parsed YAML content
+        """
+        # Imported lazily: the standardization package imports this module
+        from src.services.standardization.snapshot import load_source_file
+
+        return load_source_file(filepath)
+
     def _load_yaml_dictionary(self, filename: str) -> dict[str, str]:
         """
         Load a dictionary from a YAML file.
@@ -60,11 +75,12 @@ class KeywordStandardizer:
         Returns:
             Dictionary mapping original terms to standardized terms
         """
+        import yaml
+
         filepath = self.data_dir / filename
 
         try:
-            with open(filepath, encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            data = self._read_source(filepath)
 
             # Flatten the nested structure
             dictionary = {}
@@ -98,12 +114,13 @@ class KeywordStandardizer:
         Returns:
             List of (compiled_pattern, replacement, pattern_type) tuples
         """
+        import yaml
+
         filepath = self.data_dir / filename
         patterns = []
 
         try:
-            with open(filepath, encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            data = self._read_source(filepath)
 
             if isinstance(data, dict):
                 for _category, pattern_list in data.items():
@@ -8,6 +8,7 @@ import logging
 from pathlib import Path
 from typing import Any, ClassVar, NamedTuple
 
+from src.core.simple_prompt_manager import get_prompt_manager
 from src.services.exceptions import PromptNotAvailableError
 
 logger = logging.getLogger(__name__)
@@ -425,18 +426,15 @@ Return only JSON with exactly 25 keywords: {{"keywords": ["Term1", "Term2", ...,
             PromptConfig if file exists and is valid, None otherwise
         """
         try:
-            # First try YAML format (preferred)
+            # First try YAML format (preferred), from the shared compiled registry
             yaml_file = Path(self.prompt_base_path) / "keyword_extraction" / f"v{version}-{language}.yaml"
 
             if yaml_file.exists():
-                import yaml
-                with open(yaml_file, encoding='utf-8') as f:
-                    prompt_data = yaml.safe_load(f)
-
-                # Extract system and user prompts
-                prompts = prompt_data.get('prompts', {})
-                system_prompt = prompts.get('system', '')
-                user_prompt = prompts.get('user', '')
+                prompt_data = get_prompt_manager(self.prompt_base_path).load_prompt_config_by_filename(
+                    "keyword_extraction", yaml_file.name
+                )
+                system_prompt = prompt_data.get_system_prompt()
+                user_prompt = prompt_data.get_user_prompt()
 
                 # Combine prompts for compatibility
                 full_prompt = f"{system_prompt}\n\n{user_prompt}" if system_prompt else user_prompt
@@ -445,7 +443,7 @@ Return only JSON with exactly 25 keywords: {{"keywords": ["Term1", "Term2", ...,
                     version=version,
                     language=language,
                     content=full_prompt,
-                    metadata=prompt_data.get('metadata', {})
+                    metadata=prompt_data.metadata.model_dump()
                 )
 
             # Fallback to JSON format (legacy)
@@ -0,0 +1,194 @@
+"""
+Bulk script-composition counting shared by the language detectors.
+
+Instead of walking every character in Python with chained range checks, each
+code point is mapped to a one-character class code in bulk and the classes are
+tallied in C:
+
+- Pure ASCII text goes through ``bytes.translate`` + ``bytes.count``.
+- Other text is decoded to UTF-32 code points with NumPy, mapped through a
+  lookup table covering the whole BMP, and counted with ``np.bincount``.
+"""
+
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from src.services.language_detection.detector import LanguageDetectionService
+
+# Characters skipped entirely (not counted in total_chars)
+PUNCTUATION = '.,;:!?"\'()-[]{}/@#$%^&*+=<>|\\~`_'
+SPANISH_SPECIAL = frozenset('ñÑáéíóúÁÉÍÓÚüÜ¿¡')
+
+# Exclusively simplified characters; every other CJK ideograph counts as traditional
+SIMPLIFIED_ONLY_CHARS = frozenset(
+    LanguageDetectionService.SIMPLIFIED_CHARS - LanguageDetectionService.TRADITIONAL_CHARS
+)
+
+# One-character class codes
+CLASS_TRADITIONAL = 'T'
+CLASS_SIMPLIFIED = 'S'
+CLASS_ENGLISH = 'E'
+CLASS_JAPANESE = 'J'
+CLASS_KOREAN = 'K'
+CLASS_SPANISH = 'P'
+CLASS_DIGIT = 'D'
+CLASS_OTHER_ALPHA = 'O'
+CLASS_UNCLASSIFIED = 'N'  # Counted in total_chars only (e.g. full-width punctuation)
+
+_ALL_CLASSES = (
+    CLASS_TRADITIONAL, CLASS_SIMPLIFIED, CLASS_ENGLISH, CLASS_JAPANESE, CLASS_KOREAN,
+    CLASS_SPANISH, CLASS_DIGIT, CLASS_OTHER_ALPHA, CLASS_UNCLASSIFIED,
+)
+
+# Long-text sampling: number of evenly spaced windows taken across the text
+SAMPLE_WINDOWS = 8
+
+
+class ScriptComposition(NamedTuple):
+    """Raw per-script character counts."""
+    total_chars: int
+    traditional_chinese_chars: int
+    simplified_chinese_chars: int
+    english_chars: int
+    japanese_chars: int
+    korean_chars: int
+    spanish_chars: int
+    digit_chars: int
+    other_chars: int
+
+    @property
+    def chinese_chars(self) -> int:
+        """All CJK ideographs, traditional and simplified."""
+        return self.traditional_chinese_chars + self.simplified_chinese_chars
+
+
+def classify_char(char: str) -> str:
+    """
+    Classify a single character.
+
+    Mirrors the original per-character detector logic, including check order.
+
+    Returns:
+        One-character class code, or empty string for skipped characters
+    """
+    if char.isspace() or char in PUNCTUATION:
+        return ''
+    if '\u4e00' <= char <= '\u9fff':
+        return CLASS_SIMPLIFIED if char in SIMPLIFIED_ONLY_CHARS else CLASS_TRADITIONAL
+    if char.isalpha() and ord(char) < 128:
+        return CLASS_ENGLISH
+    if '\u3040' <= char <= '\u309f' or '\u30a0' <= char <= '\u30ff':
+        return CLASS_JAPANESE
+    if '\uac00' <= char <= '\ud7af':
+        return CLASS_KOREAN
+    if char in SPANISH_SPECIAL:
+        return CLASS_SPANISH
+    if char.isdigit():
+        return CLASS_DIGIT
+    if char.isalpha():
+        return CLASS_OTHER_ALPHA
+    return CLASS_UNCLASSIFIED
+
+
+# ASCII fast path: skipped bytes are deleted, the rest map to their class code
+_ascii_delete = bytes(i for i in range(128) if not classify_char(chr(i)))
+_ascii_table = bytes(
+    ord(classify_char(chr(i)) or CLASS_UNCLASSIFIED) for i in range(128)
+) + CLASS_UNCLASSIFIED.encode('ascii') * 128
+
+# BMP lookup table (code point -> class code byte, 0 = skipped), built on first use
+_bmp_table: np.ndarray | None = None
+_bmp_table_lock = threading.Lock()
+
+
+def _get_bmp_table() -> np.ndarray:
+    """Build (once) the class lookup table for all BMP code points."""
+    global _bmp_table
+    if _bmp_table is None:
+        with _bmp_table_lock:
+            if _bmp_table is None:
+                codes = ''.join(classify_char(chr(cp)) or '\0' for cp in range(0x10000))
+                _bmp_table = np.frombuffer(codes.encode('ascii'), dtype=np.uint8)
+    return _bmp_table
+
+
+def warm_up():
+    """Precompute lookup tables so the first request does not pay for them."""
+    _get_bmp_table()
+
+
+def _count_classes(text: str) -> dict[str, int]:
+    """Count characters per class code (skipped characters excluded)."""
+    if text.isascii():
+        codes = text.encode('ascii').translate(_ascii_table, _ascii_delete)
+        counts = {cls: codes.count(cls.encode('ascii')) for cls in _ALL_CLASSES}
+        counts['total'] = len(codes)
+        return counts
+
+    codepoints = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    is_bmp = codepoints < 0x10000
+    histogram = np.bincount(_get_bmp_table()[codepoints[is_bmp]], minlength=128)
+
+    # Astral-plane characters are rare; classify each distinct one individually
+    if not is_bmp.all():
+        astral, astral_counts = np.unique(codepoints[~is_bmp], return_counts=True)
+        for cp, count in zip(astral.tolist(), astral_counts.tolist(), strict=True):
+            cls = classify_char(chr(cp))
+            if cls:
+                histogram[ord(cls)] += count
+
+    counts = {cls: int(histogram[ord(cls)]) for cls in _ALL_CLASSES}
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def _sample_text(text: str, sample_limit: int) -> str:
+    """Take evenly spaced windows totalling ``sample_limit`` characters."""
+    window = max(1, sample_limit // SAMPLE_WINDOWS)
+    stride = (len(text) - window) / (SAMPLE_WINDOWS - 1)
+    return ''.join(
+        text[int(i * stride):int(i * stride) + window]
+        for i in range(SAMPLE_WINDOWS)
+    )
+
+
+def count_script_composition(text: str, sample_limit: int | None = None) -> ScriptComposition:
+    """
+    Count characters per script class in bulk.
+
+    Args:
+        text: Text to analyze
+        sample_limit: When set and the text is longer, analyze only evenly spaced
+            windows totalling this many characters and scale counts to the full length
+
+    Returns:
+        ScriptComposition with per-class counts
+    """
+    if not text:
+        return ScriptComposition(0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    scale = 1.0
+    if sample_limit and len(text) > sample_limit:
+        sample = _sample_text(text, sample_limit)
+        scale = len(text) / len(sample)
+        text = sample
+
+    counts = _count_classes(text)
+    composition = ScriptComposition(
+        total_chars=counts['total'],
+        traditional_chinese_chars=counts[CLASS_TRADITIONAL],
+        simplified_chinese_chars=counts[CLASS_SIMPLIFIED],
+        english_chars=counts[CLASS_ENGLISH],
+        japanese_chars=counts[CLASS_JAPANESE],
+        korean_chars=counts[CLASS_KOREAN],
+        spanish_chars=counts[CLASS_SPANISH],
+        digit_chars=counts[CLASS_DIGIT],
+        other_chars=counts[CLASS_OTHER_ALPHA],
+    )
+
+    if scale != 1.0:
+        composition = ScriptComposition(*(round(count * scale) for count in composition))
+
+    return composition
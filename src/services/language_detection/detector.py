@@ -48,6 +48,8 @@ class LanguageDetectionService:
     SUPPORTED_LANGUAGES: ClassVar[list] = ['en', 'zh-TW']
     CONFIDENCE_THRESHOLD = 0.8
     MIN_TEXT_LENGTH = 200
+    # Analyze at most this many characters (evenly sampled) for composition stats; None = exact
+    COMPOSITION_SAMPLE_LIMIT: ClassVar[int | None] = None
 
     # Comprehensive Traditional vs Simplified Chinese character sets for accurate differentiation
     # These sets focus on the most distinguishing characters commonly found in job descriptions
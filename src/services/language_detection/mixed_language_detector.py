@@ -15,6 +15,7 @@ from src.services.exceptions import (
     LowConfidenceDetectionError,
     UnsupportedLanguageError,
 )
+from src.services.language_detection.composition import count_script_composition
 from src.services.language_detection.detector import (
     LanguageDetectionResult,
     LanguageDetectionService,
@@ -59,47 +60,14 @@ class MixedLanguageDetectionService(LanguageDetectionService):
         if not text:
             return MixedLanguageStats(0, 0, 0, 0.0, 0.0, 0, 0)
 
-        # Count only meaningful characters (exclude whitespace and punctuation)
-        total_chars = 0
-        chinese_chars = 0
-        english_chars = 0
-        traditional_chars = 0
-        simplified_chars = 0
-
-        # Define punctuation to skip
-        punctuation = '.,;:!?"\'()-[]{}/@#$%^&*+=<>|\\~`_'
-
-        for char in text:
-            # Skip whitespace and common punctuation
-            if char.isspace() or char in punctuation:
-                continue
-
-            total_chars += 1
-
-            # Check for Chinese characters
-            if '\u4e00' <= char <= '\u9fff':
-                chinese_chars += 1
-
-                if char in self.TRADITIONAL_CHARS and char not in self.SIMPLIFIED_CHARS:
-                    # Exclusively traditional character
-                    traditional_chars += 1
-                elif char in self.SIMPLIFIED_CHARS and char not in self.TRADITIONAL_CHARS:
-                    # Exclusively simplified character
-                    simplified_chars += 1
-                elif char in self.TRADITIONAL_CHARS:
-                    # Shared character - count as traditional (bias for Taiwan market)
-                    traditional_chars += 1
-                else:
-                    # Shared character not in our sets - count as traditional
-                    traditional_chars += 1
-
-            # Check for English letters
-            elif char.isalpha() and ord(char) < 128:
-                english_chars += 1
-
-            # Numbers are allowed but not counted as language-specific
-            elif char.isdigit():
-                continue
+        # Count only meaningful characters (exclude whitespace and punctuation).
+        # Shared characters count as traditional (bias for Taiwan market).
+        composition = count_script_composition(text, self.COMPOSITION_SAMPLE_LIMIT)
+        total_chars = composition.total_chars
+        chinese_chars = composition.chinese_chars
+        english_chars = composition.english_chars
+        traditional_chars = composition.traditional_chinese_chars
+        simplified_chars = composition.simplified_chinese_chars
 
         # Calculate ratios based on meaningful characters only
         chinese_ratio = chinese_chars / total_chars if total_chars > 0 else 0.0
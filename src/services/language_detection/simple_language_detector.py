@@ -12,6 +12,7 @@ from typing import NamedTuple
 from langdetect import detect, detect_langs
 
 from src.services.exceptions import LanguageDetectionError, UnsupportedLanguageError
+from src.services.language_detection.composition import count_script_composition
 from src.services.language_detection.detector import (
     LanguageDetectionResult,
     LanguageDetectionService,
@@ -70,63 +71,15 @@ class SimplifiedLanguageDetector(LanguageDetectionService):
         if not text:
             return SimpleLanguageStats(0, 0, 0, 0, 0, 0, 0, 0, 0.0, 0.0, False, False)
 
-        total_chars = 0
-        traditional_chinese_chars = 0
-        simplified_chinese_chars = 0
-        english_chars = 0
-        japanese_chars = 0
-        korean_chars = 0
-        spanish_chars = 0
-        other_chars = 0
-
-        # Spanish special characters
-        spanish_special = set('ñÑáéíóúÁÉÍÓÚüÜ¿¡')
-
-        # Character-by-character analysis
-        for char in text:
-            # Skip whitespace and common punctuation
-            if char.isspace() or char in '.,;:!?"\'()-[]{}/@#$%^&*+=<>|\\~`_':
-                continue
-
-            total_chars += 1
-
-            # Check for Chinese characters
-            if '\u4e00' <= char <= '\u9fff':
-                # Determine if it's traditional or simplified
-                if char in self.SIMPLIFIED_CHARS and char not in self.TRADITIONAL_CHARS:
-                    # Exclusively simplified character
-                    simplified_chinese_chars += 1
-                elif char in self.TRADITIONAL_CHARS:
-                    # Traditional character (including shared characters)
-                    traditional_chinese_chars += 1
-                else:
-                    # Shared character - count as traditional
-                    traditional_chinese_chars += 1
-
-            # Check for English
-            elif char.isalpha() and ord(char) < 128:
-                english_chars += 1
-
-            # Check for Japanese (including Kanji range that overlaps with Chinese)
-            elif (self.JAPANESE_HIRAGANA_RANGE[0] <= char <= self.JAPANESE_HIRAGANA_RANGE[1] or
-                  self.JAPANESE_KATAKANA_RANGE[0] <= char <= self.JAPANESE_KATAKANA_RANGE[1]):
-                japanese_chars += 1
-
-            # Check for Korean
-            elif self.KOREAN_HANGUL_RANGE[0] <= char <= self.KOREAN_HANGUL_RANGE[1]:
-                korean_chars += 1
-
-            # Check for Spanish special characters
-            elif char in spanish_special:
-                spanish_chars += 1
-
-            # Check for numbers (allowed, not counted as "other")
-            elif char.isdigit():
-                continue  # Numbers are OK, don't count them
-
-            # Other alphabetic characters
-            elif char.isalpha():
-                other_chars += 1
+        composition = count_script_composition(text, self.COMPOSITION_SAMPLE_LIMIT)
+        total_chars = composition.total_chars
+        traditional_chinese_chars = composition.traditional_chinese_chars
+        simplified_chinese_chars = composition.simplified_chinese_chars
+        english_chars = composition.english_chars
+        japanese_chars = composition.japanese_chars
+        korean_chars = composition.korean_chars
+        spanish_chars = composition.spanish_chars
+        other_chars = composition.other_chars
 
         # Calculate ratios based on total characters
         trad_chinese_ratio = traditional_chinese_chars / total_chars if total_chars > 0 else 0.0
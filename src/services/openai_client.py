@@ -10,6 +10,8 @@ from typing import Any
 
 import httpx
 
+from src.core.utils import http_client_limits
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,6 +62,7 @@ class AzureOpenAIClient:
         # 設置 HTTP 客戶端
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(30.0, read=60.0),  # 30s 連接超時, 60s 讀取超時
+            limits=http_client_limits(),
             headers={
                 "api-key": self.api_key,
                 "Content-Type": "application/json",
@@ -9,6 +9,8 @@ from typing import Any
 
 import httpx
 
+from src.core.utils import http_client_limits
+
 
 class AzureOpenAIGPT41Client:
     """Azure OpenAI client for GPT-4.1 mini model integration."""
@@ -31,6 +33,7 @@ class AzureOpenAIGPT41Client:
         # 設置 HTTP 客戶端
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(30.0, read=60.0),  # 30s 連接超時, 60s 讀取超時
+            limits=http_client_limits(),
             headers={
                 "api-key": self.api_key,
                 "Content-Type": "application/json",
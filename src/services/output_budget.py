@@ -0,0 +1,289 @@
+"""
+Adaptive output token budgets.
+
+Static ``max_tokens`` values are sized for the worst case: Azure OpenAI
+reserves the full ``max_tokens`` against the deployment's tokens-per-minute
+allotment, so over-provisioning lowers throughput, while under-provisioning
+ends in ``finish_reason=length`` and a full retry.
+
+``OutputBudget`` keeps a sliding window of completion token counts per
+(operation, prompt version) and, once enough samples exist, recommends a
+``max_tokens`` at a high percentile plus a safety margin.
+``complete_with_continuation`` uses that budget and, when a reply is cut off
+anyway, asks the model once to continue from where it stopped instead of
+repeating the whole request.
+"""
+
+import math
+import os
+import threading
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from src.core.metrics.registry import get_metrics_registry
+from src.services.token_budget import count_tokens
+
+_TOKEN_BUCKETS = (128, 256, 512, 1024, 1536, 2048, 3072, 4096, 8192)
+
+_completion_tokens = get_metrics_registry().histogram(
+    "llm_completion_tokens", "Completion tokens per LLM reply", ["operation"], buckets=_TOKEN_BUCKETS
+)
+_max_tokens = get_metrics_registry().gauge(
+    "llm_adaptive_max_tokens", "Latest max_tokens recommended from observed completion lengths", ["operation"]
+)
+_truncations = get_metrics_registry().counter(
+    "llm_truncations_total", "Replies cut off by max_tokens and continued once", ["operation"]
+)
+
+CONTINUATION_PROMPT = (
+    "Your previous reply was cut off by the length limit. Continue exactly where it stopped, "
+    "without repeating any text and without adding commentary."
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class OutputBudget:
+    """Per-operation completion length distributions and the max_tokens derived from them."""
+
+    def __init__(
+        self,
+        window: int | None = None,
+        percentile: float | None = None,
+        margin: float | None = None,
+        min_samples: int | None = None,
+        floor: int | None = None,
+        ceiling: int | None = None,
+    ):
+        self.window = window or _env_int("ADAPTIVE_MAX_TOKENS_WINDOW", 200)
+        self.percentile = percentile or _env_float("ADAPTIVE_MAX_TOKENS_PERCENTILE", 99.0)
+        self.margin = margin if margin is not None else _env_float("ADAPTIVE_MAX_TOKENS_MARGIN", 0.15)
+        self.min_samples = min_samples or _env_int("ADAPTIVE_MAX_TOKENS_MIN_SAMPLES", 20)
+        self.floor = floor or _env_int("ADAPTIVE_MAX_TOKENS_FLOOR", 256)
+        # AzureOpenAIClient clamps max_tokens to 4000
+        self.ceiling = ceiling or _env_int("ADAPTIVE_MAX_TOKENS_CEILING", 4000)
+        self._samples: dict[tuple[str, str], deque[int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.getenv("ADAPTIVE_MAX_TOKENS_ENABLED", "true").lower() == "true"
+
+    def record(self, operation: str, prompt_version: str, completion_tokens: int):
+        """Record the completion length of one (possibly continued) reply."""
+        if completion_tokens <= 0:
+            return
+        _completion_tokens.observe(completion_tokens, operation=operation)
+        with self._lock:
+            samples = self._samples.get((operation, prompt_version))
+            if samples is None:
+                samples = self._samples[(operation, prompt_version)] = deque(maxlen=self.window)
+            samples.append(completion_tokens)
+
+    def observed_percentile(self, operation: str, prompt_version: str) -> int | None:
+        """Nearest-rank percentile of the window, or None below min_samples."""
+        with self._lock:
+            samples = sorted(self._samples.get((operation, prompt_version), ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = math.ceil(self.percentile / 100 * len(samples))
+        return samples[max(rank, 1) - 1]
+
+    def max_tokens(self, operation: str, prompt_version: str | None, default: int) -> int:
+        """
+        Recommend max_tokens for the next request.
+
+        Args:
+            operation: Operation name used for usage tracking
+            prompt_version: Prompt version; different prompts produce different lengths
+            default: Static budget used until enough samples are observed
+
+        Returns:
+            Percentile-plus-margin budget clamped to [floor, ceiling], or default
+        """
+        if not self.enabled() or prompt_version is None:
+            return default
+        observed = self.observed_percentile(operation, prompt_version)
+        if observed is None:
+            return default
+        budget = min(self.ceiling, max(self.floor, math.ceil(observed * (1 + self.margin))))
+        _max_tokens.set(budget, operation=operation)
+        return budget
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Sample counts and recommendations per operation and prompt version."""
+        with self._lock:
+            keys = list(self._samples)
+        stats = {}
+        for operation, prompt_version in keys:
+            observed = self.observed_percentile(operation, prompt_version)
+            stats[f"{operation}@{prompt_version}"] = {
+                "samples": len(self._samples[(operation, prompt_version)]),
+                "percentile_tokens": observed,
+            }
+        return stats
+
+
+_output_budget: OutputBudget | None = None
+
+
+def get_output_budget() -> OutputBudget:
+    """Get the process-wide output budget."""
+    global _output_budget
+    if _output_budget is None:
+        _output_budget = OutputBudget()
+    return _output_budget
+
+
+def reset_output_budget():
+    """Drop all observed samples (tests and configuration changes)."""
+    global _output_budget
+    _output_budget = None
+
+
+def _merge_continuation(first: dict[str, Any], follow_up: dict[str, Any]) -> dict[str, Any]:
+    """Join a truncated reply with its continuation; usage covers both requests."""
+    usage: dict[str, Any] = {}
+    for response in (first, follow_up):
+        for key, value in (response.get("usage") or {}).items():
+            if isinstance(value, int):
+                usage[key] = usage.get(key, 0) + value
+            elif isinstance(value, dict):
+                details = usage.setdefault(key, {})
+                for detail_key, detail_value in value.items():
+                    if isinstance(detail_value, int):
+                        details[detail_key] = details.get(detail_key, 0) + detail_value
+
+    choice = follow_up["choices"][0]
+    content = first["choices"][0]["message"]["content"] + (choice.get("message") or {}).get("content", "")
+    return {
+        **follow_up,
+        "choices": [{**choice, "message": {**choice.get("message", {}), "content": content}}],
+        "usage": usage,
+        "continued": True,
+    }
+
+
+async def _stream_completion(
+    client: Any,
+    messages: list[dict[str, str]],
+    on_delta: Callable[[str], None],
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Streaming chat completion assembled into a non-streaming response.
+
+    Content deltas go to on_delta as they arrive. With
+    ``stream_options.include_usage`` Azure OpenAI ends the stream with a
+    chunk that carries the request's usage (including cached prompt tokens);
+    token counts are only computed locally when no such chunk arrives.
+    """
+    stream = await client.chat_completion(
+        messages=messages, stream=True, stream_options={"include_usage": True}, **kwargs
+    )
+    if isinstance(stream, dict):
+        # Client without streaming support answered in one piece
+        for choice in stream.get("choices") or []:
+            on_delta((choice.get("message") or {}).get("content") or "")
+        return stream
+
+    parts: list[str] = []
+    finish_reason = None
+    model = None
+    usage = None
+    async for chunk in stream:
+        model = chunk.get("model") or model
+        usage = chunk.get("usage") or usage
+        for choice in chunk.get("choices") or []:
+            delta = (choice.get("delta") or {}).get("content")
+            if delta:
+                parts.append(delta)
+                on_delta(delta)
+            finish_reason = choice.get("finish_reason") or finish_reason
+
+    content = "".join(parts)
+    if usage is None:
+        prompt_tokens = sum(count_tokens(message["content"]) for message in messages)
+        completion_tokens = count_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+    return {
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": finish_reason,
+        }],
+        "usage": usage,
+    }
+
+
+async def complete_with_continuation(
+    client: Any,
+    messages: list[dict[str, str]],
+    operation: str,
+    prompt_version: str | None,
+    max_tokens: int,
+    on_delta: Callable[[str], None] | None = None,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Chat completion with an adaptive budget and one-shot continuation.
+
+    Args:
+        client: LLM client with an async chat_completion method
+        messages: Chat messages
+        operation: Operation name used for usage tracking
+        prompt_version: Version of the prompt that built the messages
+        max_tokens: Static budget; also the budget of the continuation request
+        on_delta: Streams the request when given; receives each content delta,
+            including those of the continuation
+        **kwargs: Other chat_completion parameters (temperature, top_p, ...)
+
+    Returns:
+        The chat completion response; a continued reply has the joined
+        content, the usage of both requests and ``continued: True``
+    """
+    async def complete(request_messages: list[dict[str, str]], request_max_tokens: int) -> dict[str, Any]:
+        if on_delta is None:
+            return await client.chat_completion(messages=request_messages, max_tokens=request_max_tokens, **kwargs)
+        return await _stream_completion(
+            client, request_messages, on_delta, max_tokens=request_max_tokens, **kwargs
+        )
+
+    limit = get_output_budget().max_tokens(operation, prompt_version, max_tokens)
+    response = await complete(messages, limit)
+
+    choices = response.get("choices") or [{}]
+    partial = (choices[0].get("message") or {}).get("content")
+    if choices[0].get("finish_reason") != "length" or not partial:
+        return response
+
+    _truncations.inc(operation=operation)
+    follow_up = await complete(
+        [
+            *messages,
+            {"role": "assistant", "content": partial},
+            {"role": "user", "content": CONTINUATION_PROMPT},
+        ],
+        max(max_tokens, limit),
+    )
+    if not follow_up.get("choices"):
+        return response
+    return _merge_continuation(response, follow_up)
@@ -0,0 +1,56 @@
+"""
+Prompt-prefix-cache-friendly message layout.
+
+Azure OpenAI caches prompt prefixes automatically (1024 tokens or longer,
+extended in 128-token steps), but only for requests whose leading tokens are
+byte-identical. Substituting request values into the system prompt, or
+concatenating system and user text into one message, gives every request a
+different prefix and no cache hits.
+
+``build_cacheable_messages`` keeps the system template as an identical leading
+message: placeholders there become static references (``<missing_keywords>``)
+and their values move to a context block at the end of the user message.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from src.core.simple_prompt_manager import CompiledTemplate
+
+
+def build_cacheable_messages(
+    system_template: CompiledTemplate | str,
+    user_template: CompiledTemplate | str,
+    variables: Mapping[str, Any],
+) -> list[dict[str, str]]:
+    """
+    Build [system, user] chat messages with a request-independent system message.
+
+    Args:
+        system_template: System prompt; its placeholders are not filled in place
+        user_template: User prompt; placeholders are filled in place
+        variables: Per-request placeholder values
+
+    Returns:
+        Chat messages for chat_completion
+    """
+    if isinstance(system_template, str):
+        system_template = CompiledTemplate.compile(system_template)
+    if isinstance(user_template, str):
+        user_template = CompiledTemplate.compile(user_template)
+
+    # Placeholders in declaration order, each once
+    referenced = [
+        name for name in dict.fromkeys(system_template.parts[1::2]) if name in variables
+    ]
+    system = system_template.render({name: f"<{name}>" for name in referenced})
+    user = user_template.render(variables)
+
+    if referenced:
+        context = "\n".join(f"<{name}>{variables[name]}</{name}>" for name in referenced)
+        user = f"{user.rstrip()}\n\n{context}"
+
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
@@ -11,9 +11,15 @@ from contextlib import asynccontextmanager
 from typing import Any
 
 from src.core.config import get_settings
+from src.core.metrics.registry import get_metrics_registry
 
 logger = logging.getLogger(__name__)
 
+# Process-wide pool metrics; pools are created per service instance
+_clients_created = get_metrics_registry().counter("openai_pool_clients_created", "OpenAI clients created")
+_clients_reused = get_metrics_registry().counter("openai_pool_clients_reused", "OpenAI clients reused from a pool")
+_clients_in_use = get_metrics_registry().gauge("openai_pool_clients_in_use", "OpenAI clients currently checked out")
+
 
 class ResourcePoolManager:
     """
@@ -131,6 +137,7 @@ class ResourcePoolManager:
 
         self.total_created += 1
         self.stats["clients_created"] += 1
+        _clients_created.inc()
         self.stats["current_pool_size"] += 1
         self.stats["peak_pool_size"] = max(
             self.stats["peak_pool_size"],
@@ -158,6 +165,7 @@ class ResourcePoolManager:
                     timeout=0.1
                 )
                 self.stats["clients_reused"] += 1
+                _clients_reused.inc()
 
             except TimeoutError:
                 # No available client, create new one if under limit
@@ -167,8 +175,13 @@ class ResourcePoolManager:
                     # At limit, wait for available client
                     client = await self.available_clients.get()
                     self.stats["clients_reused"] += 1
+                    _clients_reused.inc()
 
-            yield client
+            _clients_in_use.inc()
+            try:
+                yield client
+            finally:
+                _clients_in_use.dec()
 
         finally:
             # Return client to pool
@@ -8,6 +8,7 @@ import re
 from datetime import datetime
 from typing import Any
 
+from src.core.cpu_executor import run_cpu
 from src.core.monitoring_service import monitoring_service
 from src.models.resume_format import (
     CorrectionsMade,
@@ -23,7 +24,7 @@ from src.services.openai_client import (
     AzureOpenAIRateLimitError,
     # get_azure_openai_client, # Replaced with LLM Factory
 )
-from src.services.resume_text_processor import ResumeTextProcessor
+from src.services.resume_text_processor import ResumeTextProcessor, preprocess_ocr_text_task
 from src.services.token_tracking_mixin import TokenTrackingMixin
 from src.services.unified_prompt_service import UnifiedPromptService
 
@@ -60,7 +61,8 @@ class ResumeFormatService(TokenTrackingMixin):
         try:
             # 1. 預處理 OCR 文字
             logger.info("Starting OCR text preprocessing")
-            cleaned_text = self.text_processor.preprocess_ocr_text(ocr_text)
+            cleaned_text, correction_stats = await run_cpu(preprocess_ocr_text_task, ocr_text)
+            self.text_processor.set_correction_stats(correction_stats)
 
             # 2. 準備 LLM 輸入
             # OCR 輸出格式: 第一行是逗號分隔的 types, 第二行是逗號分隔的內容
@@ -77,7 +79,7 @@ class ResumeFormatService(TokenTrackingMixin):
 
             # 5. HTML 驗證和清理
             logger.info("Validating and cleaning HTML")
-            validated_html = self.html_validator.validate_and_clean(processed_html)
+            validated_html = await run_cpu(self.html_validator.validate_and_clean, processed_html)
 
             # 6. 檢測區段
             sections_detected = self._detect_sections(validated_html)
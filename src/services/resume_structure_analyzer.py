@@ -13,7 +13,7 @@ import time
 
 from pydantic import BaseModel, Field
 
-from src.core.simple_prompt_manager import SimplePromptManager
+from src.core.simple_prompt_manager import get_prompt_manager
 from src.services.llm_factory import get_llm_client
 
 logger = logging.getLogger(__name__)
@@ -74,7 +74,7 @@ class ResumeStructureAnalyzer:
         self.timeout = float(os.getenv("STRUCTURE_ANALYSIS_TIMEOUT", "5.0"))
 
         # Use Prompt Management System
-        self.prompt_manager = SimplePromptManager()
+        self.prompt_manager = get_prompt_manager()
         # Use RESUME_STRUCTURE_PROMPT_VERSION for consistency with CI/CD naming
         prompt_version = os.getenv("RESUME_STRUCTURE_PROMPT_VERSION", "v1.0.2")
 
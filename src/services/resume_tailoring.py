@@ -10,6 +10,7 @@ from typing import Any
 from fastapi import HTTPException
 
 from ..core.config import get_settings
+from ..core.cpu_executor import run_cpu
 from ..core.html_processor import HTMLProcessor
 from ..core.language_handler import LanguageHandler
 from ..core.marker_fixer import MarkerFixer
@@ -588,7 +589,8 @@ class ResumeTailoringService:
                 # Mark keywords in the optimized HTML
                 # still_covered → opt-keyword-existing (blue background)
                 # newly_added → opt-keyword (transparent bg, purple text)
-                optimized_html = marker.mark_keywords(
+                optimized_html = await run_cpu(
+                    marker.mark_keywords,
                     html=optimized_html,
                     original_keywords=keyword_tracking["still_covered"],
                     new_keywords=keyword_tracking["newly_added"]
@@ -14,20 +14,29 @@ import json
 import logging
 import os
 import time
-from typing import Any, Union
+from typing import TYPE_CHECKING, Any, Union
 
 from fastapi import HTTPException
 
 from ..core.config import get_settings
+from ..core.cpu_executor import run_cpu
+from ..core.html_pipeline import HTMLPipeline, parse_fragment
 from ..core.html_processor import HTMLProcessor
+from ..core.keyword_marking import KeywordMarkingEngine
 from ..core.language_handler import LanguageHandler
 from ..core.marker_fixer import MarkerFixer
 from ..core.monitoring_service import MonitoringService
 from ..core.star_formatter import STARFormatter
+from ..core.tracing import Span, span, start_trace, traced
 from ..services.index_calculation_v2 import get_index_calculation_service_v2
 from ..services.llm_factory import get_llm_client
+from ..services.output_budget import complete_with_continuation
+from ..services.token_tracking_mixin import TokenTrackingMixin
 from ..services.unified_prompt_service import UnifiedPromptService
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,7 +81,59 @@ def safe_format(template: str, **kwargs) -> str:
     return final_result
 
 
-class ResumeTailoringServiceV31:
+def build_keyword_css_engine(covered_keywords: list[str], newly_added: list[str]) -> KeywordMarkingEngine:
+    """Compile the keyword CSS marking engine (newly added keywords take priority)."""
+    # Keyword spans already in the HTML are left alone (opt-modified/opt-new are
+    # marked inside); overlapping keywords nest, e.g. "React" in "React Native"
+    return KeywordMarkingEngine(
+        [(newly_added, "opt-keyword-add"), (covered_keywords, "opt-keyword-existing")],
+        skip_span_classes=("opt-keyword-existing", "opt-keyword-add"),
+        skip_descendants=True,
+        nest_overlaps=True,
+    )
+
+
+def find_newly_added_keywords(text_content: str, missed_keywords: list[str]) -> list[str]:
+    """Return the missing keywords that appear in the resume text."""
+    text_content = text_content.lower()
+    return [keyword for keyword in missed_keywords if keyword.lower() in text_content]
+
+
+def postprocess_tailored_html(
+    html: str, covered_keywords: list[str], missed_keywords: list[str]
+) -> tuple[str, dict[str, int]]:
+    """
+    Run DOM post-processing stages over a single parse of the merged resume.
+
+    Stages: newly-added keyword detection and keyword CSS marking.
+    Module-level so it can run in the CPU process pool.
+
+    Args:
+        html: Merged resume HTML
+        covered_keywords: Keywords from original resume (mark as opt-keyword-existing)
+        missed_keywords: Keywords missing from original resume
+
+    Returns:
+        Tuple of (processed HTML, per-stage timings in ms)
+    """
+    pipeline = HTMLPipeline(html)
+
+    with pipeline.stage("keyword_detection") as soup:
+        newly_added = find_newly_added_keywords(soup.get_text(), missed_keywords)
+
+    with pipeline.stage("keyword_marking") as soup:
+        build_keyword_css_engine(covered_keywords, newly_added).mark_soup(soup)
+
+    return pipeline.serialize(), pipeline.timings
+
+
+def _span_ms(root: Span, name: str) -> int:
+    """Whole-millisecond duration of a stage span (0 if the stage did not run)."""
+    duration = root.duration_ms(name)
+    return int(duration) if duration is not None else 0
+
+
+class ResumeTailoringServiceV31(TokenTrackingMixin):
     """
     Resume Tailoring Service v3.1.0 - Two-LLM Parallel Pipeline.
 
@@ -127,106 +188,112 @@ class ResumeTailoringServiceV31:
         Returns:
             TailoringResponse with optimized resume and metrics
         """
+        with start_trace("resume_tailoring", output_language=output_language) as root:
+            return await self._tailor_resume(
+                root, original_resume, job_description, original_index, output_language
+            )
 
-        start_time = time.time()
-        pre_start = start_time
-
+    async def _tailor_resume(
+        self,
+        root: Span,
+        original_resume: str,
+        job_description: str,
+        original_index: dict,
+        output_language: str
+    ) -> dict[str, Any]:
+        """Run the tailoring pipeline with each stage in a span under ``root``."""
         try:
             # Pre-processing: Extract data from original_index
             logger.info("Starting v3.1.0 pre-processing")
 
-            # Extract components from original_index
-            # Handle both formats: nested (from Gap Analysis API) and flat (from Bubble.io)
-            if "keyword_coverage" in original_index:
-                # Nested format from Gap Analysis API
-                keyword_coverage = original_index.get("keyword_coverage", {})
-                gap_analysis = original_index.get("gap_analysis", {})
-                resume_structure = original_index.get("resume_structure", {})
-                covered_keywords = keyword_coverage.get("covered_keywords", [])
-                missed_keywords = keyword_coverage.get("missed_keywords", [])
-            else:
-                # Flat format from Bubble.io
-                keyword_coverage = {
-                    "covered_keywords": original_index.get("covered_keywords", []),
-                    "missed_keywords": original_index.get("missing_keywords", []),
-                    "coverage_percentage": original_index.get("coverage_percentage", 0)
-                }
-                gap_analysis = {
-                    "core_strengths": original_index.get("core_strengths", []),
-                    "key_gaps": original_index.get("key_gaps", []),
-                    "quick_improvements": original_index.get("quick_improvements", [])
-                }
-                resume_structure = {}  # Not provided in flat format
-                covered_keywords = original_index.get("covered_keywords", [])
-                missed_keywords = original_index.get("missing_keywords", [])
-
-            # Prepare data bundles for parallel LLMs
-            bundle1, bundle2 = self._allocate_bundles(
-                original_resume=original_resume,
-                job_description=job_description,
-                gap_analysis=gap_analysis,
-                covered_keywords=covered_keywords,
-                missing_keywords=missed_keywords,
-                resume_structure=resume_structure,
-                output_language=output_language,
-                original_index=original_index
-            )
-
-            pre_processing_ms = int((time.time() - pre_start) * 1000)
+            with span("pre_processing"):
+                # Extract components from original_index
+                # Handle both formats: nested (from Gap Analysis API) and flat (from Bubble.io)
+                if "keyword_coverage" in original_index:
+                    # Nested format from Gap Analysis API
+                    keyword_coverage = original_index.get("keyword_coverage", {})
+                    gap_analysis = original_index.get("gap_analysis", {})
+                    resume_structure = original_index.get("resume_structure", {})
+                    covered_keywords = keyword_coverage.get("covered_keywords", [])
+                    missed_keywords = keyword_coverage.get("missed_keywords", [])
+                else:
+                    # Flat format from Bubble.io
+                    keyword_coverage = {
+                        "covered_keywords": original_index.get("covered_keywords", []),
+                        "missed_keywords": original_index.get("missing_keywords", []),
+                        "coverage_percentage": original_index.get("coverage_percentage", 0)
+                    }
+                    gap_analysis = {
+                        "core_strengths": original_index.get("core_strengths", []),
+                        "key_gaps": original_index.get("key_gaps", []),
+                        "quick_improvements": original_index.get("quick_improvements", [])
+                    }
+                    resume_structure = {}  # Not provided in flat format
+                    covered_keywords = original_index.get("covered_keywords", [])
+                    missed_keywords = original_index.get("missing_keywords", [])
+
+                # Prepare data bundles for parallel LLMs
+                bundle1, bundle2 = self._allocate_bundles(
+                    original_resume=original_resume,
+                    job_description=job_description,
+                    gap_analysis=gap_analysis,
+                    covered_keywords=covered_keywords,
+                    missing_keywords=missed_keywords,
+                    resume_structure=resume_structure,
+                    output_language=output_language,
+                    original_index=original_index
+                )
 
             # Parallel LLM execution
             logger.info("Executing parallel LLM calls")
-            llm_start = time.time()
-
-            llm1_task = self._call_llm1(bundle1)
-            llm2_task = self._call_llm2(bundle2)
 
-            # Record individual start times
-            llm1_start_ms = int((llm_start - start_time) * 1000)
-            llm2_start_ms = llm1_start_ms  # Both start at same time
-
-            # Execute in parallel
-            llm1_result, llm2_result = await asyncio.gather(llm1_task, llm2_task)
-
-            # Record individual finish times
-            llm_finish = time.time()
-            llm1_finish_ms = int((llm_finish - start_time) * 1000)
-            llm2_finish_ms = llm1_finish_ms  # Both finish around same time
+            # Each call runs in its own span, so start and finish times are recorded per LLM
+            llm1_result, llm2_result = await asyncio.gather(
+                traced("llm1", self._call_llm1(bundle1)),
+                traced("llm2", self._call_llm2(bundle2))
+            )
 
             llm1_processing_ms = llm1_result.get("processing_time_ms", 0)
             llm2_processing_ms = llm2_result.get("processing_time_ms", 0)
 
             # Post-processing: Merge results
             logger.info("Starting post-processing")
-            post_start = time.time()
-
-            # Merge sections from both LLMs
-            merged_sections = self._merge_sections(llm1_result, llm2_result, resume_structure, original_resume)
-
-            # Build final HTML
-            final_html = self._build_final_html(merged_sections, resume_structure)
+            with span("post_processing"):
+                # Merge sections from both LLMs
+                with span("merge"):
+                    merged_sections = self._merge_sections(
+                        llm1_result, llm2_result, resume_structure, original_resume
+                    )
 
-            # Apply keyword CSS marking
-            final_html = self._apply_keyword_css(
-                html=final_html,
-                covered_keywords=covered_keywords,
-                newly_added=self._get_newly_added_keywords(final_html, missed_keywords)
-            )
+                    # Build final HTML
+                    final_html = self._build_final_html(merged_sections, resume_structure)
 
-            # Merge tracking arrays
-            applied_improvements = self._merge_tracking(llm1_result, llm2_result)
+                # Newly-added keyword detection and keyword CSS marking on one parsed tree
+                final_html, dom_timings = await run_cpu(
+                    postprocess_tailored_html, final_html, covered_keywords, missed_keywords
+                )
 
-            # Calculate metrics
-            metrics = await self._calculate_metrics_v3(
-                original_resume=original_resume,
-                optimized_resume=final_html,
-                job_description=job_description,
-                original_index=original_index,
-                all_keywords=covered_keywords + missed_keywords
-            )
+                # Merge tracking arrays
+                applied_improvements = self._merge_tracking(llm1_result, llm2_result)
+
+                # Calculate metrics
+                with span("metrics"):
+                    metrics = await self._calculate_metrics_v3(
+                        original_resume=original_resume,
+                        optimized_resume=final_html,
+                        job_description=job_description,
+                        original_index=original_index,
+                        all_keywords=covered_keywords + missed_keywords
+                    )
 
-            post_processing_ms = int((time.time() - post_start) * 1000)
-            total_processing_ms = int((time.time() - start_time) * 1000)
+            pre_processing_ms = _span_ms(root, "pre_processing")
+            post_processing_ms = _span_ms(root, "post_processing")
+            post_processing_breakdown = {
+                "merge_ms": _span_ms(root, "merge"),
+                **dom_timings,
+                "metrics_ms": _span_ms(root, "metrics")
+            }
+            total_processing_ms = int(root.elapsed_ms())
 
             # Check if LLM2 had issues and add warnings
             warnings = []
@@ -267,11 +334,12 @@ class ResumeTailoringServiceV31:
                 "llm1_processing_time_ms": llm1_processing_ms,
                 "llm2_processing_time_ms": llm2_processing_ms,
                 "post_processing_ms": post_processing_ms,
+                "post_processing_breakdown": post_processing_breakdown,
                 "stage_timings": {
-                    "llm1_start_time_ms": llm1_start_ms,
-                    "llm1_finish_time_ms": llm1_finish_ms,
-                    "llm2_start_time_ms": llm2_start_ms,
-                    "llm2_finish_time_ms": llm2_finish_ms
+                    "llm1_start_time_ms": int(root.find("llm1").offset_ms(root)),
+                    "llm1_finish_time_ms": int(root.find("llm1").end_offset_ms(root)),
+                    "llm2_start_time_ms": int(root.find("llm2").offset_ms(root)),
+                    "llm2_finish_time_ms": int(root.find("llm2").end_offset_ms(root))
                 },
                 "Keywords": metrics["keywords"],
                 "similarity": metrics["similarity"],
@@ -496,8 +564,12 @@ class ResumeTailoringServiceV31:
             llm_config = self.core_prompt.get("llm_config", {})
 
             # Call LLM
-            response = await self.llm1_client.chat_completion(
-                messages=messages,
+            prompt_version = self.core_prompt.get("metadata", {}).get("version")
+            response = await complete_with_continuation(
+                self.llm1_client,
+                messages,
+                operation="resume_tailoring_llm1",
+                prompt_version=prompt_version,
                 temperature=llm_config.get("temperature", 0.2),
                 max_tokens=llm_config.get("max_tokens", 5000),
                 top_p=llm_config.get("top_p", 0.15),
@@ -506,6 +578,7 @@ class ResumeTailoringServiceV31:
             )
 
             processing_time_ms = int((time.time() - start_time) * 1000)
+            self.track_openai_usage(response, "resume_tailoring_llm1", prompt_version=prompt_version)
 
             # Parse response
             content = response["choices"][0]["message"]["content"].strip()
@@ -587,8 +660,12 @@ class ResumeTailoringServiceV31:
             llm_config = self.additional_prompt.get("llm_config", {})
 
             # Call LLM
-            response = await self.llm2_client.chat_completion(
-                messages=messages,
+            prompt_version = self.additional_prompt.get("metadata", {}).get("version")
+            response = await complete_with_continuation(
+                self.llm2_client,
+                messages,
+                operation="resume_tailoring_llm2",
+                prompt_version=prompt_version,
                 temperature=llm_config.get("temperature", 0.2),
                 max_tokens=llm_config.get("max_tokens", 5000),
                 top_p=llm_config.get("top_p", 0.15),
@@ -597,6 +674,7 @@ class ResumeTailoringServiceV31:
             )
 
             processing_time_ms = int((time.time() - start_time) * 1000)
+            self.track_openai_usage(response, "resume_tailoring_llm2", prompt_version=prompt_version)
 
             # Parse response
             content = response["choices"][0]["message"]["content"].strip()
@@ -623,15 +701,24 @@ class ResumeTailoringServiceV31:
             logger.error(f"LLM2 call failed: {e}")
             raise
 
-    def _extract_original_section(self, section_name: str, original_resume: str = "") -> str:
-        """Extract a section from the original resume as fallback."""
+    def _extract_original_section(
+        self, section_name: str, original_resume: str = "", original_soup: "BeautifulSoup | None" = None
+    ) -> str:
+        """
+        Extract a section from the original resume as fallback.
 
-        from bs4 import BeautifulSoup
+        Args:
+            section_name: Section to extract (education, projects, certifications)
+            original_resume: HTML content of the original resume
+            original_soup: Already parsed original resume, reused across sections
 
+        Returns:
+            Section HTML, or empty string if not found
+        """
         if not original_resume:
             return ""
 
-        soup = BeautifulSoup(original_resume, 'html.parser')
+        soup = original_soup if original_soup is not None else parse_fragment(original_resume)
 
         # Common section headers to look for
         section_headers = {
@@ -804,12 +891,19 @@ class ResumeTailoringServiceV31:
                         }
                     }
                 else:
-                    # Production mode: Use original content
+                    # Production mode: Use original content (parsed once for all sections)
+                    original_soup = parse_fragment(original_resume)
                     return {
                         "optimized_sections": {
-                            "education": self._extract_original_section("education", original_resume),
-                            "projects": self._extract_original_section("projects", original_resume),
-                            "certifications": self._extract_original_section("certifications", original_resume)
+                            "education": self._extract_original_section(
+                                "education", original_resume, original_soup
+                            ),
+                            "projects": self._extract_original_section(
+                                "projects", original_resume, original_soup
+                            ),
+                            "certifications": self._extract_original_section(
+                                "certifications", original_resume, original_soup
+                            )
                         },
                         "tracking": ["LLM2 parsing failed - using original content as fallback"],
                         "parse_error": str(e),
@@ -831,6 +925,16 @@ class ResumeTailoringServiceV31:
         sections1 = llm1_result.get("optimized_sections", {})
         sections2 = llm2_result.get("optimized_sections", {})
 
+        # Original resume is parsed at most once, and only if a fallback is needed
+        original_soup = None
+
+        def extract_fallback(section_name: str) -> str:
+            """Extract a fallback section, parsing the original resume on first use."""
+            nonlocal original_soup
+            if original_soup is None and original_resume:
+                original_soup = parse_fragment(original_resume)
+            return self._extract_original_section(section_name, original_resume, original_soup)
+
         # Check if LLM2 sections are empty and use fallback if needed
         if not sections2.get("education"):
             logger.warning("LLM2 education section is empty, using fallback from original resume")
@@ -869,7 +973,7 @@ class ResumeTailoringServiceV31:
                 }
             else:
                 # Production mode: Use original content
-                fallback_education = self._extract_original_section("education", original_resume)
+                fallback_education = extract_fallback("education")
                 if fallback_education:
                     sections2["education"] = fallback_education
                     llm2_result["fallback_used"] = True
@@ -910,7 +1014,7 @@ class ResumeTailoringServiceV31:
                 }
             else:
                 # Production mode: Use original content
-                fallback_projects = self._extract_original_section("projects", original_resume)
+                fallback_projects = extract_fallback("projects")
                 if fallback_projects:
                     sections2["projects"] = fallback_projects
                     llm2_result["fallback_used"] = True
@@ -949,7 +1053,7 @@ class ResumeTailoringServiceV31:
                 }
             else:
                 # Production mode: Use original content
-                fallback_certifications = self._extract_original_section("certifications", original_resume)
+                fallback_certifications = extract_fallback("certifications")
                 if fallback_certifications:
                     sections2["certifications"] = fallback_certifications
                     llm2_result["fallback_used"] = True
@@ -1007,6 +1111,12 @@ class ResumeTailoringServiceV31:
 
         return "\n\n".join(html_parts)
 
+    def _postprocess_html(
+        self, html: str, covered_keywords: list[str], missed_keywords: list[str]
+    ) -> tuple[str, dict[str, int]]:
+        """Run DOM post-processing on the calling thread (see postprocess_tailored_html)."""
+        return postprocess_tailored_html(html, covered_keywords, missed_keywords)
+
     def _apply_keyword_css(self, html: str, covered_keywords: list[str], newly_added: list[str]) -> str:
         """
         Apply keyword CSS classes with proper nesting prevention.
@@ -1019,81 +1129,7 @@ class ResumeTailoringServiceV31:
         Returns:
             HTML with keyword CSS classes applied
         """
-        import re
-
-        from bs4 import BeautifulSoup
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Function to check if a node is inside a keyword span
-        def is_inside_keyword_span(element):
-            """Check if element is inside a keyword span tag."""
-            parent = element.parent
-            while parent:
-                if parent.name == 'span' and parent.get('class'):
-                    classes = parent.get('class')
-                    # Only check keyword-specific classes to prevent keyword nesting
-                    # Allow keywords inside opt-modified and opt-new spans
-                    if 'opt-keyword-existing' in classes or 'opt-keyword-add' in classes:
-                        return True
-                parent = parent.parent
-            return False
-
-        # Function to mark keywords in text
-        def mark_keywords_in_text(text, keywords, css_class):
-            """Mark all occurrences of keywords with CSS class."""
-            for keyword in keywords:
-                # Use word boundary to match complete words only
-                pattern = re.compile(rf'\b{re.escape(keyword)}\b', re.IGNORECASE)
-
-                def replacer(match):
-                    return f'<span class="{css_class}">{match.group()}</span>'
-
-                text = pattern.sub(replacer, text)
-            return text
-
-        # Process all text nodes
-        for text_node in soup.find_all(text=True):
-            # Skip if parent is script, style
-            if text_node.parent.name in ['script', 'style']:
-                continue
-
-            # IMPORTANT: Skip only if already inside a keyword span (not just any span)
-            if is_inside_keyword_span(text_node):
-                continue
-
-            original_text = str(text_node)
-            modified_text = original_text
-
-            # First mark newly added keywords (higher priority)
-            if newly_added:
-                modified_text = mark_keywords_in_text(modified_text, newly_added, "opt-keyword-add")
-
-            # Then mark existing keywords (but not if already marked)
-            if covered_keywords:
-                # Only mark if not already marked with opt-keyword-add
-                temp_text = modified_text
-                for keyword in covered_keywords:
-                    # Check if this keyword is not already marked as newly added
-                    if keyword not in newly_added:
-                        pattern = re.compile(rf'\b{re.escape(keyword)}\b', re.IGNORECASE)
-
-                        def replacer(match):
-                            # Check if this match is not already inside a span
-                            return f'<span class="opt-keyword-existing">{match.group()}</span>'
-
-                        temp_text = pattern.sub(replacer, temp_text)
-                modified_text = temp_text
-
-            # Replace the text node if modified
-            if modified_text != original_text:
-                new_soup = BeautifulSoup(modified_text, 'html.parser')
-                # Extract all children from new_soup and insert them
-                for element in list(new_soup.children):
-                    text_node.insert_before(element)
-                text_node.extract()
-
-        return str(soup)
+        return build_keyword_css_engine(covered_keywords, newly_added).mark_html(html)
 
     def _get_newly_added_keywords(self, html: str, missed_keywords: list[str]) -> list[str]:
         """
@@ -1106,18 +1142,7 @@ class ResumeTailoringServiceV31:
         Returns:
             List of keywords that are now present in the optimized resume
         """
-        from bs4 import BeautifulSoup
-
-        soup = BeautifulSoup(html, 'html.parser')
-        text_content = soup.get_text().lower()
-
-        newly_added = []
-        for keyword in missed_keywords:
-            # Check if the keyword is now present
-            if keyword.lower() in text_content:
-                newly_added.append(keyword)
-
-        return newly_added
+        return find_newly_added_keywords(parse_fragment(html).get_text(), missed_keywords)
 
     def _merge_tracking(self, llm1_result: dict, llm2_result: dict) -> list[str]:
         """Merge tracking arrays from both LLMs."""
@@ -320,3 +320,22 @@ class ResumeTextProcessor:
             "phone_fixes": self.phone_fix_count,
             "date_standardization": self.date_fix_count
         }
+
+    def set_correction_stats(self, stats: dict[str, int]):
+        """設定修正統計 (合併在 CPU 工作程序中計算的結果)"""
+        self.ocr_error_count = stats.get("ocr_errors", 0)
+        self.email_fix_count = stats.get("email_fixes", 0)
+        self.phone_fix_count = stats.get("phone_fixes", 0)
+        self.date_fix_count = stats.get("date_standardization", 0)
+
+
+def preprocess_ocr_text_task(text: str) -> tuple[str, dict[str, int]]:
+    """
+    在獨立的處理器中預處理 OCR 文字 (CPU 工作池入口)
+
+    Returns:
+        (清理後的文字, 修正統計)
+    """
+    processor = ResumeTextProcessor()
+    cleaned_text = processor.preprocess_ocr_text(text)
+    return cleaned_text, processor.get_correction_stats()
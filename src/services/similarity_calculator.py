@@ -5,8 +5,6 @@ Similarity calculation service for comparing resume content before and after opt
 import re
 from collections import Counter
 
-from bs4 import BeautifulSoup
-
 
 class SimilarityCalculator:
     """Calculate semantic similarity between job description and resume."""
@@ -33,6 +31,8 @@ class SimilarityCalculator:
         Returns:
             Similarity score between 0-100
         """
+        from bs4 import BeautifulSoup
+
         # Extract text from HTML
         if resume_html.strip().startswith('<'):
             soup = BeautifulSoup(resume_html, 'html.parser')
@@ -69,6 +69,10 @@ class BaseStandardizer(ABC):
         """
         self.config_path = config_path
         self.config = None
+        # Compiled exclusion/pattern rules and the config they were compiled from
+        self._exclusion_patterns: list[re.Pattern] = []
+        self._pattern_rules: list[tuple[re.Pattern, str]] = []
+        self._compiled_config: dict | None = None
         self._load_config()
 
     @abstractmethod
@@ -76,6 +80,25 @@ class BaseStandardizer(ABC):
         """Load standardization configuration. Must be implemented by subclasses."""
         pass
 
+    def compile_rules(self) -> int:
+        """
+        Compile exclusion and pattern rules once per loaded config.
+
+        Called lazily on first use, or up front by the start-up warm-up.
+
+        Returns:
+            Number of compiled rules
+        """
+        if self.config is not None and self._compiled_config is not self.config:
+            self._exclusion_patterns = [
+                re.compile(rule['pattern']) for rule in self.config.get('exclusion_rules', [])
+            ]
+            self._pattern_rules = [
+                (re.compile(rule['pattern']), rule['replacement']) for rule in self.config.get('pattern_rules', [])
+            ]
+            self._compiled_config = self.config
+        return len(self._exclusion_patterns) + len(self._pattern_rules)
+
     @abstractmethod
     def get_supported_language(self) -> str:
         """Get the language code supported by this standardizer."""
@@ -181,15 +204,12 @@ class BaseStandardizer(ABC):
         filtered = []
         excluded = []
 
-        exclusion_patterns = [
-            re.compile(rule['pattern'])
-            for rule in self.config['exclusion_rules']
-        ]
+        self.compile_rules()
 
         for keyword in keywords:
             should_exclude = False
 
-            for pattern in exclusion_patterns:
+            for pattern in self._exclusion_patterns:
                 if pattern.search(keyword):
                     excluded.append(keyword)
                     should_exclude = True
@@ -254,14 +274,13 @@ class BaseStandardizer(ABC):
         standardized = []
         mappings = []
 
+        self.compile_rules()
+
         for keyword in keywords:
             original_keyword = keyword
 
-            for rule in self.config['pattern_rules']:
-                pattern = rule['pattern']
-                replacement = rule['replacement']
-
-                new_keyword = re.sub(pattern, replacement, keyword)
+            for pattern, replacement in self._pattern_rules:
+                new_keyword = pattern.sub(replacement, keyword)
                 if new_keyword != keyword:
                     keyword = new_keyword
                     mappings.append({
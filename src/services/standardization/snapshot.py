@@ -0,0 +1,206 @@
+"""
+Binary snapshot of the standardization dictionaries.
+
+The YAML/JSON dictionaries under ``src/data/standardization`` are compiled by
+``validate_dictionaries.py --build-snapshot`` into a single marshal file that
+loads in a few milliseconds. The snapshot records a checksum of every source
+file; when any source changes the snapshot is treated as stale and callers
+fall back to parsing the YAML/JSON sources directly.
+"""
+
+import hashlib
+import json
+import logging
+import marshal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_FILENAME = "standardization.snapshot"
+DEFAULT_DATA_DIR = Path(__file__).parent.parent.parent / "data" / "standardization"
+
+# Source files compiled into the snapshot
+SOURCE_FILES = (
+    "skills.yaml",
+    "tools.yaml",
+    "positions.yaml",
+    "patterns.yaml",
+    "zh_tw_standard_terms.json",
+)
+
+# Per-directory cache: resolved data dir -> (stat signature, payload or None)
+_snapshot_cache: dict[Path, tuple[tuple, dict[str, Any] | None]] = {}
+_cache_lock = threading.Lock()
+
+
+def _parse_source(filepath: Path) -> Any:
+    """Parse a single YAML or JSON source file."""
+    import yaml
+
+    with open(filepath, encoding='utf-8') as f:
+        if filepath.suffix == ".json":
+            return json.load(f)
+        return yaml.safe_load(f)
+
+
+def _stat_signature(data_dir: Path) -> tuple:
+    """Cheap change signature (size + mtime) of all source files and the snapshot."""
+    signature = []
+    for name in (*SOURCE_FILES, SNAPSHOT_FILENAME):
+        try:
+            stat = (data_dir / name).stat()
+            signature.append((name, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            signature.append((name, None, None))
+    return tuple(signature)
+
+
+def compute_source_checksum(data_dir: Path | str = DEFAULT_DATA_DIR) -> str:
+    """
+    Compute a content checksum over all source dictionary files.
+
+    Args:
+        data_dir: Directory containing the standardization sources
+
+    Returns:
+        Hex SHA-256 digest of file names and contents
+    """
+    data_dir = Path(data_dir)
+    digest = hashlib.sha256()
+    for name in SOURCE_FILES:
+        filepath = data_dir / name
+        digest.update(name.encode('utf-8'))
+        if filepath.exists():
+            digest.update(filepath.read_bytes())
+        else:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def build_snapshot(
+    data_dir: Path | str = DEFAULT_DATA_DIR,
+    output_path: Path | str | None = None
+) -> Path:
+    """
+    Compile all source dictionaries into a single snapshot file.
+
+    Args:
+        data_dir: Directory containing the standardization sources
+        output_path: Snapshot destination. Defaults to ``<data_dir>/standardization.snapshot``
+
+    Returns:
+        Path of the written snapshot
+    """
+    data_dir = Path(data_dir)
+    output_path = Path(output_path) if output_path else data_dir / SNAPSHOT_FILENAME
+
+    files = {}
+    for name in SOURCE_FILES:
+        filepath = data_dir / name
+        if filepath.exists():
+            files[name] = _parse_source(filepath)
+
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "python_version": list(sys.version_info[:2]),
+        "source_checksum": compute_source_checksum(data_dir),
+        "created_at": time.time(),
+        "files": files,
+    }
+
+    # Write atomically so a concurrently starting process never sees a partial file
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        marshal.dump(snapshot, f)
+    tmp_path.replace(output_path)
+
+    logger.info(f"Built standardization snapshot with {len(files)} files: {output_path}")
+    return output_path
+
+
+def _read_snapshot(data_dir: Path) -> dict[str, Any] | None:
+    """Read and validate the snapshot file, returning its file payload or None."""
+    snapshot_path = data_dir / SNAPSHOT_FILENAME
+    if not snapshot_path.exists():
+        return None
+
+    try:
+        with open(snapshot_path, "rb") as f:
+            snapshot = marshal.load(f)  # noqa: S302 - locally built, trusted artifact
+    except (EOFError, ValueError, TypeError, OSError) as e:
+        logger.warning(f"Unreadable standardization snapshot {snapshot_path}: {e}")
+        return None
+
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        logger.info("Standardization snapshot format changed, falling back to sources")
+        return None
+    if snapshot.get("python_version") != list(sys.version_info[:2]):
+        logger.info("Standardization snapshot built by another Python version, falling back to sources")
+        return None
+    if snapshot.get("source_checksum") != compute_source_checksum(data_dir):
+        logger.info("Standardization snapshot is stale, falling back to sources")
+        return None
+
+    return snapshot.get("files", {})
+
+
+def load_snapshot(data_dir: Path | str = DEFAULT_DATA_DIR) -> dict[str, Any] | None:
+    """
+    Load the snapshot payload for a data directory.
+
+    Results are cached per directory and revalidated only when a source file
+    or the snapshot itself changes on disk.
+
+    Args:
+        data_dir: Directory containing the standardization sources
+
+    Returns:
+        Mapping of source file name to parsed content, or None if no valid snapshot exists
+    """
+    data_dir = Path(data_dir).resolve()
+    signature = _stat_signature(data_dir)
+
+    with _cache_lock:
+        cached = _snapshot_cache.get(data_dir)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        payload = _read_snapshot(data_dir)
+        _snapshot_cache[data_dir] = (signature, payload)
+        return payload
+
+
+def load_source_file(filepath: Path | str) -> Any:
+    """
+    Load a parsed dictionary source, preferring a fresh snapshot over YAML/JSON parsing.
+
+    Args:
+        filepath: Path of the YAML or JSON source file
+
+    Returns:
+        Parsed file content
+
+    Raises:
+        FileNotFoundError: If the source file does not exist
+        yaml.YAMLError / json.JSONDecodeError: If the source cannot be parsed
+    """
+    filepath = Path(filepath)
+    if filepath.name in SOURCE_FILES and filepath.exists():
+        payload = load_snapshot(filepath.parent)
+        if payload is not None and filepath.name in payload:
+            return payload[filepath.name]
+
+    return _parse_source(filepath)
+
+
+def clear_snapshot_cache():
+    """Clear the in-memory snapshot cache (used by tests and reloads)."""
+    with _cache_lock:
+        _snapshot_cache.clear()
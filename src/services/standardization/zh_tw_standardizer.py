@@ -3,12 +3,12 @@ Traditional Chinese (Taiwan) keyword standardizer.
 Provides standardization for Traditional Chinese professional terms.
 """
 
-import json
 import logging
 import re
 from pathlib import Path
 
 from .base_standardizer import BaseStandardizer
+from .snapshot import load_source_file
 
 logger = logging.getLogger(__name__)
 
@@ -49,8 +49,7 @@ class TraditionalChineseStandardizer(BaseStandardizer):
                 self.config = None
                 return
 
-            with open(config_path, encoding='utf-8') as f:
-                self.config = json.load(f)
+            self.config = load_source_file(config_path)
 
             # Validate config structure
             if not self._validate_config():
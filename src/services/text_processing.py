@@ -8,8 +8,6 @@ import html
 import logging
 import re
 
-from bs4 import BeautifulSoup
-
 logger = logging.getLogger(__name__)
 
 
@@ -182,6 +180,8 @@ def validate_html_for_tinymce(html_content: str) -> str:
     Returns:
         TinyMCE-compatible HTML
     """
+    from bs4 import BeautifulSoup
+
     try:
         if not html_content or not html_content.strip():
             raise ValueError("Empty HTML content")
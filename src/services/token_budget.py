@@ -0,0 +1,409 @@
+"""
+Input token budgeting for LLM calls.
+
+Resumes arrive as HTML and job descriptions often carry boilerplate (EEO
+statements, benefits lists) that adds tokens, and therefore latency, without
+changing the analysis. ``compact_inputs`` turns each input into compact
+text, drops boilerplate and, if an input is still over its per-operation
+budget, drops its lowest-value sections (references, hobbies, "about us").
+Skills, projects, certifications and coursework are evidence for the gap
+analysis and are never dropped; a resume still over budget loses the later
+bullets of its experience entries next, and is truncated only as a last
+resort. Token counts come from the o200k_base BPE encoding used
+by GPT-4.1, loaded from the vendored ``src/data/tokenizers`` file (no
+network). Without tiktoken installed, counts fall back to an estimate.
+
+Environment:
+- INPUT_COMPACTION_ENABLED: compact LLM inputs (default: true)
+- INPUT_TOKEN_BUDGET_<OPERATION>_<FIELD>: token budget for one input, e.g.
+  INPUT_TOKEN_BUDGET_GAP_ANALYSIS_RESUME=3000
+"""
+
+import base64
+import hashlib
+import html
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.core.metrics.registry import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+ENCODING_PATH = Path(__file__).resolve().parents[1] / "data" / "tokenizers" / "o200k_base.tiktoken"
+ENCODING_SHA256 = "446a9538cb6c348e3516120d7c08b09f57c36495e2acfffe59a5bf8b0cfb1a2d"
+
+# Pre-tokenization pattern of o200k_base (tiktoken_ext.openai_public)
+_O200K_PATTERN = "|".join([
+    r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+    r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+    r"""\p{N}{1,3}""",
+    r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+    r"""\s*[\r\n]+""",
+    r"""\s+(?!\S)""",
+    r"""\s+""",
+])
+_O200K_SPECIAL_TOKENS = {"<|endoftext|>": 199999, "<|endofprompt|>": 200018}
+
+# Token budgets per operation and input
+DEFAULT_BUDGETS: dict[str, dict[str, int]] = {
+    "gap_analysis": {"resume": 3000, "job_description": 1500},
+    "keyword_extraction": {"job_description": 1500},
+}
+
+# Section priorities: lower is dropped first; unlisted sections (skills, projects,
+# certifications, coursework, experience, ...) are core and never dropped
+CORE = 3
+_RESUME_SECTION_PRIORITY = [
+    (re.compile(
+        r"^(references?|hobbies|interests|hobbies (and|&) interests|personal (details|information|interests)"
+        r"|興趣|推薦人)$"
+    ), 0),
+    (re.compile(r"^(volunteer(ing| work| experience)?|extracurricular activities|activities|志工|活動)$"), 1),
+    # Spoken languages only; "Programming Languages" is a skills section
+    (re.compile(r"^(languages?|language skills|spoken languages|語言|語言能力)$"), 2),
+]
+# Sections whose later bullets are trimmed before the whole text is truncated
+_RESUME_DETAIL_SECTION = re.compile(r"experience|employment|work history|career|經歷|經驗")
+_JD_SECTION_PRIORITY = [
+    (re.compile(r"about (us|the company|the team)|who we are|our (culture|mission|story)|公司簡介|關於我們"), 1),
+    (re.compile(r"nice to have|preferred|bonus|\bplus\b|加分"), 2),
+]
+_JD_BOILERPLATE_HEADING = re.compile(
+    r"benefit|perks|what we offer|why (join|work)|compensation|equal (employment )?opportunit|"
+    r"\beeo\b|diversity|accommodation|福利|待遇|平等就業"
+)
+_JD_BOILERPLATE_LINE = re.compile(
+    r"equal opportunity employer|without regard to|affirmative action|reasonable accommodation|"
+    r"e-verify|protected veteran|drug[- ]free|平等就業|不分性別",
+    re.IGNORECASE,
+)
+
+_tokens_sent = get_metrics_registry().counter(
+    "llm_input_tokens_total", "Input tokens sent to the LLM after compaction", ["operation"]
+)
+_tokens_saved = get_metrics_registry().counter(
+    "llm_input_tokens_saved_total", "Input tokens removed by compaction", ["operation"]
+)
+
+
+# --- Tokenizer ---------------------------------------------------------------
+
+class _EstimatingTokenizer:
+    """Fallback when tiktoken is not installed: ~4 chars per token, 1 per CJK character."""
+    exact = False
+    _CJK = re.compile(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+    def count(self, text: str) -> int:
+        cjk = len(self._CJK.findall(text))
+        return cjk + -(-(len(text) - cjk) // 4)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.count(text)
+        if tokens <= max_tokens:
+            return text
+        return text[:len(text) * max_tokens // tokens]
+
+
+class _BPETokenizer:
+    """Exact o200k_base token counts via tiktoken."""
+    exact = True
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode_ordinary(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.encoding.encode_ordinary(text)
+        if len(tokens) <= max_tokens:
+            return text
+        # A cut inside a multi-byte character decodes to U+FFFD
+        return self.encoding.decode(tokens[:max_tokens]).rstrip("\ufffd")
+
+
+def _load_bpe_tokenizer() -> _BPETokenizer:
+    import tiktoken
+
+    data = ENCODING_PATH.read_bytes()
+    if hashlib.sha256(data).hexdigest() != ENCODING_SHA256:
+        raise ValueError(f"Unexpected hash for {ENCODING_PATH}")
+    ranks = {
+        base64.b64decode(token): int(rank)
+        for token, rank in (line.split() for line in data.splitlines() if line)
+    }
+    return _BPETokenizer(tiktoken.Encoding(
+        name="o200k_base",
+        pat_str=_O200K_PATTERN,
+        mergeable_ranks=ranks,
+        special_tokens=_O200K_SPECIAL_TOKENS,
+    ))
+
+
+_tokenizer: "_BPETokenizer | _EstimatingTokenizer | None" = None
+_tokenizer_lock = threading.Lock()
+
+
+def get_tokenizer() -> "_BPETokenizer | _EstimatingTokenizer":
+    """
+    Get the process-wide tokenizer (singleton pattern).
+
+    Returns:
+        Tokenizer with count(text) and truncate(text, max_tokens)
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                try:
+                    _tokenizer = _load_bpe_tokenizer()
+                except Exception as e:
+                    logger.warning(f"[TokenBudget] BPE tokenizer unavailable, estimating token counts: {e}")
+                    _tokenizer = _EstimatingTokenizer()
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    """Number of o200k_base tokens in text."""
+    return get_tokenizer().count(text) if text else 0
+
+
+# --- Compaction --------------------------------------------------------------
+
+_BLOCK_DROP = re.compile(r"<(script|style|head)\b[^>]*>.*?</\1>", re.IGNORECASE | re.DOTALL)
+_HEADING_OPEN = re.compile(r"<h[1-6]\b[^>]*>", re.IGNORECASE)
+_LIST_ITEM = re.compile(r"<li\b[^>]*>", re.IGNORECASE)
+_CELL = re.compile(r"<t[dh]\b[^>]*>", re.IGNORECASE)
+_LINE_BREAK = re.compile(
+    r"<br\s*/?>|</(p|div|li|ul|ol|tr|table|section|article|header|footer|h[1-6])\s*>", re.IGNORECASE
+)
+_TAG = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"[ \t\u00a0]+")
+
+
+def html_to_text(content: str) -> str:
+    """
+    Convert HTML to compact text.
+
+    Headings become ``## Title`` lines and list items ``- item`` lines, so
+    section structure survives; markup, attributes and blank lines do not.
+
+    Args:
+        content: HTML or plain text
+
+    Returns:
+        Compact text, one block per line
+    """
+    if "<" in content:
+        content = _BLOCK_DROP.sub("", content)
+        content = _HEADING_OPEN.sub("\n## ", content)
+        content = _LIST_ITEM.sub("\n- ", content)
+        content = _CELL.sub(" ", content)
+        content = _LINE_BREAK.sub("\n", content)
+        content = _TAG.sub("", content)
+    content = html.unescape(content)
+
+    lines = []
+    for line in content.splitlines():
+        line = _SPACES.sub(" ", line).strip()
+        if line and line not in ("-", "##"):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+@dataclass
+class _Section:
+    title: str
+    lines: list[str]
+    priority: int = CORE
+    trimmable: bool = False
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+def _is_heading(line: str, plain_text_headings: bool) -> bool:
+    if line.startswith("## "):
+        return True
+    # Plain-text JDs mark sections with short "Title:" lines
+    return plain_text_headings and len(line) <= 60 and line.endswith((":", "\uff1a"))
+
+
+def _split_sections(text: str, plain_text_headings: bool) -> list[_Section]:
+    sections = [_Section(title="", lines=[])]
+    for line in text.splitlines():
+        if _is_heading(line, plain_text_headings):
+            sections.append(_Section(title=line.lstrip("# ").rstrip(":\uff1a").strip(), lines=[line]))
+        else:
+            sections[-1].lines.append(line)
+    return [section for section in sections if section.lines]
+
+
+def _priority(title: str, rules: list[tuple[re.Pattern, int]]) -> int:
+    lowered = title.lower()
+    for pattern, priority in rules:
+        if pattern.search(lowered):
+            return priority
+    return CORE
+
+
+def _trim_details(sections: list[_Section], costs: list[int], total: int, budget: float) -> int:
+    """Drop the last bullet of the longest detail entry until the text fits; returns the new total."""
+    tokenizer = get_tokenizer()
+    # Bullets per entry: an entry is a non-bullet line (role, company) and the bullets under it
+    entries: list[tuple[int, list[int]]] = []
+    for i, section in enumerate(sections):
+        if not section.trimmable or not costs[i]:
+            continue
+        bullets = None
+        for j, line in enumerate(section.lines):
+            if not line.startswith("- ") or bullets is None:
+                bullets = []
+                entries.append((i, bullets))
+            if line.startswith("- "):
+                bullets.append(j)
+
+    removed: dict[int, set[int]] = {}
+    while total > budget:
+        candidates = [entry for entry in entries if len(entry[1]) > 1]
+        if not candidates:
+            break
+        i, bullets = max(candidates, key=lambda entry: len(entry[1]))
+        j = bullets.pop()
+        removed.setdefault(i, set()).add(j)
+        total -= tokenizer.count(sections[i].lines[j]) + 1
+
+    for i, lines in removed.items():
+        sections[i].lines = [line for j, line in enumerate(sections[i].lines) if j not in lines]
+        costs[i] = tokenizer.count(sections[i].text) + 1
+    return sum(costs)
+
+
+def _fit(sections: list[_Section], budget: float, dropped: list[str]) -> str:
+    tokenizer = get_tokenizer()
+    costs = [tokenizer.count(section.text) + 1 for section in sections]
+    total = sum(costs)
+
+    # Lowest priority first; among equals, the later section first
+    for i in sorted(range(len(sections)), key=lambda i: (sections[i].priority, -i)):
+        if total <= budget or sections[i].priority >= CORE:
+            break
+        total -= costs[i]
+        costs[i] = 0
+        dropped.append(sections[i].title)
+
+    if total > budget:
+        total = _trim_details(sections, costs, total, budget)
+
+    text = "\n".join(section.text for section, cost in zip(sections, costs, strict=True) if cost)
+    if total > budget:
+        text = tokenizer.truncate(text, budget) + "\n[...]"
+    return text
+
+
+@dataclass
+class CompactedInputs:
+    """Compacted LLM inputs with token accounting."""
+    texts: dict[str, str]
+    tokens_before: dict[str, int] = field(default_factory=dict)
+    tokens_after: dict[str, int] = field(default_factory=dict)
+    dropped_sections: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens removed across all inputs."""
+        return sum(self.tokens_before.values()) - sum(self.tokens_after.values())
+
+
+def _budget(operation: str, name: str) -> int | None:
+    override = os.getenv(f"INPUT_TOKEN_BUDGET_{operation.upper()}_{name.upper()}")
+    if override:
+        return int(override)
+    return DEFAULT_BUDGETS.get(operation, {}).get(name)
+
+
+def compact_resume(resume: str, budget: int | None, dropped: list[str] | None = None) -> str:
+    """
+    Compact a resume to text within a token budget.
+
+    Args:
+        resume: Resume HTML or text
+        budget: Token budget, or None for no limit
+        dropped: Receives the titles of dropped sections
+
+    Returns:
+        Compact resume text
+    """
+    sections = _split_sections(html_to_text(resume), plain_text_headings=False)
+    for section in sections:
+        title = section.title.lower()
+        section.priority = _priority(title, _RESUME_SECTION_PRIORITY) if title else CORE
+        section.trimmable = bool(_RESUME_DETAIL_SECTION.search(title))
+    return _fit(sections, budget if budget is not None else float("inf"), dropped if dropped is not None else [])
+
+
+def compact_job_description(job_description: str, budget: int | None, dropped: list[str] | None = None) -> str:
+    """
+    Compact a job description: drop EEO/benefits boilerplate, then fit a token budget.
+
+    Args:
+        job_description: Job description HTML or text
+        budget: Token budget, or None for no limit
+        dropped: Receives the titles of dropped sections
+
+    Returns:
+        Compact job description text
+    """
+    dropped = dropped if dropped is not None else []
+    sections = []
+    for section in _split_sections(html_to_text(job_description), plain_text_headings=True):
+        if section.title and _JD_BOILERPLATE_HEADING.search(section.title.lower()):
+            dropped.append(section.title)
+            continue
+        section.lines = [line for line in section.lines if not _JD_BOILERPLATE_LINE.search(line)]
+        if not section.lines:
+            continue
+        section.priority = _priority(section.title, _JD_SECTION_PRIORITY) if section.title else CORE
+        sections.append(section)
+    return _fit(sections, budget if budget is not None else float("inf"), dropped)
+
+
+_COMPACTORS = {"resume": compact_resume, "job_description": compact_job_description}
+
+
+def compact_inputs(operation: str, **inputs: str) -> CompactedInputs:
+    """
+    Compact the inputs of one LLM call to the operation's token budgets.
+
+    Args:
+        operation: Budget key (e.g., "gap_analysis")
+        **inputs: Inputs by kind: resume and/or job_description
+
+    Returns:
+        CompactedInputs; texts are unchanged when INPUT_COMPACTION_ENABLED=false
+    """
+    if os.getenv("INPUT_COMPACTION_ENABLED", "true").lower() != "true":
+        return CompactedInputs(texts=dict(inputs))
+
+    result = CompactedInputs(texts={})
+    for name, text in inputs.items():
+        dropped: list[str] = []
+        compacted = _COMPACTORS[name](text, _budget(operation, name), dropped) if text else text
+        result.texts[name] = compacted
+        result.tokens_before[name] = count_tokens(text)
+        result.tokens_after[name] = count_tokens(compacted)
+        if dropped:
+            result.dropped_sections[name] = dropped
+
+    _tokens_sent.inc(sum(result.tokens_after.values()), operation=operation)
+    _tokens_saved.inc(max(result.tokens_saved, 0), operation=operation)
+    logger.info(
+        f"[TokenBudget] {operation}: {sum(result.tokens_before.values())} -> "
+        f"{sum(result.tokens_after.values())} input tokens, dropped {result.dropped_sections or 'nothing'}"
+    )
+    return result
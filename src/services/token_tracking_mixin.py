@@ -4,7 +4,16 @@ Provides a reusable way to track token usage across services.
 """
 from typing import Any
 
+from src.core.metrics.registry import get_metrics_registry
 from src.core.monitoring_service import monitoring_service
+from src.services.output_budget import get_output_budget
+
+_prompt_tokens = get_metrics_registry().counter(
+    "llm_prompt_tokens_total", "Prompt tokens sent to Azure OpenAI", ["operation"]
+)
+_cached_prompt_tokens = get_metrics_registry().counter(
+    "llm_cached_prompt_tokens_total", "Prompt tokens served from the Azure OpenAI prompt cache", ["operation"]
+)
 
 
 class TokenTrackingMixin:
@@ -14,7 +23,8 @@ class TokenTrackingMixin:
         self,
         response: dict[str, Any],
         operation: str,
-        additional_properties: dict[str, Any] | None = None
+        additional_properties: dict[str, Any] | None = None,
+        prompt_version: str | None = None
     ) -> dict[str, int]:
         """
         Track OpenAI token usage from API response.
@@ -23,15 +33,19 @@ class TokenTrackingMixin:
             response: OpenAI API response containing usage data
             operation: Name of the operation (e.g., "gap_analysis", "keyword_extraction")
             additional_properties: Additional properties to track
+            prompt_version: Prompt version; feeds the adaptive max_tokens policy
 
         Returns:
             Dictionary with token usage statistics
         """
-        usage = response.get("usage", {})
+        usage = response.get("usage") or {}
+        prompt_details = usage.get("prompt_tokens_details") or {}
         token_info = {
             "prompt_tokens": usage.get("prompt_tokens", 0),
             "completion_tokens": usage.get("completion_tokens", 0),
-            "total_tokens": usage.get("total_tokens", 0)
+            "total_tokens": usage.get("total_tokens", 0),
+            # Prompt prefix served from the Azure OpenAI prompt cache
+            "cached_tokens": prompt_details.get("cached_tokens") or 0
         }
 
         # Build tracking properties
@@ -40,8 +54,11 @@ class TokenTrackingMixin:
             "prompt_tokens": token_info["prompt_tokens"],
             "completion_tokens": token_info["completion_tokens"],
             "total_tokens": token_info["total_tokens"],
+            "cached_tokens": token_info["cached_tokens"],
             "model": response.get("model", "unknown"),
-            "finish_reason": response.get("choices", [{}])[0].get("finish_reason", "unknown")
+            "finish_reason": response.get("choices", [{}])[0].get("finish_reason", "unknown"),
+            "prompt_version": prompt_version or "unknown",
+            "continued": bool(response.get("continued"))
         }
 
         # Add any additional properties
@@ -57,6 +74,19 @@ class TokenTrackingMixin:
             token_info["total_tokens"],
             {"operation": operation}
         )
+        monitoring_service.track_metric(
+            "openai_cached_tokens",
+            token_info["cached_tokens"],
+            {"operation": operation}
+        )
+
+        # Cache hit ratio per operation = cached / prompt tokens
+        _prompt_tokens.inc(token_info["prompt_tokens"], operation=operation)
+        _cached_prompt_tokens.inc(token_info["cached_tokens"], operation=operation)
+
+        # Completion length distribution behind the adaptive max_tokens
+        if prompt_version:
+            get_output_budget().record(operation, prompt_version, token_info["completion_tokens"])
 
         return token_info
 
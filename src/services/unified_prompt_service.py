@@ -3,10 +3,9 @@ Unified Prompt Service for managing prompts and LLM configurations.
 Combines multilingual support with YAML-based configuration management.
 """
 import logging
-from pathlib import Path
 from typing import ClassVar
 
-from src.core.simple_prompt_manager import SimplePromptManager
+from src.core.simple_prompt_manager import get_prompt_manager
 from src.models.prompt_config import LLMConfig, PromptConfig
 
 logger = logging.getLogger(__name__)
@@ -36,7 +35,8 @@ class UnifiedPromptService:
         """
         if prompts_base_dir is None:
             prompts_base_dir = "src/prompts"
-        self.simple_prompt_manager = SimplePromptManager(prompts_base_dir)
+        # Shared compiled registry for the directory
+        self.simple_prompt_manager = get_prompt_manager(prompts_base_dir)
         self._cache = {}  # Cache for loaded configs
         # Allow overriding the default task path
         if task_path:
@@ -161,18 +161,16 @@ class UnifiedPromptService:
         if language not in self.SUPPORTED_LANGUAGES:
             return []
 
-        # Scan the task directory for files with language suffix
-        task_dir = Path(self.simple_prompt_manager.prompts_dir) / self.TASK_PATH
-        if not task_dir.exists():
-            return []
-
+        # Files with language suffix, from the registry's file index
         versions = []
-        pattern = f"*-{language}.yaml"
-        for file in task_dir.glob(pattern):
+        suffix = f"-{language}.yaml"
+        for filename in self.simple_prompt_manager.list_filenames(self.TASK_PATH):
+            if not filename.endswith(suffix):
+                continue
             # Extract version from filename (v1.3.0-zh-TW.yaml -> 1.3.0)
-            filename = file.stem  # Remove .yaml
-            if '-' in filename:
-                version = filename.split('-')[0]  # Get part before first dash
+            stem = filename[:-len(".yaml")]
+            if '-' in stem:
+                version = stem.split('-')[0]  # Get part before first dash
                 if version.startswith('v'):
                     version = version[1:]  # Remove 'v' prefix
                 versions.append(version)
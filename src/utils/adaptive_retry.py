@@ -11,8 +11,16 @@ import secrets
 from collections.abc import Callable
 from typing import Any
 
+from src.core.metrics.registry import get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
+# Process-wide counters; strategies are created per request
+_retry_attempts = get_metrics_registry().counter("retry_attempts", "Retries scheduled by error type", ["error_type"])
+_retry_outcomes = get_metrics_registry().counter(
+    "retry_outcomes", "Retried operations by error type and final outcome", ["error_type", "outcome"]
+)
+
 
 class AdaptiveRetryStrategy:
     """
@@ -107,6 +115,7 @@ class AdaptiveRetryStrategy:
                 # Success - update stats if this was a retry
                 if attempt > 0:
                     self.retry_stats[error_type]["successes"] += 1
+                    _retry_outcomes.inc(error_type=error_type, outcome="success")
                     logger.info(
                         f"Retry succeeded on attempt {attempt + 1} "
                         f"for {error_type} error"
@@ -125,6 +134,7 @@ class AdaptiveRetryStrategy:
                 # Check if we should continue retrying
                 if attempt >= config["max_attempts"] - 1:
                     self.retry_stats[error_type]["failures"] += 1
+                    _retry_outcomes.inc(error_type=error_type, outcome="failure")
                     logger.error(
                         f"All {config['max_attempts']} retry attempts failed "
                         f"for {error_type} error: {e!s}"
@@ -148,6 +158,7 @@ class AdaptiveRetryStrategy:
 
                 # Update retry statistics
                 self.retry_stats[error_type]["attempts"] += 1
+                _retry_attempts.inc(error_type=error_type)
 
                 logger.warning(
                     f"Attempt {attempt + 1} failed with {error_type} error: {e!s}. "
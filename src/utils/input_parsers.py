@@ -5,8 +5,6 @@ Input parsing utilities for handling various input formats from Bubble.io and ot
 import logging
 import re
 
-from bs4 import BeautifulSoup
-
 logger = logging.getLogger(__name__)
 
 
@@ -91,6 +89,8 @@ def parse_multiline_items(content: str | list) -> list[str]:
     Returns:
         List of parsed items
     """
+    from bs4 import BeautifulSoup
+
     if not content:
         return []
 
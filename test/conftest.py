@@ -16,6 +16,7 @@ os.environ['TESTING'] = 'true'
 os.environ['MONITORING_ENABLED'] = 'false'
 os.environ['LIGHTWEIGHT_MONITORING'] = 'false'
 os.environ['ERROR_CAPTURE_ENABLED'] = 'false'
+os.environ['CPU_POOL_MODE'] = 'inline'
 os.environ['AZURE_OPENAI_ENDPOINT'] = 'https://test.openai.azure.com'
 os.environ['AZURE_OPENAI_API_KEY'] = 'test-key'
 os.environ['LLM2_ENDPOINT'] = 'https://test.openai.azure.com'
@@ -37,11 +37,13 @@ def create_gantt_chart(results):
     for result in results['results']:
         if result['status'] == 'success' and 'data' in result:
             metadata = result['data'].get('metadata', {})
-            if 'execution_timeline' in metadata:
+            if 'execution_timeline' in metadata or 'spans' in metadata:
                 test_cases.append({
                     'name': result['test_case'],
-                    'timeline': metadata['execution_timeline'],
-                    'timings': metadata.get('detailed_timings_ms', {})
+                    'timeline': metadata.get('execution_timeline', {}),
+                    'timings': metadata.get('detailed_timings_ms', {}),
+                    # Span tree, present when the API runs with SPAN_TRACE_IN_RESPONSE=true
+                    'spans': metadata.get('spans')
                 })
 
     if not test_cases:
@@ -54,6 +56,7 @@ def create_gantt_chart(results):
     # Define colors for different task types
     colors = {
         'keywords': '#FF6B6B',           # Red
+        'keyword_matching': '#FF6B6B',   # Red (span name)
         'embeddings': '#4ECDC4',         # Teal
         'structure_analysis': '#95E77E',  # Green
         'pgvector_warmup': '#FFE66D',    # Yellow
@@ -64,7 +67,10 @@ def create_gantt_chart(results):
 
     # Plot 1: Detailed timeline for first test case
     ax1 = plt.subplot(3, 1, 1)
-    plot_single_test_timeline(ax1, test_cases[0], colors)
+    if test_cases[0]['spans']:
+        plot_span_timeline(ax1, test_cases[0], colors)
+    else:
+        plot_single_test_timeline(ax1, test_cases[0], colors)
 
     # Plot 2: Comparison across all test cases
     ax2 = plt.subplot(3, 1, 2)
@@ -175,6 +181,36 @@ def plot_single_test_timeline(ax, test_case, colors):
            fontsize=11, fontweight='bold', va='center',
            bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.5))
 
+def flatten_spans(span, depth=0):
+    """Flatten a span tree (metadata.spans) into (name, depth, start_ms, end_ms) rows in start order"""
+    rows = [(span['name'], depth, span['start_ms'], span['end_ms'])]
+    for child in sorted(span.get('children', []), key=lambda c: c['start_ms']):
+        rows.extend(flatten_spans(child, depth + 1))
+    return rows
+
+def plot_span_timeline(ax, test_case, colors):
+    """Plot the recorded span tree of a single test case, one bar per span"""
+
+    rows = flatten_spans(test_case['spans'])
+    ax.set_title(f'Span Timeline - {test_case["name"]}', fontsize=14, fontweight='bold')
+
+    max_time = 0
+    for y_pos, (name, depth, start, end) in enumerate(rows):
+        duration = end - start
+        ax.barh(y_pos, duration, left=start, height=0.7,
+               color=colors.get(name, 'gray'), alpha=0.8 if depth else 0.3,
+               edgecolor='black', linewidth=1)
+        ax.text(start + duration/2, y_pos, f'{duration:.0f}ms',
+               ha='center', va='center', fontsize=9, fontweight='bold')
+        max_time = max(max_time, end)
+
+    ax.set_ylim(len(rows) - 0.5, -0.5)
+    ax.set_xlim(0, max_time * 1.1 if max_time else 1)
+    ax.set_xlabel('Time (milliseconds)', fontsize=11)
+    ax.set_yticks(range(len(rows)))
+    ax.set_yticklabels(['  ' * depth + name.replace('_', ' ').title() for name, depth, _, _ in rows])
+    ax.grid(True, alpha=0.3, axis='x')
+
 def plot_comparison_timeline(ax, test_cases, colors):
     """Plot comparison of execution times across test cases"""
 
@@ -7,6 +7,7 @@ Tests:
 - API-GAP-003-PT: 資源池重用率測試
 - API-GAP-004-PT: API 呼叫減少驗證
 - API-GAP-005-PT: 資源池擴展測試
+- API-GAP-006-PT: Fan-out 子請求 vs 單一 completion 牆鐘時間比較
 
 IMPORTANT:
 - For P50/P95 tests, MUST disable resource pool cache (RESOURCE_POOL_ENABLED=false)
@@ -754,6 +755,68 @@ class TestGapAnalysisV2Performance:
             print("   Pool can scale from MIN to MAX size based on load")
             print("   In production, this enables handling traffic spikes efficiently")
 
+    # TEST: API-GAP-006-PT
+    @pytest.mark.performance
+    def test_fanout_wall_clock(self, test_data):
+        """TEST: API-GAP-006-PT - Fan-out 子請求與單一 completion 的牆鐘時間比較.
+
+        同一份輸入分別以單一 completion 與平行子請求 (GAP_ANALYSIS_FANOUT_ENABLED)
+        執行 Gap Analysis, 交替順序以抵銷 prompt cache 暖機, 報告 P50 差異。
+        兩種模式都必須產生完整的回應欄位。
+        """
+        from src.services.gap_analysis_v2 import GapAnalysisServiceV2
+
+        runs = int(os.getenv("GAP_FANOUT_BENCHMARK_RUNS", "5"))
+        index_result = {
+            "similarity_percentage": 72,
+            "keyword_coverage": {
+                "coverage_percentage": 57,
+                "covered_keywords": ["Python", "FastAPI", "Docker", "AWS"],
+                "missed_keywords": ["React", "Kubernetes", "Microservices"]
+            }
+        }
+
+        async def timed(fanout: bool, data: dict) -> float:
+            with patch.dict(os.environ, {"GAP_ANALYSIS_FANOUT_ENABLED": str(fanout).lower()}):
+                start = time.perf_counter()
+                result = await GapAnalysisServiceV2().analyze_with_context(
+                    resume=data["resume"],
+                    job_description=data["job_description"],
+                    index_result=index_result,
+                    language="en"
+                )
+                elapsed = time.perf_counter() - start
+            for field in ("CoreStrengths", "KeyGaps", "QuickImprovements", "OverallAssessment"):
+                assert result.get(field), f"{field} empty (fanout={fanout})"
+            return elapsed
+
+        timings = {"monolithic": [], "fanout": []}
+        for i in range(runs):
+            data = self.generate_unique_test_data(i, test_data)
+            order = [False, True] if i % 2 == 0 else [True, False]
+            for fanout in order:
+                elapsed = asyncio.run(timed(fanout, data))
+                timings["fanout" if fanout else "monolithic"].append(elapsed)
+                print(f"  Run {i + 1} {'fanout' if fanout else 'monolithic'}: {elapsed:.2f}s")
+
+        p50_mono = statistics.median(timings["monolithic"])
+        p50_fanout = statistics.median(timings["fanout"])
+        improvement = (p50_mono - p50_fanout) / p50_mono * 100
+
+        print("\n📊 Gap Analysis wall-clock (P50):")
+        print(f"  Monolithic: {p50_mono:.2f}s")
+        print(f"  Fan-out:    {p50_fanout:.2f}s ({improvement:+.1f}%)")
+
+        self.save_performance_results("gap_fanout", {
+            "test_id": "API-GAP-006-PT",
+            "timestamp": datetime.now().isoformat(),
+            "runs": runs,
+            "timings_s": timings,
+            "p50_monolithic_s": round(p50_mono, 3),
+            "p50_fanout_s": round(p50_fanout, 3),
+            "improvement_percent": round(improvement, 1)
+        })
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-m", "performance"])
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Performance test for keyword marking on large tailored resumes.
+Test ID: KW-MARK-001-PT
+
+Compares the single-pass KeywordMarkingEngine (one compiled automaton, one DOM
+walk, spans spliced in place) against the legacy approach that ran one regex
+per keyword on every text node and re-parsed each modified node with
+BeautifulSoup.
+"""
+
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+import pytest
+from bs4 import BeautifulSoup
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.enhanced_marker import EnhancedMarker
+
+ORIGINAL_KEYWORDS = ["Python", "Docker", "AWS", "SQL", "REST", "machine learning", "team leadership", "Azure"]
+NEW_KEYWORDS = [
+    "Kubernetes", "FastAPI", "CI/CD", "Node.js", "JavaScript", "PostgreSQL",
+    "GraphQL", "microservices", "Terraform", "data pipelines",
+]
+FILLER = ["the", "and", "built", "led", "with", "for", "scalable", "systems", "across", "teams"]
+
+
+def build_tailored_resume(roles: int = 40, bullets: int = 6, seed: int = 42) -> str:
+    """Build a large tailored resume with opt-modified and opt-placeholder spans."""
+    rng = random.Random(seed)  # noqa: S311
+    vocabulary = (ORIGINAL_KEYWORDS + NEW_KEYWORDS) * 2 + FILLER * 6
+
+    def sentence(words: int) -> str:
+        return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+    parts = [f"<h2>Summary</h2><p>{sentence(60)}</p>", "<h2>Experience</h2>"]
+    for role in range(roles):
+        items = "".join(
+            f'<li>{sentence(25)} <span class="opt-modified">{sentence(12)} <strong>{sentence(4)}</strong></span>'
+            f' <span class="opt-placeholder">[X]% {sentence(3)}</span></li>'
+            for _ in range(bullets)
+        )
+        parts.append(f"<h3>Role {role}</h3><ul>{items}</ul>")
+    return "\n".join(parts)
+
+
+def legacy_mark_keywords(marker: EnhancedMarker, html: str, original: list[str], new: list[str]) -> str:
+    """Reference implementation of the former per-text-node re-parsing marker."""
+    soup = BeautifulSoup(html, 'html.parser')
+    keywords = sorted(
+        [(kw, 'opt-keyword-existing') for kw in original] + [(kw, 'opt-keyword') for kw in new],
+        key=lambda item: len(item[0]), reverse=True,
+    )
+
+    def mark_text(text: str) -> str:
+        marked, replacements = [], []
+        for keyword, css_class in keywords:
+            for match in re.finditer(marker._create_keyword_pattern(keyword), text, re.IGNORECASE):
+                start, end = match.span()
+                if any(start < m_end and end > m_start for m_start, m_end in marked):
+                    continue
+                marked.append((start, end))
+                corrected = marker._get_corrected_case(match.group())
+                replacements.append((start, end, f'<span class="{css_class}">{corrected}</span>'))
+        for start, end, replacement in sorted(replacements, reverse=True):
+            text = text[:start] + replacement + text[end:]
+        return text
+
+    for node in soup.find_all(string=True):
+        parent = node.parent
+        if parent.name in ['script', 'style']:
+            continue
+        if parent.name == 'span' and set(parent.get('class') or []) & set(EnhancedMarker.SKIP_SPAN_CLASSES):
+            continue
+        new_html = mark_text(str(node))
+        if new_html != str(node):
+            for child in list(BeautifulSoup(new_html, 'html.parser').children):
+                node.insert_before(child)
+            node.extract()
+    return str(soup)
+
+
+def measure(func, iterations: int = 5) -> dict[str, float]:
+    """Run a function several times and return timing statistics in ms."""
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": min(times), "median_ms": statistics.median(times), "max_ms": max(times)}
+
+
+class TestKeywordMarkingPerformance:
+    """Benchmark keyword marking on large tailored resumes."""
+
+    @pytest.fixture
+    def marker(self):
+        """Create EnhancedMarker instance."""
+        return EnhancedMarker()
+
+    @pytest.mark.parametrize("roles", [5, 20, 40])
+    def test_single_pass_vs_legacy(self, marker, roles):
+        """Single-pass marking produces identical HTML and is faster than per-node re-parsing."""
+        html = build_tailored_resume(roles=roles)
+
+        expected = legacy_mark_keywords(marker, html, ORIGINAL_KEYWORDS, NEW_KEYWORDS)
+        result = marker.mark_keywords(html, ORIGINAL_KEYWORDS, NEW_KEYWORDS)
+        assert result == expected
+
+        legacy = measure(lambda: legacy_mark_keywords(marker, html, ORIGINAL_KEYWORDS, NEW_KEYWORDS))
+        single_pass = measure(lambda: marker.mark_keywords(html, ORIGINAL_KEYWORDS, NEW_KEYWORDS))
+
+        print(f"\n{len(html) / 1024:.0f}KB resume: legacy {legacy['median_ms']:.1f}ms, "
+              f"single-pass {single_pass['median_ms']:.1f}ms "
+              f"({legacy['median_ms'] / single_pass['median_ms']:.1f}x)")
+        assert single_pass["median_ms"] < legacy["median_ms"]
+
+
+if __name__ == "__main__":
+    resume_marker = EnhancedMarker()
+    for role_count in (5, 20, 40, 80):
+        resume_html = build_tailored_resume(roles=role_count)
+        legacy_stats = measure(
+            lambda html=resume_html: legacy_mark_keywords(resume_marker, html, ORIGINAL_KEYWORDS, NEW_KEYWORDS)
+        )
+        new_stats = measure(
+            lambda html=resume_html: resume_marker.mark_keywords(html, ORIGINAL_KEYWORDS, NEW_KEYWORDS)
+        )
+        print(f"{len(resume_html) / 1024:6.0f}KB  legacy {legacy_stats['median_ms']:8.1f}ms  "
+              f"single-pass {new_stats['median_ms']:8.1f}ms")
@@ -0,0 +1,50 @@
+"""Unit tests for the request-scoped AnalyzedText document."""
+
+from unittest.mock import patch
+
+from src.services.analyzed_text import AnalyzedText, as_analyzed_text
+from src.services.index_calculation_v2 import IndexCalculationServiceV2
+
+
+class TestAnalyzedText:
+    """Test memoized views of AnalyzedText."""
+
+    def test_behaves_like_raw_string(self):
+        """AnalyzedText is a drop-in replacement for the raw text."""
+        doc = AnalyzedText("<p>Python &amp; FastAPI</p>")
+        assert doc == "<p>Python &amp; FastAPI</p>"
+        assert len(doc) == len("<p>Python &amp; FastAPI</p>")
+        assert type(doc.raw) is str
+
+    def test_derived_views(self):
+        """Clean, lowercase and hash views are derived from the raw text."""
+        doc = AnalyzedText("<p>Senior  Python &amp; FastAPI</p>\n<li>Docker</li>")
+        assert doc.clean_text == "Senior Python & FastAPI Docker"
+        assert doc.lower_text == "senior python & fastapi docker"
+        assert len(doc.content_hash) == 64
+
+    def test_views_are_computed_once(self):
+        """Each view is computed at most once per document."""
+        doc = AnalyzedText("<p>Python developer</p>")
+        with patch("src.services.analyzed_text.clean_html_text", return_value="Python developer") as mock_clean:
+            for _ in range(3):
+                _ = doc.clean_text
+                _ = doc.lower_text
+                _ = doc.normalized_text
+                _ = doc.content_hash
+            assert mock_clean.call_count == 1
+
+    def test_as_analyzed_text_reuses_instance(self):
+        """Existing documents are passed through unchanged."""
+        doc = AnalyzedText("resume")
+        assert as_analyzed_text(doc) is doc
+        assert isinstance(as_analyzed_text("resume"), AnalyzedText)
+        assert as_analyzed_text(None) == ""
+
+    def test_cache_key_matches_index_calculation(self):
+        """Cache keys are identical for raw strings and AnalyzedText."""
+        service = IndexCalculationServiceV2(embedding_client=object(), enable_cache=False)
+        raw = "<div>Python   Developer with FastAPI</div>"
+        assert service._generate_cache_key(raw, "embedding") == AnalyzedText(raw).cache_key("embedding")
+        assert service._normalize_text(raw) == "python developer with fastapi"
+
@@ -0,0 +1,111 @@
+"""
+Unit tests for the dependency-aware execution plan in CombinedAnalysisServiceV2
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.combined_analysis_v2 import CombinedAnalysisServiceV2
+from src.services.gap_analysis_v2 import GapAnalysisServiceV2
+
+RESUME = "Senior Python developer with FastAPI and PostgreSQL experience. " * 5
+JOB_DESCRIPTION = "We need a Python engineer who knows FastAPI, Docker and Kubernetes. " * 5
+KEYWORDS = ["Python", "FastAPI", "Docker", "Kubernetes"]
+INDEX_RESULT = {"similarity_percentage": 82, "keyword_coverage": {"coverage_percentage": 50}}
+
+
+def _build_service(prompt_needs_similarity: bool, events: list[str]) -> CombinedAnalysisServiceV2:
+    async def calculate_index(**kwargs):
+        await asyncio.sleep(0.1)
+        events.append("index_done")
+        return INDEX_RESULT
+
+    async def analyze_with_context(index_result, pending_index_result=None, **kwargs):
+        events.append("gap_started")
+        if pending_index_result is not None:
+            await pending_index_result
+        return {"CoreStrengths": "", "context": index_result}
+
+    index_service = MagicMock()
+    index_service.calculate_index = calculate_index
+    gap_service = MagicMock()
+    gap_service.requires_similarity_score.return_value = prompt_needs_similarity
+    gap_service.analyze_with_context = analyze_with_context
+
+    service = CombinedAnalysisServiceV2(index_service=index_service, gap_service=gap_service)
+    service.retry_strategy = None
+    service.enable_structure_analysis = False
+    service._generate_embeddings_parallel = AsyncMock(return_value={})
+    service._warmup_pgvector = AsyncMock(return_value={"completed": True, "duration_ms": 0})
+    return service
+
+
+@pytest.mark.asyncio
+class TestExecutionPlan:
+    """Gap Analysis waits only for the inputs its prompt uses"""
+
+    @pytest.fixture(autouse=True)
+    def _no_resource_pool(self, monkeypatch):
+        monkeypatch.setenv("RESOURCE_POOL_ENABLED", "false")
+
+    async def test_gap_starts_before_index_when_prompt_ignores_similarity(self):
+        """Coverage-only prompts start the LLM call while the index is still running"""
+        events = []
+        service = _build_service(prompt_needs_similarity=False, events=events)
+
+        result = await service._execute_parallel_analysis(RESUME, JOB_DESCRIPTION, KEYWORDS, "en", None)
+
+        assert events == ["gap_started", "index_done"]
+        assert set(result["gap_analysis"]["context"]) == {"keyword_coverage"}
+        assert result["index_calculation"] == INDEX_RESULT
+
+    async def test_gap_waits_for_index_when_prompt_uses_similarity(self):
+        """Prompts with {similarity_score} get the full index result"""
+        events = []
+        service = _build_service(prompt_needs_similarity=True, events=events)
+
+        result = await service._execute_parallel_analysis(RESUME, JOB_DESCRIPTION, KEYWORDS, "en", None)
+
+        assert events == ["index_done", "gap_started"]
+        assert result["gap_analysis"]["context"] == INDEX_RESULT
+
+    async def test_index_failure_cancels_gap(self):
+        """An index failure surfaces as-is and stops the in-flight gap analysis"""
+        events = []
+        service = _build_service(prompt_needs_similarity=False, events=events)
+        gap_cancelled = asyncio.Event()
+
+        async def failing_index(**kwargs):
+            await asyncio.sleep(0.05)
+            raise ValueError("Keywords must be provided")
+
+        async def slow_gap(**kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                gap_cancelled.set()
+                raise
+
+        service.index_service.calculate_index = failing_index
+        service.gap_service.analyze_with_context = slow_gap
+
+        with pytest.raises(ValueError, match="Keywords must be provided"):
+            await service._execute_parallel_analysis(RESUME, JOB_DESCRIPTION, KEYWORDS, "en", None)
+        await asyncio.wait_for(gap_cancelled.wait(), 1)
+
+
+class TestPromptDependencies:
+    """Detecting whether a gap analysis prompt needs the similarity score"""
+
+    def test_requires_similarity_score(self, monkeypatch):
+        """Only prompts that reference {similarity_score} need it"""
+        service = GapAnalysisServiceV2()
+        config = MagicMock()
+
+        config.prompts = {"system": "Coverage: {keyword_coverage_percentage}%", "user": "{resume}"}
+        monkeypatch.setattr(service, "_load_prompt_config", lambda: config)
+        assert service.requires_similarity_score() is False
+
+        config.prompts = {"system": "", "user": "Similarity Score: {similarity_score}%"}
+        assert service.requires_similarity_score() is True
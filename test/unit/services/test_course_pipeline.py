@@ -0,0 +1,172 @@
+"""
+Unit tests for course availability lookups pipelined with streamed Gap Analysis output
+"""
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services import course_availability
+from src.services.course_availability import CourseAvailabilityPipeline
+from src.services.gap_analysis_utils import SkillQueryStreamParser, parse_gap_response
+from src.services.output_budget import complete_with_continuation, reset_output_budget
+
+RESPONSE = """<core_strengths>
+- Python
+</core_strengths>
+<skill_development_priorities>
+SKILL_1::Docker::TECH::Containerize services
+SKILL_2::Kubernetes::TECH::Orchestrate containers
+SKILL_3::Cloud Architecture::DOMAIN::Design cloud systems
+</skill_development_priorities>
+<overall_assessment>Good fit</overall_assessment>"""
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestSkillQueryStreamParser:
+    """Skill queries are emitted once their line is complete"""
+
+    def test_emits_each_skill_once_in_order(self):
+        """Arbitrary chunk boundaries give the same skills as the full-response parser"""
+        parser = SkillQueryStreamParser()
+        emitted = []
+        for chunk in _chunks(RESPONSE, 7):
+            emitted.extend(parser.feed(chunk))
+
+        assert emitted == parse_gap_response(RESPONSE)["skill_queries"]
+        assert [skill["skill_category"] for skill in emitted] == ["SKILL", "SKILL", "FIELD"]
+
+    def test_skill_available_before_response_ends(self):
+        """The first skill is emitted as soon as its line ends, not at the closing tag"""
+        parser = SkillQueryStreamParser()
+        head, _ = RESPONSE.split("SKILL_2")
+
+        assert [skill["skill_name"] for skill in parser.feed(head)] == ["Docker"]
+        assert parser.feed("") == []
+
+
+@pytest.mark.asyncio
+class TestStreamedCompletion:
+    """Streaming through complete_with_continuation"""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_budget(self):
+        reset_output_budget()
+
+    async def test_deltas_forwarded_and_response_assembled(self):
+        """Deltas reach on_delta; the result looks like a non-streaming response"""
+        async def stream():
+            for chunk in _chunks(RESPONSE, 20):
+                yield {"model": "gpt-4.1", "choices": [{"delta": {"content": chunk}, "finish_reason": None}]}
+            yield {"choices": [{"delta": {}, "finish_reason": "stop"}]}
+
+        client = MagicMock()
+
+        async def chat_completion(**kwargs):
+            assert kwargs["stream"] is True
+            return stream()
+
+        client.chat_completion = chat_completion
+        deltas = []
+
+        response = await complete_with_continuation(
+            client, [{"role": "user", "content": "Analyze"}], "gap_analysis", "v1", max_tokens=3000,
+            on_delta=deltas.append
+        )
+
+        assert "".join(deltas) == RESPONSE
+        assert response["choices"][0]["message"]["content"] == RESPONSE
+        assert response["choices"][0]["finish_reason"] == "stop"
+        assert response["usage"]["completion_tokens"] > 0
+
+    async def test_final_usage_chunk_is_reported(self):
+        """Azure's usage (with cached prompt tokens) replaces the local estimate"""
+        usage = {
+            "prompt_tokens": 2048,
+            "completion_tokens": 120,
+            "total_tokens": 2168,
+            "prompt_tokens_details": {"cached_tokens": 1536},
+        }
+
+        async def stream():
+            yield {"model": "gpt-4.1", "choices": [{"delta": {"content": RESPONSE}, "finish_reason": None}],
+                   "usage": None}
+            yield {"choices": [{"delta": {}, "finish_reason": "stop"}], "usage": None}
+            yield {"model": "gpt-4.1", "choices": [], "usage": usage}
+
+        client = MagicMock()
+        requests = []
+
+        async def chat_completion(**kwargs):
+            requests.append(kwargs)
+            return stream()
+
+        client.chat_completion = chat_completion
+
+        response = await complete_with_continuation(
+            client, [{"role": "user", "content": "Analyze"}], "gap_analysis", "v1", max_tokens=3000,
+            on_delta=lambda delta: None
+        )
+
+        assert requests[0]["stream_options"] == {"include_usage": True}
+        assert response["usage"] == usage
+        assert response["choices"][0]["message"]["content"] == RESPONSE
+        assert response["choices"][0]["finish_reason"] == "stop"
+
+
+@pytest.mark.asyncio
+class TestCourseAvailabilityPipeline:
+    """Lookups started during streaming are merged into the final skill queries"""
+
+    async def test_resolve_merges_pipelined_and_missing_skills(self, monkeypatch):
+        """Streamed skills reuse their lookup; others are checked in one batch"""
+        calls = []
+
+        async def fake_check(skills):
+            calls.append([skill["skill_name"] for skill in skills])
+            await asyncio.sleep(0)
+            for skill in skills:
+                skill.update(has_available_courses=True, course_count=len(skill["skill_name"]))
+            skills[0]["resume_enhancement_project"] = ["partial"]
+            return skills
+
+        checker = MagicMock()
+        checker._build_enhancement_data.return_value = (["project"], ["certification"])
+        monkeypatch.setattr(course_availability, "check_course_availability", fake_check)
+        monkeypatch.setattr(course_availability, "_checker_instance", checker)
+
+        pipeline = CourseAvailabilityPipeline()
+        pipeline.submit({"skill_name": "Docker"})
+        pipeline.submit({"skill_name": "docker"})
+        pipeline.submit({"skill_name": "Kubernetes"})
+
+        final = [{"skill_name": "Docker"}, {"skill_name": "Go"}, {"skill_name": "Kubernetes"}]
+        result = await pipeline.resolve(final)
+
+        assert sorted(calls) == [["Docker"], ["Go"], ["Kubernetes"]]
+        assert [skill["course_count"] for skill in result] == [6, 2, 10]
+        assert result[0]["resume_enhancement_project"] == ["project"]
+        assert result[0]["resume_enhancement_certification"] == ["certification"]
+        assert all("resume_enhancement_project" not in skill for skill in result[1:])
+
+    async def test_unused_lookups_are_cancelled(self, monkeypatch):
+        """Skills missing from the final response do not keep running"""
+        started = asyncio.Event()
+
+        async def slow_check(skills):
+            started.set()
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(course_availability, "check_course_availability", slow_check)
+
+        pipeline = CourseAvailabilityPipeline()
+        pipeline.submit({"skill_name": "Docker"})
+        task = next(iter(pipeline._tasks.values()))
+        await started.wait()
+
+        pipeline.cancel()
+        await asyncio.sleep(0)
+        assert task.cancelled()
@@ -0,0 +1,95 @@
+"""
+Unit tests for gap analysis fan-out into parallel sub-prompts
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.services.gap_analysis_utils import GAP_SECTION_GROUPS, merge_gap_sections
+from src.services.gap_analysis_v2 import GapAnalysisServiceV2
+from src.services.output_budget import reset_output_budget
+
+SECTION_TEXT = {
+    "core_strengths": "- Strong Python background",
+    "key_gaps": "- 🔧 Kubernetes: no orchestration experience",
+    "quick_improvements": "- 🔧 Docker: mention container work",
+    "overall_assessment": "[V2.1.8-100W] Solid backend engineer.",
+    "skill_development_priorities": "SKILL_1::Kubernetes::TECH::Learn container orchestration",
+}
+
+
+def _xml(sections) -> str:
+    return "\n".join(f"<{name}>\n{SECTION_TEXT[name]}\n</{name}>" for name in sections)
+
+
+class TestMergeGapSections:
+    """Partial responses combine into the single-completion format"""
+
+    def test_sections_merged_in_output_order(self):
+        """Groups are reordered to the prompt's section order"""
+        merged = merge_gap_sections({
+            sections: _xml(sections) for sections in reversed(GAP_SECTION_GROUPS.values())
+        })
+
+        assert merged.startswith("<gap_analysis>\n<core_strengths>")
+        assert merged.index("<key_gaps>") < merged.index("<overall_assessment>") < merged.index(
+            "<skill_development_priorities>"
+        )
+
+    def test_sections_outside_the_group_are_ignored(self):
+        """A sub-response that writes extra sections does not duplicate them"""
+        merged = merge_gap_sections({
+            ("core_strengths",): _xml(["core_strengths", "key_gaps"]),
+            ("key_gaps",): "<key_gaps>\n- Real gap\n</key_gaps>",
+        })
+
+        assert merged.count("<key_gaps>") == 1
+        assert "- Real gap" in merged
+
+
+@pytest.mark.asyncio
+class TestFanout:
+    """GAP_ANALYSIS_FANOUT_ENABLED issues one parallel completion per section group"""
+
+    @pytest.fixture(autouse=True)
+    def _fanout(self, monkeypatch):
+        monkeypatch.setenv("GAP_ANALYSIS_FANOUT_ENABLED", "true")
+        reset_output_budget()
+
+    async def test_parallel_sub_prompts_share_prefix(self):
+        """All groups run concurrently with identical leading messages and merge into one result"""
+        requests = []
+        in_flight = 0
+        peak = 0
+
+        class FakeClient:
+            async def chat_completion(self, messages, **kwargs):
+                nonlocal in_flight, peak
+                requests.append(messages)
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                sections = next(s for s in GAP_SECTION_GROUPS.values() if f"<{s[0]}>" in messages[-1]["content"])
+                return {
+                    "choices": [{"message": {"content": _xml(sections)}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 3000, "completion_tokens": 200, "total_tokens": 3200},
+                }
+
+        service = GapAnalysisServiceV2()
+        messages = [{"role": "system", "content": "Analyze"}, {"role": "user", "content": "Resume"}]
+        skills = []
+
+        with patch("src.services.llm_factory.get_llm_client", return_value=FakeClient()):
+            content = await service._call_llm_with_context(messages, on_skill_query=skills.append)
+
+        assert len(requests) == 3 and peak == 3
+        assert all(request[:2] == messages for request in requests)
+        assert [skill["skill_name"] for skill in skills] == ["Kubernetes"]
+
+        result = service._parse_enhanced_response(content)
+        assert "Strong Python background" in result["CoreStrengths"]
+        assert "Kubernetes" in result["KeyGaps"]
+        assert "Solid backend engineer" in result["OverallAssessment"]
+        assert result["SkillSearchQueries"][0]["skill_name"] == "Kubernetes"
@@ -0,0 +1,100 @@
+"""
+Unit tests for Idempotency-Key replay of analysis results
+"""
+import asyncio
+
+import pytest
+
+from src.core.cache_backends import InProcessBackend
+from src.core.single_flight import request_key
+from src.services import idempotency
+from src.services.exceptions import ValidationError
+from src.services.idempotency import IdempotencyStore, run_deduplicated
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = IdempotencyStore(backend=InProcessBackend(max_entries=10), ttl_seconds=60)
+    monkeypatch.setattr(idempotency, "_idempotency_store", store)
+    return store
+
+
+@pytest.mark.asyncio
+class TestIdempotencyKey:
+    """Repeats of an Idempotency-Key reuse the first attempt"""
+
+    async def test_retry_after_completion_replays_stored_result(self, store):
+        """The pipeline runs once; the retry gets the stored result from the compressed store"""
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return {"keywords": ["Python"] * 100, "attempt": calls}
+
+        fingerprint = request_key("op", {"jd": "Python developer"})
+        first = await run_deduplicated("op_replay", fingerprint, work, idempotency_key="abc")
+        second = await run_deduplicated("op_replay", fingerprint, work, idempotency_key="abc")
+
+        assert calls == 1
+        assert first == second == {"keywords": ["Python"] * 100, "attempt": 1}
+        stored = store.backend.get("idempotency:op_replay:abc")
+        assert stored is not None and len(stored) < len(str(first))
+
+    async def test_retry_while_running_attaches(self, store):
+        """A repeat of an in-progress key waits for the running attempt"""
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"attempt": calls}
+
+        fingerprint = request_key("op", {"jd": "Go developer"})
+        results = await asyncio.gather(
+            run_deduplicated("op_attach", fingerprint, work, idempotency_key="abc"),
+            run_deduplicated("op_attach", fingerprint, work, idempotency_key="abc"),
+        )
+
+        assert calls == 1
+        assert results == [{"attempt": 1}, {"attempt": 1}]
+
+    async def test_key_reused_with_different_inputs_rejected(self, store):
+        """A key bound to one request body cannot return another request's result"""
+        async def work():
+            return {"ok": True}
+
+        await run_deduplicated("op_conflict", "fingerprint-a", work, idempotency_key="abc")
+
+        with pytest.raises(ValidationError) as exc_info:
+            await run_deduplicated("op_conflict", "fingerprint-b", work, idempotency_key="abc")
+        assert exc_info.value.status_code == 422
+
+    async def test_failures_are_not_stored(self, store):
+        """A retry after an error runs again"""
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("LLM timeout")
+            return {"attempt": calls}
+
+        with pytest.raises(RuntimeError):
+            await run_deduplicated("op_failure", "fingerprint", work, idempotency_key="abc")
+
+        assert await run_deduplicated("op_failure", "fingerprint", work, idempotency_key="abc") == {"attempt": 2}
+
+    async def test_without_key_nothing_is_stored(self, store):
+        """Requests without the header are only deduplicated while in flight"""
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await run_deduplicated("op_no_key", "fingerprint", work) == 1
+        assert await run_deduplicated("op_no_key", "fingerprint", work) == 2
@@ -0,0 +1,242 @@
+"""
+Unit tests for the asynchronous job queue
+"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.v1 import jobs as jobs_api
+from src.core.cache_backends import InProcessBackend
+from src.services import job_queue
+from src.services.exceptions import ServiceError, ValidationError
+from src.services.job_queue import (
+    JOB_FAILED,
+    JOB_SUCCEEDED,
+    JobQueue,
+    JobStore,
+    report_job_progress,
+    validate_webhook_url,
+)
+
+
+async def _public_dns(host, port):
+    return ["93.184.216.34"]
+
+
+def _queue(**kwargs) -> JobQueue:
+    return JobQueue(store=JobStore(backend=InProcessBackend(), ttl_seconds=60), **kwargs)
+
+
+async def _finished(queue: JobQueue, job_id: str) -> dict:
+    for _ in range(200):
+        record = await queue.store.get(job_id)
+        if record["status"] in (JOB_SUCCEEDED, JOB_FAILED):
+            return record
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+@pytest.mark.asyncio
+class TestJobQueue:
+    """Jobs run in the background with bounded queueing and concurrency"""
+
+    async def test_job_result_and_partial_progress(self, monkeypatch):
+        """The record carries the endpoint's response and stages reported while running"""
+        queue = _queue(concurrency=1)
+        monkeypatch.setattr(job_queue, "_job_queue", queue)
+
+        async def run():
+            await report_job_progress("index_calculation", {"similarity_percentage": 80})
+            return 200, {"success": True, "data": {"ok": True}}
+
+        record = await queue.submit("index_cal_and_gap_analysis", run)
+        assert record["status"] == "queued"
+
+        finished = await _finished(queue, record["job_id"])
+        assert finished["status"] == JOB_SUCCEEDED
+        assert finished["status_code"] == 200
+        assert finished["result"]["data"] == {"ok": True}
+        assert finished["partial"]["index_calculation"] == {"similarity_percentage": 80}
+        await queue.shutdown()
+
+    async def test_error_response_marks_job_failed(self):
+        """A 4xx/5xx endpoint response or an exception fails the job"""
+        queue = _queue()
+
+        async def rejected():
+            return 422, {"success": False}
+
+        async def crashed():
+            raise RuntimeError("boom")
+
+        first = await queue.submit("tailor_resume", rejected)
+        second = await queue.submit("tailor_resume", crashed)
+
+        assert (await _finished(queue, first["job_id"]))["status_code"] == 422
+        crashed_record = await _finished(queue, second["job_id"])
+        assert crashed_record["status"] == JOB_FAILED and crashed_record["status_code"] == 500
+        await queue.shutdown()
+
+    async def test_concurrency_limit_and_full_queue(self):
+        """At most `concurrency` jobs run; beyond max_queued waiting jobs, submit is rejected"""
+        queue = _queue(concurrency=2, max_queued=1)
+        release = asyncio.Event()
+        running = 0
+        peak = 0
+
+        async def run():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+            return 200, {}
+
+        records = []
+        for _ in range(3):
+            records.append(await queue.submit("tailor_resume", run))
+            await asyncio.sleep(0.01)
+
+        with pytest.raises(ServiceError) as exc_info:
+            await queue.submit("tailor_resume", run)
+        assert exc_info.value.status_code == 503
+
+        release.set()
+        for record in records:
+            await _finished(queue, record["job_id"])
+        assert peak == 2
+        await queue.shutdown()
+
+    async def test_rejected_submissions_leave_no_record(self, monkeypatch):
+        """Submissions racing for the last slot while records are stored get 503 and store nothing"""
+        queue = _queue(concurrency=1, max_queued=1)
+        release = asyncio.Event()
+
+        async def run():
+            await release.wait()
+            return 200, {}
+
+        first = await queue.submit("tailor_resume", run)
+        await asyncio.sleep(0.01)
+
+        put = queue.store.put
+
+        async def slow_put(record):
+            await asyncio.sleep(0.01)
+            await put(record)
+
+        monkeypatch.setattr(queue.store, "put", slow_put)
+        results = await asyncio.gather(
+            *(queue.submit("tailor_resume", run) for _ in range(3)), return_exceptions=True
+        )
+
+        accepted = [result for result in results if isinstance(result, dict)]
+        assert len(accepted) == 1
+        assert all(isinstance(result, ServiceError) for result in results if not isinstance(result, dict))
+        stored = [key for key in queue.store.backend._data if key.startswith("job:")]
+        assert sorted(stored) == sorted(f"job:{record['job_id']}" for record in (first, *accepted))
+
+        release.set()
+        await _finished(queue, accepted[0]["job_id"])
+        await queue.shutdown()
+
+    async def test_shutdown_fails_unfinished_jobs(self):
+        """Pollers of interrupted jobs get a final status"""
+        queue = _queue(concurrency=1)
+
+        async def run():
+            await asyncio.sleep(10)
+            return 200, {}
+
+        running = await queue.submit("tailor_resume", run)
+        waiting = await queue.submit("tailor_resume", run)
+        await asyncio.sleep(0.01)
+        await queue.shutdown()
+
+        assert (await queue.store.get(running["job_id"]))["status"] == JOB_FAILED
+        assert (await queue.store.get(waiting["job_id"]))["status"] == JOB_FAILED
+
+    async def test_webhook_receives_finished_job(self, monkeypatch):
+        """The finished record is POSTed to webhook_url without the URL itself"""
+        monkeypatch.setattr(job_queue, "_resolve", _public_dns)
+        queue = _queue()
+        delivered = []
+
+        async def notify(record):
+            delivered.append(job_queue.public_view(record))
+
+        monkeypatch.setattr(queue, "_notify", notify)
+
+        async def run():
+            return 200, {"success": True}
+
+        record = await queue.submit("tailor_resume", run, webhook_url="https://example.com/hook")
+        await _finished(queue, record["job_id"])
+        await asyncio.sleep(0)
+
+        assert delivered and delivered[0]["job_id"] == record["job_id"]
+        assert "webhook_url" not in delivered[0]
+        await queue.shutdown()
+
+
+@pytest.mark.asyncio
+class TestWebhookValidation:
+    """Callback URLs are restricted to http(s), public addresses and the allowed hosts"""
+
+    async def test_rejects_non_http_and_disallowed_hosts(self, monkeypatch):
+        monkeypatch.setattr(job_queue, "_resolve", _public_dns)
+        with pytest.raises(ValidationError):
+            await validate_webhook_url("file:///etc/passwd")
+
+        monkeypatch.setenv("JOB_WEBHOOK_ALLOWED_HOSTS", "hooks.bubble.io")
+        await validate_webhook_url("https://hooks.bubble.io/callback")
+        with pytest.raises(ValidationError):
+            await validate_webhook_url("https://example.com/callback")
+
+    @pytest.mark.parametrize("url", [
+        "http://169.254.169.254/latest/meta-data",
+        "http://127.0.0.1:8000/admin",
+        "http://10.0.0.5/hook",
+        "http://[::1]/hook",
+        "http://[::ffff:192.168.1.1]/hook",
+        "http://localhost/hook",
+    ])
+    async def test_rejects_internal_addresses(self, url):
+        """Hosts resolving to private, loopback or link-local addresses are refused by default"""
+        with pytest.raises(ValidationError):
+            await validate_webhook_url(url)
+
+    async def test_rejects_names_resolving_to_internal_addresses(self, monkeypatch):
+        """A public-looking name is checked by the addresses it resolves to"""
+        async def internal_dns(host, port):
+            return ["93.184.216.34", "10.1.2.3"]
+
+        monkeypatch.setattr(job_queue, "_resolve", internal_dns)
+        with pytest.raises(ValidationError):
+            await validate_webhook_url("https://rebind.example.com/hook")
+
+    async def test_private_addresses_allowed_when_configured(self, monkeypatch):
+        monkeypatch.setenv("JOB_WEBHOOK_ALLOW_PRIVATE", "true")
+        await validate_webhook_url("http://10.0.0.5/hook")
+
+
+class TestJobsEndpoint:
+    """GET /jobs/{job_id} polls the store"""
+
+    def test_poll_known_and_unknown_jobs(self, monkeypatch):
+        queue = _queue()
+        asyncio.run(queue.store.put({"job_id": "abc", "kind": "tailor_resume", "status": "queued", "webhook_url": None}))
+        monkeypatch.setattr(jobs_api, "get_job_queue", lambda: queue)
+
+        app = FastAPI()
+        app.include_router(jobs_api.router)
+        client = TestClient(app)
+
+        response = client.get("/jobs/abc")
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "queued"
+        assert "webhook_url" not in response.json()["data"]
+
+        assert client.get("/jobs/missing").status_code == 404
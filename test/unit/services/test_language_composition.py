@@ -0,0 +1,80 @@
+"""Unit tests for bulk script-composition counting."""
+
+import random
+
+import pytest
+
+from src.services.language_detection.composition import (
+    ScriptComposition,
+    classify_char,
+    count_script_composition,
+)
+from src.services.language_detection.mixed_language_detector import MixedLanguageDetectionService
+from src.services.language_detection.rule_based_detector import RuleBasedLanguageDetector
+from src.services.language_detection.simple_language_detector import SimplifiedLanguageDetector
+
+
+def reference_composition(text: str) -> ScriptComposition:
+    """Per-character reference implementation."""
+    counts = dict.fromkeys("TSEJKPDON", 0)
+    total = 0
+    for char in text:
+        cls = classify_char(char)
+        if cls:
+            total += 1
+            counts[cls] += 1
+    return ScriptComposition(
+        total, counts["T"], counts["S"], counts["E"], counts["J"],
+        counts["K"], counts["P"], counts["D"], counts["O"],
+    )
+
+
+class TestScriptComposition:
+    """Test bulk composition counting against the per-character rules."""
+
+    @pytest.mark.parametrize("text", [
+        "",
+        "Senior Python Developer, 5+ years (FastAPI/Django).",
+        "我們正在尋找資深的Python開發工程師，熟悉Docker。",
+        "我们正在寻找资深的软件开发工程师",
+        "ひらがなカタカナ 한국어 mañana ¿qué? Ωмега ²",
+        "Emoji 😀 and extension B 𠀀 characters",
+    ])
+    def test_matches_reference(self, text):
+        """Bulk counts equal per-character classification."""
+        assert count_script_composition(text) == reference_composition(text)
+
+    def test_random_mixed_text_matches_reference(self):
+        """Randomized mixed-script text is counted exactly."""
+        alphabet = "abcXYZ 123 .,!，。資料软件ひらカナ한국ñáé¿ЖΩ٣²\t\n繁体語😀"
+        rng = random.Random(42)  # noqa: S311
+        for _ in range(200):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 80)))
+            assert count_script_composition(text) == reference_composition(text)
+
+    def test_sample_mode_scales_counts(self):
+        """Sampling long text keeps ratios and scales counts to full length."""
+        text = "資深工程師 Python " * 5000
+        exact = count_script_composition(text)
+        sampled = count_script_composition(text, sample_limit=2000)
+
+        assert sampled.total_chars == pytest.approx(exact.total_chars, rel=0.02)
+        assert (sampled.traditional_chinese_chars / sampled.total_chars
+                == pytest.approx(exact.traditional_chinese_chars / exact.total_chars, abs=0.02))
+
+    def test_sample_mode_ignored_for_short_text(self):
+        """Text shorter than the sample limit is counted exactly."""
+        text = "資深工程師 Python"
+        assert count_script_composition(text, sample_limit=1000) == count_script_composition(text)
+
+    def test_detectors_share_composition(self):
+        """All detectors report the same counts for the same text."""
+        text = "我們正在尋找資深工程師，需要 Python 與 FastAPI 經驗 5 年以上"
+        simple = SimplifiedLanguageDetector().analyze_language_composition(text)
+        rule_based = RuleBasedLanguageDetector().analyze_language_composition(text)
+        mixed = MixedLanguageDetectionService().analyze_language_mix(text)
+
+        assert tuple(simple) == tuple(rule_based)
+        assert mixed.total_chars == simple.total_chars
+        assert mixed.traditional_chars == simple.traditional_chinese_chars
+        assert mixed.english_chars == simple.english_chars
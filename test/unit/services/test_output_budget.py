@@ -0,0 +1,107 @@
+"""
+Unit tests for adaptive max_tokens and one-shot continuation
+"""
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.output_budget import (
+    CONTINUATION_PROMPT,
+    OutputBudget,
+    complete_with_continuation,
+    get_output_budget,
+    reset_output_budget,
+)
+from src.services.token_tracking_mixin import TokenTrackingMixin
+
+MESSAGES = [{"role": "system", "content": "Analyze"}, {"role": "user", "content": "Resume"}]
+
+
+def _response(content: str, finish_reason: str, completion_tokens: int) -> dict:
+    return {
+        "choices": [{"message": {"role": "assistant", "content": content}, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": 1000, "completion_tokens": completion_tokens, "total_tokens": 1000 + completion_tokens},
+    }
+
+
+@pytest.fixture(autouse=True)
+def _fresh_budget():
+    reset_output_budget()
+    yield
+    reset_output_budget()
+
+
+class TestOutputBudget:
+    """Percentile-plus-margin budgets per operation and prompt version"""
+
+    def test_static_budget_until_enough_samples(self):
+        """The default applies below min_samples and for unversioned prompts"""
+        budget = OutputBudget(min_samples=5, percentile=99, margin=0.1)
+        for tokens in (900, 1000, 1100, 1200):
+            budget.record("gap_analysis", "2.1.8", tokens)
+
+        assert budget.max_tokens("gap_analysis", "2.1.8", default=3000) == 3000
+        budget.record("gap_analysis", "2.1.8", 1000)
+        assert budget.max_tokens("gap_analysis", "2.1.8", default=3000) == 1320
+        assert budget.max_tokens("gap_analysis", None, default=3000) == 3000
+        assert budget.max_tokens("gap_analysis", "2.2.0", default=3000) == 3000
+
+    def test_budget_is_clamped_and_can_be_disabled(self, monkeypatch):
+        """Recommendations stay within [floor, ceiling]; the flag restores static budgets"""
+        budget = OutputBudget(min_samples=1, margin=0.5, floor=256, ceiling=4000)
+        budget.record("short", "v1", 10)
+        budget.record("long", "v1", 3500)
+
+        assert budget.max_tokens("short", "v1", default=3000) == 256
+        assert budget.max_tokens("long", "v1", default=3000) == 4000
+
+        monkeypatch.setenv("ADAPTIVE_MAX_TOKENS_ENABLED", "false")
+        assert budget.max_tokens("long", "v1", default=3000) == 3000
+
+    def test_usage_tracking_feeds_the_budget(self):
+        """track_openai_usage records completion tokens for versioned prompts only"""
+        TokenTrackingMixin().track_openai_usage(_response("ok", "stop", 700), "budget_test", prompt_version="v1")
+        TokenTrackingMixin().track_openai_usage(_response("ok", "stop", 900), "budget_test")
+
+        assert get_output_budget().stats()["budget_test@v1"]["samples"] == 1
+
+
+@pytest.mark.asyncio
+class TestContinuation:
+    """Truncated replies are continued once instead of retried"""
+
+    async def test_complete_reply_is_returned_as_is(self):
+        """finish_reason=stop needs a single request"""
+        client = AsyncMock()
+        client.chat_completion.return_value = _response("<gap/>", "stop", 500)
+
+        response = await complete_with_continuation(client, MESSAGES, "gap_analysis", "v1", max_tokens=3000)
+
+        assert response["choices"][0]["message"]["content"] == "<gap/>"
+        client.chat_completion.assert_awaited_once_with(messages=MESSAGES, max_tokens=3000)
+
+    async def test_truncated_reply_is_continued_once(self):
+        """The partial reply is sent back as an assistant turn and the parts are joined"""
+        client = AsyncMock()
+        client.chat_completion.side_effect = [
+            _response("<gap><strengths>Py", "length", 1000),
+            _response("thon</strengths></gap>", "stop", 200),
+        ]
+
+        response = await complete_with_continuation(
+            client, MESSAGES, "gap_analysis", "v1", max_tokens=3000, temperature=0.3
+        )
+
+        assert response["choices"][0]["message"]["content"] == "<gap><strengths>Python</strengths></gap>"
+        assert response["choices"][0]["finish_reason"] == "stop"
+        assert response["usage"]["completion_tokens"] == 1200
+        assert response["usage"]["prompt_tokens"] == 2000
+        assert response["continued"] is True
+
+        follow_up = client.chat_completion.await_args_list[1].kwargs
+        assert follow_up["messages"][-2:] == [
+            {"role": "assistant", "content": "<gap><strengths>Py"},
+            {"role": "user", "content": CONTINUATION_PROMPT},
+        ]
+        assert follow_up["temperature"] == 0.3
+        assert client.chat_completion.await_count == 2
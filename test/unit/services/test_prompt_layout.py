@@ -0,0 +1,90 @@
+"""
+Unit tests for the prompt-prefix-cache-friendly message layout
+"""
+from src.core.metrics.registry import get_metrics_registry
+from src.services.gap_analysis_v2 import GapAnalysisServiceV2
+from src.services.prompt_layout import build_cacheable_messages
+from src.services.token_tracking_mixin import TokenTrackingMixin
+
+SYSTEM = 'Only suggest keywords from {missing_keywords}. Reply as {"Score": 1}.'
+USER = "Resume:\n{resume}\n\nMissing Keywords: {missing_keywords}"
+
+
+def _index_result(missing: list[str], similarity: int) -> dict:
+    return {
+        "similarity_percentage": similarity,
+        "keyword_coverage": {
+            "coverage_percentage": 50,
+            "covered_keywords": ["Python"],
+            "missed_keywords": missing,
+        },
+    }
+
+
+class TestBuildCacheableMessages:
+    """Static system text first, request values last"""
+
+    def test_system_message_is_request_independent(self):
+        """System placeholders become references; their values move to the end of the user message"""
+        first = build_cacheable_messages(SYSTEM, USER, {"resume": "A", "missing_keywords": "Docker"})
+        second = build_cacheable_messages(SYSTEM, USER, {"resume": "B", "missing_keywords": "Go, SQL"})
+
+        assert first[0] == second[0] == {
+            "role": "system",
+            "content": 'Only suggest keywords from <missing_keywords>. Reply as {"Score": 1}.',
+        }
+        assert second[1]["content"] == (
+            "Resume:\nB\n\nMissing Keywords: Go, SQL\n\n<missing_keywords>Go, SQL</missing_keywords>"
+        )
+
+    def test_values_are_not_substituted_twice(self):
+        """Placeholders inside request values are left alone"""
+        messages = build_cacheable_messages("Static", USER, {"resume": "{missing_keywords}", "missing_keywords": "Go"})
+
+        assert messages[1]["content"] == "Resume:\n{missing_keywords}\n\nMissing Keywords: Go"
+
+
+class TestGapAnalysisLayout:
+    """Gap analysis requests share the system prompt prefix"""
+
+    def test_shipped_prompt_keeps_identical_system_message(self):
+        """Different resumes and keyword lists produce the same leading message"""
+        service = GapAnalysisServiceV2()
+
+        first = service._build_enhanced_prompt("Resume A", "JD A", _index_result(["Docker"], 70), "en", None)
+        second = service._build_enhanced_prompt("Resume B", "JD B", _index_result(["Go", "SQL"], 40), "en", None)
+
+        assert [m["role"] for m in first] == ["system", "user"]
+        assert first[0] == second[0]
+        assert "{missing_keywords}" not in first[0]["content"]
+        assert second[1]["content"].endswith("<missing_keywords>Go, SQL</missing_keywords>")
+
+
+class TestCachedTokenTracking:
+    """Prompt cache hits are recorded per operation"""
+
+    def test_cached_tokens_recorded(self):
+        """prompt_tokens_details.cached_tokens is returned and counted"""
+        registry = get_metrics_registry()
+        prompt_before = registry.counter("llm_prompt_tokens_total", "", ["operation"]).value(operation="layout_test")
+        cached_before = registry.counter(
+            "llm_cached_prompt_tokens_total", "", ["operation"]
+        ).value(operation="layout_test")
+
+        token_info = TokenTrackingMixin().track_openai_usage({
+            "usage": {
+                "prompt_tokens": 2048,
+                "completion_tokens": 100,
+                "total_tokens": 2148,
+                "prompt_tokens_details": {"cached_tokens": 1536},
+            }
+        }, "layout_test")
+        assert token_info["cached_tokens"] == 1536
+        assert TokenTrackingMixin().track_openai_usage({"usage": {}}, "layout_test")["cached_tokens"] == 0
+
+        assert registry.counter("llm_prompt_tokens_total", "", ["operation"]).value(
+            operation="layout_test"
+        ) == prompt_before + 2048
+        assert registry.counter("llm_cached_prompt_tokens_total", "", ["operation"]).value(
+            operation="layout_test"
+        ) == cached_before + 1536
@@ -0,0 +1,118 @@
+"""Unit tests for the parse-once tailoring post-processing pipeline."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.core.html_pipeline import HTMLPipeline, parse_fragment
+from src.services.resume_tailoring_v31 import ResumeTailoringServiceV31
+
+
+class TestHTMLPipeline:
+    """Test the shared-tree pipeline and its stage timings."""
+
+    def test_stages_share_one_tree(self):
+        """Changes made in one stage are visible to the next and serialized once."""
+        pipeline = HTMLPipeline("<p>Python</p>")
+        with pipeline.stage("edit") as soup:
+            soup.p["class"] = "opt-new"
+        with pipeline.stage("read") as soup:
+            assert soup.p["class"] == "opt-new"
+
+        assert pipeline.serialize() == '<p class="opt-new">Python</p>'
+        assert set(pipeline.timings) == {"parse_ms", "edit_ms", "read_ms", "serialize_ms"}
+
+    def test_default_parser_is_html_parser(self):
+        """Output does not depend on which optional parsers are installed."""
+        pipeline = HTMLPipeline("<p>Python<br>Go</p>")
+
+        assert pipeline.soup.builder.NAME == "html.parser"
+        assert pipeline.serialize() == "<p>Python<br/>Go</p>"
+
+
+class TestTailoringPostprocess:
+    """Test ResumeTailoringServiceV31 DOM post-processing."""
+
+    @pytest.fixture
+    def service(self):
+        """Create service instance."""
+        return ResumeTailoringServiceV31()
+
+    @pytest.mark.parametrize("html, covered, missed, expected", [
+        pytest.param(
+            "<h2>Skills</h2><p>Python, Docker and Kubernetes</p>"
+            '<ul><li><span class="opt-modified">Deployed Kubernetes on AWS</span></li></ul>',
+            ["Python", "AWS"], ["Kubernetes", "Terraform"],
+            '<h2>Skills</h2><p><span class="opt-keyword-existing">Python</span>, Docker and '
+            '<span class="opt-keyword-add">Kubernetes</span></p><ul><li><span class="opt-modified">Deployed '
+            '<span class="opt-keyword-add">Kubernetes</span> on '
+            '<span class="opt-keyword-existing">AWS</span></span></li></ul>',
+            id="keywords-inside-opt-modified",
+        ),
+        pytest.param(
+            "<p>Built React Native apps and React hooks; tuned python services.</p>",
+            ["React", "Python"], ["React Native"],
+            '<p>Built <span class="opt-keyword-add"><span class="opt-keyword-existing">React</span> Native</span> '
+            'apps and <span class="opt-keyword-existing">React</span> hooks; tuned '
+            '<span class="opt-keyword-existing">python</span> services.</p>',
+            id="overlap-nests-existing-in-added",
+        ),
+        pytest.param(
+            "<p>Led Machine Learning Engineering for machine learning models.</p>",
+            ["Machine Learning"], ["Machine Learning Engineering"],
+            '<p>Led <span class="opt-keyword-add"><span class="opt-keyword-existing">Machine Learning</span> '
+            'Engineering</span> for <span class="opt-keyword-existing">machine learning</span> models.</p>',
+            id="overlap-multi-word",
+        ),
+        pytest.param(
+            '<p><span class="opt-keyword-existing">Python</span> and Python 3 with CI/CD, C++ and Node.js</p>',
+            ["Python", "C++"], ["CI/CD", "Node.js"],
+            '<p><span class="opt-keyword-existing">Python</span> and '
+            '<span class="opt-keyword-existing">Python</span> 3 with <span class="opt-keyword-add">CI/CD</span>, '
+            'C++ and <span class="opt-keyword-add">Node.js</span></p>',
+            id="existing-span-and-punctuation",
+        ),
+        pytest.param(
+            '<p class="opt-placeholder">[X]% faster Docker builds</p><span class="opt-new">SQL tuning</span>',
+            ["SQL"], ["Docker", "Go"],
+            '<p class="opt-placeholder">[X]% faster <span class="opt-keyword-add">Docker</span> builds</p>'
+            '<span class="opt-new"><span class="opt-keyword-existing">SQL</span> tuning</span>',
+            id="llm-markers",
+        ),
+    ])
+    def test_postprocess_matches_baseline_output(self, service, html, covered, missed, expected):
+        """Post-processing output equals the HTML the baseline keyword CSS passes produced."""
+        result, timings = service._postprocess_html(html, covered, missed)
+
+        assert result == expected
+        for stage in ("parse_ms", "keyword_detection_ms", "keyword_marking_ms", "serialize_ms"):
+            assert stage in timings
+
+    def test_postprocess_keeps_llm_markers(self, service):
+        """Markers written by the LLMs are kept as-is; only keyword spans are added."""
+        html = '<p class="opt-placeholder">[X]% improvement in Python</p><span class="opt-new"></span>'
+        result, timings = service._postprocess_html(html, ["Python"], [])
+        assert result == (
+            '<p class="opt-placeholder">[X]% improvement in '
+            '<span class="opt-keyword-existing">Python</span></p><span class="opt-new"></span>'
+        )
+        assert "marker_fix_ms" not in timings
+
+    def test_fallback_sections_parse_original_once(self, service):
+        """Missing LLM2 sections reuse a single parse of the original resume."""
+        original = (
+            "<h2>Education</h2><p>MSc Computer Science</p>"
+            "<h2>Projects</h2><p>Personal dashboard</p>"
+            "<h2>Certifications</h2><p>AWS Certified</p>"
+        )
+        llm2_result = {"optimized_sections": {}}
+
+        with patch(
+            "src.services.resume_tailoring_v31.parse_fragment", side_effect=parse_fragment
+        ) as mock_parse:
+            merged = service._merge_sections({"optimized_sections": {}}, llm2_result, {}, original)
+
+        assert mock_parse.call_count == 1
+        assert "MSc Computer Science" in merged["education"]
+        assert "Personal dashboard" in merged["projects"]
+        assert "AWS Certified" in merged["certifications"]
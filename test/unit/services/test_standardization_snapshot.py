@@ -0,0 +1,65 @@
+"""Unit tests for the standardization dictionary snapshot."""
+
+import shutil
+
+import pytest
+
+from src.services.keyword_standardizer import KeywordStandardizer
+from src.services.standardization import TraditionalChineseStandardizer, snapshot
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Copy the real dictionaries into an isolated directory."""
+    for name in snapshot.SOURCE_FILES:
+        shutil.copy(snapshot.DEFAULT_DATA_DIR / name, tmp_path / name)
+    snapshot.clear_snapshot_cache()
+    yield tmp_path
+    snapshot.clear_snapshot_cache()
+
+
+class TestStandardizationSnapshot:
+    """Test snapshot building, loading and staleness detection."""
+
+    def test_snapshot_matches_yaml_sources(self, data_dir):
+        """Standardizer loaded from the snapshot equals one parsed from YAML."""
+        from_yaml = KeywordStandardizer(str(data_dir))
+
+        snapshot.build_snapshot(data_dir)
+        snapshot.clear_snapshot_cache()
+        assert snapshot.load_snapshot(data_dir) is not None
+
+        from_snapshot = KeywordStandardizer(str(data_dir))
+        assert from_snapshot.combined_dictionary == from_yaml.combined_dictionary
+        assert [p[0].pattern for p in from_snapshot.patterns] == [p[0].pattern for p in from_yaml.patterns]
+
+    def test_missing_snapshot_returns_none(self, data_dir):
+        """Without a snapshot, callers fall back to the sources."""
+        assert snapshot.load_snapshot(data_dir) is None
+        data = snapshot.load_source_file(data_dir / "skills.yaml")
+        assert isinstance(data, dict) and data
+
+    def test_stale_snapshot_is_ignored(self, data_dir):
+        """Editing a source file invalidates the snapshot."""
+        snapshot.build_snapshot(data_dir)
+        assert snapshot.load_snapshot(data_dir) is not None
+
+        with open(data_dir / "tools.yaml", "a", encoding="utf-8") as f:
+            f.write("\nsnapshot_test_tools:\n  snapshotctl: SnapshotCtl\n")
+
+        assert snapshot.load_snapshot(data_dir) is None
+        standardizer = KeywordStandardizer(str(data_dir))
+        assert standardizer.standardize("snapshotctl") == "SnapshotCtl"
+
+    def test_corrupt_snapshot_is_ignored(self, data_dir):
+        """An unreadable snapshot falls back to the sources."""
+        (data_dir / snapshot.SNAPSHOT_FILENAME).write_bytes(b"not a snapshot")
+        assert snapshot.load_snapshot(data_dir) is None
+        assert KeywordStandardizer(str(data_dir)).combined_dictionary
+
+    def test_chinese_standardizer_uses_snapshot(self, data_dir):
+        """Traditional Chinese config loads from the snapshot."""
+        snapshot.build_snapshot(data_dir)
+        standardizer = TraditionalChineseStandardizer(str(data_dir / "zh_tw_standard_terms.json"))
+        assert standardizer.config is not None
+        assert standardizer.config["language"] == "zh-TW"
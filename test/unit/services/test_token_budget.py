@@ -0,0 +1,124 @@
+"""
+Unit tests for input token budgeting and compaction
+"""
+import pytest
+
+from src.services import token_budget
+from src.services.token_budget import (
+    compact_inputs,
+    compact_job_description,
+    compact_resume,
+    count_tokens,
+    html_to_text,
+)
+
+RESUME_HTML = (
+    "<h2>Summary</h2><p>Senior  Python developer&nbsp;with <strong>FastAPI</strong></p>"
+    "<h2>Experience</h2><ul><li>Built APIs</li><li>Led a team of five</li></ul>"
+    "<h2>Volunteer</h2><p>Code mentor at a local school every weekend</p>"
+    "<h2>References</h2><p>Available on request from previous managers</p>"
+)
+JOB_DESCRIPTION = """Senior Python Engineer
+Responsibilities:
+Build services with FastAPI.
+Requirements:
+5 years of Python.
+Benefits:
+Health insurance, 401(k) matching and unlimited PTO
+We are an equal opportunity employer and value diversity."""
+
+
+class TestTokenizer:
+    """Exact token counts from the vendored o200k_base encoding"""
+
+    def test_counts_o200k_tokens(self):
+        """Counts match the GPT-4.1 tokenizer"""
+        pytest.importorskip("tiktoken")
+        assert token_budget.get_tokenizer().exact
+        assert count_tokens("Hello world") == 2
+        assert count_tokens("") == 0
+
+
+class TestCompaction:
+    """HTML stripping, boilerplate removal and budget trimming"""
+
+    def test_html_to_text_keeps_structure(self):
+        """Headings and list items survive as markdown-style lines"""
+        assert html_to_text(RESUME_HTML).splitlines()[:5] == [
+            "## Summary",
+            "Senior Python developer with FastAPI",
+            "## Experience",
+            "- Built APIs",
+            "- Led a team of five",
+        ]
+
+    def test_job_description_boilerplate_dropped(self):
+        """Benefits sections and EEO statements are removed regardless of budget"""
+        dropped = []
+        text = compact_job_description(JOB_DESCRIPTION, budget=None, dropped=dropped)
+
+        assert text.endswith("5 years of Python.")
+        assert "401(k)" not in text and "equal opportunity" not in text
+        assert dropped == ["Benefits"]
+
+    def test_lowest_value_sections_dropped_first(self):
+        """Over budget, references go before volunteer work; core sections are truncated last"""
+        full = count_tokens(html_to_text(RESUME_HTML))
+        references = count_tokens("## References\nAvailable on request from previous managers")
+
+        dropped = []
+        text = compact_resume(RESUME_HTML, budget=full - references, dropped=dropped)
+        assert dropped == ["References"]
+        assert "## Volunteer" in text
+
+        dropped = []
+        text = compact_resume(RESUME_HTML, budget=8, dropped=dropped)
+        assert dropped == ["References", "Volunteer"]
+        assert text.startswith("## Summary") and text.endswith("[...]")
+
+    def test_evidence_sections_are_never_dropped(self):
+        """Skills, projects, certifications and coursework stay; only spoken languages are low value"""
+        resume = (
+            "<h2>Programming Languages</h2><p>Python, Go, Rust</p>"
+            "<h2>Projects</h2><p>Kubernetes operator for batch jobs</p>"
+            "<h2>Certifications</h2><p>AWS Solutions Architect</p>"
+            "<h2>Relevant Coursework</h2><p>Distributed systems</p>"
+            "<h2>Languages</h2><p>English, Mandarin</p>"
+        )
+        dropped = []
+        text = compact_resume(resume, budget=count_tokens(html_to_text(resume)) - 3, dropped=dropped)
+
+        assert dropped == ["Languages"]
+        for evidence in ("Python, Go, Rust", "Kubernetes operator", "AWS Solutions Architect", "Distributed systems"):
+            assert evidence in text
+
+    def test_experience_bullets_trimmed_before_truncation(self):
+        """Later experience bullets go before any evidence section is cut"""
+        resume = (
+            "<h2>Experience</h2><p>Backend Engineer, Acme</p>"
+            "<ul><li>Built payment APIs in Python</li><li>Migrated billing to PostgreSQL</li>"
+            "<li>Reduced p99 latency by 40 percent with caching</li><li>Mentored four junior engineers</li></ul>"
+            "<h2>Certifications</h2><p>AWS Solutions Architect</p>"
+        )
+        full = count_tokens(html_to_text(resume))
+        text = compact_resume(resume, budget=full - count_tokens("- Mentored four junior engineers") - 2)
+
+        assert "Backend Engineer, Acme" in text and "- Built payment APIs in Python" in text
+        assert "Mentored" not in text
+        assert text.endswith("AWS Solutions Architect")
+
+    def test_compact_inputs_reports_savings(self, monkeypatch):
+        """Savings are reported per request; the feature flag passes inputs through"""
+        result = compact_inputs("gap_analysis", resume=RESUME_HTML, job_description=JOB_DESCRIPTION)
+        assert result.tokens_saved == (
+            sum(result.tokens_before.values()) - sum(result.tokens_after.values())
+        ) > 0
+        assert result.dropped_sections == {"job_description": ["Benefits"]}
+
+        monkeypatch.setenv("INPUT_TOKEN_BUDGET_GAP_ANALYSIS_RESUME", "8")
+        assert compact_inputs("gap_analysis", resume=RESUME_HTML).dropped_sections["resume"] == [
+            "References", "Volunteer"
+        ]
+
+        monkeypatch.setenv("INPUT_COMPACTION_ENABLED", "false")
+        assert compact_inputs("gap_analysis", resume=RESUME_HTML).texts["resume"] == RESUME_HTML
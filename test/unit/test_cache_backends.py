@@ -0,0 +1,253 @@
+"""Unit tests for the pluggable cache backends."""
+
+import asyncio
+import socketserver
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.core import cache_backends
+from src.core.cache_backends import (
+    CacheNamespace,
+    InProcessBackend,
+    RedisBackend,
+    SQLiteBackend,
+    decode_value,
+    encode_value,
+)
+from src.core.metrics.registry import get_metrics_registry
+from src.services.dynamic_course_cache import DynamicCourseCache
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    """Serve the RESP2 commands the client uses from a dict."""
+
+    def _read_command(self) -> list[bytes] | None:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _bulk(self, value: bytes | None) -> bytes:
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        store = self.server.store
+        while (args := self._read_command()) is not None:
+            name = args[0].upper()
+            if name == b"PING":
+                reply = b"+PONG\r\n"
+            elif name == b"GET":
+                value, expires_at = store.get(args[1], (None, 0.0))
+                reply = self._bulk(value if expires_at > time.time() else None)
+            elif name == b"SET":
+                store[args[1]] = (args[2], time.time() + int(args[4]) / 1000)
+                reply = b"+OK\r\n"
+            elif name == b"DEL":
+                removed = sum(store.pop(key, None) is not None for key in args[1:])
+                reply = b":%d\r\n" % removed
+            elif name == b"SCAN":
+                prefix = args[3].rstrip(b"*")
+                keys = [key for key in store if key.startswith(prefix)]
+                reply = b"*2\r\n" + self._bulk(b"0") + b"*%d\r\n" % len(keys) + b"".join(map(self._bulk, keys))
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def resp_server():
+    """Local Redis-protocol stand-in on an ephemeral port."""
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RespHandler)
+    server.daemon_threads = True
+    server.store = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestEncoding:
+    """Test value serialization."""
+
+    def test_embeddings_are_packed_as_float32(self):
+        """Float vectors take 4 bytes per dimension and round-trip at float32 precision."""
+        embedding = [0.1 * i for i in range(1536)]
+        data = encode_value(embedding)
+
+        assert len(data) == 1 + 4 * 1536
+        assert decode_value(data) == pytest.approx(embedding, rel=1e-6)
+        assert decode_value(encode_value(np.ones(3))) == [1.0, 1.0, 1.0]
+
+    def test_other_values_use_json(self):
+        """Dicts and mixed lists survive unchanged; unknown encodings are rejected."""
+        value = {"keywords": ["Python", "SQL"], "score": 0.5, "技能": True}
+        assert decode_value(encode_value(value)) == value
+        assert decode_value(encode_value([1, 2.5])) == [1, 2.5]
+        with pytest.raises(ValueError):
+            decode_value(b"Xpayload")
+
+
+class TestBackends:
+    """Test each backend through the same namespace API."""
+
+    @pytest.fixture(params=["memory", "sqlite", "redis"])
+    def backend(self, request, tmp_path):
+        if request.param == "memory":
+            backend = InProcessBackend()
+        elif request.param == "sqlite":
+            backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+        else:
+            server = request.getfixturevalue("resp_server")
+            backend = RedisBackend(f"redis://127.0.0.1:{server.server_address[1]}/0", timeout=1.0)
+        yield backend
+        backend.close()
+
+    def test_get_set_ttl_and_clear(self, backend):
+        """Values round-trip, expire after their TTL and clear per namespace."""
+        embeddings = CacheNamespace(backend, "index_embedding", ttl_seconds=60)
+        keywords = CacheNamespace(backend, "keyword_extraction", ttl_seconds=60)
+        embeddings.set("k1", [0.25, 0.5])
+        keywords.set("k1", {"keywords": ["Python"]})
+
+        assert embeddings.get("k1") == [0.25, 0.5]
+        assert keywords.get("k1") == {"keywords": ["Python"]}
+        assert embeddings.get("missing") is None
+
+        embeddings.clear()
+        assert embeddings.get("k1") is None
+        assert keywords.get("k1") == {"keywords": ["Python"]}
+
+        short = CacheNamespace(backend, "short", ttl_seconds=0.01)
+        short.set("k", {"a": 1})
+        time.sleep(0.05)
+        assert short.get("k") is None
+
+    def test_latency_is_observed_per_backend(self, backend):
+        """Every operation lands in the per-backend latency histogram."""
+        backend.set("latency-probe", b"Jnull", 60)
+        backend.get("latency-probe")
+
+        rendered = get_metrics_registry().render()
+        assert f'resume_api_cache_backend_latency_seconds_count{{backend="{backend.name}",op="get"}}' in rendered
+
+
+class TestSharing:
+    """Test sharing entries between processes."""
+
+    def test_sqlite_entries_are_visible_to_other_connections(self, tmp_path):
+        """Two backends on one file behave like two workers."""
+        path = str(tmp_path / "shared.sqlite3")
+        worker_a, worker_b = SQLiteBackend(path), SQLiteBackend(path)
+        CacheNamespace(worker_a, "course_search", 60).set("key", {"courses": 3})
+
+        assert CacheNamespace(worker_b, "course_search", 60).get("key") == {"courses": 3}
+
+    def test_unreachable_backend_is_a_miss(self):
+        """Connection failures count as errors and never raise."""
+        backend = RedisBackend("redis://127.0.0.1:1/0", timeout=0.05)
+        namespace = CacheNamespace(backend, "keyword_extraction", 60)
+        errors = get_metrics_registry().counter("cache_backend_errors", "")
+        before = errors.value(backend="redis", op="get")
+
+        namespace.set("key", {"a": 1})
+        assert namespace.get("key") is None
+        assert errors.value(backend="redis", op="get") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_dynamic_course_cache_reads_through(self, tmp_path, monkeypatch):
+        """A second cache instance finds entries another instance wrote."""
+        monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+        monkeypatch.setenv("CACHE_SQLITE_PATH", str(tmp_path / "courses.sqlite3"))
+        cache_backends.reset_cache_backend()
+        try:
+            worker_a, worker_b = DynamicCourseCache(), DynamicCourseCache()
+            await worker_a.set("skill", {"has_courses": True, "count": 5})
+
+            assert await worker_b.get("skill") == {"has_courses": True, "count": 5}
+            assert worker_b._stats.cache_hits == 1
+            assert "skill" in worker_b._cache
+            assert await worker_b.get("other") is None
+        finally:
+            cache_backends.reset_cache_backend()
+
+
+class TestCircuitBreaker:
+    """Test skipping a failing backend and keeping its I/O off the event loop."""
+
+    def test_repeated_errors_open_the_breaker(self, monkeypatch):
+        """After N consecutive errors the backend is skipped until the pause ends."""
+        monkeypatch.setenv("CACHE_BACKEND_BREAKER_FAILURES", "2")
+        monkeypatch.setenv("CACHE_BACKEND_BREAKER_S", "0.2")
+        backend = RedisBackend("redis://127.0.0.1:1/0", timeout=0.05)
+        attempts = []
+        connect = backend._connect
+        monkeypatch.setattr(backend, "_connect", lambda: attempts.append(1) or connect())
+        skipped = get_metrics_registry().counter("cache_backend_skipped", "")
+        before = skipped.value(backend="redis", op="get")
+
+        for _ in range(5):
+            assert backend.get("key") is None
+
+        assert len(attempts) == 2
+        assert backend.breaker_open
+        assert skipped.value(backend="redis", op="get") == before + 3
+
+        time.sleep(0.25)
+        assert backend.get("key") is None
+        assert len(attempts) == 3
+
+    def test_success_resets_the_error_count(self, monkeypatch):
+        """Only consecutive errors count towards opening the breaker."""
+        monkeypatch.setenv("CACHE_BACKEND_BREAKER_FAILURES", "2")
+        backend = InProcessBackend()
+        failing = {"on": True}
+        real_get = backend._get
+
+        def flaky_get(key):
+            if failing["on"]:
+                raise OSError("flaky")
+            return real_get(key)
+
+        monkeypatch.setattr(backend, "_get", flaky_get)
+        backend.get("key")
+        failing["on"] = False
+        backend.get("key")
+        failing["on"] = True
+        backend.get("key")
+
+        assert not backend.breaker_open
+
+    @pytest.mark.asyncio
+    async def test_async_calls_do_not_block_the_loop(self, tmp_path, monkeypatch):
+        """Shared backend calls run in a thread while other tasks keep running."""
+        backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+        real_get = backend._get
+
+        def slow_get(key):
+            time.sleep(0.1)
+            return real_get(key)
+
+        monkeypatch.setattr(backend, "_get", slow_get)
+        namespace = CacheNamespace(backend, "course_search", 60)
+        await namespace.aset("key", {"courses": 3})
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        assert await namespace.aget("key") == {"courses": 3}
+        task.cancel()
+
+        assert ticks >= 5
@@ -0,0 +1,90 @@
+"""Unit tests for the managed CPU executor."""
+
+import asyncio
+
+import pytest
+
+from src.core.cpu_executor import CPUExecutor
+from src.core.enhanced_marker import EnhancedMarker
+from src.services.html_validator import HTMLValidator
+from src.services.resume_tailoring_v31 import postprocess_tailored_html
+from src.services.resume_text_processor import preprocess_ocr_text_task
+
+
+def square(value: int) -> int:
+    """Module-level task usable by every pool mode."""
+    return value * value
+
+
+def fail(message: str):
+    """Module-level task that raises."""
+    raise ValueError(message)
+
+
+class TestCPUExecutor:
+    """Test run modes and metrics of CPUExecutor."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["inline", "thread"])
+    async def test_run_returns_result_and_records_metrics(self, mode):
+        """Results are returned and task timings recorded."""
+        executor = CPUExecutor(mode=mode, max_workers=2)
+        try:
+            results = await asyncio.gather(*(executor.run(square, i) for i in range(5)))
+            assert results == [0, 1, 4, 9, 16]
+
+            stats = executor.get_stats()
+            assert stats["mode"] == mode
+            assert stats["completed"] == 5
+            assert stats["in_flight"] == 0
+            assert stats["queue_depth"] == 0
+            assert stats["tasks"]["square"]["count"] == 5
+            if mode == "thread":
+                assert stats["peak_queue_depth"] == 3
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_and_raised(self):
+        """Task exceptions propagate and are counted."""
+        executor = CPUExecutor(mode="inline")
+        with pytest.raises(ValueError, match="boom"):
+            await executor.run(fail, "boom")
+
+        stats = executor.get_stats()
+        assert stats["failed"] == 1
+        assert stats["tasks"]["fail"]["failed"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_unknown_mode_falls_back_to_process(self):
+        """Invalid CPU_POOL_MODE values use the process pool."""
+        assert CPUExecutor(mode="gpu").mode == "process"
+
+    @pytest.mark.asyncio
+    @pytest.mark.timeout(60)
+    async def test_process_pool_runs_adopted_stages(self):
+        """Stages adopting run_cpu are picklable and run in worker processes."""
+        executor = CPUExecutor(mode="process", max_workers=1)
+        try:
+            html, timings = await executor.run(
+                postprocess_tailored_html, "<p>Python and Docker</p>", ["Python"], ["Docker"]
+            )
+            assert html == (
+                '<p><span class="opt-keyword-existing">Python</span> and '
+                '<span class="opt-keyword-add">Docker</span></p>'
+            )
+            assert "keyword_marking_ms" in timings
+
+            marked = await executor.run(EnhancedMarker().mark_keywords, "<p>javascript</p>", [], ["JavaScript"])
+            assert marked == '<p><span class="opt-keyword">JavaScript</span></p>'
+
+            cleaned = await executor.run(HTMLValidator().validate_and_clean, "<p>Hi<script>x</script></p>")
+            assert "<script>" not in cleaned
+
+            text, stats = await executor.run(preprocess_ocr_text_task, "【Email】:john＠gmai1.c0m")
+            assert text == "【Email】:john@gmail.com"
+            assert stats["email_fixes"] > 0
+
+            assert executor.get_stats()["completed"] == 4
+        finally:
+            executor.shutdown()
@@ -0,0 +1,115 @@
+"""Unit tests for the single-pass keyword marking engine."""
+
+from src.core.enhanced_marker import EnhancedMarker
+from src.core.keyword_marking import KeywordMarkingEngine
+from src.core.marker_fixer import MarkerFixer
+
+
+class TestKeywordMarkingEngine:
+    """Test automaton matching, skip rules and in-place splicing."""
+
+    def test_longest_keyword_wins(self):
+        """Overlapping keywords resolve to the longest match."""
+        engine = KeywordMarkingEngine([(["machine learning", "learning"], "opt-keyword")])
+        result = engine.mark_html("<p>Machine Learning and learning</p>")
+        assert result == (
+            '<p><span class="opt-keyword">Machine Learning</span> and '
+            '<span class="opt-keyword">learning</span></p>'
+        )
+
+    def test_overlap_resolved_by_length_across_text(self):
+        """A longer keyword later in the text beats a shorter one that starts earlier."""
+        engine = KeywordMarkingEngine([(["Deep Learning", "Learning Systems"], "opt-keyword")])
+        result = engine.mark_html("<p>We build Deep Learning Systems daily.</p>")
+        assert result == '<p>We build Deep <span class="opt-keyword">Learning Systems</span> daily.</p>'
+
+    def test_nest_overlaps_applies_keywords_in_priority_order(self):
+        """With nest_overlaps later keywords are marked inside earlier keyword spans."""
+        engine = KeywordMarkingEngine(
+            [(["React Native"], "opt-keyword-add"), (["React", "Native"], "opt-keyword-existing")],
+            nest_overlaps=True,
+        )
+        result = engine.mark_html("<p>React Native and React &lt;b&gt;</p>")
+        assert result == (
+            '<p><span class="opt-keyword-add"><span class="opt-keyword-existing">React</span> '
+            '<span class="opt-keyword-existing">Native</span></span> and '
+            '<span class="opt-keyword-existing">React</span> &lt;b&gt;</p>'
+        )
+
+    def test_first_group_wins_for_duplicates(self):
+        """A keyword listed in two groups keeps the class of the first group."""
+        engine = KeywordMarkingEngine([(["Python"], "opt-keyword-add"), (["python"], "opt-keyword-existing")])
+        assert engine.mark_html("<p>python</p>") == '<p><span class="opt-keyword-add">python</span></p>'
+
+    def test_text_is_not_reparsed(self):
+        """Escaped markup in text stays escaped after marking."""
+        engine = KeywordMarkingEngine([(["Python"], "opt-keyword")])
+        result = engine.mark_html("<p>Python &lt;script&gt; &amp; more</p>")
+        assert result == '<p><span class="opt-keyword">Python</span> &lt;script&gt; &amp; more</p>'
+
+    def test_skip_tags_and_comments(self):
+        """Script, style and comment content is never marked."""
+        engine = KeywordMarkingEngine([(["Python"], "opt-keyword")])
+        html = "<style>.Python{}</style><!-- Python --><p>Python</p>"
+        result = engine.mark_html(html)
+        assert result.count('class="opt-keyword"') == 1
+        assert "<!-- Python -->" in result
+
+    def test_direct_parent_skip(self):
+        """Without skip_descendants only the direct parent span is checked."""
+        engine = KeywordMarkingEngine([(["Python"], "opt-keyword")], skip_span_classes=["opt-placeholder"])
+        html = '<span class="opt-placeholder">Python <b>Python</b></span>'
+        assert engine.mark_html(html).count('class="opt-keyword"') == 1
+
+    def test_descendant_skip(self):
+        """With skip_descendants any ancestor span blocks marking."""
+        engine = KeywordMarkingEngine(
+            [(["Python"], "opt-keyword")], skip_span_classes=["opt-placeholder"], skip_descendants=True
+        )
+        html = '<span class="opt-placeholder">Python <b>Python</b></span>'
+        assert engine.mark_html(html) == html
+
+    def test_mark_soup_returns_count(self):
+        """mark_soup modifies the tree in place and counts inserted spans."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup("<ul><li>Docker and AWS</li><li>Docker</li></ul>", "html.parser")
+        engine = KeywordMarkingEngine([(["Docker", "AWS"], "opt-keyword")])
+        assert engine.mark_soup(soup) == 3
+        assert len(soup.find_all("span", class_="opt-keyword")) == 3
+
+
+class TestMarkerCallers:
+    """Test the marker classes built on the engine keep their skip rules."""
+
+    def test_enhanced_marker_rules(self):
+        """EnhancedMarker corrects case, marks opt-modified and skips placeholders."""
+        html = (
+            '<p>Used javascript and Docker</p>'
+            '<span class="opt-modified">Deployed Docker</span>'
+            '<span class="opt-placeholder">[X] Docker</span>'
+            '<span class="opt-keyword">Docker</span>'
+        )
+        result = EnhancedMarker().mark_keywords(html, ["Docker"], ["JavaScript"])
+        assert '<span class="opt-keyword">JavaScript</span>' in result
+        assert '<span class="opt-modified">Deployed <span class="opt-keyword-existing">Docker</span></span>' in result
+        assert '<span class="opt-placeholder">[X] Docker</span>' in result
+        assert result.count('opt-keyword-existing') == 2
+
+    def test_enhanced_marker_overlap_matches_legacy(self):
+        """Overlapping keywords keep the legacy global longest-first priority."""
+        result = EnhancedMarker().mark_keywords(
+            "<p>We build Deep Learning Systems daily.</p>", ["Deep Learning", "Learning Systems"], []
+        )
+        assert result == (
+            '<p>We build Deep <span class="opt-keyword-existing">Learning Systems</span> daily.</p>'
+        )
+
+    def test_marker_fixer_skips_all_opt_spans(self):
+        """MarkerFixer leaves text directly inside any opt-* span untouched."""
+        html = '<p>Kubernetes</p><span class="opt-modified">Kubernetes</span>'
+        result = MarkerFixer().apply_keyword_markers(html, ["Kubernetes"])
+        assert result == (
+            '<p><span class="opt-keyword">Kubernetes</span></p>'
+            '<span class="opt-modified">Kubernetes</span>'
+        )
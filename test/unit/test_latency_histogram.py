@@ -0,0 +1,99 @@
+"""Unit tests for streaming latency histograms and the response time tracker."""
+
+import random
+
+import pytest
+
+from src.core.metrics.latency_histogram import LatencyHistogram, RollingLatencyRecorder
+from src.middleware.lightweight_monitoring import ResponseTimeTracker
+
+
+def exact_percentile(sorted_values: list[float], quantile: float) -> float:
+    """Reference percentile with the histogram's rank convention."""
+    return sorted_values[int(quantile * (len(sorted_values) - 1))]
+
+
+class TestLatencyHistogram:
+    """Test accuracy and merging of LatencyHistogram."""
+
+    def test_percentiles_within_relative_accuracy(self):
+        """Percentiles stay within the configured relative error."""
+        rng = random.Random(7)  # noqa: S311
+        values = [rng.lognormvariate(5, 1) for _ in range(20000)]
+        histogram = LatencyHistogram(relative_accuracy=0.01)
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        for quantile in (0.5, 0.95, 0.99):
+            expected = exact_percentile(values, quantile)
+            assert histogram.percentile(quantile) == pytest.approx(expected, rel=0.011)
+        assert histogram.count == 20000
+        assert histogram.min == values[0]
+        assert histogram.max == values[-1]
+        # Memory is bounded by the value range, not the sample count
+        assert len(histogram.counts) < 1000
+
+    def test_merge_matches_single_histogram(self):
+        """Merging per-shard histograms equals recording into one."""
+        combined = LatencyHistogram()
+        shards = [LatencyHistogram() for _ in range(4)]
+        for i in range(1, 1001):
+            combined.record(i)
+            shards[i % 4].record(i)
+
+        merged = LatencyHistogram()
+        for shard in shards:
+            merged.merge(shard)
+
+        assert merged.counts == combined.counts
+        assert merged.summary() == combined.summary()
+        with pytest.raises(ValueError):
+            merged.merge(LatencyHistogram(relative_accuracy=0.05))
+
+    def test_empty_summary(self):
+        """An empty histogram reports zeros."""
+        assert LatencyHistogram().summary()["p99_ms"] == 0.0
+
+
+class TestRollingLatencyRecorder:
+    """Test rolling windows of RollingLatencyRecorder."""
+
+    def test_windows_expire_old_slots(self):
+        """Measurements leave each window once their slot ages out."""
+        recorder = RollingLatencyRecorder()
+        start = 1_000_000.0
+        recorder.record(100, now=start)
+        recorder.record(200, now=start + 120)
+
+        assert recorder.window("1m", now=start + 120).count == 1
+        assert recorder.window("5m", now=start + 120).count == 2
+        assert recorder.window("5m", now=start + 300).count == 1
+        assert recorder.window("1h", now=start + 300).count == 2
+        assert recorder.window("1h", now=start + 4000).count == 0
+        assert recorder.snapshot().count == 2
+
+
+class TestResponseTimeTracker:
+    """Test statistics produced by ResponseTimeTracker."""
+
+    def test_stats_split_by_status_class_and_window(self):
+        """Endpoint stats keep the legacy fields and add windows and status classes."""
+        tracker = ResponseTimeTracker()
+        for duration in range(1, 101):
+            tracker.add_request("POST /api/v1/tailor", float(duration), 200)
+        tracker.add_request("POST /api/v1/tailor", 500.0, 503, "SERVICE_UNAVAILABLE")
+
+        stats = tracker.get_stats()
+        endpoint = stats["endpoints"]["POST /api/v1/tailor"]
+        assert endpoint["count"] == 101
+        assert endpoint["max_ms"] == 500.0
+        assert endpoint["p50_ms"] == pytest.approx(51, rel=0.02)
+        assert endpoint["windows"]["1m"]["count"] == 101
+        assert endpoint["by_status_class"]["2xx"]["count"] == 100
+        assert endpoint["by_status_class"]["5xx"]["count"] == 1
+        assert stats["errors"]["SERVICE_UNAVAILABLE"]["count"] == 1
+        assert stats["summary"] == {"total_endpoints": 1, "total_errors": 1}
+
+        tracker.reset()
+        assert tracker.get_stats()["endpoints"] == {}
@@ -0,0 +1,67 @@
+"""Unit tests for the event-loop lag monitor."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.core.monitoring.loop_lag import LoopLagMonitor
+
+
+def block_event_loop(seconds: float):
+    """Synchronous call that holds the event loop."""
+    time.sleep(seconds)
+
+
+class TestLoopLagMonitor:
+    """Test lag measurement and blocking-site capture."""
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_records_samples_without_stalls(self):
+        """An idle loop produces lag samples but no stalls."""
+        monitor = LoopLagMonitor(interval_ms=10, threshold_ms=200)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.15)
+        finally:
+            await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["samples"] > 0
+        assert sum(stats["histogram"].values()) == stats["samples"]
+        assert stats["stalls"] == 0
+        assert stats["blocking_sites"] == []
+        assert not stats["running"]
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_captured(self):
+        """A blocking call shows up as lag and as the top blocking site."""
+        monitor = LoopLagMonitor(interval_ms=10, threshold_ms=50)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            block_event_loop(0.4)
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["max_lag_ms"] >= 300
+        assert stats["stalls"] == 1
+        assert stats["stack_samples"] >= 2
+
+        top_site = stats["blocking_sites"][0]
+        assert "in block_event_loop" in top_site["site"]
+        assert top_site["samples"] == stats["stack_samples"]
+        assert any("block_event_loop" in line for line in top_site["stack"])
+
+    def test_reset_clears_metrics(self):
+        """Reset drops samples and sites."""
+        monitor = LoopLagMonitor(interval_ms=10, threshold_ms=50)
+        monitor._record_lag(120.0)
+        assert monitor.get_stats()["histogram"]["le_250ms"] == 1
+
+        monitor.reset()
+        stats = monitor.get_stats()
+        assert stats["samples"] == 0
+        assert stats["max_lag_ms"] == 0.0
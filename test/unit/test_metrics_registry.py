@@ -0,0 +1,103 @@
+"""Unit tests for the metric registry and Prometheus exposition."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.metrics.collectors import observe_trace_stages
+from src.core.metrics.registry import MetricFamily, MetricsRegistry, cache_metric_families, get_metrics_registry
+from src.core.tracing import span, start_trace
+from src.middleware import lightweight_monitoring
+from src.middleware.lightweight_monitoring import LightweightMonitoringMiddleware, ResponseTimeTracker
+
+
+class TestMetricsRegistry:
+    """Test push metrics, collectors and text rendering."""
+
+    def test_push_metrics_render_in_text_format(self):
+        """Counters, gauges and histograms render as Prometheus samples."""
+        registry = MetricsRegistry()
+        registry.counter("retries", "Retries", ["error_type"]).inc(error_type="timeout")
+        registry.counter("retries", "Retries", ["error_type"]).inc(2, error_type="timeout")
+        registry.gauge("in_use", "In use").set(3)
+        histogram = registry.histogram("stage_seconds", "Stage", ["stage"], buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage="llm")
+        histogram.observe(0.5, stage="llm")
+        histogram.observe(5, stage="llm")
+
+        text = registry.render()
+        assert "# TYPE resume_api_retries_total counter" in text
+        assert 'resume_api_retries_total{error_type="timeout"} 3' in text
+        assert "resume_api_in_use 3" in text
+        assert 'resume_api_stage_seconds_bucket{stage="llm",le="0.1"} 1' in text
+        assert 'resume_api_stage_seconds_bucket{stage="llm",le="1"} 2' in text
+        assert 'resume_api_stage_seconds_bucket{stage="llm",le="+Inf"} 3' in text
+        assert 'resume_api_stage_seconds_count{stage="llm"} 3' in text
+
+    def test_collectors_merge_families_and_skip_failures(self):
+        """Families from several collectors share one HELP/TYPE header; failing collectors are skipped."""
+        registry = MetricsRegistry()
+        registry.register_collector("a", lambda: cache_metric_families("a", 3, 1, 10))
+        registry.register_collector("b", lambda: cache_metric_families("b", 0, 0))
+        registry.register_collector("broken", lambda: 1 / 0)
+
+        text = registry.render()
+        assert text.count("# TYPE resume_api_cache_hits_total counter") == 1
+        assert 'resume_api_cache_hits_total{cache="a"} 3' in text
+        assert 'resume_api_cache_hits_total{cache="b"} 0' in text
+        assert 'resume_api_cache_hit_ratio{cache="a"} 0.75' in text
+        assert 'resume_api_cache_entries{cache="a"} 10' in text
+
+        registry.unregister_collector("a")
+        assert 'cache="a"' not in registry.render()
+
+    def test_label_values_are_escaped(self):
+        """Quotes, backslashes and newlines in label values are escaped."""
+        family = MetricFamily("x", "gauge", "X").add(1, path='a"b\\c\nd')
+        assert family.render().endswith('resume_api_x{path="a\\"b\\\\c\\nd"} 1')
+
+
+class TestMetricCollectors:
+    """Test component collectors."""
+
+    def test_trace_stages_feed_stage_histogram(self):
+        """Every finished span in a trace is observed under its name."""
+        with start_trace("unit_trace") as root, span("unit_embedding"):
+            pass
+        observe_trace_stages(root)
+
+        text = get_metrics_registry().render()
+        assert 'resume_api_stage_duration_seconds_count{stage="unit_embedding"}' in text
+        assert 'resume_api_stage_duration_seconds_count{stage="unit_trace"}' in text
+
+    def test_response_tracker_exports_summary(self):
+        """Request latency is exported as a summary in seconds."""
+        tracker = ResponseTimeTracker()
+        tracker.add_request("GET /x", 200.0, 200)
+        tracker.add_request("GET /x", 400.0, 500, "INTERNAL_SERVER_ERROR")
+
+        registry = MetricsRegistry()
+        registry.register_collector("response_times", tracker.collect_metrics)
+        text = registry.render()
+        assert 'resume_api_http_request_duration_seconds_count{endpoint="GET /x",status_class="2xx"} 1' in text
+        assert 'resume_api_http_request_duration_seconds_sum{endpoint="GET /x",status_class="5xx"} 0.4' in text
+        assert 'resume_api_http_errors_total{error_code="INTERNAL_SERVER_ERROR"} 1' in text
+
+    def test_response_tracker_keys_by_route_template(self, monkeypatch):
+        """Path parameters and unknown paths do not create new series."""
+        tracker = ResponseTimeTracker()
+        monkeypatch.setattr(lightweight_monitoring, "response_tracker", tracker)
+        app = FastAPI()
+        app.add_middleware(LightweightMonitoringMiddleware)
+
+        @app.get("/api/v1/jobs/{job_id}")
+        async def get_job(job_id: str):
+            return {"job_id": job_id}
+
+        client = TestClient(app)
+        for job_id in ("a1", "b2", "c3"):
+            assert client.get(f"/api/v1/jobs/{job_id}").status_code == 200
+        client.get("/wp-login.php")
+        client.get("/.env")
+
+        assert set(tracker.recorders) == {"GET /api/v1/jobs/{job_id}", "GET unmatched"}
+        assert tracker.recorders["GET /api/v1/jobs/{job_id}"]["2xx"].snapshot().count == 3
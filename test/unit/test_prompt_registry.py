@@ -0,0 +1,81 @@
+"""Unit tests for the compiled prompt registry."""
+
+import os
+
+import pytest
+
+from src.core.simple_prompt_manager import CompiledTemplate, SimplePromptManager
+
+
+def _write_prompt(tmp_path, task, filename, version, status="active", user="Resume: {resume}"):
+    task_dir = tmp_path / task
+    task_dir.mkdir(exist_ok=True)
+    path = task_dir / filename
+    path.write_text(
+        f'version: "{version}"\n'
+        f"metadata:\n  status: {status}\n"
+        f"prompts:\n  system: 'Reply as {{\"ok\": true}}'\n  user: \"{user}\"\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def _touch(path, seconds):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+class TestCompiledTemplate:
+    """Test single-pass placeholder substitution."""
+
+    def test_render_is_single_pass(self):
+        """Values are not re-scanned; unknown placeholders and JSON braces stay as-is."""
+        template = CompiledTemplate.compile('JD: {job_description} / {resume} / {"a": 1} / {other}')
+
+        rendered = template.render({"job_description": "{resume}", "resume": "CV"})
+
+        assert rendered == 'JD: {resume} / CV / {"a": 1} / {other}'
+        assert template.placeholders == {"job_description", "resume", "other"}
+
+
+class TestPromptRegistry:
+    """Test version resolution and hot reload."""
+
+    def test_versions_resolve_once_per_index(self, tmp_path, monkeypatch):
+        """Env var beats the active version, which beats the newest version."""
+        _write_prompt(tmp_path, "demo", "v1.0.0.yaml", "1.0.0", status="active")
+        _write_prompt(tmp_path, "demo", "v1.1.0.yaml", "1.1.0", status="testing")
+        _write_prompt(tmp_path, "demo", "v1.1.0-zh-TW.yaml", "1.1.0", status="testing")
+        manager = SimplePromptManager(str(tmp_path), reload_interval_s=-1)
+
+        assert manager.list_versions("demo") == ["1.1.0", "1.0.0"]
+        assert manager.load_prompt_config("demo").version == "1.0.0"
+        assert manager.list_filenames("demo") == ["v1.0.0.yaml", "v1.1.0-zh-TW.yaml", "v1.1.0.yaml"]
+
+        monkeypatch.setenv("DEMO_PROMPT_VERSION", "1.1.0")
+        assert manager.load_prompt_config("demo").version == "1.0.0"  # Resolved when the index was built
+        manager.reload()
+        assert manager.load_compiled_prompt("demo").version == "1.1.0"
+        assert manager.get_resolved_version("demo", "active") == "1.0.0"
+
+    def test_changed_files_reload_atomically(self, tmp_path):
+        """Edited files are re-parsed; a broken edit keeps the last good prompt."""
+        path = _write_prompt(tmp_path, "demo", "v1.0.0.yaml", "1.0.0")
+        manager = SimplePromptManager(str(tmp_path), reload_interval_s=0)
+        before = manager.load_compiled_prompt("demo", "1.0.0")
+        assert manager.load_compiled_prompt("demo", "1.0.0") is before
+
+        _write_prompt(tmp_path, "demo", "v1.0.0.yaml", "1.0.0", user="JD: {job_description}")
+        _touch(path, 1)
+        after = manager.load_compiled_prompt("demo", "1.0.0")
+        assert after.templates["user"].placeholders == {"job_description"}
+        assert before.templates["user"].placeholders == {"resume"}
+
+        path.write_text("prompts: [unclosed", encoding="utf-8")
+        _touch(path, 2)
+        assert manager.load_compiled_prompt("demo", "1.0.0") is after
+
+        _write_prompt(tmp_path, "demo", "v2.0.0.yaml", "2.0.0")
+        assert manager.load_prompt_config("demo", "2.0.0").version == "2.0.0"
+        with pytest.raises(FileNotFoundError):
+            manager.load_prompt_config("demo", "9.9.9")
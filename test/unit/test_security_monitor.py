@@ -0,0 +1,88 @@
+"""Unit tests for SecurityMonitor rate limiting and content scanning."""
+
+import re
+
+import pytest
+
+from src.core.monitoring.security_monitor import SecurityMonitor
+
+
+class FakeRequest:
+    """Minimal request exposing a body."""
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+        class State:
+            pass
+
+        self.state = State()
+
+    async def body(self) -> bytes:
+        return self._body
+
+
+class TestRateLimit:
+    """Test the bucketed sliding-window rate limit."""
+
+    def test_window_slides_and_limit_applies(self):
+        """Requests count for one minute, then expire bucket by bucket."""
+        monitor = SecurityMonitor()
+        start = 1000.0
+        for i in range(60):
+            assert monitor._check_rate_limit("1.1.1.1", now=start + i * 0.5)["allowed"]
+
+        over = monitor._check_rate_limit("1.1.1.1", now=start + 30)
+        assert not over["allowed"]
+        assert over["current_rate"] == 61
+
+        # Well past a full window, only new requests count
+        assert monitor._check_rate_limit("1.1.1.1", now=start + 100)["current_rate"] == 1
+        # Other IPs are independent
+        assert monitor._check_rate_limit("2.2.2.2", now=start + 100)["current_rate"] == 1
+
+    def test_idle_ips_are_compacted(self):
+        """Counters of IPs idle for a full window are dropped."""
+        monitor = SecurityMonitor()
+        monitor._last_compaction = 0.0
+        monitor._check_rate_limit("idle", now=10.0)
+        monitor._check_rate_limit("active", now=200.0)
+
+        assert "idle" not in monitor.ip_requests
+        assert "active" in monitor.ip_requests
+
+
+class TestContentScan:
+    """Test the single-pass threat scan."""
+
+    @pytest.mark.parametrize("text", [
+        "<script>alert(1)</script> onload = x",
+        "SELECT * FROM users; UNION ALL select",
+        "exec (x) ../../etc ${a} bash;",
+        "${cmd; rm} ok",
+        "<SCRIPT src=x></script> JavaScript: OnClick=1",
+        "plain resume text about Python and SQL",
+    ])
+    def test_same_classification_as_per_pattern_search(self, text):
+        """The combined scan reports exactly what separate searches would."""
+        monitor = SecurityMonitor()
+        expected = [
+            threat for pattern, threat in monitor.suspicious_patterns
+            if re.search(pattern, text, re.IGNORECASE)
+        ]
+        assert monitor._scan_threats(text) == expected
+
+    @pytest.mark.asyncio
+    async def test_scan_is_bounded_to_body_prefix(self):
+        """Only the leading bytes are scanned; oversized bodies are still flagged."""
+        monitor = SecurityMonitor()
+        body = b"a" * (SecurityMonitor.CONTENT_SCAN_BYTES + 10) + b"<script>x</script>"
+        result = await monitor._check_request_content(FakeRequest(body))
+        assert result["threats"] == []
+
+        result = await monitor._check_request_content(FakeRequest(b"javascript:" + b"a" * 100001))
+        assert result["threats"] == ["XSS_ATTEMPT", "OVERSIZED_REQUEST"]
+
+        # 40000 CJK characters are 120000 bytes but not an oversized request
+        result = await monitor._check_request_content(FakeRequest(("履" * 40000).encode()))
+        assert result["threats"] == []
@@ -0,0 +1,163 @@
+"""
+Unit tests for single-flight deduplication of concurrent identical requests
+"""
+import asyncio
+
+import pytest
+
+from src.core.metrics.registry import get_metrics_registry
+from src.core.single_flight import ClientDisconnectedError, SingleFlight, request_key
+
+
+def _counter(name: str, operation: str) -> float:
+    return get_metrics_registry().counter(name, "", ["operation"]).value(operation=operation)
+
+
+class TestRequestKey:
+    """Keys identify the normalized inputs of an operation"""
+
+    def test_whitespace_and_key_order_ignored(self):
+        """Reformatted text and reordered fields hash to the same key"""
+        first = request_key("op", {"resume": "Python  developer\n", "language": "en"})
+        second = request_key("op", {"language": "en", "resume": " Python developer"})
+
+        assert first == second
+
+    def test_operation_and_content_distinguish_keys(self):
+        """Different operations or inputs never share a key"""
+        payload = {"resume": "Python developer"}
+
+        assert request_key("a", payload) != request_key("b", payload)
+        assert request_key("a", payload) != request_key("a", {"resume": "Go developer"})
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Concurrent calls with the same key share one execution"""
+
+    async def test_concurrent_calls_execute_once(self):
+        """Followers await the leader's execution and receive independent copies"""
+        flight = SingleFlight("sf_once")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"keywords": ["Python"]}
+
+        before = _counter("single_flight_coalesced_total", "sf_once")
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)))
+
+        assert calls == 1
+        assert results == [{"keywords": ["Python"]}] * 3
+        results[0]["keywords"].append("Go")
+        assert results[1]["keywords"] == ["Python"]
+        assert _counter("single_flight_coalesced_total", "sf_once") - before == 2
+        assert flight.in_flight == 0
+
+    async def test_sequential_calls_are_not_cached(self):
+        """A finished execution releases its key"""
+        flight = SingleFlight("sf_sequential")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("key", work) == 1
+        assert await flight.do("key", work) == 2
+
+    async def test_exception_reaches_every_caller(self):
+        """A failed execution fails all waiters"""
+        flight = SingleFlight("sf_error")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(2)), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    async def test_leader_cancellation_does_not_affect_followers(self):
+        """The caller that started the work can leave while others still wait"""
+        flight = SingleFlight("sf_leader")
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == "done"
+        assert leader.cancelled()
+
+    async def test_execution_cancelled_when_every_waiter_leaves(self):
+        """Work nobody waits for is cancelled and counted as abandoned"""
+        flight = SingleFlight("sf_abandoned")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        before = _counter("single_flight_abandoned_total", "sf_abandoned")
+        waiter = asyncio.create_task(flight.do("key", work))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert _counter("single_flight_abandoned_total", "sf_abandoned") - before == 1
+        assert flight.in_flight == 0
+
+    async def test_disconnected_client_stops_waiting(self, monkeypatch):
+        """is_disconnected turns into ClientDisconnectedError for that waiter only"""
+        monkeypatch.setenv("SINGLE_FLIGHT_DISCONNECT_POLL_S", "0.01")
+        flight = SingleFlight("sf_disconnect")
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        async def gone():
+            return True
+
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ClientDisconnectedError):
+            await flight.do("key", work, is_disconnected=gone)
+
+        release.set()
+        assert await follower == "done"
+
+    async def test_disabled_runs_every_call(self, monkeypatch):
+        """SINGLE_FLIGHT_ENABLED=false bypasses deduplication"""
+        monkeypatch.setenv("SINGLE_FLIGHT_ENABLED", "false")
+        flight = SingleFlight("sf_disabled")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(flight.do("key", work), flight.do("key", work))
+
+        assert calls == 2
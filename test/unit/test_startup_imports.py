@@ -0,0 +1,68 @@
+"""Import-time budget for application start-up (``python -X importtime``)."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Heavy packages that must only load on first use, never while importing the app
+DEFERRED_MODULES = (
+    "sklearn",
+    "scipy",
+    "opencensus",
+    "azure.identity",
+    "bs4",
+    "asyncpg",
+    "pgvector",
+    "yaml",
+)
+
+# The app's own import cost (src.main minus FastAPI) as a multiple of importing
+# FastAPI itself. Both slow down together on a loaded machine, so the ratio is
+# stable where a wall-clock budget is not. It was ~2.3 with eager sklearn and
+# OpenCensus imports and is ~0.7 without them.
+IMPORT_BUDGET_RATIO = float(os.getenv("IMPORT_TIME_BUDGET_RATIO", "1.5"))
+
+
+def _import_profile() -> dict[str, tuple[int, int]]:
+    """Import src.main in a fresh interpreter; module -> (self us, cumulative us)."""
+    env = {**os.environ, "MONITORING_ENABLED": "false", "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(  # noqa: S603 - fixed argv, current interpreter
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+@pytest.fixture(scope="module")
+def import_profile():
+    return _import_profile()
+
+
+class TestStartupImports:
+    """Guard against start-up import regressions."""
+
+    def test_heavy_modules_are_deferred(self, import_profile):
+        """Importing the app does not load packages that are only needed by requests."""
+        loaded = sorted(
+            name for name in import_profile
+            if any(name == module or name.startswith(module + ".") for module in DEFERRED_MODULES)
+        )
+        assert loaded == []
+
+    def test_import_time_within_budget(self, import_profile):
+        """Importing the app costs at most IMPORT_BUDGET_RATIO times importing FastAPI on top of it."""
+        _, app_us = import_profile["src.main"]
+        _, framework_us = import_profile["fastapi"]
+        ratio = (app_us - framework_us) / framework_us
+        assert ratio < IMPORT_BUDGET_RATIO, f"src.main import cost is {ratio:.2f}x FastAPI's ({app_us / 1000:.0f}ms total)"
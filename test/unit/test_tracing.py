@@ -0,0 +1,74 @@
+"""Unit tests for contextvar-based span tracing."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.core import tracing
+from src.core.tracing import current_span, span, start_trace, traced
+
+
+class TestSpanTracing:
+    """Test span nesting, no-op behaviour and export."""
+
+    def test_span_outside_trace_is_noop(self):
+        """Spans opened without a trace record nothing."""
+        with span("orphan") as orphan:
+            orphan.set_attribute("ignored", True)
+            assert current_span() is None
+
+    def test_nested_spans_build_tree(self):
+        """Spans nest under the current span and serialize with offsets."""
+        with start_trace("request") as root:
+            with span("outer", size=3):
+                time.sleep(0.01)
+                with span("inner"):
+                    pass
+            with span("after"):
+                pass
+
+        tree = root.to_dict()
+        assert [child["name"] for child in tree["children"]] == ["outer", "after"]
+        outer = tree["children"][0]
+        assert outer["attributes"] == {"size": 3}
+        assert outer["children"][0]["name"] == "inner"
+        assert outer["duration_ms"] >= 10
+        assert tree["children"][1]["start_ms"] >= outer["end_ms"]
+        assert root.duration_ms("missing") is None
+        assert current_span() is None
+
+    @pytest.mark.asyncio
+    async def test_tasks_and_threads_inherit_parent(self):
+        """Spans in created tasks and to_thread calls nest under the span that started them."""
+
+        def blocking_step():
+            with span("thread_step"):
+                time.sleep(0.01)
+
+        with start_trace("request") as root:
+            await asyncio.gather(
+                traced("task_a", asyncio.sleep(0.02)),
+                asyncio.create_task(traced("task_b", asyncio.to_thread(blocking_step))),
+            )
+
+        names = {child.name for child in root.children}
+        assert names == {"task_a", "task_b"}
+        assert root.find("task_b").children[0].name == "thread_step"
+        # Both tasks ran concurrently
+        assert root.elapsed_ms() < root.duration_ms("task_a") + root.duration_ms("task_b")
+
+    def test_nested_trace_becomes_child_and_exports_once(self):
+        """Only finished root spans are exported; errors are recorded."""
+        exported = []
+        tracing.register_span_exporter(exported.append)
+        try:
+            with pytest.raises(ValueError), start_trace("request") as root, start_trace("service"):
+                raise ValueError("boom")
+        finally:
+            tracing.unregister_span_exporter(exported.append)
+
+        assert exported == [root]
+        service = root.find("service")
+        assert service.parent is root
+        assert service.error == "ValueError: boom"
@@ -0,0 +1,146 @@
+"""Unit tests for the start-up warm-up runner and readiness endpoint."""
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core import warmup
+from src.core.warmup import WarmupRunner, WarmupSkipped, WarmupStep
+from src.services.dynamic_course_cache import DynamicCourseCache
+
+
+def _fail():
+    raise RuntimeError("boom")
+
+
+def _skip():
+    raise WarmupSkipped("nothing to do")
+
+
+class TestWarmupRunner:
+    """Test step execution and readiness rules."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_steps_run_first_and_gate_readiness(self):
+        """Background steps wait for run(blocking=False); readiness waits for them."""
+        calls = []
+
+        async def background():
+            calls.append("background")
+            return {"connections": 2}
+
+        runner = WarmupRunner([
+            WarmupStep("load", lambda: calls.append("load"), required=True, blocking=True),
+            WarmupStep("connect", background),
+        ])
+        await runner.run(blocking=True)
+        assert calls == ["load"]
+        assert runner.report()["status"] == "warming"
+        assert not runner.ready
+
+        await runner.run(blocking=False)
+        assert calls == ["load", "background"]
+        assert runner.ready
+        assert runner.report()["steps"]["connect"]["detail"] == {"connections": 2}
+
+    @pytest.mark.asyncio
+    async def test_only_required_failures_block_readiness(self):
+        """Optional failures and skips are reported; a required failure is fatal."""
+        optional = WarmupRunner([WarmupStep("db", _fail), WarmupStep("snapshot", _skip)])
+        await optional.run()
+        assert optional.ready
+        assert optional.results["db"].error == "RuntimeError: boom"
+        assert optional.results["snapshot"].status == "skipped"
+        assert not optional.succeeded("db")
+
+        required = WarmupRunner([WarmupStep("prompts", _fail, required=True)])
+        await required.run()
+        assert not required.ready
+        assert required.report()["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_sync_steps_run_off_the_loop_and_time_out(self):
+        """Sync steps run in a worker thread; slow steps fail after the timeout."""
+        loop_thread = threading.get_ident()
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        runner = WarmupRunner(
+            [WarmupStep("sync", threading.get_ident), WarmupStep("slow", slow)], step_timeout_s=0.05
+        )
+        await runner.run()
+
+        assert runner.results["sync"].detail != loop_thread
+        assert runner.results["slow"].status == "failed"
+        assert "timed out" in runner.results["slow"].error
+
+
+class TestReadinessEndpoint:
+    """Test /ready against the process-wide runner."""
+
+    def test_ready_returns_503_until_warm(self, monkeypatch):
+        """The probe fails while steps are pending and passes once they have run."""
+        from src.main import app
+
+        runner = WarmupRunner([WarmupStep("prompts", lambda: {}, required=True)])
+        monkeypatch.setattr(warmup, "_runner", runner)
+        client = TestClient(app)
+
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["data"]["steps"]["prompts"]["status"] == "pending"
+
+        asyncio.run(runner.run())
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "ready"
+
+
+class TestCourseCacheSnapshot:
+    """Test filling the course availability cache from a snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_round_trip_skips_expired(self, tmp_path):
+        """Live items survive a restart with their age; expired ones are dropped."""
+        path = str(tmp_path / "courses.json")
+        cache = DynamicCourseCache(ttl_minutes=30)
+        await cache.set("python", {"has_courses": True, "count": 5})
+        await cache.set("sql", {"has_courses": False, "count": 0})
+        cache._cache["sql"].timestamp = datetime.now() - timedelta(minutes=29)
+
+        assert await cache.save_snapshot(path) == 2
+        snapshot = json.loads((tmp_path / "courses.json").read_text(encoding="utf-8"))
+        assert [item["key"] for item in snapshot["items"]] == ["python", "sql"]
+
+        restored = DynamicCourseCache(ttl_minutes=30)
+        assert await restored.load_snapshot(path) == 2
+        assert await restored.get("python") == {"has_courses": True, "count": 5}
+
+        short_lived = DynamicCourseCache(ttl_minutes=1)
+        assert await short_lived.load_snapshot(path) == 1
+        assert await short_lived.get("sql") is None
+        assert await DynamicCourseCache().load_snapshot(str(tmp_path / "missing.json")) == 0
+
+
+class TestStandardizationRules:
+    """Test compiling standardization rules up front."""
+
+    def test_rules_compile_once_per_config(self):
+        """compile_rules is idempotent and recompiles when the config changes."""
+        from src.services.standardization.zh_tw_standardizer import TraditionalChineseStandardizer
+
+        standardizer = TraditionalChineseStandardizer()
+        count = standardizer.compile_rules()
+        patterns = standardizer._pattern_rules
+        assert standardizer.compile_rules() == count
+        assert standardizer._pattern_rules is patterns
+
+        standardizer.config = {**standardizer.config, "pattern_rules": [{"pattern": r"^js$", "replacement": "JavaScript"}]}
+        standardized, mappings = standardizer._apply_pattern_rules(["js", "Go"])
+        assert standardized == ["JavaScript", "Go"]
+        assert mappings[0]["method"] == "pattern"
@@ -0,0 +1,69 @@
+"""Unit tests for cross-worker metrics aggregation."""
+
+import json
+
+from src.core.metrics.latency_histogram import RollingLatencyRecorder
+from src.core.metrics.worker_metrics import get_aggregated_stats, publish_worker_state, worker_state_path
+from src.middleware.lightweight_monitoring import ResponseTimeTracker
+
+
+class TestRecorderMerge:
+    """Test serialization and merging of rolling recorders."""
+
+    def test_round_trip_and_merge_windows(self):
+        """Recorders survive JSON and merge slot by slot."""
+        start = 1_000_000.0
+        first = RollingLatencyRecorder()
+        first.record(100, now=start)
+        second = RollingLatencyRecorder()
+        second.record(300, now=start + 1)
+        second.record(500, now=start - 7200)  # only in lifetime
+
+        restored = RollingLatencyRecorder.from_dict(json.loads(json.dumps(second.to_dict())))
+        first.merge(restored)
+
+        assert first.snapshot().count == 3
+        assert first.window("1m", now=start + 1).count == 2
+        assert first.window("1m", now=start + 1).max == 300
+
+
+class TestTrackerAggregation:
+    """Test merging ResponseTimeTracker state across workers."""
+
+    def test_merge_state_combines_series_and_errors(self):
+        """Counts, status classes and error examples add up."""
+        worker_a = ResponseTimeTracker()
+        worker_a.add_request("POST /api/v1/tailor", 100.0, 200)
+        worker_b = ResponseTimeTracker()
+        worker_b.add_request("POST /api/v1/tailor", 300.0, 200)
+        worker_b.add_request("POST /api/v1/tailor", 50.0, 429, "RATE_LIMIT_EXCEEDED")
+
+        merged = ResponseTimeTracker()
+        merged.merge_state(worker_a.export_state())
+        merged.merge_state(json.loads(json.dumps(worker_b.export_state())))
+
+        stats = merged.get_stats()
+        endpoint = stats["endpoints"]["POST /api/v1/tailor"]
+        assert endpoint["count"] == 3
+        assert endpoint["by_status_class"]["2xx"]["count"] == 2
+        assert stats["errors"]["RATE_LIMIT_EXCEEDED"]["count"] == 1
+
+    def test_aggregated_stats_include_other_workers(self, tmp_path, monkeypatch):
+        """Stats merge this process's live state with other workers' files."""
+        other = ResponseTimeTracker()
+        for _ in range(5):
+            other.add_request("GET /health-probe", 10.0, 200)
+        other_state = {"pid": -1, "published_at": 0.0, "response_times": other.export_state(), "cpu_pool": {}}
+        worker_state_path(tmp_path, -1).write_text(json.dumps(other_state), encoding="utf-8")
+        (tmp_path / "worker-corrupt.json").write_text("{", encoding="utf-8")
+
+        monkeypatch.delenv("WORKER_METRICS_DIR", raising=False)
+        assert get_aggregated_stats() is None
+
+        monkeypatch.setenv("WORKER_METRICS_DIR", str(tmp_path))
+        publish_worker_state(tmp_path)
+        stats = get_aggregated_stats()
+
+        assert stats["endpoints"]["GET /health-probe"]["count"] == 5
+        assert len(stats["workers"]) == 2
+        assert {worker["pid"] for worker in stats["workers"]} >= {-1}